@@ -14,9 +14,10 @@
 
 import logging
 
-import google.cloud.storage as storage
 from google.api_core import exceptions
 
+from app.services.connections import get_storage_client
+
 
 def create_bucket_if_not_exists(bucket_name: str, project: str, location: str) -> None:
     """Creates a new bucket if it doesn't already exist.
@@ -26,7 +27,7 @@ def create_bucket_if_not_exists(bucket_name: str, project: str, location: str) -
         project: Google Cloud project ID
         location: Location to create the bucket in (defaults to eu-west1)
     """
-    storage_client = storage.Client(project=project)
+    storage_client = get_storage_client(project)
 
     if bucket_name.startswith("gs://"):
         bucket_name = bucket_name[5:]
@@ -50,3 +51,35 @@ def create_bucket_if_not_exists(bucket_name: str, project: str, location: str) -
             f"Failed to create or access bucket {bucket_name}. "
             f"App will continue without bucket: {e}"
         )
+
+
+def upload_bytes(bucket_name: str, object_name: str, payload: bytes, project: str, content_type: str) -> None:
+    """Uploads a payload as a Cloud Storage object.
+
+    Args:
+        bucket_name: Name of the bucket (with or without gs:// prefix)
+        object_name: Name of the object in the bucket
+        payload: Object content
+        project: Google Cloud project ID
+        content_type: Content type of the object
+    """
+    bucket = get_storage_client(project).bucket(bucket_name.removeprefix("gs://").rstrip("/"))
+    bucket.blob(object_name).upload_from_string(payload, content_type=content_type)
+
+
+def download_bytes(bucket_name: str, object_name: str, project: str) -> bytes | None:
+    """Downloads a Cloud Storage object.
+
+    Args:
+        bucket_name: Name of the bucket (with or without gs:// prefix)
+        object_name: Name of the object in the bucket
+        project: Google Cloud project ID
+
+    Returns:
+        The object content, or None if the object does not exist
+    """
+    bucket = get_storage_client(project).bucket(bucket_name.removeprefix("gs://").rstrip("/"))
+    try:
+        return bucket.blob(object_name).download_as_bytes()
+    except exceptions.NotFound:
+        return None
@@ -14,6 +14,12 @@
 import logging
 import os
 
+from opentelemetry import trace
+from opentelemetry.sdk.trace import TracerProvider
+
+from app.config.settings import settings
+from app.services.telemetry_export import GcsTelemetryUploader, telemetry_exporter
+
 
 def setup_telemetry() -> str | None:
     """Configure OpenTelemetry and GenAI telemetry with GCS upload."""
@@ -22,7 +28,11 @@ def setup_telemetry() -> str | None:
     capture_content = os.environ.get(
         "OTEL_INSTRUMENTATION_GENAI_CAPTURE_MESSAGE_CONTENT", "false"
     )
-    if bucket and capture_content != "false":
+    if settings.TELEMETRY_EXPORT_ENABLED:
+        # Completion metadata is exported in batches with the model call spans
+        # instead of one upload per completion
+        logging.info("Prompt-response logging handled by the batched telemetry exporter")
+    elif bucket and capture_content != "false":
         logging.info(
             "Prompt-response logging enabled - mode: NO_CONTENT (metadata only, no prompts/responses)"
         )
@@ -48,3 +58,25 @@ def setup_telemetry() -> str | None:
         )
 
     return bucket
+
+
+def register_telemetry_exporter() -> bool:
+    """
+    Attach the batched span exporter to the tracer provider set up by ADK.
+
+    Returns:
+        True if the exporter was registered
+    """
+    if not settings.TELEMETRY_EXPORT_ENABLED:
+        return False
+    uploader = telemetry_exporter.uploader
+    if isinstance(uploader, GcsTelemetryUploader) and not uploader.bucket:
+        logging.warning("Telemetry export disabled: set TELEMETRY_EXPORT_BUCKET or LOGS_BUCKET_NAME")
+        return False
+    provider = trace.get_tracer_provider()
+    if not isinstance(provider, TracerProvider):
+        logging.warning(f"Telemetry export disabled: unsupported tracer provider {type(provider).__name__}")
+        return False
+    provider.add_span_processor(telemetry_exporter)
+    logging.info(f"Exporting spans in batches to {uploader.name}")
+    return True
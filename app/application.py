@@ -1,67 +1,123 @@
 """FastAPI application factory."""
 
+import asyncio
+import contextlib
 import logging
-
+from collections.abc import AsyncIterator
 
 from fastapi import FastAPI
-from fastapi.responses import JSONResponse
 from google.adk.cli.fast_api import get_fast_api_app
 
+from app.app_utils.telemetry import register_telemetry_exporter, setup_telemetry
 from app.config.settings import settings
+from app.routers import cache, debug, feedback, health, metrics
+from app.services.client_registry import clients
+from app.services.compact_sessions import register_compact_session_service
+from app.services.concurrency_limiter import agent_run_limiter
+from app.services.feedback import feedback_pipeline
+from app.services.loop_monitor import loop_lag_monitor
+from app.services.memory import memory_tracker
+from app.services.skill_contracts import skill_contracts
+from app.services.telemetry_export import telemetry_exporter
+from app.services.tenants import tenant_quotas
+from app.services.warmup import run_warmup, warmup_state
 from app.utils.agent_card_generator import generate_all_agent_cards
+from app.utils.load_shedding import LoadSheddingMiddleware
+from app.utils.request_context import RequestContextMiddleware
+from app.utils.responses import use_orjson_responses
+from app.utils.skill_validation import SkillValidationMiddleware
+from app.utils.tenancy import TenantMiddleware
 
 logger = logging.getLogger(__name__)
 
 
+@contextlib.asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """Warm up the shared clients in the background, close them on shutdown."""
+    loop_lag_monitor.start()
+    if settings.MEMORY_TRACKING_ENABLED:
+        memory_tracker.start(settings.MEMORY_TRACKING_FRAMES)
+    if settings.FEEDBACK_ENABLED:
+        feedback_pipeline.start()
+    if settings.TELEMETRY_EXPORT_ENABLED:
+        telemetry_exporter.start()
+    task = None
+    if settings.WARMUP_ENABLED:
+        task = asyncio.create_task(run_warmup())
+    else:
+        warmup_state.ready = True
+        warmup_state.status = "skipped"
+
+    yield
+
+    if task is not None and not task.done():
+        task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await task
+
+    await loop_lag_monitor.stop()
+    # Last feedback batches still use the shared clients
+    await feedback_pipeline.stop()
+    await asyncio.to_thread(telemetry_exporter.shutdown)
+    await clients.aclose()
+
+
 def create_app() -> FastAPI:
     """Create and configure the FastAPI application instance."""
 
-    try:
-        generate_all_agent_cards()
-    except Exception as e:
-        logger.error(f"FATAL: Failed to generate agent cards on startup: {e}", exc_info=True)
-        # Re-raise the exception to prevent the app from starting in a broken state
-        raise
+    if settings.SKIP_AGENT_CARD_GENERATION:
+        logger.info("Agent cards already generated by the launcher, skipping")
+    else:
+        try:
+            generate_all_agent_cards()
+        except Exception as e:
+            logger.error(f"FATAL: Failed to generate agent cards on startup: {e}", exc_info=True)
+            # Re-raise the exception to prevent the app from starting in a broken state
+            raise
 
-    session_service_uri = None
+    setup_telemetry()
+    register_compact_session_service()
+    session_service_uri = settings.get_session_service_uri()
     if settings.USE_AGENT_ENGINE_SESSIONS:
-        if not settings.AGENT_ENGINE_ID:
-            raise ValueError(
-                "AGENT_ENGINE_ID must be set when USE_AGENT_ENGINE_SESSIONS is True."
-            )
-        APP_ID = settings.AGENT_ENGINE_ID.split('/')[-1]
-        session_service_uri = f"agentengine://{APP_ID}"
-        logger.info(f"Using Vertex AI Agent Engine Sessions: {APP_ID}")
+        logger.info(f"Using Vertex AI Agent Engine Sessions: {session_service_uri}")
+    elif session_service_uri:
+        logger.info(f"Using session service: {session_service_uri}")
     else:
-        logger.info("Using InMemorySessionService (sessions not persisted)")
+        logger.info("Using ADK local session storage (per-agent SQLite)")
 
     app: FastAPI = get_fast_api_app(
         agents_dir=settings.AGENT_DIR,
         web=True,  # Enable web UI
         a2a=True,  # Enable A2A protocol support
         session_service_uri=session_service_uri,
+        lifespan=lifespan,
     )
 
+    # ADK sets up the tracer provider while building the app
+    register_telemetry_exporter()
+
     app.title = settings.APP_NAME
     app.description = settings.APP_DESCRIPTION
     app.version = settings.APP_VERSION
 
-    @app.get("/health", tags=["Health"], summary="Health Check")
-    async def health_check() -> JSONResponse:
-        """
-        Health check endpoint for monitoring systems.
-
-        Returns:
-            JSONResponse: A simple JSON response with status "ok"
-        """
-        return JSONResponse(
-            content={
-                "status": "ok",
-                "app": settings.APP_NAME,
-                "version": settings.APP_VERSION,
-            },
-            status_code=200,
-        )
+    app.add_middleware(RequestContextMiddleware)
+    if settings.LOAD_SHEDDING_ENABLED:
+        app.add_middleware(LoadSheddingMiddleware, limiter=agent_run_limiter)
+    # Outside load shedding: an invalid message never takes a slot
+    app.add_middleware(SkillValidationMiddleware, contracts=skill_contracts)
+    if settings.MULTI_TENANCY_ENABLED:
+        # Outermost: a tenant over its quota never takes a slot of the global limit
+        app.add_middleware(TenantMiddleware, quotas=tenant_quotas)
+    app.include_router(health.router)
+    app.include_router(cache.router)
+    app.include_router(metrics.router)
+    if settings.FEEDBACK_ENABLED:
+        app.include_router(feedback.router)
+    if settings.DEBUG_ENDPOINTS_ENABLED:
+        app.include_router(debug.router)
+        logger.info("Debug endpoints enabled on /debug")
+    if settings.ORJSON_RESPONSES_ENABLED:
+        use_orjson_responses(app)
 
     logger.info(
         f"FastAPI application created: {settings.APP_NAME} v{settings.APP_VERSION}"
@@ -1,19 +1,7 @@
 """
-Agents package - Exposes all available agents.
+Agents package - One subpackage per agent.
 
-This module centralizes access to all agents in the application:
-- Quizz Agent: Generates quizzes and educational content
-- Training Script Agent: Creates comprehensive training scripts
+Every package of this directory with an `agent.py` defining `root_agent` is
+an agent, discovered at startup (see `app.services.agent_discovery`); use
+`app.components.agents.registry` to list or load them.
 """
-
-from app.components.agents.quizz_agent.agent import (
-    root_agent as quizz_agent,
-)
-from app.components.agents.training_script_agent.agent import (
-    root_agent as training_script_agent,
-)
-
-__all__ = [
-    "quizz_agent",
-    "training_script_agent",
-]
@@ -1,29 +1,84 @@
-
 import logging
 
-from google.adk.agents import LlmAgent
+from google.adk.agents import BaseAgent, LlmAgent
 
-from app.components.callbacks.after_agent import log_agent_end
-from app.components.callbacks.before_agent import log_agent_start
-from app.components.callbacks.tool_callbacks import log_after_tool, log_before_tool
+from app.components.agents.quizz_agent.variation import build_quiz_variation_agent
+from app.components.callbacks.after_agent import (
+    discard_rag_prefetch,
+    log_agent_end,
+    record_agent_metrics,
+    record_session_memory,
+    store_cached_response,
+    validate_skill_output,
+)
+from app.components.callbacks.after_model import (
+    log_model_usage,
+    record_model_metrics,
+    record_tenant_usage,
+)
+from app.components.callbacks.before_agent import (
+    log_agent_start,
+    serve_cached_response,
+    start_rag_prefetch,
+)
+from app.components.callbacks.before_model import apply_context_cache, route_model
+from app.components.callbacks.tool_callbacks import (
+    limit_tool_response,
+    log_after_tool,
+    log_before_tool,
+)
+from app.components.tools.custom.a2a_delegation_tool import get_delegation_tools
+from app.components.tools.custom.tool_response_tool import get_tool_response_tools
 from app.components.tools.custom.vertex_ai_rag_retrieval_tool import (
-    vertex_ai_rag_retrieval_tool,
+    get_rag_retrieval_tool,
+)
+from app.config.constants import (
+    AGENT_QUIZZ_DESCRIPTION,
+    AGENT_QUIZZ_STATIC_INSTRUCTION,
+    AGENT_QUIZZ_VARIATION_INSTRUCTION,
+    resolve_static_instruction,
 )
-from app.config.constants import AGENT_QUIZZ_DESCRIPTION, AGENT_QUIZZ_INSTRUCTION
 from app.config.settings import settings
+from app.services.connections import get_llm
+from app.services.tenants import TenantConfig, tenant_agent
 
 logger = logging.getLogger(__name__)
 
-root_agent = LlmAgent(
-    name="quizz_agent",
-    model=settings.MODEL,
-    description=AGENT_QUIZZ_DESCRIPTION,
-    instruction=AGENT_QUIZZ_INSTRUCTION,
-    tools=[
-        vertex_ai_rag_retrieval_tool
-    ],
-    before_agent_callback=log_agent_start,
-    after_agent_callback=log_agent_end,
-    before_tool_callback=log_before_tool,
-    after_tool_callback=log_after_tool
-)
+AGENT_NAME = "quizz_agent"
+
+
+def build_agent(tenant: TenantConfig) -> BaseAgent:
+    """Build the quiz agent with a tenant's model, corpus and instructions."""
+    quizz_writer = LlmAgent(
+        name=AGENT_NAME,
+        model=get_llm(tenant.model),
+        description=AGENT_QUIZZ_DESCRIPTION,
+        static_instruction=resolve_static_instruction(
+            AGENT_NAME, tenant.instructions.get(AGENT_NAME), AGENT_QUIZZ_STATIC_INSTRUCTION
+        ),
+        tools=[
+            get_rag_retrieval_tool(tenant.rag_corpus_id),
+            *get_delegation_tools(),
+            *get_tool_response_tools(),
+        ],
+        before_agent_callback=[log_agent_start, serve_cached_response, start_rag_prefetch],
+        after_agent_callback=[
+            log_agent_end,
+            store_cached_response,
+            record_agent_metrics,
+            record_session_memory,
+            discard_rag_prefetch,
+            validate_skill_output,
+        ],
+        before_model_callback=[route_model, apply_context_cache],
+        after_model_callback=[log_model_usage, record_model_metrics, record_tenant_usage],
+        before_tool_callback=log_before_tool,
+        after_tool_callback=[log_after_tool, limit_tool_response],
+    )
+
+    if settings.QUIZ_VARIATION_ENABLED:
+        return build_quiz_variation_agent(quizz_writer, question_instruction=AGENT_QUIZZ_VARIATION_INSTRUCTION)
+    return quizz_writer
+
+
+root_agent = tenant_agent(build_agent)
@@ -0,0 +1,366 @@
+"""
+Variation mode of the quiz agent.
+
+A variation request ("Génère 2 autres versions de ce test") used to rewrite
+whole quizzes in a single call, retrieving the documents again. With
+`QUIZ_VARIATION_ENABLED`:
+
+1. every quiz written by the agent is parsed into questions and stored in
+   session state with the passages retrieved to write it (in full, when the
+   tool response budget truncated them)
+   (`QUIZ_STATE_KEY`, `QUIZ_CONTEXTS_STATE_KEY`)
+2. variation requests of the same session only regenerate what changes: the
+   questions named in the request ("les questions 2 et 4"), only their wrong
+   answers ("change les distracteurs"), or every question otherwise. Each
+   question of each version is regenerated by its own sub-agent,
+   concurrently, from the stored passages (no retrieval)
+3. unchanged questions, stems and correct answers are copied from the
+   stored quiz, and the versions are assembled in the standard quiz format
+
+Output tokens and latency thus follow the share of the quiz that changes.
+Other requests, and variations without a stored quiz, go to the single-call
+writer agent.
+"""
+
+import asyncio
+import functools
+import logging
+import re
+import unicodedata
+from collections.abc import AsyncGenerator
+from typing import Any
+
+from google.adk.agents import BaseAgent, LlmAgent
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.events import Event, EventActions
+from google.genai import types
+from typing_extensions import override
+
+from app.components.agents.training_script_agent.pipeline import (
+    Emit,
+    clone_with_brief,
+    get_text,
+    run_concurrently,
+    run_sub_agent,
+)
+from app.components.callbacks.after_agent import discard_rag_prefetch
+from app.components.callbacks.before_agent import start_rag_prefetch
+from app.components.tools.custom.vertex_ai_rag_retrieval_tool import (
+    PooledVertexAiRagRetrieval,
+)
+from app.config.settings import settings
+from app.services.model_router import Intent, detect_intent
+from app.services.tool_responses import tool_response_budget
+
+logger = logging.getLogger(__name__)
+
+QUIZ_STATE_KEY = "quiz_questions"
+QUIZ_CONTEXTS_STATE_KEY = "quiz_contexts"
+
+_QUESTION = re.compile(r"^\s*\*\*Question\s*\d+\s*:\s*(?P<text>.+?)\s*\*\*\s*$", re.MULTILINE | re.IGNORECASE)
+_OPTION = re.compile(r"^\s*(?P<letter>[A-D])\)\s*(?P<text>.+?)\s*$", re.MULTILINE)
+_ANSWER = re.compile(r"\*\*Bonne\s+R[ée]ponse\s*:\s*\*\*\s*\(?(?P<letter>[A-D])\b", re.IGNORECASE)
+_EXPLANATION = re.compile(r"\*\*Explication\s*:\s*\*\*\s*(?P<text>.*)", re.IGNORECASE | re.DOTALL)
+_NUMBERS = {"un": 1, "une": 1, "deux": 2, "trois": 3, "quatre": 4, "cinq": 5}
+_VERSIONS = re.compile(
+    r"\b(?P<count>\d+|une?|deux|trois|quatre|cinq)\s+(?:autres?\s+|nouvelles?\s+)?"
+    r"(?:versions?|variantes?|variations?|quiz|tests?)\b"
+)
+_TARGETS = re.compile(r"\bquestions?\s+(?:n\W?\s*)?(?P<numbers>\d+(?:\s*(?:,|et|&)\s*\d+)*)")
+_DISTRACTORS = re.compile(
+    r"\b(distract\w*|(mauvaises?|fausses?) (reponses?|options?|propositions?)"
+    r"|(reponses?|options?|propositions?) (incorrectes?|fausses?))\b"
+)
+
+
+def _fold(text: str) -> str:
+    """Lowercase and strip accents for keyword matching."""
+    decomposed = unicodedata.normalize("NFKD", text.lower())
+    return "".join(char for char in decomposed if not unicodedata.combining(char))
+
+
+def parse_questions(text: str) -> list[dict[str, Any]]:
+    """
+    Parse a quiz in the standard format into questions.
+
+    Returns:
+        The questions (`question`, `options` by letter, `answer`,
+        `explanation`); blocks without options or answer are skipped
+    """
+    headers = list(_QUESTION.finditer(text or ""))
+    questions = []
+    for header, following in zip(headers, [*headers[1:], None], strict=True):
+        block = text[header.end() : following.start() if following else len(text)]
+        options = {match["letter"]: match["text"] for match in _OPTION.finditer(block)}
+        answer = _ANSWER.search(block)
+        if len(options) < 2 or answer is None:
+            continue
+        explanation = _EXPLANATION.search(block)
+        questions.append(
+            {
+                "question": header["text"],
+                "options": options,
+                "answer": answer["letter"].upper(),
+                "explanation": explanation["text"].strip().rstrip("-").strip() if explanation else "",
+            }
+        )
+    return questions
+
+
+def format_question(number: int, question: dict[str, Any]) -> str:
+    """Format a question in the standard quiz format."""
+    options = "\n".join(f"{letter}) {text}" for letter, text in sorted(question["options"].items()))
+    return (
+        f"**Question {number} : {question['question']}**\n{options}\n\n"
+        f"**Bonne Réponse :** {question['answer']}\n"
+        f"**Explication :** {question['explanation']}"
+    )
+
+
+def format_quiz(questions: list[dict[str, Any]]) -> str:
+    """Format the questions of a quiz, numbered in order."""
+    return "\n\n---\n\n".join(
+        format_question(number, question) for number, question in enumerate(questions, start=1)
+    )
+
+
+def requested_versions(prompt: str) -> int:
+    """Number of versions asked for ("2 autres versions"), 1 by default."""
+    match = _VERSIONS.search(_fold(prompt))
+    if not match:
+        return 1
+    count = match["count"]
+    count = int(count) if count.isdigit() else _NUMBERS[count]
+    return max(1, min(count, settings.QUIZ_VARIATION_MAX_VERSIONS))
+
+
+def requested_questions(prompt: str, question_count: int) -> list[int]:
+    """Indexes of the questions named in the request ("questions 2 et 4"), all by default."""
+    match = _TARGETS.search(_fold(prompt))
+    if match:
+        indexes = sorted({int(number) - 1 for number in re.findall(r"\d+", match["numbers"])})
+        indexes = [index for index in indexes if 0 <= index < question_count]
+        if indexes:
+            return indexes
+    return list(range(question_count))
+
+
+def distractors_only(prompt: str) -> bool:
+    """Whether the request only asks for new wrong answers."""
+    return bool(_DISTRACTORS.search(_fold(prompt)))
+
+
+def build_question_brief(
+    questions: list[dict[str, Any]],
+    index: int,
+    version: int,
+    versions: int,
+    distractors: bool,
+    passages: list[str],
+) -> str:
+    """Build the dynamic instruction of the sub-agent regenerating one question."""
+    question = questions[index]
+    others = "\n".join(
+        f"-   {other['question']}" for position, other in enumerate(questions) if position != index
+    )
+    documents = "\n\n".join(
+        f"[Extrait {position}]\n{passage}" for position, passage in enumerate(passages, start=1)
+    )
+    if distractors:
+        wrong = ", ".join(letter for letter in sorted(question["options"]) if letter != question["answer"])
+        task = f"## MODE : distracteurs\nLettres à réécrire : {wrong}\n\n"
+    else:
+        task = f"## MODE : question\nNuméro : {index + 1}\n\n"
+    return (
+        f"{task}"
+        f"## VERSION\n{version} sur {versions} : proposez une variante propre à cette version.\n\n"
+        f"## QUESTION D'ORIGINE\n{format_question(index + 1, question)}\n\n"
+        f"## AUTRES QUESTIONS DU QUIZ\n{others or 'Aucune.'}\n\n"
+        f"## EXTRAITS DOCUMENTAIRES\n{documents or 'Aucun extrait.'}"
+    )
+
+
+def merge_question(question: dict[str, Any], text: str, distractors: bool) -> dict[str, Any]:
+    """
+    Merge a sub-agent's answer into the original question.
+
+    Returns:
+        The new question; the original (or its unparsable parts) is kept when
+        the answer cannot be parsed
+    """
+    if distractors:
+        options = dict(question["options"])
+        for match in _OPTION.finditer(text):
+            if match["letter"] in options and match["letter"] != question["answer"]:
+                options[match["letter"]] = match["text"]
+        return {**question, "options": options}
+    parsed = parse_questions(text)
+    if not parsed:
+        logger.warning(f"Unparsable question variant, keeping the original: {question['question']!r}")
+        return question
+    return parsed[0]
+
+
+async def collect_passages(event: Event, rag_tool_names: set[str]) -> list[str]:
+    """
+    Passages retrieved in an event: RAG tool responses or built-in retrieval grounding.
+
+    Responses truncated by the tool response budget are read back in full.
+    """
+    passages: list[str] = []
+    for response in event.get_function_responses():
+        if response.name in rag_tool_names and isinstance(response.response, dict):
+            result = (await tool_response_budget.restore(response.response)).get("result")
+            if isinstance(result, list):
+                passages.extend(passage for passage in result if isinstance(passage, str))
+    grounding = event.grounding_metadata
+    for chunk in (grounding.grounding_chunks or []) if grounding else []:
+        if chunk.retrieved_context and chunk.retrieved_context.text:
+            passages.append(chunk.retrieved_context.text)
+    return passages
+
+
+class QuizVariationAgent(BaseAgent):
+    """Routes quiz variations to per-question regeneration, the rest to the writer."""
+
+    writer: LlmAgent
+    """Single-call quiz agent, used for every other request and as fallback."""
+
+    question_agent: LlmAgent
+    """Template of the sub-agent regenerating one question (cloned per question and version)."""
+
+    max_concurrency: int = 4
+    """Maximum number of sub-agents running at the same time."""
+
+    @override
+    async def _run_async_impl(
+        self, ctx: InvocationContext
+    ) -> AsyncGenerator[Event, None]:
+        prompt = get_text(ctx.user_content)
+        questions = ctx.session.state.get(QUIZ_STATE_KEY)
+        if questions and detect_intent(prompt) is Intent.VARIATION:
+            async for event in self._run_variations(ctx, prompt, questions):
+                yield event
+            return
+
+        rag_tool_names = {tool.name for tool in self.writer.tools if isinstance(tool, PooledVertexAiRagRetrieval)}
+        passages: list[str] = []
+        text = ""
+        async for event in self.writer.run_async(ctx):
+            passages.extend(await collect_passages(event, rag_tool_names))
+            if event.is_final_response() and event.author == self.writer.name:
+                text = get_text(event.content)
+            yield event
+
+        # Whatever the request, a quiz written by the writer is the one later
+        # variations start from; without a new retrieval, it was written from
+        # the passages already stored
+        questions = parse_questions(text)
+        if questions:
+            passages = passages or ctx.session.state.get(QUIZ_CONTEXTS_STATE_KEY) or []
+            yield Event(
+                invocation_id=ctx.invocation_id,
+                author=self.name,
+                branch=ctx.branch,
+                actions=EventActions(state_delta={QUIZ_STATE_KEY: questions, QUIZ_CONTEXTS_STATE_KEY: passages}),
+            )
+
+    async def _run_variations(
+        self, ctx: InvocationContext, prompt: str, questions: list[dict[str, Any]]
+    ) -> AsyncGenerator[Event, None]:
+        versions = requested_versions(prompt)
+        targets = requested_questions(prompt, len(questions))
+        distractors = distractors_only(prompt)
+        passages: list[str] = ctx.session.state.get(QUIZ_CONTEXTS_STATE_KEY) or []
+        results = [list(questions) for _ in range(versions)]
+        logger.info(
+            f"Agent '{self.name}' regenerating {len(targets)} of {len(questions)} questions "
+            f"({'distractors' if distractors else 'questions'}) for {versions} version(s)"
+        )
+
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        jobs = [
+            functools.partial(
+                self._vary_question, ctx, questions, index, version, versions, distractors, passages, results, semaphore
+            )
+            for version in range(versions)
+            for index in targets
+        ]
+        async for event in run_concurrently(jobs):
+            yield event
+
+        if versions == 1:
+            text = format_quiz(results[0])
+        else:
+            text = "\n\n".join(
+                f"## Version {version}\n\n{format_quiz(result)}" for version, result in enumerate(results, start=1)
+            )
+        yield Event(
+            invocation_id=ctx.invocation_id,
+            author=self.name,
+            branch=ctx.branch,
+            content=types.Content(role="model", parts=[types.Part(text=text)]),
+        )
+
+    async def _vary_question(
+        self,
+        ctx: InvocationContext,
+        questions: list[dict[str, Any]],
+        index: int,
+        version: int,
+        versions: int,
+        distractors: bool,
+        passages: list[str],
+        results: list[list[dict[str, Any]]],
+        semaphore: asyncio.Semaphore,
+        emit: Emit,
+    ) -> None:
+        """Regenerate one question of one version into `results`."""
+        brief = build_question_brief(questions, index, version + 1, versions, distractors, passages)
+        name = f"{self.question_agent.name}_{version + 1}_{index + 1}"
+        async with semaphore:
+            text = await run_sub_agent(ctx, self.name, clone_with_brief(self.question_agent, name, brief), emit)
+        results[version][index] = merge_question(questions[index], text, distractors)
+
+
+def build_quiz_variation_agent(writer: LlmAgent, question_instruction: str) -> QuizVariationAgent:
+    """
+    Build the variation agent around the single-call quiz agent.
+
+    The variation agent takes over the writer's name (and thus its A2A
+    identity and agent callbacks); the writer is kept as a renamed sub-agent.
+
+    Args:
+        writer: The single-call quiz agent
+        question_instruction: Static instruction of the question sub-agents
+
+    Returns:
+        The variation root agent
+    """
+    question_agent = LlmAgent(
+        name=f"{writer.name}_question",
+        model=writer.model,
+        description="Régénère une question ou ses distracteurs.",
+        static_instruction=question_instruction,
+        include_contents="none",
+        before_model_callback=writer.before_model_callback,
+        after_model_callback=writer.after_model_callback,
+    )
+    inner_writer = writer.clone(
+        update={
+            "name": f"{writer.name}_writer",
+            # The turn's RAG prefetch is only useful when the writer runs
+            "before_agent_callback": [start_rag_prefetch],
+            "after_agent_callback": [discard_rag_prefetch],
+        }
+    )
+    return QuizVariationAgent(
+        name=writer.name,
+        description=writer.description,
+        writer=inner_writer,
+        question_agent=question_agent,
+        max_concurrency=settings.QUIZ_VARIATION_MAX_CONCURRENCY,
+        sub_agents=[inner_writer],
+        before_agent_callback=writer.before_agent_callback,
+        after_agent_callback=writer.after_agent_callback,
+    )
@@ -1,34 +1,26 @@
 """
 Agent Registry - Central registry for all agents.
 
-This module provides a dictionary mapping agent names to their instances,
-making it easy to discover and access all available agents programmatically.
+Agents are discovered from `AGENT_DIR` (see `app.services.agent_discovery`):
+listing them reads the agent index, and an agent module is only imported
+when its instance is requested.
 """
 
+import importlib
 
 from google.adk.agents import Agent
 
-from app.components.agents.quizz_agent.agent import (
-    root_agent as quizz_agent,
-)
-from app.components.agents.training_script_agent.agent import (
-    root_agent as training_script_agent,
-)
-
-AGENTS_REGISTRY: dict[str, Agent] = {
-    "quizz_agent": quizz_agent,
-    "training_script_agent": training_script_agent,
-}
+from app.services.agent_discovery import agent_catalog
 
 
 def get_all_agents() -> dict[str, Agent]:
     """
-    Get all registered agents.
+    Get all registered agents (imports every agent module).
 
     Returns:
         Dictionary mapping agent names to agent instances
     """
-    return AGENTS_REGISTRY
+    return {agent_name: get_agent(agent_name) for agent_name in list_agent_names()}
 
 
 def get_agent(agent_name: str) -> Agent:
@@ -44,12 +36,7 @@ def get_agent(agent_name: str) -> Agent:
     Raises:
         KeyError: If agent name is not found in registry
     """
-    if agent_name not in AGENTS_REGISTRY:
-        available = ", ".join(AGENTS_REGISTRY.keys())
-        raise KeyError(
-            f"Agent '{agent_name}' not found. Available agents: {available}"
-        )
-    return AGENTS_REGISTRY[agent_name]
+    return importlib.import_module(agent_catalog.get(agent_name).module).root_agent
 
 
 def list_agent_names() -> list[str]:
@@ -59,4 +46,4 @@ def list_agent_names() -> list[str]:
     Returns:
         List of agent names
     """
-    return list(AGENTS_REGISTRY.keys())
+    return list(agent_catalog.entries())
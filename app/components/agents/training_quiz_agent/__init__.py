@@ -0,0 +1,5 @@
+"""Training Quiz Agent package."""
+
+from app.components.agents.training_quiz_agent.agent import root_agent
+
+__all__ = ["root_agent"]
@@ -0,0 +1,63 @@
+import logging
+
+from google.adk.agents import BaseAgent, LlmAgent
+
+from app.components.agents.training_quiz_agent.workflow import (
+    build_training_quiz_workflow,
+)
+from app.components.callbacks.after_agent import (
+    log_agent_end,
+    record_agent_metrics,
+    record_session_memory,
+    store_cached_response,
+    validate_skill_output,
+)
+from app.components.callbacks.after_model import (
+    log_model_usage,
+    record_model_metrics,
+    record_tenant_usage,
+)
+from app.components.callbacks.before_agent import log_agent_start, serve_cached_response
+from app.components.callbacks.before_model import apply_context_cache, route_model
+from app.config.constants import (
+    AGENT_QUIZZ_INSTRUCTION,
+    AGENT_QUIZZ_SECTION_INSTRUCTION,
+    AGENT_TRAINING_QUIZ_DESCRIPTION,
+    AGENT_TRAINING_SCRIPT_AGENDA_INSTRUCTION,
+    AGENT_TRAINING_SCRIPT_SECTION_INSTRUCTION,
+)
+from app.services.connections import get_llm
+from app.services.tenants import TenantConfig, tenant_agent
+
+logger = logging.getLogger(__name__)
+
+AGENT_NAME = "training_quiz_agent"
+
+
+def build_agent(tenant: TenantConfig) -> BaseAgent:
+    """Build the script → quiz workflow with a tenant's model."""
+    template = LlmAgent(
+        name=AGENT_NAME,
+        model=get_llm(tenant.model),
+        description=AGENT_TRAINING_QUIZ_DESCRIPTION,
+        before_agent_callback=[log_agent_start, serve_cached_response],
+        after_agent_callback=[
+            log_agent_end,
+            store_cached_response,
+            record_agent_metrics,
+            record_session_memory,
+            validate_skill_output,
+        ],
+        before_model_callback=[route_model, apply_context_cache],
+        after_model_callback=[log_model_usage, record_model_metrics, record_tenant_usage],
+    )
+    return build_training_quiz_workflow(
+        template,
+        agenda_instruction=AGENT_TRAINING_SCRIPT_AGENDA_INSTRUCTION,
+        section_instruction=AGENT_TRAINING_SCRIPT_SECTION_INSTRUCTION,
+        quiz_instruction=AGENT_QUIZZ_SECTION_INSTRUCTION,
+        followup_instruction=AGENT_QUIZZ_INSTRUCTION,
+    )
+
+
+root_agent = tenant_agent(build_agent)
@@ -0,0 +1,269 @@
+"""
+Script → quiz workflow: a training script and a quiz per section, in one run.
+
+Asking the training script agent for a script, then the quiz agent for a
+matching quiz, retrieves the same documents twice and only starts the quiz
+once the whole script is written. The workflow instead:
+
+1. asks the agenda agent for the list of sections (JSON)
+2. for every section, concurrently: retrieves its passages, writes it, then
+   immediately writes its quiz from the section text and the same passages
+   (no second retrieval), while the other sections are still being written
+3. assembles the script and the quiz, and stores them in session state with
+   the retrieved passages (`SCRIPT_STATE_KEY`, `QUIZ_STATE_KEY`,
+   `CONTEXTS_STATE_KEY`)
+
+Follow-up requests of the same session (harder quiz, explanations...) are
+answered from that state, without retrieval. Agendas that cannot be parsed
+fall back to a single section covering the whole request.
+"""
+
+import asyncio
+import json
+import logging
+from collections.abc import AsyncGenerator
+from typing import Any
+
+from google.adk.agents import BaseAgent, LlmAgent
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.agents.readonly_context import ReadonlyContext
+from google.adk.events import Event, EventActions
+from google.genai import types
+from typing_extensions import override
+
+from app.components.agents.training_script_agent.pipeline import (
+    AGENDA_STATE_KEY,
+    SCRIPT_STATE_KEY,
+    Emit,
+    SectionFanOutAgent,
+    assemble_script,
+    branch_context,
+    clone_with_brief,
+    get_text,
+    parse_agenda,
+)
+from app.config.settings import settings
+from app.services.model_router import is_followup_request
+
+logger = logging.getLogger(__name__)
+
+QUIZ_STATE_KEY = "training_quiz"
+CONTEXTS_STATE_KEY = "training_contexts"
+
+
+def build_section_quiz_brief(
+    agenda: dict[str, Any], index: int, section_text: str, passages: list[str]
+) -> str:
+    """Build the dynamic instruction of the sub-agent writing the quiz of one section."""
+    section = agenda["sections"][index]
+    objectives = "\n".join(f"-   {objective}" for objective in section.get("objectives") or [])
+    documents = "\n\n".join(
+        f"[Extrait {position}]\n{passage}" for position, passage in enumerate(passages, start=1)
+    )
+    return (
+        f"## FORMATION\nTitre : {agenda.get('title', '')}\n"
+        f"Public : {agenda.get('audience', '')}\n\n"
+        f"## SECTION : {index + 1}. {section['title']}\n"
+        f"Objectifs :\n{objectives}\n\n"
+        f"## NOMBRE DE QUESTIONS\n{settings.TRAINING_QUIZ_QUESTIONS_PER_SECTION}\n\n"
+        f"## TEXTE DE LA SECTION\n{section_text}\n\n"
+        f"## EXTRAITS DOCUMENTAIRES\n{documents or 'Aucun extrait.'}"
+    )
+
+
+def assemble_quiz(agenda: dict[str, Any], quizzes: list[str]) -> str:
+    """Assemble the section quizzes in agenda order."""
+    blocks = [
+        f"## Quiz {position}. {section['title']}\n\n{quiz.strip()}"
+        for position, (section, quiz) in enumerate(zip(agenda["sections"], quizzes, strict=True), start=1)
+        if quiz.strip()
+    ]
+    return "# Quiz\n\n" + "\n\n".join(blocks)
+
+
+def build_followup_brief(context: ReadonlyContext) -> str:
+    """Dynamic instruction of follow-up requests: the script, quiz and passages in state."""
+    state = context.state
+    documents = "\n\n".join(
+        f"[Extrait {position}]\n{passage}"
+        for position, passage in enumerate(
+            (passage for passages in state.get(CONTEXTS_STATE_KEY) or [] for passage in passages),
+            start=1,
+        )
+    )
+    return (
+        "Répondez à la demande de l'utilisateur à partir de la formation et du quiz "
+        "ci-dessous, déjà rédigés, et des extraits documentaires qui ont servi à les rédiger.\n\n"
+        f"## SCRIPT DE FORMATION\n{state.get(SCRIPT_STATE_KEY, '')}\n\n"
+        f"## QUIZ\n{state.get(QUIZ_STATE_KEY, '')}\n\n"
+        f"## EXTRAITS DOCUMENTAIRES\n{documents or 'Aucun extrait.'}"
+    )
+
+
+class SectionQuizFanOutAgent(SectionFanOutAgent):
+    """Writes every section, then its quiz as soon as it is written, concurrently."""
+
+    quiz_agent: LlmAgent
+    """Template of the sub-agent writing the quiz of one section (cloned per section)."""
+
+    @override
+    async def _process_section(
+        self,
+        ctx: InvocationContext,
+        prompt: str,
+        agenda: dict[str, Any],
+        index: int,
+        result: dict[str, Any],
+        semaphore: asyncio.Semaphore,
+        emit: Emit,
+    ) -> None:
+        await super()._process_section(ctx, prompt, agenda, index, result, semaphore, emit)
+        if not result.get("text"):
+            return
+        brief = build_section_quiz_brief(agenda, index, result["text"], result["passages"])
+        agent = clone_with_brief(self.quiz_agent, f"{self.quiz_agent.name}_{index + 1}", brief)
+        # The semaphore is taken again: pending sections are not delayed by finished ones
+        async with semaphore:
+            result["quiz"] = await self._run_sub_agent(ctx, agent, emit)
+
+    @override
+    def _final_event(
+        self, ctx: InvocationContext, agenda: dict[str, Any], results: list[dict[str, Any]]
+    ) -> Event:
+        script = assemble_script(agenda, [result.get("text", "") for result in results])
+        quiz = assemble_quiz(agenda, [result.get("quiz", "") for result in results])
+        return Event(
+            invocation_id=ctx.invocation_id,
+            author=self.name,
+            branch=ctx.branch,
+            content=types.Content(role="model", parts=[types.Part(text=f"{script}\n\n---\n\n{quiz}")]),
+            actions=EventActions(
+                state_delta={
+                    SCRIPT_STATE_KEY: script,
+                    QUIZ_STATE_KEY: quiz,
+                    CONTEXTS_STATE_KEY: [result.get("passages", []) for result in results],
+                }
+            ),
+        )
+
+
+class TrainingQuizWorkflowAgent(BaseAgent):
+    """Creates a script and its quizzes, or answers follow-ups from the session state."""
+
+    agenda_agent: LlmAgent
+    """Agent producing the JSON agenda (stored under `AGENDA_STATE_KEY`)."""
+
+    fan_out_agent: SectionQuizFanOutAgent
+    """Agent writing the sections and their quizzes and assembling them."""
+
+    followup_agent: LlmAgent
+    """Agent answering follow-up requests from the script, quiz and passages in state."""
+
+    @override
+    async def _run_async_impl(
+        self, ctx: InvocationContext
+    ) -> AsyncGenerator[Event, None]:
+        prompt = get_text(ctx.user_content)
+        if ctx.session.state.get(SCRIPT_STATE_KEY) and is_followup_request(prompt):
+            async for event in self.followup_agent.run_async(ctx):
+                yield event
+            return
+
+        agenda_ctx = branch_context(ctx, self.name, self.agenda_agent.name)
+        async for event in self.agenda_agent.run_async(agenda_ctx):
+            yield event
+
+        if parse_agenda(str(ctx.session.state.get(AGENDA_STATE_KEY, ""))) is None:
+            logger.warning("Agenda could not be parsed, writing the training as a single section")
+            agenda = {"title": prompt, "sections": [{"title": prompt, "query": prompt}]}
+            yield Event(
+                invocation_id=ctx.invocation_id,
+                author=self.name,
+                branch=agenda_ctx.branch,
+                actions=EventActions(state_delta={AGENDA_STATE_KEY: json.dumps(agenda, ensure_ascii=False)}),
+            )
+
+        logger.info(f"Agent '{self.name}' writing sections and quizzes in parallel")
+        async for event in self.fan_out_agent.run_async(ctx):
+            yield event
+
+
+def build_training_quiz_workflow(
+    template: LlmAgent,
+    agenda_instruction: str,
+    section_instruction: str,
+    quiz_instruction: str,
+    followup_instruction: str,
+) -> TrainingQuizWorkflowAgent:
+    """
+    Build the workflow agent.
+
+    The sub-agents share the model and model callbacks of `template`, and
+    take no RAG tool: passages are retrieved once per section by the
+    workflow itself.
+
+    Args:
+        template: Agent carrying the workflow's name, description, model and callbacks
+        agenda_instruction: Static instruction of the agenda agent
+        section_instruction: Static instruction of the section sub-agents
+        quiz_instruction: Static instruction of the section quiz sub-agents
+        followup_instruction: Static instruction of the follow-up agent
+
+    Returns:
+        The workflow root agent
+    """
+    name = template.name
+    agenda_agent = LlmAgent(
+        name=f"{name}_agenda",
+        description="Produit l'agenda JSON d'un script de formation.",
+        static_instruction=agenda_instruction,
+        output_key=AGENDA_STATE_KEY,
+        model=template.model,
+        before_model_callback=template.before_model_callback,
+        after_model_callback=template.after_model_callback,
+    )
+    section_agent = LlmAgent(
+        name=f"{name}_section",
+        description="Rédige une section d'un script de formation.",
+        static_instruction=section_instruction,
+        include_contents="none",
+        model=template.model,
+        before_model_callback=template.before_model_callback,
+        after_model_callback=template.after_model_callback,
+    )
+    quiz_agent = LlmAgent(
+        name=f"{name}_quiz",
+        description="Rédige le quiz d'une section d'un script de formation.",
+        static_instruction=quiz_instruction,
+        include_contents="none",
+        model=template.model,
+        before_model_callback=template.before_model_callback,
+        after_model_callback=template.after_model_callback,
+    )
+    followup_agent = LlmAgent(
+        name=f"{name}_followup",
+        description="Répond aux demandes de suivi sur la formation et son quiz.",
+        static_instruction=followup_instruction,
+        instruction=build_followup_brief,
+        include_contents="none",
+        model=template.model,
+        before_model_callback=template.before_model_callback,
+        after_model_callback=template.after_model_callback,
+    )
+    fan_out_agent = SectionQuizFanOutAgent(
+        name=f"{name}_sections",
+        description="Rédige les sections et leurs quiz en parallèle et les assemble.",
+        section_agent=section_agent,
+        quiz_agent=quiz_agent,
+        max_concurrency=settings.TRAINING_SCRIPT_PIPELINE_MAX_CONCURRENCY,
+    )
+    return TrainingQuizWorkflowAgent(
+        name=name,
+        description=template.description,
+        agenda_agent=agenda_agent,
+        fan_out_agent=fan_out_agent,
+        followup_agent=followup_agent,
+        sub_agents=[agenda_agent, fan_out_agent, followup_agent],
+        before_agent_callback=template.before_agent_callback,
+        after_agent_callback=template.after_agent_callback,
+    )
@@ -1,32 +1,91 @@
-
 import logging
 
-from google.adk.agents import LlmAgent
+from google.adk.agents import BaseAgent, LlmAgent
 
-from app.components.callbacks.after_agent import log_agent_end
-from app.components.callbacks.before_agent import log_agent_start
-from app.components.callbacks.tool_callbacks import log_after_tool, log_before_tool
+from app.components.agents.training_script_agent.pipeline import (
+    build_training_script_pipeline,
+)
+from app.components.callbacks.after_agent import (
+    discard_rag_prefetch,
+    log_agent_end,
+    record_agent_metrics,
+    record_session_memory,
+    store_cached_response,
+    validate_skill_output,
+)
+from app.components.callbacks.after_model import (
+    log_model_usage,
+    record_model_metrics,
+    record_tenant_usage,
+)
+from app.components.callbacks.before_agent import (
+    log_agent_start,
+    serve_cached_response,
+    start_rag_prefetch,
+)
+from app.components.callbacks.before_model import apply_context_cache, route_model
+from app.components.callbacks.tool_callbacks import (
+    limit_tool_response,
+    log_after_tool,
+    log_before_tool,
+)
+from app.components.tools.custom.a2a_delegation_tool import get_delegation_tools
+from app.components.tools.custom.tool_response_tool import get_tool_response_tools
 from app.components.tools.custom.vertex_ai_rag_retrieval_tool import (
-    vertex_ai_rag_retrieval_tool,
+    get_rag_retrieval_tool,
 )
 from app.config.constants import (
+    AGENT_TRAINING_SCRIPT_AGENDA_INSTRUCTION,
     AGENT_TRAINING_SCRIPT_DESCRIPTION,
-    AGENT_TRAINING_SCRIPT_INSTRUCTION,
+    AGENT_TRAINING_SCRIPT_SECTION_INSTRUCTION,
+    AGENT_TRAINING_SCRIPT_STATIC_INSTRUCTION,
+    resolve_static_instruction,
 )
 from app.config.settings import settings
+from app.services.connections import get_llm
+from app.services.tenants import TenantConfig, tenant_agent
 
 logger = logging.getLogger(__name__)
 
-root_agent = LlmAgent(
-    name="training_script_agent",
-    model=settings.MODEL,
-    description=AGENT_TRAINING_SCRIPT_DESCRIPTION,
-    instruction=AGENT_TRAINING_SCRIPT_INSTRUCTION,
-    tools=[
-        vertex_ai_rag_retrieval_tool
-    ],
-    before_agent_callback=log_agent_start,
-    after_agent_callback=log_agent_end,
-    before_tool_callback=log_before_tool,
-    after_tool_callback=log_after_tool
-)
+AGENT_NAME = "training_script_agent"
+
+
+def build_agent(tenant: TenantConfig) -> BaseAgent:
+    """Build the training script agent with a tenant's model, corpus and instructions."""
+    training_script_writer = LlmAgent(
+        name=AGENT_NAME,
+        model=get_llm(tenant.model),
+        description=AGENT_TRAINING_SCRIPT_DESCRIPTION,
+        static_instruction=resolve_static_instruction(
+            AGENT_NAME, tenant.instructions.get(AGENT_NAME), AGENT_TRAINING_SCRIPT_STATIC_INSTRUCTION
+        ),
+        tools=[
+            get_rag_retrieval_tool(tenant.rag_corpus_id),
+            *get_delegation_tools(),
+            *get_tool_response_tools(),
+        ],
+        before_agent_callback=[log_agent_start, serve_cached_response, start_rag_prefetch],
+        after_agent_callback=[
+            log_agent_end,
+            store_cached_response,
+            record_agent_metrics,
+            record_session_memory,
+            discard_rag_prefetch,
+            validate_skill_output,
+        ],
+        before_model_callback=[route_model, apply_context_cache],
+        after_model_callback=[log_model_usage, record_model_metrics, record_tenant_usage],
+        before_tool_callback=log_before_tool,
+        after_tool_callback=[log_after_tool, limit_tool_response],
+    )
+
+    if settings.TRAINING_SCRIPT_PIPELINE_ENABLED:
+        return build_training_script_pipeline(
+            training_script_writer,
+            agenda_instruction=AGENT_TRAINING_SCRIPT_AGENDA_INSTRUCTION,
+            section_instruction=AGENT_TRAINING_SCRIPT_SECTION_INSTRUCTION,
+        )
+    return training_script_writer
+
+
+root_agent = tenant_agent(build_agent)
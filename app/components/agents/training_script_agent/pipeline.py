@@ -0,0 +1,355 @@
+"""
+Pipeline mode of the training script agent.
+
+Instead of generating a whole script in a single sequential LLM call, the
+pipeline:
+
+1. asks an agenda agent for the list of sections (JSON)
+2. writes every section concurrently with a dedicated sub-agent, each fed by
+   its own RAG retrieval scoped to the section
+3. assembles the sections in agenda order into the final script
+
+Concurrency is bounded by `TRAINING_SCRIPT_PIPELINE_MAX_CONCURRENCY`. Requests
+that are not script creations (adaptation, objectives, questions...) and
+agendas that cannot be parsed fall back to the single-call writer agent: once
+the session holds an answer, only an explicit request for new content ("Crée
+une formation sur...") goes through the pipeline.
+"""
+
+import asyncio
+import functools
+import json
+import logging
+import re
+from collections.abc import AsyncGenerator, Awaitable, Callable, Sequence
+from typing import Any
+
+from google.adk.agents import BaseAgent, LlmAgent
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.events import Event, EventActions
+from google.genai import types
+from typing_extensions import override
+
+from app.components.tools.custom.vertex_ai_rag_retrieval_tool import retrieve_contexts
+from app.config.settings import settings
+from app.services.model_router import is_followup_request, is_new_content_request
+
+logger = logging.getLogger(__name__)
+
+AGENDA_STATE_KEY = "training_script_agenda"
+SCRIPT_STATE_KEY = "training_script"
+
+_JSON_OBJECT = re.compile(r"\{.*\}", re.DOTALL)
+
+
+def get_text(content: types.Content | None) -> str:
+    """Concatenate the text parts of a content."""
+    if not content or not content.parts:
+        return ""
+    return "".join(part.text or "" for part in content.parts if not part.thought)
+
+
+def parse_agenda(text: str) -> dict[str, Any] | None:
+    """
+    Parse the JSON agenda produced by the agenda agent.
+
+    Returns:
+        The agenda with a non-empty `sections` list, or None if unparsable
+    """
+    match = _JSON_OBJECT.search(text or "")
+    if not match:
+        return None
+    try:
+        agenda = json.loads(match.group(0))
+    except json.JSONDecodeError:
+        return None
+
+    sections = agenda.get("sections") if isinstance(agenda, dict) else None
+    if not isinstance(sections, list) or not sections:
+        return None
+    agenda["sections"] = [
+        section for section in sections if isinstance(section, dict) and section.get("title")
+    ][: settings.TRAINING_SCRIPT_PIPELINE_MAX_SECTIONS]
+    return agenda if agenda["sections"] else None
+
+
+def build_section_brief(
+    prompt: str, agenda: dict[str, Any], index: int, passages: list[str]
+) -> str:
+    """Build the dynamic instruction of the sub-agent writing one section."""
+    section = agenda["sections"][index]
+    outline = "\n".join(
+        f"{position}. {item.get('title')} ({item.get('duration', '?')})"
+        for position, item in enumerate(agenda["sections"], start=1)
+    )
+    objectives = "\n".join(f"-   {objective}" for objective in section.get("objectives") or [])
+    documents = "\n\n".join(
+        f"[Extrait {position}]\n{passage}" for position, passage in enumerate(passages, start=1)
+    )
+    return (
+        f"## DEMANDE INITIALE\n{prompt}\n\n"
+        f"## FORMATION\nTitre : {agenda.get('title', '')}\n"
+        f"Public : {agenda.get('audience', '')}\n"
+        f"Durée totale : {agenda.get('duration', '')}\n\n"
+        f"## AGENDA COMPLET\n{outline}\n\n"
+        f"## SECTION À RÉDIGER : {index + 1}. {section['title']}\n"
+        f"Durée : {section.get('duration', '')}\n"
+        f"Objectifs :\n{objectives}\n"
+        f"Contenu attendu : {section.get('summary', '')}\n\n"
+        f"## EXTRAITS DOCUMENTAIRES\n{documents or 'Aucun extrait pertinent trouvé.'}"
+    )
+
+
+def assemble_script(agenda: dict[str, Any], sections: list[str]) -> str:
+    """Assemble the written sections in agenda order."""
+    header = f"# {agenda.get('title', 'Script de formation')}"
+    details = " | ".join(
+        value
+        for value in (agenda.get("audience"), agenda.get("duration"))
+        if value
+    )
+    body = "\n\n---\n\n".join(section.strip() for section in sections)
+    return f"{header}\n\n{details}\n\n---\n\n{body}" if details else f"{header}\n\n{body}"
+
+
+def clone_with_brief(template: LlmAgent, name: str, brief: str) -> LlmAgent:
+    """Clone a sub-agent template with a per-call dynamic instruction."""
+    return template.clone(update={"name": name, "instruction": lambda _ctx: brief})
+
+
+def has_previous_answer(ctx: InvocationContext) -> bool:
+    """Whether an agent already answered in the session, before this invocation."""
+    return any(
+        event.author != "user" and event.invocation_id != ctx.invocation_id for event in ctx.session.events
+    )
+
+
+def branch_context(ctx: InvocationContext, parent_name: str, agent_name: str) -> InvocationContext:
+    """Context running a sub-agent in its own branch, isolated from its siblings."""
+    branch = f"{parent_name}.{agent_name}"
+    return ctx.model_copy(update={"branch": f"{ctx.branch}.{branch}" if ctx.branch else branch})
+
+
+Emit = Callable[[Event], Awaitable[None]]
+
+
+async def run_concurrently(jobs: Sequence[Callable[[Emit], Awaitable[None]]]) -> AsyncGenerator[Event, None]:
+    """
+    Run jobs concurrently and yield the events they emit.
+
+    Each job receives an `emit` callback. Events are yielded one at a time, in
+    the order produced, and `emit` returns once its event has been consumed.
+
+    Args:
+        jobs: Coroutine functions taking the `emit` callback
+    """
+    # An event with its consumption signal, or None when a job ends
+    queue: asyncio.Queue[tuple[Event, asyncio.Event] | None] = asyncio.Queue()
+
+    async def emit(event: Event) -> None:
+        consumed = asyncio.Event()
+        await queue.put((event, consumed))
+        await consumed.wait()
+
+    async def run(job: Callable[[Emit], Awaitable[None]]) -> None:
+        try:
+            await job(emit)
+        finally:
+            await queue.put(None)
+
+    async with asyncio.TaskGroup() as task_group:
+        for job in jobs:
+            task_group.create_task(run(job))
+
+        finished = 0
+        while finished < len(jobs):
+            item = await queue.get()
+            if item is None:
+                finished += 1
+                continue
+            event, consumed = item
+            yield event
+            consumed.set()
+
+
+async def run_sub_agent(ctx: InvocationContext, parent_name: str, agent: LlmAgent, emit: Emit) -> str:
+    """Run a sub-agent in its own branch, emit its events and return its final text."""
+    text = ""
+    async for event in agent.run_async(branch_context(ctx, parent_name, agent.name)):
+        if event.is_final_response() and event.author == agent.name:
+            text = get_text(event.content)
+        await emit(event)
+    return text
+
+
+class SectionFanOutAgent(BaseAgent):
+    """Writes every agenda section concurrently, then assembles the script."""
+
+    section_agent: LlmAgent
+    """Template of the sub-agent writing one section (cloned per section)."""
+
+    max_concurrency: int = 4
+    """Maximum number of sub-agents running at the same time."""
+
+    @override
+    async def _run_async_impl(
+        self, ctx: InvocationContext
+    ) -> AsyncGenerator[Event, None]:
+        agenda = parse_agenda(str(ctx.session.state.get(AGENDA_STATE_KEY, "")))
+        if agenda is None:
+            return
+
+        prompt = get_text(ctx.user_content)
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        results: list[dict[str, Any]] = [{} for _ in agenda["sections"]]
+        jobs = [
+            functools.partial(self._process_section, ctx, prompt, agenda, index, results[index], semaphore)
+            for index in range(len(results))
+        ]
+        async for event in run_concurrently(jobs):
+            yield event
+
+        yield self._final_event(ctx, agenda, results)
+
+    async def _process_section(
+        self,
+        ctx: InvocationContext,
+        prompt: str,
+        agenda: dict[str, Any],
+        index: int,
+        result: dict[str, Any],
+        semaphore: asyncio.Semaphore,
+        emit: Emit,
+    ) -> None:
+        """Retrieve the passages of a section and write it (`passages`, `text` of `result`)."""
+        async with semaphore:
+            result["passages"] = await self._retrieve_section(agenda, index)
+            brief = build_section_brief(prompt, agenda, index, result["passages"])
+            agent = clone_with_brief(self.section_agent, f"{self.section_agent.name}_{index + 1}", brief)
+            result["text"] = await self._run_sub_agent(ctx, agent, emit)
+
+    async def _retrieve_section(self, agenda: dict[str, Any], index: int) -> list[str]:
+        section = agenda["sections"][index]
+        query = section.get("query") or f"{agenda.get('title', '')} {section['title']}"
+        try:
+            return await retrieve_contexts(query, settings.TRAINING_SCRIPT_SECTION_TOP_K)
+        except Exception as e:
+            logger.warning(f"Section {index + 1} retrieval failed: {e}")
+            return []
+
+    async def _run_sub_agent(self, ctx: InvocationContext, agent: LlmAgent, emit: Emit) -> str:
+        """Run a sub-agent in its own branch, emit its events and return its final text."""
+        return await run_sub_agent(ctx, self.name, agent, emit)
+
+    def _final_event(
+        self, ctx: InvocationContext, agenda: dict[str, Any], results: list[dict[str, Any]]
+    ) -> Event:
+        script = assemble_script(agenda, [result.get("text", "") for result in results])
+        return Event(
+            invocation_id=ctx.invocation_id,
+            author=self.name,
+            branch=ctx.branch,
+            content=types.Content(role="model", parts=[types.Part(text=script)]),
+            actions=EventActions(state_delta={SCRIPT_STATE_KEY: script}),
+        )
+
+
+class TrainingScriptPipelineAgent(BaseAgent):
+    """Routes script creations to the agenda/fan-out pipeline, the rest to the writer."""
+
+    writer: LlmAgent
+    """Single-call agent used for every non-creation request and as fallback."""
+
+    agenda_agent: LlmAgent
+    """Agent producing the JSON agenda (stored under `AGENDA_STATE_KEY`)."""
+
+    fan_out_agent: SectionFanOutAgent
+    """Agent writing the sections concurrently and assembling the script."""
+
+    @override
+    async def _run_async_impl(
+        self, ctx: InvocationContext
+    ) -> AsyncGenerator[Event, None]:
+        prompt = get_text(ctx.user_content)
+        if is_followup_request(prompt) or (has_previous_answer(ctx) and not is_new_content_request(prompt)):
+            async for event in self.writer.run_async(ctx):
+                yield event
+            return
+
+        # The agenda runs in its own branch so that its raw JSON stays out of
+        # the section sub-agents' context (they receive a formatted brief).
+        agenda_ctx = branch_context(ctx, self.name, self.agenda_agent.name)
+        async for event in self.agenda_agent.run_async(agenda_ctx):
+            yield event
+
+        if parse_agenda(str(ctx.session.state.get(AGENDA_STATE_KEY, ""))) is None:
+            logger.warning("Agenda could not be parsed, falling back to single-call writer")
+            async for event in self.writer.run_async(ctx):
+                yield event
+            return
+
+        logger.info(f"Agent '{self.name}' writing script sections in parallel")
+        async for event in self.fan_out_agent.run_async(ctx):
+            yield event
+
+
+def build_training_script_pipeline(
+    writer: LlmAgent,
+    agenda_instruction: str,
+    section_instruction: str,
+) -> TrainingScriptPipelineAgent:
+    """
+    Build the pipeline agent around the single-call training script agent.
+
+    The pipeline takes over the writer's name (and thus its A2A identity and
+    callbacks); the writer is kept as a renamed sub-agent.
+
+    Args:
+        writer: The single-call training script agent
+        agenda_instruction: Static instruction of the agenda agent
+        section_instruction: Static instruction of the section sub-agents
+
+    Returns:
+        The pipeline root agent
+    """
+    agenda_agent = LlmAgent(
+        name=f"{writer.name}_agenda",
+        model=writer.model,
+        description="Produit l'agenda JSON d'un script de formation.",
+        static_instruction=agenda_instruction,
+        output_key=AGENDA_STATE_KEY,
+        before_model_callback=writer.before_model_callback,
+        after_model_callback=writer.after_model_callback,
+    )
+    section_agent = LlmAgent(
+        name=f"{writer.name}_section",
+        model=writer.model,
+        description="Rédige une section d'un script de formation.",
+        static_instruction=section_instruction,
+        include_contents="none",
+        before_model_callback=writer.before_model_callback,
+        after_model_callback=writer.after_model_callback,
+    )
+    fan_out_agent = SectionFanOutAgent(
+        name=f"{writer.name}_sections",
+        description="Rédige les sections en parallèle et assemble le script.",
+        section_agent=section_agent,
+        max_concurrency=settings.TRAINING_SCRIPT_PIPELINE_MAX_CONCURRENCY,
+    )
+    inner_writer = writer.clone(
+        update={
+            "name": f"{writer.name}_writer",
+            "before_agent_callback": None,
+            "after_agent_callback": None,
+        }
+    )
+    return TrainingScriptPipelineAgent(
+        name=writer.name,
+        description=writer.description,
+        writer=inner_writer,
+        agenda_agent=agenda_agent,
+        fan_out_agent=fan_out_agent,
+        sub_agents=[inner_writer, agenda_agent, fan_out_agent],
+        before_agent_callback=writer.before_agent_callback,
+        after_agent_callback=writer.after_agent_callback,
+    )
@@ -6,12 +6,26 @@ Use cases:
 - Log agent execution completion
 - Process agent outputs
 - Update workflow status
+- Cache final responses
+- Record latency metrics
+- Measure session memory
+- Release speculative work of the turn
+- Validate final responses against the skill output schemas
 """
 
 import logging
+import time
 
 from google.adk.agents.callback_context import CallbackContext
 
+from app.components.callbacks.before_model import get_invocation_model
+from app.config.settings import settings
+from app.services.memory import memory_tracker, session_memory
+from app.services.metrics import metrics
+from app.services.rag_prefetch import rag_prefetcher
+from app.services.response_cache import get_response_cache_key, response_cache
+from app.services.skill_contracts import skill_contracts
+
 logger = logging.getLogger(__name__)
 
 
@@ -24,3 +38,131 @@ def log_agent_end(callback_context: CallbackContext) -> None:
     """
     agent_name = callback_context.agent_name
     logger.info(f"Agent '{agent_name}' execution completed")
+
+
+def get_final_response_text(callback_context: CallbackContext) -> str | None:
+    """
+    Return the final text response of the invocation.
+
+    The last final response of the invocation's main branch is used (it may
+    be authored by a sub-agent, e.g. in pipeline mode).
+
+    Args:
+        callback_context: ADK callback context
+
+    Returns:
+        The text, or None if the invocation produced an error or no text
+    """
+    events = [
+        event
+        for event in callback_context.session.events
+        if event.invocation_id == callback_context.invocation_id
+    ]
+    if any(event.error_code for event in events):
+        return None
+
+    for event in reversed(events):
+        if event.branch or not event.is_final_response():
+            continue
+        if event.content and event.content.parts:
+            text = "".join(part.text or "" for part in event.content.parts)
+            if text.strip():
+                return text
+        return None
+    return None
+
+
+async def store_cached_response(callback_context: CallbackContext) -> None:
+    """
+    Store the agent's final text response in the response cache.
+
+    Invocations that produced an error are never cached.
+
+    Args:
+        callback_context: ADK callback context
+    """
+    key = get_response_cache_key(callback_context, get_invocation_model(callback_context))
+    if key is None:
+        return
+
+    text = get_final_response_text(callback_context)
+    if text is not None:
+        await response_cache.set(key, callback_context.agent_name, text)
+
+
+def record_agent_metrics(callback_context: CallbackContext) -> None:
+    """
+    Record the end-to-end latency of the invocation, checked against the SLOs.
+
+    The latency runs from the user message that started the invocation to the
+    end of the agent. Responses replayed from the response cache skip this
+    callback and are not counted.
+
+    Args:
+        callback_context: ADK callback context
+    """
+    events = [
+        event
+        for event in callback_context.session.events
+        if event.invocation_id == callback_context.invocation_id
+    ]
+    if not events:
+        return
+
+    metrics.observe(
+        "agents",
+        callback_context.agent_name,
+        time.time() - events[0].timestamp,
+        errors=int(any(event.error_code for event in events)),
+    )
+
+
+def record_session_memory(callback_context: CallbackContext) -> None:
+    """
+    Measure the approximate in-memory size of the session.
+
+    Only active while memory tracking is on (MEMORY_TRACKING_ENABLED or
+    /debug/memory/start), as walking the session's object graph costs time
+    proportional to its size.
+
+    Args:
+        callback_context: ADK callback context
+    """
+    if memory_tracker.tracing:
+        session_memory.record(callback_context.session)
+
+
+def discard_rag_prefetch(callback_context: CallbackContext) -> None:
+    """
+    Drop the RAG prefetch of the invocation if no tool call used it.
+
+    Args:
+        callback_context: ADK callback context
+    """
+    rag_prefetcher.discard(callback_context.invocation_id)
+
+
+def validate_skill_output(callback_context: CallbackContext) -> None:
+    """
+    Validate the final response against the output schemas of the agent's skills.
+
+    A response no skill accepts is logged, not altered: it has already been
+    streamed to the client.
+
+    Args:
+        callback_context: ADK callback context
+    """
+    if not settings.SKILL_VALIDATION_ENABLED:
+        return
+    text = get_final_response_text(callback_context)
+    if text is None:
+        return
+    try:
+        contract = skill_contracts.get(callback_context.agent_name)
+    except KeyError:
+        return
+    errors = contract.validate_output({"response": text})
+    if errors:
+        logger.warning(
+            f"Response of '{callback_context.agent_name}' does not match its skills: {'; '.join(errors)}"
+        )
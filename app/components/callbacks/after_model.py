@@ -0,0 +1,121 @@
+"""
+After-model callbacks.
+
+These callbacks are executed after each LLM response is received.
+Use cases:
+- Report token usage and context cache hits
+- Count tenant token usage against its quota
+- Post-process or replace model responses
+"""
+
+import logging
+import time
+
+from google.adk.agents.callback_context import CallbackContext
+from google.adk.models import LlmResponse
+from google.genai import types
+
+from app.components.callbacks.before_model import (
+    MODEL_ROUTE_STATE_KEY,
+    pop_model_call_started_at,
+)
+from app.config.settings import settings
+from app.services.metrics import metrics
+from app.services.tenants import get_request_tenant_id, tenant_quotas
+
+logger = logging.getLogger(__name__)
+
+
+def log_model_usage(
+    callback_context: CallbackContext, llm_response: LlmResponse
+) -> LlmResponse | None:
+    """
+    Log token usage of a model response, including cached input tokens.
+
+    Args:
+        callback_context: ADK callback context
+        llm_response: The response returned by the model
+
+    Returns:
+        None: Use original response
+    """
+    usage = llm_response.usage_metadata
+    if usage is None or llm_response.partial:
+        return None
+
+    prompt_tokens = usage.prompt_token_count or 0
+    cached_tokens = usage.cached_content_token_count or 0
+    cached_ratio = cached_tokens / prompt_tokens if prompt_tokens else 0.0
+    logger.info(
+        f"Agent '{callback_context.agent_name}' model usage: "
+        f"prompt={prompt_tokens} cached={cached_tokens} ({cached_ratio:.0%}) "
+        f"output={usage.candidates_token_count or 0}"
+    )
+    return None
+
+
+def record_model_metrics(
+    callback_context: CallbackContext, llm_response: LlmResponse
+) -> LlmResponse | None:
+    """
+    Record latency and quality counters of a model call for its route.
+
+    Args:
+        callback_context: ADK callback context
+        llm_response: The response returned by the model
+
+    Returns:
+        None: Use original response
+    """
+    if llm_response.partial:
+        return None
+
+    started_at = pop_model_call_started_at()
+    latency = time.perf_counter() - started_at if started_at else None
+
+    decision = callback_context.state.get(MODEL_ROUTE_STATE_KEY) or {}
+    if decision.get("invocation_id") != callback_context.invocation_id:
+        decision = {}
+    route = decision.get("route", "default")
+
+    content = llm_response.content
+    parts = content.parts if content and content.parts else []
+    has_text = any(part.text for part in parts)
+    function_calls = sum(1 for part in parts if part.function_call)
+    usage = llm_response.usage_metadata
+
+    counters = {
+        "errors": int(bool(llm_response.error_code)),
+        "empty": int(not has_text and not function_calls),
+        "truncated": int(llm_response.finish_reason == types.FinishReason.MAX_TOKENS),
+        "function_calls": function_calls,
+        "output_tokens": (usage.candidates_token_count or 0) if usage else 0,
+    }
+    if "intent" in decision:
+        counters[f"intent_{decision['intent']}"] = 1
+
+    metrics.observe(
+        "model_routes", f"{callback_context.agent_name}:{route}", latency, **counters
+    )
+    return None
+
+
+def record_tenant_usage(
+    callback_context: CallbackContext, llm_response: LlmResponse
+) -> LlmResponse | None:
+    """
+    Count the tokens of a model response against the tenant's quota.
+
+    Args:
+        callback_context: ADK callback context
+        llm_response: The response returned by the model
+
+    Returns:
+        None: Use original response
+    """
+    usage = llm_response.usage_metadata
+    if not settings.MULTI_TENANCY_ENABLED or usage is None or llm_response.partial:
+        return None
+
+    tenant_quotas.record_tokens(get_request_tenant_id(), usage.total_token_count or 0)
+    return None
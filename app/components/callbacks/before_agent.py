@@ -6,11 +6,26 @@ Use cases:
 - Log agent execution start
 - Initialize state
 - Validate prerequisites
+- Short-circuit the agent with a cached response
+- Start speculative work for the turn
 """
 
 import logging
 
+from google.adk.agents import LlmAgent
 from google.adk.agents.callback_context import CallbackContext
+from google.adk.utils.model_name_utils import is_gemini_2_or_above
+from google.genai import types
+
+from app.components.callbacks.before_model import get_invocation_model
+from app.components.tools.custom.vertex_ai_rag_retrieval_tool import (
+    PooledVertexAiRagRetrieval,
+    retrieve_contexts,
+)
+from app.config.settings import settings
+from app.services.rag_prefetch import rag_prefetcher
+from app.services.response_cache import get_response_cache_key, response_cache
+from app.utils.adk_context import get_running_agent
 
 logger = logging.getLogger(__name__)
 
@@ -24,3 +39,64 @@ def log_agent_start(callback_context: CallbackContext) -> None:
     """
     agent_name = callback_context.agent_name
     logger.info(f"Agent '{agent_name}' execution starting")
+
+
+async def serve_cached_response(callback_context: CallbackContext) -> types.Content | None:
+    """
+    Replay a cached final response, skipping RAG retrieval and the model.
+
+    Args:
+        callback_context: ADK callback context
+
+    Returns:
+        None: Run the agent normally
+        Content: Cached response returned as the agent's final answer
+    """
+    key = get_response_cache_key(callback_context, get_invocation_model(callback_context))
+    if key is None:
+        return None
+
+    text = await response_cache.get(key)
+    if text is None:
+        return None
+
+    logger.info(f"Agent '{callback_context.agent_name}' served from response cache")
+    return types.Content(role="model", parts=[types.Part(text=text)])
+
+
+def start_rag_prefetch(callback_context: CallbackContext) -> None:
+    """
+    Start retrieving passages for the user prompt, alongside the first model call.
+
+    Only for agents with the RAG retrieval function tool, on models without
+    built-in retrieval (before Gemini 2). The retrieval tool then serves the
+    model's call from the prefetch when its query is close to the prompt.
+
+    Args:
+        callback_context: ADK callback context
+    """
+    if not settings.RAG_PREFETCH_ENABLED:
+        return
+
+    agent = get_running_agent(callback_context)
+    if not isinstance(agent, LlmAgent):
+        return
+    tool = next((tool for tool in agent.tools if isinstance(tool, PooledVertexAiRagRetrieval)), None)
+    if tool is None:
+        return
+
+    if is_gemini_2_or_above(get_invocation_model(callback_context)):
+        return
+
+    user_content = callback_context.user_content
+    if not user_content or not user_content.parts:
+        return
+    prompt = "\n".join(part.text for part in user_content.parts if part.text)
+    if not prompt.strip():
+        return
+
+    corpus = tool.corpus
+    rag_prefetcher.start(
+        callback_context.invocation_id, prompt, corpus, retrieve_contexts(prompt, corpus=corpus)
+    )
+    logger.info(f"Agent '{callback_context.agent_name}' prefetching RAG passages")
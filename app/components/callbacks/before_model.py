@@ -0,0 +1,157 @@
+"""
+Before-model callbacks.
+
+These callbacks are executed before each LLM request is sent.
+Use cases:
+- Rewrite the request (model, cached content, config)
+- Short-circuit the model call with a prepared response
+"""
+
+import logging
+import time
+from contextvars import ContextVar
+
+from google.adk.agents.callback_context import CallbackContext
+from google.adk.models import LlmRequest, LlmResponse
+from google.genai import types
+
+from app.config.settings import settings
+from app.services.context_cache import static_context_cache
+from app.services.model_router import classify_request
+from app.utils.adk_context import get_agent_models, get_running_agent
+
+logger = logging.getLogger(__name__)
+
+MODEL_ROUTE_STATE_KEY = "temp:model_route"
+
+# Start time of the model call in progress. The before- and after-model
+# callbacks of a call run in the same task, while concurrent calls of a
+# session (section fan-outs, quiz variations) run in tasks of their own: a
+# session state key would be shared, and overwritten, by all of them.
+_model_call_started_at: ContextVar[float | None] = ContextVar("model_call_started_at", default=None)
+
+
+def pop_model_call_started_at() -> float | None:
+    """Return the start time of the model call in progress, and forget it."""
+    started_at = _model_call_started_at.get()
+    _model_call_started_at.set(None)
+    return started_at
+
+
+def get_invocation_route(callback_context: CallbackContext) -> dict:
+    """
+    Return the model route of the current invocation, classifying it once.
+
+    The decision is kept in the session state for the invocation, so every
+    model call (and the callbacks preparing them) use the same route.
+
+    Args:
+        callback_context: ADK callback context
+
+    Returns:
+        The route decision (route, model, reason, invocation_id)
+    """
+    decision = callback_context.state.get(MODEL_ROUTE_STATE_KEY)
+    if decision and decision.get("invocation_id") == callback_context.invocation_id:
+        return decision
+
+    user_content = callback_context.user_content
+    prompt = ""
+    if user_content and user_content.parts:
+        prompt = "\n".join(part.text for part in user_content.parts if part.text)
+
+    decision = {
+        **classify_request(prompt).to_dict(),
+        "invocation_id": callback_context.invocation_id,
+    }
+    callback_context.state[MODEL_ROUTE_STATE_KEY] = decision
+    logger.info(
+        f"Agent '{callback_context.agent_name}' routed to {decision['route']} "
+        f"model {decision['model']} ({decision['reason']})"
+    )
+    return decision
+
+
+def get_invocation_model(callback_context: CallbackContext) -> str:
+    """
+    Return the model serving the current invocation.
+
+    With model routing, the routed model; otherwise the model of the agent,
+    or of the LLM agents of a workflow agent (e.g. the pipeline root).
+
+    Args:
+        callback_context: ADK callback context
+
+    Returns:
+        The model name (several names joined with "," for mixed workflows)
+    """
+    if settings.MODEL_ROUTING_ENABLED:
+        return get_invocation_route(callback_context)["model"]
+    return ",".join(get_agent_models(get_running_agent(callback_context)))
+
+
+def route_model(
+    callback_context: CallbackContext, llm_request: LlmRequest
+) -> LlmResponse | None:
+    """
+    Dispatch the request to the fast or heavy model.
+
+    The request is classified once per invocation; every model call of the
+    invocation then uses the same route. The call start time is recorded for
+    the per-route latency metrics.
+
+    Args:
+        callback_context: ADK callback context
+        llm_request: The request about to be sent to the model
+
+    Returns:
+        None: Always proceed with the (possibly rerouted) model call
+    """
+    _model_call_started_at.set(time.perf_counter())
+    if not settings.MODEL_ROUTING_ENABLED:
+        return None
+
+    llm_request.model = get_invocation_route(callback_context)["model"]
+    return None
+
+
+async def apply_context_cache(
+    callback_context: CallbackContext, llm_request: LlmRequest
+) -> LlmResponse | None:
+    """
+    Serve the static system instruction and tools from an explicit context cache.
+
+    The cached content replaces `system_instruction` and `tools` in the request;
+    when no cache can be obtained the request is sent unchanged.
+
+    Args:
+        callback_context: ADK callback context
+        llm_request: The request about to be sent to the model
+
+    Returns:
+        None: Always proceed with the (possibly rewritten) model call
+    """
+    if not settings.CONTEXT_CACHE_ENABLED or not llm_request.model:
+        return None
+
+    config = llm_request.config
+    if config.cached_content or not config.system_instruction:
+        return None
+    tools = [tool for tool in config.tools or [] if isinstance(tool, types.Tool)]
+    if len(tools) != len(config.tools or []):
+        # Python callables and MCP sessions are resolved by the SDK per call
+        return None
+
+    cache_name = await static_context_cache.get_cache_name(
+        model=llm_request.model,
+        system_instruction=config.system_instruction,
+        tools=tools or None,
+        display_name=callback_context.agent_name,
+    )
+    if cache_name:
+        config.cached_content = cache_name
+        config.system_instruction = None
+        config.tools = None
+        config.tool_config = None
+
+    return None
@@ -17,6 +17,7 @@ Use cases:
 - Log tool execution
 - Monitor performance
 - Cache tool results
+- Limit the size of tool responses kept in the session
 """
 
 import logging
@@ -24,6 +25,8 @@ from typing import Any
 
 from google.adk.tools import BaseTool, ToolContext
 
+from app.services.tool_responses import text_lengths, tool_response_budget
+
 logger = logging.getLogger(__name__)
 
 
@@ -64,5 +67,27 @@ def log_after_tool(
         None: Use original response
         Dict: Replace the tool response with this dict
     """
-    logger.info(f"Tool '{tool.name}' completed")
+    logger.info(f"Tool '{tool.name}' completed ({sum(text_lengths(tool_response))} chars)")
     return None  # Use original response
+
+
+async def limit_tool_response(
+    tool: BaseTool, args: dict[str, Any], tool_context: ToolContext, tool_response: Any
+) -> dict | None:
+    """
+    Enforce the tool response budget (`TOOL_RESPONSE_MAX_CHARS`).
+
+    Responses exceeding it are stored in full out of line and replaced by a
+    truncated copy referencing them, readable with `fetch_tool_response`.
+
+    Args:
+        tool: The tool that was called
+        args: Tool arguments
+        tool_context: Tool execution context
+        tool_response: Tool response
+
+    Returns:
+        None: Response within budget, used as is
+        Dict: Truncated response with its `truncation` reference
+    """
+    return await tool_response_budget.enforce(tool.name, tool_response)
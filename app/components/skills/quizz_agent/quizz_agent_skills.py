@@ -1,8 +1,8 @@
 """Skills for the Quizz Agent."""
 
-from a2a.types import AgentSkill
+from app.components.skills.schema_skill import SchemaSkill
 
-generic_quizz_skill = AgentSkill(
+generic_quizz_skill = SchemaSkill(
     id="generic_quizz_request",
     name="Gérer les demandes de quiz",
     description=(
@@ -17,17 +17,18 @@ generic_quizz_skill = AgentSkill(
         "Génère 2 autres versions de ce test sur la biologie",
         "Explique-moi les réponses du quiz précédent",
     ],
-    inputSchema={
+    input_schema={
         "type": "object",
         "properties": {
             "prompt": {
                 "type": "string",
+                "minLength": 1,
                 "description": "Votre demande complète en langage naturel concernant le quiz."
             }
         },
-        "required": ["prompt"]
+        "minProperties": 1
     },
-    outputSchema={
+    output_schema={
         "type": "object",
         "properties": {
             "response": {
@@ -0,0 +1,26 @@
+"""A2A skill declaring the JSON schemas of its input and output."""
+
+from typing import Any
+
+from a2a.types import AgentSkill
+
+
+class SchemaSkill(AgentSkill):
+    """
+    A2A skill with the JSON schemas of its input and output.
+
+    `AgentSkill` has no schema fields, so `inputSchema`/`outputSchema`
+    arguments given to it are silently dropped. The schemas of a
+    `SchemaSkill` are compiled into validators by
+    `app.services.skill_contracts`; they are not part of the agent card.
+    """
+
+    input_schema: dict[str, Any] | None = None
+    """
+    Schema of the input: `prompt` (text parts of the message), `files` (its
+    file parts) and the fields of its data parts. Messages may carry only
+    files or data: require `prompt` only if the skill needs text.
+    """
+
+    output_schema: dict[str, Any] | None = None
+    """Schema of the output: `response` (final text of the agent)."""
@@ -0,0 +1,43 @@
+"""Skills for the Training Quiz Agent."""
+
+from app.components.skills.schema_skill import SchemaSkill
+
+training_quiz_skill = SchemaSkill(
+    id="training_script_with_quiz",
+    name="Créer un script de formation et son quiz",
+    description=(
+        "Crée un script de formation sur un sujet et, pour chaque section, un quiz "
+        "d'évaluation fondé sur les mêmes documents. Les demandes suivantes (quiz plus "
+        "difficile, explications...) réutilisent le script et les documents déjà trouvés. "
+        "Formulez votre demande en langage naturel."
+    ),
+    tags=["Formation", "Script", "Quiz", "Évaluation", "Pédagogie"],
+    examples=[
+        "Crée une formation d'une heure sur les bases de Python avec un quiz par module",
+        "Prépare un script de formation sur Docker et le quiz associé",
+        "Rends le quiz du deuxième module plus difficile",
+    ],
+    input_schema={
+        "type": "object",
+        "properties": {
+            "prompt": {
+                "type": "string",
+                "minLength": 1,
+                "description": "Votre demande complète en langage naturel concernant la formation et son quiz."
+            }
+        },
+        "minProperties": 1
+    },
+    output_schema={
+        "type": "object",
+        "properties": {
+            "response": {
+                "type": "string",
+                "description": "Le script de formation suivi du quiz de chaque section, ou la réponse à la demande de suivi."
+            }
+        }
+    }
+)
+
+
+TRAINING_QUIZ_AGENT_SKILLS = [training_quiz_skill]
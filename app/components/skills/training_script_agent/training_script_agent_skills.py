@@ -1,8 +1,8 @@
 """Skills for the Training Script Agent."""
 
-from a2a.types import AgentSkill
+from app.components.skills.schema_skill import SchemaSkill
 
-generic_training_script_skill = AgentSkill(
+generic_training_script_skill = SchemaSkill(
     id="generic_training_script_request",
     name="Gérer les demandes de scripts de formation",
     description=(
@@ -18,17 +18,18 @@ generic_training_script_skill = AgentSkill(
         "Génère des exercices pratiques pour cette session sur Docker",
         "Quels sont les objectifs pédagogiques de ce document ?",
     ],
-    inputSchema={
+    input_schema={
         "type": "object",
         "properties": {
             "prompt": {
                 "type": "string",
+                "minLength": 1,
                 "description": "Votre demande complète en langage naturel concernant le script de formation."
             }
         },
-        "required": ["prompt"]
+        "minProperties": 1
     },
-    outputSchema={
+    output_schema={
         "type": "object",
         "properties": {
             "response": {
@@ -0,0 +1,79 @@
+"""A2A delegation tool: lets an agent hand a request over to another agent."""
+
+import logging
+from typing import Any
+
+from google.adk.tools import BaseTool, ToolContext
+from google.genai import types
+from typing_extensions import override
+
+from app.config.settings import settings
+from app.services.a2a_delegation import A2ADelegator, DelegationError, a2a_delegator
+
+logger = logging.getLogger(__name__)
+
+
+class A2ADelegationTool(BaseTool):
+    """
+    Sends a request to another agent and returns its response.
+
+    The declaration lists the available agents with their description and
+    skills, read from the agent index on each model request, so agents added
+    to `AGENT_DIR` or `A2A_REMOTE_AGENTS` are offered without code changes.
+    """
+
+    def __init__(self, delegator: A2ADelegator):
+        super().__init__(
+            name="delegate_to_agent",
+            description=(
+                "Send a request to another specialized agent and return its answer. "
+                "Use it when the user asks for work another agent is specialized in, "
+                "e.g. a quiz based on a training script. The request must be "
+                "self-contained: include the content the other agent needs."
+            ),
+        )
+        self.delegator = delegator
+
+    @override
+    def _get_declaration(self) -> types.FunctionDeclaration:
+        agents = self.delegator.describe_agents()
+        catalog = "\n".join(f"- {name}: {description}" for name, description in agents.items())
+        return types.FunctionDeclaration(
+            name=self.name,
+            description=f"{self.description}\n\nAvailable agents:\n{catalog}",
+            parameters=types.Schema(
+                type=types.Type.OBJECT,
+                properties={
+                    "agent_name": types.Schema(
+                        type=types.Type.STRING,
+                        enum=list(agents),
+                        description="Name of the agent to delegate to",
+                    ),
+                    "request": types.Schema(
+                        type=types.Type.STRING,
+                        description="Complete request for the agent, with the content it needs",
+                    ),
+                },
+                required=["agent_name", "request"],
+            ),
+        )
+
+    @override
+    async def run_async(self, *, args: dict[str, Any], tool_context: ToolContext) -> Any:
+        agent_name = args.get("agent_name", "")
+        if agent_name == tool_context.agent_name:
+            return {"status": "error", "error": "An agent cannot delegate to itself"}
+        try:
+            response = await self.delegator.delegate(agent_name, args.get("request", ""))
+        except DelegationError as e:
+            logger.warning(f"Delegation from {tool_context.agent_name} to {agent_name} failed: {e}")
+            return {"status": "error", "error": str(e)}
+        return {"status": "success", "agent": agent_name, "response": response}
+
+
+a2a_delegation_tool = A2ADelegationTool(a2a_delegator)
+
+
+def get_delegation_tools() -> list[BaseTool]:
+    """Tools to add to an agent: the delegation tool when `A2A_DELEGATION_ENABLED`."""
+    return [a2a_delegation_tool] if settings.A2A_DELEGATION_ENABLED else []
@@ -0,0 +1,75 @@
+"""Fetch tool: reads the full text of a tool response truncated by the budget."""
+
+from typing import Any
+
+from google.adk.tools import BaseTool, ToolContext
+from google.genai import types
+from typing_extensions import override
+
+from app.services.tool_responses import (
+    FETCH_TOOL_NAME,
+    ToolResponseBudget,
+    tool_response_budget,
+)
+
+
+class FetchToolResponseTool(BaseTool):
+    """
+    Returns a page of a field of a truncated tool response.
+
+    Truncated responses carry a `truncation.ref`; the full response is read
+    from the tool response store only when the model calls this tool.
+    """
+
+    def __init__(self, budget: ToolResponseBudget):
+        super().__init__(
+            name=FETCH_TOOL_NAME,
+            description=(
+                "Read the full text of a field of a tool response that was truncated "
+                "(responses with a 'truncation' object). Only call it when the truncated "
+                "part is needed to answer. Long fields are returned page by page: call "
+                "again with 'next_offset' to read the next page."
+            ),
+        )
+        self.budget = budget
+
+    @override
+    def _get_declaration(self) -> types.FunctionDeclaration:
+        return types.FunctionDeclaration(
+            name=self.name,
+            description=self.description,
+            parameters=types.Schema(
+                type=types.Type.OBJECT,
+                properties={
+                    "ref": types.Schema(
+                        type=types.Type.STRING,
+                        description="The 'ref' of the truncation object",
+                    ),
+                    "path": types.Schema(
+                        type=types.Type.STRING,
+                        description="Dotted path of the truncated field, e.g. 'result.2' (whole response if empty)",
+                    ),
+                    "offset": types.Schema(
+                        type=types.Type.INTEGER,
+                        description="Character offset of the page to read (0 for the first page)",
+                    ),
+                },
+                required=["ref"],
+            ),
+        )
+
+    @override
+    async def run_async(self, *, args: dict[str, Any], tool_context: ToolContext) -> Any:
+        return await self.budget.fetch(
+            ref=str(args.get("ref", "")),
+            path=str(args.get("path") or ""),
+            offset=int(args.get("offset") or 0),
+        )
+
+
+fetch_tool_response_tool = FetchToolResponseTool(tool_response_budget)
+
+
+def get_tool_response_tools() -> list[BaseTool]:
+    """Tools to add to an agent: the fetch tool when the tool response budget is enabled."""
+    return [fetch_tool_response_tool] if tool_response_budget.enabled else []
@@ -1,25 +1,117 @@
 """Vertex AI RAG Retrieval tool for querying Google Drive documents."""
 
+import asyncio
 import logging
+from functools import cache
+from typing import Any
 
 from google.adk.tools.retrieval.vertex_ai_rag_retrieval import VertexAiRagRetrieval
+from google.adk.tools.tool_context import ToolContext
+from google.cloud import aiplatform_v1
 from vertexai.preview import rag
 
 from app.config.settings import settings
+from app.services.client_registry import clients
+from app.services.connections import RAG_CLIENT, get_rag_client
+from app.services.rag_prefetch import rag_prefetcher
+from app.services.tenants import get_current_tenant
 
 logger = logging.getLogger(__name__)
 
-vertex_ai_rag_retrieval_tool = VertexAiRagRetrieval(
-    name="retrieve_drive_documents",
-    description=(
-        "Use this tool to retrieve information from Google Drive documents. "
-        "Searches across vectorized documents in the RAG corpus."
-    ),
-    rag_resources=[
-        rag.RagResource(
-            rag_corpus=settings.RAG_CORPUS_ID,
-        )
-    ],
-    similarity_top_k=10,
-    vector_distance_threshold=0.6,
-)
+
+class PooledVertexAiRagRetrieval(VertexAiRagRetrieval):
+    """
+    Vertex AI RAG retrieval served by the process-wide RAG client.
+
+    Only used for models without the built-in retrieval tool (before Gemini 2);
+    the upstream tool opens a new client and blocks the event loop per call.
+    Calls close to the user prompt are served by the turn's RAG prefetch.
+    """
+
+    @property
+    def corpus(self) -> str:
+        """RAG corpus resource name the tool retrieves from."""
+        resources = self.vertex_rag_store.rag_resources
+        if not resources or not resources[0].rag_corpus:
+            raise ValueError(f"Tool '{self.name}' has no RAG corpus")
+        return resources[0].rag_corpus
+
+    async def run_async(self, *, args: dict[str, Any], tool_context: ToolContext) -> Any:
+        corpus = self.corpus
+        contexts = await rag_prefetcher.take(tool_context.invocation_id, args["query"], corpus)
+        if contexts is None:
+            contexts = await retrieve_contexts(args["query"], corpus=corpus)
+        return contexts or f"No matching result found with the config: {self.vertex_rag_store}"
+
+
+@cache
+def get_rag_retrieval_tool(corpus_id: str) -> PooledVertexAiRagRetrieval:
+    """
+    Return the retrieval tool of a RAG corpus, shared by the agents using it.
+
+    Args:
+        corpus_id: RAG corpus resource name (tenants may override `RAG_CORPUS_ID`)
+    """
+    return PooledVertexAiRagRetrieval(
+        name="retrieve_drive_documents",
+        description=(
+            "Use this tool to retrieve information from Google Drive documents. "
+            "Searches across vectorized documents in the RAG corpus."
+        ),
+        rag_resources=[
+            rag.RagResource(
+                rag_corpus=corpus_id,
+            )
+        ],
+        similarity_top_k=10,
+        vector_distance_threshold=0.6,
+    )
+
+
+vertex_ai_rag_retrieval_tool = get_rag_retrieval_tool(settings.RAG_CORPUS_ID)
+
+
+async def retrieve_contexts(
+    query: str,
+    similarity_top_k: int | None = None,
+    corpus: str | None = None,
+) -> list[str]:
+    """
+    Retrieve RAG passages for a query from a corpus.
+
+    The query goes through the shared RAG client; the client is synchronous,
+    so it runs in a worker thread to keep the event loop free for concurrent
+    retrievals.
+
+    Args:
+        query: Retrieval query text
+        similarity_top_k: Number of passages to return (tool default if None)
+        corpus: RAG corpus resource name (current tenant's corpus if None)
+
+    Returns:
+        List of retrieved passage texts (empty when nothing matches)
+    """
+    store = vertex_ai_rag_retrieval_tool.vertex_rag_store
+    corpus = corpus or get_current_tenant().rag_corpus_id
+    request = aiplatform_v1.RetrieveContextsRequest(
+        parent=corpus.split("/ragCorpora/")[0],
+        vertex_rag_store=aiplatform_v1.RetrieveContextsRequest.VertexRagStore(
+            rag_resources=[
+                aiplatform_v1.RetrieveContextsRequest.VertexRagStore.RagResource(
+                    rag_corpus=corpus,
+                )
+            ],
+        ),
+        query=aiplatform_v1.RagQuery(
+            text=query,
+            rag_retrieval_config=aiplatform_v1.RagRetrievalConfig(
+                top_k=similarity_top_k or store.similarity_top_k,
+                filter=aiplatform_v1.RagRetrievalConfig.Filter(
+                    vector_distance_threshold=store.vector_distance_threshold,
+                ),
+            ),
+        ),
+    )
+    with clients.track(RAG_CLIENT):
+        response = await asyncio.to_thread(get_rag_client().retrieve_contexts, request=request)
+    return [context.text for context in response.contexts.contexts]
@@ -1,9 +1,42 @@
+from app.config.skills import get_skills_for_agent
 from app.instructions.instructions_manager import InstructionsManager
 
 instructions_manager = InstructionsManager()
 
+
+def build_static_instruction(instruction: str, agent_name: str) -> str:
+    """Append the agent's skill metadata to its rendered instruction."""
+    skills = instructions_manager.get_instructions(
+        "skills_v1", skills=get_skills_for_agent(agent_name)
+    )
+    return f"{instruction}\n\n{skills}"
+
+
+def resolve_static_instruction(agent_name: str, template: str | None, default: str) -> str:
+    """Static instruction of an agent, rendered from a tenant's template if it has one."""
+    if template is None:
+        return default
+    return build_static_instruction(instructions_manager.get_instructions(template), agent_name)
+
+
 AGENT_QUIZZ_DESCRIPTION = """Agent spécialisé dans la création de quiz interactifs basés sur des documents fournis par l'utilisateur."""
 AGENT_QUIZZ_INSTRUCTION = instructions_manager.get_instructions("quizz_v1")
+AGENT_QUIZZ_STATIC_INSTRUCTION = build_static_instruction(
+    AGENT_QUIZZ_INSTRUCTION, "quizz_agent"
+)
+AGENT_QUIZZ_VARIATION_INSTRUCTION = instructions_manager.get_instructions("quizz_variation_v1")
 
 AGENT_TRAINING_SCRIPT_DESCRIPTION = """Agent spécialisé dans la création de scripts de formation pédagogiques et structurés."""
 AGENT_TRAINING_SCRIPT_INSTRUCTION = instructions_manager.get_instructions("training_script_v1")
+AGENT_TRAINING_SCRIPT_STATIC_INSTRUCTION = build_static_instruction(
+    AGENT_TRAINING_SCRIPT_INSTRUCTION, "training_script_agent"
+)
+AGENT_TRAINING_SCRIPT_AGENDA_INSTRUCTION = instructions_manager.get_instructions(
+    "training_script_agenda_v1"
+)
+AGENT_TRAINING_SCRIPT_SECTION_INSTRUCTION = instructions_manager.get_instructions(
+    "training_script_section_v1"
+)
+
+AGENT_TRAINING_QUIZ_DESCRIPTION = """Agent spécialisé dans la création d'un script de formation accompagné d'un quiz par section."""
+AGENT_QUIZZ_SECTION_INSTRUCTION = instructions_manager.get_instructions("quizz_section_v1")
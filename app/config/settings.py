@@ -1,5 +1,6 @@
 import os
 from pathlib import Path
+from typing import Literal
 
 from dotenv import find_dotenv, load_dotenv
 from google.cloud import secretmanager
@@ -7,6 +8,7 @@ from google.genai import types
 from pydantic import Field, ValidationError
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
+from app.services.client_registry import clients
 from app.utils.error import ConfigurationError, ErrorCode
 
 
@@ -15,7 +17,7 @@ def get_secret(project_id: str, secret_id: str, version_id: str = "latest") -> s
     if not project_id:
         return None
     try:
-        client = secretmanager.SecretManagerServiceClient()
+        client = clients.get("secret_manager", secretmanager.SecretManagerServiceClient)
         name = f"projects/{project_id}/secrets/{secret_id}/versions/{version_id}"
         response = client.access_secret_version(name=name)
         return response.payload.data.decode("UTF-8")
@@ -87,6 +89,310 @@ class Settings(BaseSettings):
         description="AI model to use for the agent",
     )
 
+    MODEL_ROUTING_ENABLED: bool = Field(
+        default=False,
+        description="Route each request to MODEL_FAST or MODEL_HEAVY based on its class",
+    )
+
+    MODEL_FAST: str = Field(
+        default="",
+        description="Cheap/fast model for simple requests (defaults to MODEL)",
+    )
+
+    MODEL_HEAVY: str = Field(
+        default="",
+        description="Large model for heavy generation requests (defaults to MODEL)",
+    )
+
+    MODEL_ROUTING_FAST_MAX_PROMPT_CHARS: int = Field(
+        default=400,
+        description="Prompts longer than this are always routed to MODEL_HEAVY",
+    )
+
+    MODEL_ROUTING_FAST_INTENTS: list[str] = Field(
+        default=["analyse", "explication"],
+        description="Intents (creation, analyse, variation, explication) served by MODEL_FAST",
+    )
+
+    MODEL_BASE_URL: str = Field(
+        default="",
+        description="Override of the GenAI API base URL (e.g. a local stub server)",
+    )
+
+    HTTP_MAX_CONNECTIONS: int = Field(
+        default=100,
+        description="Maximum number of connections of the shared HTTP pool",
+    )
+
+    HTTP_MAX_KEEPALIVE_CONNECTIONS: int = Field(
+        default=20,
+        description="Maximum number of idle connections kept alive in the shared HTTP pool",
+    )
+
+    HTTP_KEEPALIVE_EXPIRY_SECONDS: float = Field(
+        default=120.0,
+        description="Idle time after which a pooled HTTP connection is closed",
+    )
+
+    HTTP_TIMEOUT_SECONDS: float = Field(
+        default=300.0,
+        description="Default timeout of requests sent through the shared HTTP pool",
+    )
+
+    HTTP2_ENABLED: bool = Field(
+        default=False,
+        description=(
+            "Negotiate HTTP/2 on the shared HTTP pool (requires the 'h2' package, "
+            "not installed by default: HTTP/1.1 is used without it)"
+        ),
+    )
+
+    GRPC_KEEPALIVE_TIME_MS: int = Field(
+        default=30_000,
+        description="Interval of the keep-alive pings on the shared gRPC channels",
+    )
+
+    RECORDING_MODE: Literal["off", "record", "replay"] = Field(
+        default="off",
+        description="Record the model and RAG calls to RECORDING_PATH, or replay them from it",
+    )
+
+    RECORDING_PATH: str = Field(
+        default=".adk/recordings/calls.jsonl.gz",
+        description="File of the recorded model and RAG calls",
+    )
+
+    RECORDING_REPLAY_SPEED: float = Field(
+        default=1.0,
+        description="Replay speed of the recorded timings (2 = twice as fast, 0 = no delay)",
+    )
+
+    HOST: str = Field(
+        default="0.0.0.0",
+        description="Interface the server binds to",
+    )
+
+    PORT: int = Field(
+        default=8080,
+        description="Port the server listens on (provided by Cloud Run)",
+    )
+
+    WEB_CONCURRENCY: int = Field(
+        default=0,
+        description="Number of worker processes (0 = one per available CPU)",
+    )
+
+    SHARED_STATE_DIR: str = Field(
+        default=".adk/shared",
+        description="Directory of the local state shared by the worker processes",
+    )
+
+    CACHE_BACKEND: Literal["memory", "sqlite"] = Field(
+        default="memory",
+        description=(
+            "Backend of the response and context caches: per-process memory, or "
+            "a SQLite store shared by all workers of the instance"
+        ),
+    )
+
+    SESSION_SERVICE_URI: str = Field(
+        default="",
+        description=(
+            "ADK session service URI (e.g. sqlite:///.adk/shared/sessions.db, or compact:// "
+            "for in-memory sessions with serialized events). "
+            "Defaults to ADK's per-agent local SQLite storage."
+        ),
+    )
+
+    SKIP_AGENT_CARD_GENERATION: bool = Field(
+        default=False,
+        description="Skip agent card generation at startup (cards prepared by the launcher)",
+    )
+
+    WARMUP_ENABLED: bool = Field(
+        default=True,
+        description="Open the model and RAG connections before reporting ready",
+    )
+
+    WARMUP_PRIME_MODEL: bool = Field(
+        default=False,
+        description="Issue a one-token generation during warm-up",
+    )
+
+    WARMUP_PRIME_RAG: bool = Field(
+        default=False,
+        description="Issue a one-passage RAG retrieval during warm-up",
+    )
+
+    WARMUP_TIMEOUT_SECONDS: float = Field(
+        default=30.0,
+        description="Maximum duration of each warm-up step",
+    )
+
+    ORJSON_RESPONSES_ENABLED: bool = Field(
+        default=True,
+        description="Render the JSON responses of ADK's API routes (/run, sessions...) with orjson",
+    )
+
+    LOAD_SHEDDING_ENABLED: bool = Field(
+        default=True,
+        description="Reject agent runs above the adaptive concurrency limit",
+    )
+
+    LOAD_SHEDDING_INITIAL_LIMIT: int = Field(
+        default=32,
+        description="Initial number of concurrent agent runs per worker",
+    )
+
+    LOAD_SHEDDING_MIN_LIMIT: int = Field(
+        default=4,
+        description="Lower bound of the adaptive concurrency limit",
+    )
+
+    LOAD_SHEDDING_MAX_LIMIT: int = Field(
+        default=256,
+        description="Upper bound of the adaptive concurrency limit",
+    )
+
+    LOAD_SHEDDING_TOLERANCE: float = Field(
+        default=1.5,
+        description="Latency increase over the baseline tolerated before the limit shrinks",
+    )
+
+    LOAD_SHEDDING_MAX_WAIT_SECONDS: float = Field(
+        default=0.0,
+        description="How long a run over the limit may wait for a slot before being rejected",
+    )
+
+    LOAD_SHEDDING_STATUS_CODE: Literal[429, 503] = Field(
+        default=503,
+        description="HTTP status of rejected runs (sent with a Retry-After header)",
+    )
+
+    HEALTH_CACHE_TTL_SECONDS: float = Field(
+        default=15.0,
+        description="How long deep health check results are reused",
+    )
+
+    HEALTH_PROBE_TIMEOUT_SECONDS: float = Field(
+        default=3.0,
+        description="Timeout of each deep health check",
+    )
+
+    HEALTH_LOOP_LAG_MAX_MS: float = Field(
+        default=250.0,
+        description="Event-loop lag (p95 over the last minute) above which the instance is degraded",
+    )
+
+    HEALTH_MEMORY_MAX_RATIO: float = Field(
+        default=0.9,
+        description="Share of the container memory limit above which the instance is degraded",
+    )
+
+    HEALTH_SLO_MIN_SAMPLES: int = Field(
+        default=20,
+        description="Minimum number of requests before an agent latency SLO is enforced",
+    )
+
+    DEFAULT_LATENCY_SLO_P95_MS: int = Field(
+        default=30_000,
+        description="Default p95 latency SLO of an agent invocation",
+    )
+
+    AGENT_LATENCY_SLO_P95_MS: dict[str, int] = Field(
+        default={},
+        description='p95 latency SLO per agent, e.g. {"quizz_agent": 20000}',
+    )
+
+    FEEDBACK_ENABLED: bool = Field(
+        default=False,
+        description=(
+            "Expose POST /feedback and run the background feedback flusher "
+            "(use the bigquery or cloud_logging sink in production)"
+        ),
+    )
+
+    FEEDBACK_SINK: Literal["jsonl", "bigquery", "cloud_logging"] = Field(
+        default="jsonl",
+        description="Destination of feedback records",
+    )
+
+    FEEDBACK_JSONL_PATH: str = Field(
+        default=".adk/feedback/feedback.jsonl",
+        description="File of the jsonl feedback sink (local, lost with the container)",
+    )
+
+    FEEDBACK_BIGQUERY_TABLE: str = Field(
+        default="feedback.feedback",
+        description="BigQuery table of the bigquery sink (dataset.table or project.dataset.table)",
+    )
+
+    FEEDBACK_LOG_NAME: str = Field(
+        default="feedback",
+        description="Cloud Logging log name of the cloud_logging sink",
+    )
+
+    FEEDBACK_BATCH_SIZE: int = Field(
+        default=100,
+        description="Records written per batch; a full batch is flushed immediately",
+    )
+
+    FEEDBACK_FLUSH_INTERVAL_SECONDS: float = Field(
+        default=5.0,
+        description="Maximum time a record waits in the buffer before being flushed",
+    )
+
+    FEEDBACK_BUFFER_MAX_RECORDS: int = Field(
+        default=10_000,
+        description="Records kept in memory at most; the oldest are dropped beyond",
+    )
+
+    FEEDBACK_MAX_ATTEMPTS: int = Field(
+        default=5,
+        description="Write attempts of a batch before it is dropped",
+    )
+
+    DEBUG_ENDPOINTS_ENABLED: bool = Field(
+        default=False,
+        description="Expose the /debug profiling endpoints (requires DEBUG_TOKEN)",
+    )
+
+    DEBUG_TOKEN: str = Field(
+        default="",
+        description=(
+            "Bearer token of the /debug endpoints. "
+            "Read from the DEBUG_TOKEN secret in Secret Manager when not set"
+        ),
+    )
+
+    DEBUG_PROFILE_INTERVAL_MS: float = Field(
+        default=10.0,
+        description="Default sampling interval of the profiler (10 ms = 100 Hz)",
+    )
+
+    DEBUG_PROFILE_MAX_SECONDS: float = Field(
+        default=60.0,
+        description="Maximum duration of a profiling session",
+    )
+
+    MEMORY_TRACKING_ENABLED: bool = Field(
+        default=False,
+        description=(
+            "Trace allocations (tracemalloc) from startup and measure sessions after each invocation. "
+            "Slows allocations down, for debugging and benchmarks"
+        ),
+    )
+
+    MEMORY_TRACKING_FRAMES: int = Field(
+        default=1,
+        description="Call stack depth stored per traced allocation",
+    )
+
+    MEMORY_TRACKED_SESSIONS: int = Field(
+        default=200,
+        description="Number of most recently active sessions whose size is kept",
+    )
+
     @property
     def AGENT_DIR(self) -> str:
         """Get the absolute path to the agents directory."""
@@ -144,6 +450,64 @@ class Settings(BaseSettings):
         ),
     )
 
+    TELEMETRY_EXPORT_ENABLED: bool = Field(
+        default=False,
+        description="Export ADK spans (agent, LLM and tool calls) in compressed batches",
+    )
+
+    TELEMETRY_EXPORT_DESTINATION: Literal["gcs", "local"] = Field(
+        default="gcs",
+        description="Upload batches to Cloud Storage or write them to a local directory",
+    )
+
+    TELEMETRY_EXPORT_BUCKET: str = Field(
+        default="",
+        description="Cloud Storage bucket of the exported batches (defaults to LOGS_BUCKET_NAME)",
+    )
+
+    TELEMETRY_EXPORT_PREFIX: str = Field(
+        default="telemetry",
+        description="Object name prefix of the exported batches",
+    )
+
+    TELEMETRY_EXPORT_LOCAL_DIR: str = Field(
+        default=".adk/telemetry",
+        description="Directory of the local exporter",
+    )
+
+    TELEMETRY_EXPORT_BATCH_SPANS: int = Field(
+        default=512,
+        description="Spans per uploaded batch; a full batch is uploaded immediately",
+    )
+
+    TELEMETRY_EXPORT_FLUSH_INTERVAL_SECONDS: float = Field(
+        default=10.0,
+        description="Maximum time a span waits before being uploaded",
+    )
+
+    TELEMETRY_EXPORT_MAX_QUEUE_SPANS: int = Field(
+        default=8192,
+        description="Spans buffered at most; new spans are dropped beyond",
+    )
+
+    TELEMETRY_EXPORT_PRESSURE_THRESHOLD: float = Field(
+        default=0.5,
+        description="Queue fill ratio above which spans are sampled",
+    )
+
+    TELEMETRY_EXPORT_PRESSURE_SAMPLE_RATE: float = Field(
+        default=0.1,
+        description=(
+            "Share of traces kept under pressure; error spans, LLM call spans "
+            "and root spans are always kept"
+        ),
+    )
+
+    TELEMETRY_EXPORT_CAPTURE_CONTENT: bool = Field(
+        default=False,
+        description="Keep prompts, responses and tool payloads in exported spans (metadata only by default)",
+    )
+
     A2A_BASE_URL: str = Field(
         default="http://localhost:8085",
         description="Base URL for A2A agent exposure (e.g., https://your-domain.com)",
@@ -154,17 +518,141 @@ class Settings(BaseSettings):
         description="Name of the agent to expose via A2A protocol",
     )
 
-    # Custom URLs per agent (optional)
-    # Format: A2A_AGENT_<AGENT_NAME>_URL
-    # Example: A2A_AGENT_QUIZZ_AGENT_URL=https://agent1.example.com
-    A2A_AGENT_QUIZZ_AGENT_URL: str = Field(
+    # Custom URLs per agent (optional), overriding A2A_BASE_URL
+    # Either A2A_AGENT_URLS='{"quizz_agent": "https://agent1.example.com"}'
+    # or one A2A_AGENT_<AGENT_NAME>_URL variable per agent
+    A2A_AGENT_URLS: dict[str, str] = Field(
+        default={},
+        description="Custom URL per agent name (overrides A2A_BASE_URL)",
+    )
+
+    SKILL_VALIDATION_ENABLED: bool = Field(
+        default=True,
+        description=(
+            "Validate A2A messages and final responses against the skills' "
+            "input and output schemas (invalid messages are rejected)"
+        ),
+    )
+
+    SKILL_VALIDATION_MAX_BODY_BYTES: int = Field(
+        default=10 * 1024 * 1024,
+        description="Largest A2A request body buffered for validation; larger ones are rejected with 413",
+    )
+
+    A2A_DELEGATION_ENABLED: bool = Field(
+        default=False,
+        description="Give the agents a tool delegating requests to the other agents (local or A2A_REMOTE_AGENTS)",
+    )
+
+    # Remote A2A agents the agents may delegate to, e.g.
+    # A2A_REMOTE_AGENTS='{"glossary_agent": "https://glossary.example.com/a2a/glossary_agent"}'
+    A2A_REMOTE_AGENTS: dict[str, str] = Field(
+        default={},
+        description="Remote A2A agent URL per agent name (card under /.well-known/agent-card.json)",
+    )
+
+    A2A_DELEGATION_TIMEOUT_SECONDS: float = Field(
+        default=120.0,
+        description="Maximum duration of a delegated request",
+    )
+
+    A2A_DELEGATION_MAX_DEPTH: int = Field(
+        default=2,
+        description="Maximum nesting of delegations (an agent delegating to one that delegates...)",
+    )
+
+    A2A_CARD_CACHE_TTL_SECONDS: float = Field(
+        default=300.0,
+        description="Time remote agent cards are reused before being fetched again",
+    )
+
+    TOOL_RESPONSE_MAX_CHARS: int = Field(
+        default=0,
+        description=(
+            "Text budget of one tool response kept in the session; larger ones are "
+            "truncated and stored in full in TOOL_RESPONSE_STORE (0 = no limit)"
+        ),
+    )
+
+    TOOL_RESPONSE_FETCH_PAGE_CHARS: int = Field(
+        default=4_000,
+        description="Characters returned per call of the fetch_tool_response tool",
+    )
+
+    TOOL_RESPONSE_STORE: Literal["gcs", "local"] = Field(
+        default="local",
+        description="Store of the full truncated tool responses: Cloud Storage or a local directory",
+    )
+
+    TOOL_RESPONSE_BUCKET: str = Field(
         default="",
-        description="Custom URL for quizz_agent (overrides A2A_BASE_URL)",
+        description="Cloud Storage bucket of the full tool responses (defaults to LOGS_BUCKET_NAME)",
     )
 
-    A2A_AGENT_TRAINING_SCRIPT_AGENT_URL: str = Field(
+    TOOL_RESPONSE_PREFIX: str = Field(
+        default="tool_responses",
+        description="Object name prefix of the full tool responses",
+    )
+
+    TOOL_RESPONSE_LOCAL_DIR: str = Field(
+        default=".adk/tool_responses",
+        description="Directory of the local tool response store",
+    )
+
+    TOOL_RESPONSE_TTL_SECONDS: int = Field(
+        default=7 * 24 * 3600,
+        description=(
+            "Age after which the local store deletes full tool responses "
+            "(use a bucket lifecycle rule for the gcs store)"
+        ),
+    )
+
+    AGENT_MANIFEST_PATH: str = Field(
+        default=".adk/agents_manifest.json",
+        description="Index of the discovered agents, reused on boot while their sources are unchanged (empty to disable)",
+    )
+
+    MULTI_TENANCY_ENABLED: bool = Field(
+        default=False,
+        description="Serve several tenants, identified by TENANT_HEADER, with their own configuration and quotas",
+    )
+
+    TENANT_HEADER: str = Field(
+        default="X-Tenant-ID",
+        description="Request header naming the tenant (requests without it use the default tenant)",
+    )
+
+    TENANT_API_KEY_HEADER: str = Field(
+        default="X-API-Key",
+        description="Request header carrying the API key of the tenant named by TENANT_HEADER",
+    )
+
+    TENANT_HEADER_TRUSTED: bool = Field(
+        default=False,
+        description=(
+            "Trust TENANT_HEADER without an API key. Only behind a proxy that "
+            "authenticates callers, sets the header and strips it from client requests"
+        ),
+    )
+
+    TENANTS_CONFIG_PATH: str = Field(
         default="",
-        description="Custom URL for training_script_agent (overrides A2A_BASE_URL)",
+        description="JSON file of the tenant configurations, keyed by tenant id",
+    )
+
+    TENANT_AGENT_CACHE_SIZE: int = Field(
+        default=32,
+        description="Tenant agent instances kept per agent (least recently used evicted)",
+    )
+
+    TENANT_MAX_CONCURRENT_RUNS: int = Field(
+        default=16,
+        description="Default concurrent agent runs per tenant (0 for no limit)",
+    )
+
+    TENANT_TOKENS_PER_MINUTE: int = Field(
+        default=0,
+        description="Default model tokens per tenant over the last minute (0 for no limit)",
     )
 
     RAG_CORPUS_ID: str = Field(
@@ -176,12 +664,161 @@ class Settings(BaseSettings):
         ),
     )
 
+    RAG_API_ENDPOINT: str = Field(
+        default="",
+        description=(
+            "Override of the Vertex AI RAG API endpoint (defaults to "
+            "LOCATION-aiplatform.googleapis.com). Plaintext http:// endpoints, "
+            "e.g. local stub servers, are called without credentials."
+        ),
+    )
+
+    RAG_API_TRANSPORT: Literal["grpc", "rest"] = Field(
+        default="grpc",
+        description="Transport of the Vertex AI RAG client",
+    )
+
+    RAG_PREFETCH_ENABLED: bool = Field(
+        default=False,
+        description="Retrieve passages for the user prompt while the model plans its first call",
+    )
+
+    RAG_PREFETCH_MIN_OVERLAP: float = Field(
+        default=0.5,
+        description="Share of the tool query's words found in the prompt for the prefetch to serve it",
+    )
+
+    TRAINING_SCRIPT_PIPELINE_ENABLED: bool = Field(
+        default=False,
+        description=(
+            "Generate training scripts with the agenda + parallel sections "
+            "pipeline instead of a single LLM call"
+        ),
+    )
+
+    TRAINING_SCRIPT_PIPELINE_MAX_CONCURRENCY: int = Field(
+        default=4,
+        description="Maximum number of script sections generated concurrently",
+    )
+
+    TRAINING_SCRIPT_PIPELINE_MAX_SECTIONS: int = Field(
+        default=12,
+        description="Maximum number of agenda sections written by the pipeline",
+    )
+
+    TRAINING_SCRIPT_SECTION_TOP_K: int = Field(
+        default=5,
+        description="Number of RAG passages retrieved for each script section",
+    )
+
+    TRAINING_QUIZ_QUESTIONS_PER_SECTION: int = Field(
+        default=3,
+        description="Number of quiz questions written for each section by the script → quiz workflow",
+    )
+
+    QUIZ_VARIATION_ENABLED: bool = Field(
+        default=False,
+        description=(
+            "Answer quiz variation requests by regenerating only the changed "
+            "questions or distractors of the session's quiz, in parallel"
+        ),
+    )
+
+    QUIZ_VARIATION_MAX_CONCURRENCY: int = Field(
+        default=4,
+        description="Maximum number of quiz questions regenerated concurrently",
+    )
+
+    QUIZ_VARIATION_MAX_VERSIONS: int = Field(
+        default=5,
+        description="Maximum number of quiz versions generated by one variation request",
+    )
+
+    RAG_CORPUS_VERSION: str = Field(
+        default="1",
+        description=(
+            "Version of the RAG corpus content. Bump it after re-indexing to "
+            "invalidate responses cached for the previous corpus."
+        ),
+    )
+
+    RESPONSE_CACHE_ENABLED: bool = Field(
+        default=False,
+        description="Replay cached final responses for identical first-turn requests",
+    )
+
+    RESPONSE_CACHE_MAX_ENTRIES: int = Field(
+        default=512,
+        description="Maximum number of cached responses (LRU eviction)",
+    )
+
+    RESPONSE_CACHE_TTL_SECONDS: int = Field(
+        default=3600,
+        description="Time-to-live of a cached response",
+    )
+
+    RESPONSE_CACHE_BYPASS_HEADER: str = Field(
+        default="X-Response-Cache",
+        description="Request header that bypasses the response cache when set to 'bypass'",
+    )
+
+    CONTEXT_CACHE_ENABLED: bool = Field(
+        default=True,
+        description=(
+            "Serve the static agent instructions from a Vertex AI explicit "
+            "context cache instead of resending them on every turn"
+        ),
+    )
+
+    CONTEXT_CACHE_TTL_SECONDS: int = Field(
+        default=3600,
+        description="Time-to-live of each context cache, refreshed while in use",
+    )
+
+    CONTEXT_CACHE_REFRESH_MARGIN_SECONDS: int = Field(
+        default=300,
+        description="Extend a context cache TTL when it expires within this margin",
+    )
+
+    CONTEXT_CACHE_MIN_CHARS: int = Field(
+        default=4096,
+        description=(
+            "Minimum size of the static prefix (in characters) worth caching. "
+            "Vertex AI rejects caches below the model's minimum token count."
+        ),
+    )
+
+    CONTEXT_CACHE_RETRY_AFTER_SECONDS: int = Field(
+        default=600,
+        description="Delay before retrying a context cache creation that failed",
+    )
+
+    def get_session_service_uri(self) -> str | None:
+        """
+        Get the ADK session service URI.
+
+        Priority:
+        1. Vertex AI Agent Engine Sessions (USE_AGENT_ENGINE_SESSIONS)
+        2. SESSION_SERVICE_URI
+        3. None: ADK local storage (per-agent SQLite)
+
+        Returns:
+            The session service URI, or None for ADK local storage
+        """
+        if self.USE_AGENT_ENGINE_SESSIONS:
+            if not self.AGENT_ENGINE_ID:
+                raise ValueError(
+                    "AGENT_ENGINE_ID must be set when USE_AGENT_ENGINE_SESSIONS is True."
+                )
+            return f"agentengine://{self.AGENT_ENGINE_ID.split('/')[-1]}"
+        return self.SESSION_SERVICE_URI or None
+
     def get_agent_url(self, agent_name: str) -> str:
         """
         Get the A2A URL for a specific agent.
 
         Priority:
-        1. Agent-specific URL (A2A_AGENT_<AGENT_NAME>_URL)
+        1. Agent-specific URL (A2A_AGENT_URLS, then A2A_AGENT_<AGENT_NAME>_URL)
         2. Base A2A URL (A2A_BASE_URL)
 
         Args:
@@ -190,9 +827,7 @@ class Settings(BaseSettings):
         Returns:
             The URL for the agent
         """
-        env_var_name = f"A2A_AGENT_{agent_name.upper()}_URL"
-
-        agent_url = getattr(self, env_var_name, "")
+        agent_url = self.A2A_AGENT_URLS.get(agent_name) or os.getenv(f"A2A_AGENT_{agent_name.upper()}_URL", "")
 
         if agent_url:
             return agent_url
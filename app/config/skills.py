@@ -3,15 +3,13 @@ Skills configuration for A2A agents.
 
 This module provides helper functions to retrieve skills for each agent.
 Skills are defined in their respective agent's skills module under
-`app/components/skills/<agent_name>/skills.py`.
+`app/components/skills/<agent_name>/`, as `*_SKILLS` lists, and are
+discovered with the agents (see `app.services.agent_discovery`).
 """
 
 from a2a.types import AgentSkill
 
-from app.components.skills.quizz_agent.quizz_agent_skills import QUIZZ_AGENT_SKILLS
-from app.components.skills.training_script_agent.training_script_agent_skills import (
-    TRAINING_SCRIPT_AGENT_SKILLS,
-)
+from app.services.agent_discovery import agent_catalog
 
 
 def get_skills_for_agent(agent_name: str) -> list[AgentSkill]:
@@ -27,18 +25,7 @@ def get_skills_for_agent(agent_name: str) -> list[AgentSkill]:
     Raises:
         ValueError: If agent_name is not recognized
     """
-    skills_map = {
-        "quizz_agent": QUIZZ_AGENT_SKILLS,
-        "training_script_agent": TRAINING_SCRIPT_AGENT_SKILLS,
-    }
-
-    if agent_name not in skills_map:
-        available = ", ".join(skills_map.keys())
-        raise ValueError(
-            f"Unknown agent '{agent_name}'. Available agents: {available}"
-        )
-
-    return skills_map[agent_name]
+    return agent_catalog.skills(agent_name)
 
 
 def get_all_skills() -> dict[str, list[AgentSkill]]:
@@ -48,7 +35,4 @@ def get_all_skills() -> dict[str, list[AgentSkill]]:
     Returns:
         Dictionary mapping agent names to their skills
     """
-    return {
-        "quizz_agent": QUIZZ_AGENT_SKILLS,
-        "training_script_agent": TRAINING_SCRIPT_AGENT_SKILLS,
-    }
+    return {agent_name: entry.skills for agent_name, entry in agent_catalog.entries().items()}
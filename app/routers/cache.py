@@ -0,0 +1,44 @@
+"""Response cache administration endpoints."""
+
+from fastapi import APIRouter, Depends
+from fastapi.responses import ORJSONResponse
+
+from app.routers.debug import require_debug_token
+from app.services.response_cache import response_cache
+
+router = APIRouter(prefix="/cache", tags=["Cache"])
+
+
+@router.get("/responses", summary="Response cache statistics")
+async def get_response_cache_stats() -> ORJSONResponse:
+    """
+    Get response cache statistics.
+
+    Returns:
+        ORJSONResponse: Number of entries and hit/miss counters
+    """
+    return ORJSONResponse(content=await response_cache.stats(), status_code=200)
+
+
+@router.delete(
+    "/responses",
+    summary="Invalidate cached responses",
+    dependencies=[Depends(require_debug_token)],
+)
+async def invalidate_response_cache(agent_name: str | None = None) -> ORJSONResponse:
+    """
+    Invalidate cached responses.
+
+    Requires `Authorization: Bearer <DEBUG_TOKEN>`, as the debug endpoints.
+
+    Args:
+        agent_name: Only invalidate responses of this agent (all agents if omitted)
+
+    Returns:
+        ORJSONResponse: Number of invalidated entries
+    """
+    removed = await response_cache.invalidate(agent_name)
+    return ORJSONResponse(
+        content={"invalidated": removed, "agent_name": agent_name},
+        status_code=200,
+    )
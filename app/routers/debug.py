@@ -0,0 +1,254 @@
+"""
+Debug endpoints for live instances: sampling profiler, asyncio task dump,
+event-loop lag history and memory instrumentation.
+
+Only mounted when `DEBUG_ENDPOINTS_ENABLED=true`, and every call must carry
+`Authorization: Bearer <DEBUG_TOKEN>`. Without a configured token all calls
+are refused.
+"""
+
+import asyncio
+import logging
+import os
+import secrets
+import time
+from typing import Literal
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import ORJSONResponse, PlainTextResponse, Response
+
+from app.config.settings import get_secret, settings
+from app.services.diagnostics import dump_tasks, profiler, to_collapsed, top_functions
+from app.services.health import get_rss_bytes
+from app.services.loop_monitor import loop_lag_monitor
+from app.services.memory import memory_tracker, session_memory
+from app.utils.error import (
+    ConflictError,
+    ErrorCode,
+    InvalidInputError,
+    UnauthorizedError,
+)
+
+logger = logging.getLogger(__name__)
+
+
+# Delay before looking the token up again when none was found (e.g. a
+# transient Secret Manager failure)
+DEBUG_TOKEN_RETRY_SECONDS = 60
+
+_debug_token = ""
+_debug_token_checked_at: float | None = None
+
+
+def get_debug_token() -> str:
+    """
+    Return the debug token, from the settings or Secret Manager ("" if none).
+
+    A token found is kept for the life of the process; a missing token is
+    looked up again after `DEBUG_TOKEN_RETRY_SECONDS`.
+    """
+    global _debug_token, _debug_token_checked_at
+    if _debug_token:
+        return _debug_token
+    now = time.monotonic()
+    if _debug_token_checked_at is not None and now - _debug_token_checked_at < DEBUG_TOKEN_RETRY_SECONDS:
+        return ""
+    _debug_token_checked_at = now
+    _debug_token = settings.DEBUG_TOKEN or get_secret(os.getenv("GOOGLE_CLOUD_PROJECT", ""), "DEBUG_TOKEN") or ""
+    if not _debug_token:
+        logger.warning(
+            f"No DEBUG_TOKEN configured or readable: debug calls are refused (retrying in {DEBUG_TOKEN_RETRY_SECONDS}s)"
+        )
+    return _debug_token
+
+
+def require_debug_token(request: Request) -> None:
+    """
+    Check the bearer token of a debug call.
+
+    Raises:
+        HTTPException: 401 if the token is missing, invalid or not configured
+    """
+    expected = get_debug_token()
+    scheme, _, provided = request.headers.get("Authorization", "").partition(" ")
+    if not expected or scheme.lower() != "bearer" or not secrets.compare_digest(provided, expected):
+        error = UnauthorizedError(error_code=ErrorCode.UNAUTHORIZED)
+        raise HTTPException(
+            status_code=error.status_code,
+            detail=error.to_dict(),
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+
+router = APIRouter(prefix="/debug", tags=["Debug"], dependencies=[Depends(require_debug_token)])
+
+
+@router.get("/profile", summary="Sampling profile")
+async def get_profile(
+    seconds: float = Query(10.0, gt=0, description="Profile duration"),
+    interval_ms: float | None = Query(None, ge=1, description="Sampling interval (default DEBUG_PROFILE_INTERVAL_MS)"),
+    format: Literal["collapsed", "json"] = Query("collapsed", description="Collapsed stacks or JSON summary"),
+    idle: bool = Query(False, description="Keep the samples of idle threads (event loop polling, idle workers)"),
+) -> Response:
+    """
+    Profile all threads of the process for a few seconds.
+
+    Args:
+        seconds: Profile duration (capped by DEBUG_PROFILE_MAX_SECONDS)
+        interval_ms: Sampling interval
+        format: "collapsed" for flamegraph.pl / speedscope, "json" for the
+            sample count, overhead and hottest functions
+        idle: Keep the samples of threads waiting for work
+
+    Returns:
+        Response: Collapsed stacks as text, or the JSON summary; 409 if a
+        profile is already running
+    """
+    duration = min(seconds, settings.DEBUG_PROFILE_MAX_SECONDS)
+    interval = (interval_ms or settings.DEBUG_PROFILE_INTERVAL_MS) / 1000
+    try:
+        profile = await asyncio.to_thread(profiler.profile, duration, interval, idle)
+    except RuntimeError as e:
+        error = ConflictError(error_code=ErrorCode.CONFLICT, message=str(e))
+        return ORJSONResponse(content=error.to_dict(), status_code=error.status_code)
+
+    stacks = profile.pop("stacks")
+    logger.info(
+        f"Profiled {profile['samples']} samples in {profile['duration_seconds']}s "
+        f"(overhead {profile['overhead_ratio']:.2%})"
+    )
+    if format == "collapsed":
+        return PlainTextResponse(
+            content=to_collapsed(stacks),
+            headers={
+                "X-Profile-Samples": str(profile["samples"]),
+                "X-Profile-Overhead-Ratio": str(profile["overhead_ratio"]),
+            },
+        )
+    return ORJSONResponse(content={**profile, "top_functions": top_functions(stacks)}, status_code=200)
+
+
+@router.get("/tasks", summary="asyncio task dump")
+async def get_tasks(
+    stack_limit: int = Query(20, ge=1, le=200, description="Maximum depth of each await chain"),
+) -> ORJSONResponse:
+    """
+    List the pending asyncio tasks and where each one is awaiting.
+
+    Args:
+        stack_limit: Maximum depth of each await chain
+
+    Returns:
+        ORJSONResponse: Task count, count per coroutine and the task list
+    """
+    return ORJSONResponse(content=dump_tasks(stack_limit), status_code=200)
+
+
+@router.get("/loop-lag", summary="Event-loop lag history")
+async def get_loop_lag(
+    seconds: float = Query(300.0, gt=0, description="History window"),
+) -> ORJSONResponse:
+    """
+    Get the event-loop lag samples of the last `seconds`.
+
+    Args:
+        seconds: History window (bounded by the monitor's history size)
+
+    Returns:
+        ORJSONResponse: Sampling interval, summary and [timestamp, lag_ms] samples
+    """
+    return ORJSONResponse(
+        content={
+            "interval_seconds": loop_lag_monitor.interval_seconds,
+            "summary": loop_lag_monitor.snapshot(seconds),
+            "samples": [[round(timestamp, 3), round(lag_ms, 2)] for timestamp, lag_ms in loop_lag_monitor.history(seconds)],
+        },
+        status_code=200,
+    )
+
+
+@router.get("/memory", summary="Memory status")
+async def get_memory_status() -> ORJSONResponse:
+    """
+    Get the process memory and the allocation tracing status.
+
+    Returns:
+        ORJSONResponse: Resident set size, traced memory and tracemalloc overhead
+    """
+    return ORJSONResponse(content={"rss_bytes": get_rss_bytes(), **memory_tracker.status()}, status_code=200)
+
+
+@router.post("/memory/start", summary="Start allocation tracing")
+async def start_memory_tracing(
+    frames: int = Query(1, ge=1, le=50, description="Call stack depth stored per allocation"),
+) -> ORJSONResponse:
+    """
+    Start tracing allocations (tracemalloc) and take the baseline snapshot.
+
+    Args:
+        frames: Call stack depth stored per allocation
+
+    Returns:
+        ORJSONResponse: Tracing status
+    """
+    await asyncio.to_thread(memory_tracker.start, frames)
+    return ORJSONResponse(content=memory_tracker.status(), status_code=200)
+
+
+@router.post("/memory/stop", summary="Stop allocation tracing")
+async def stop_memory_tracing() -> ORJSONResponse:
+    """
+    Stop tracing allocations and free the traces.
+
+    Returns:
+        ORJSONResponse: Tracing status
+    """
+    memory_tracker.stop()
+    return ORJSONResponse(content=memory_tracker.status(), status_code=200)
+
+
+@router.get("/memory/diff", summary="Allocation growth")
+async def get_memory_diff(
+    against: Literal["baseline", "previous"] = Query("baseline", description="Reference snapshot"),
+    group_by: Literal["lineno", "filename", "traceback"] = Query("lineno", description="Aggregation of allocations"),
+    limit: int = Query(25, ge=1, le=500, description="Number of allocation sites"),
+) -> ORJSONResponse:
+    """
+    Take a snapshot and list the allocation sites that grew since the
+    baseline (tracing start) or the previous snapshot.
+
+    Args:
+        against: Reference snapshot
+        group_by: Aggregate per line, per file or per call stack
+        limit: Number of allocation sites
+
+    Returns:
+        ORJSONResponse: Traced memory, growth and top allocation sites; 400 if
+        tracing is not started
+    """
+    try:
+        diff = await asyncio.to_thread(memory_tracker.diff, against, group_by, limit)
+    except RuntimeError as e:
+        error = InvalidInputError(error_code=ErrorCode.INVALID_INPUT, message=str(e))
+        return ORJSONResponse(content=error.to_dict(), status_code=error.status_code)
+    return ORJSONResponse(content={"rss_bytes": get_rss_bytes(), **diff}, status_code=200)
+
+
+@router.get("/memory/sessions", summary="Session sizes")
+async def get_session_memory(
+    limit: int = Query(20, ge=1, le=500, description="Number of sessions returned"),
+) -> ORJSONResponse:
+    """
+    Get the approximate in-memory size of the recently active sessions
+    (measured after each invocation while memory tracking is on).
+
+    Args:
+        limit: Number of sessions returned, largest first
+
+    Returns:
+        ORJSONResponse: Totals and per-session breakdown (state, events, tool responses)
+    """
+    return ORJSONResponse(
+        content={"tracing": memory_tracker.tracing, **session_memory.largest(limit)},
+        status_code=200,
+    )
@@ -0,0 +1,30 @@
+"""Feedback ingestion endpoint."""
+
+import time
+import uuid
+
+from fastapi import APIRouter
+from fastapi.responses import ORJSONResponse
+
+from app.app_utils.typing import Feedback
+from app.services.feedback import feedback_pipeline
+
+router = APIRouter(tags=["Feedback"])
+
+
+@router.post("/feedback", summary="Submit feedback", status_code=202)
+async def submit_feedback(feedback: Feedback) -> ORJSONResponse:
+    """
+    Queue a feedback record; it is written in a later batch.
+
+    Args:
+        feedback: Score and comment on a conversation
+
+    Returns:
+        ORJSONResponse: Identifier of the queued record
+    """
+    feedback_id = uuid.uuid4().hex
+    feedback_pipeline.submit(
+        {**feedback.model_dump(mode="json"), "feedback_id": feedback_id, "received_at": time.time()}
+    )
+    return ORJSONResponse(content={"status": "accepted", "feedback_id": feedback_id}, status_code=202)
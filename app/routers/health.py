@@ -0,0 +1,68 @@
+"""Health, liveness and readiness endpoints."""
+
+from fastapi import APIRouter, Query
+from fastapi.responses import ORJSONResponse
+
+from app.config.settings import settings
+from app.services.health import health_checker
+from app.services.warmup import warmup_state
+
+router = APIRouter(prefix="/health", tags=["Health"])
+
+
+@router.get("", summary="Health Check")
+async def health_check(
+    deep: bool = Query(False, description="Probe dependencies, resources and latency SLOs"),
+) -> ORJSONResponse:
+    """
+    Health check endpoint for monitoring systems.
+
+    In deep mode, the session backend, RAG corpus and model endpoint are
+    probed (results cached for a few seconds), and the event-loop lag,
+    memory pressure and per-agent p95 latency are compared with their
+    thresholds.
+
+    Args:
+        deep: Run the deep checks
+
+    Returns:
+        ORJSONResponse: Status "ok" (200), or in deep mode the report of each
+        check, with 503 when the instance is degraded or failed
+    """
+    if deep:
+        report = await health_checker.run()
+        return ORJSONResponse(content=report, status_code=200 if report["status"] == "ok" else 503)
+
+    return ORJSONResponse(
+        content={
+            "status": "ok",
+            "app": settings.APP_NAME,
+            "version": settings.APP_VERSION,
+        },
+        status_code=200,
+    )
+
+
+@router.get("/live", summary="Liveness probe")
+async def liveness() -> ORJSONResponse:
+    """
+    Liveness probe: the process is up and serving requests.
+
+    Returns:
+        ORJSONResponse: Always 200 while the event loop answers
+    """
+    return ORJSONResponse(content={"status": "alive"}, status_code=200)
+
+
+@router.get("/ready", summary="Readiness probe")
+async def readiness() -> ORJSONResponse:
+    """
+    Readiness probe: the warm-up of the model and RAG connections is done.
+
+    Returns:
+        ORJSONResponse: 200 with the warm-up report once ready, 503 before
+    """
+    return ORJSONResponse(
+        content=warmup_state.to_dict(),
+        status_code=200 if warmup_state.ready else 503,
+    )
@@ -0,0 +1,181 @@
+"""In-process metrics endpoints."""
+
+from fastapi import APIRouter
+from fastapi.responses import ORJSONResponse
+
+from app.config.settings import settings
+from app.services.a2a_delegation import a2a_delegator
+from app.services.client_registry import clients
+from app.services.concurrency_limiter import agent_run_limiter
+from app.services.feedback import feedback_pipeline
+from app.services.metrics import metrics
+from app.services.rag_prefetch import rag_prefetcher
+from app.services.recording import recorder
+from app.services.skill_contracts import skill_contracts
+from app.services.telemetry_export import telemetry_exporter
+from app.services.tenants import tenant_quotas
+from app.services.tool_responses import tool_response_budget
+
+router = APIRouter(prefix="/metrics", tags=["Metrics"])
+
+
+@router.get("/routes", summary="Model routing metrics")
+async def get_route_metrics() -> ORJSONResponse:
+    """
+    Get latency and quality metrics per agent and model route.
+
+    Returns:
+        ORJSONResponse: Rolling p50/p95 latency and counters per `agent:route`
+    """
+    return ORJSONResponse(
+        content={
+            "routing_enabled": settings.MODEL_ROUTING_ENABLED,
+            "routes": metrics.snapshot("model_routes"),
+        },
+        status_code=200,
+    )
+
+
+@router.get("/agents", summary="Agent latency metrics")
+async def get_agent_metrics() -> ORJSONResponse:
+    """
+    Get the end-to-end invocation latency per agent.
+
+    Returns:
+        ORJSONResponse: Rolling p50/p95 latency and error count per agent
+    """
+    return ORJSONResponse(content={"agents": metrics.snapshot("agents")}, status_code=200)
+
+
+@router.get("/concurrency", summary="Adaptive concurrency limit")
+async def get_concurrency_metrics() -> ORJSONResponse:
+    """
+    Get the state of the adaptive concurrency limit on agent runs.
+
+    Returns:
+        ORJSONResponse: Current limit, runs in flight, accepted/rejected counts
+        and the latency averages driving the limit
+    """
+    return ORJSONResponse(
+        content={"enabled": settings.LOAD_SHEDDING_ENABLED, **agent_run_limiter.stats()},
+        status_code=200,
+    )
+
+
+@router.get("/clients", summary="Shared client pool metrics")
+async def get_client_metrics() -> ORJSONResponse:
+    """
+    Get the utilization of the shared network clients.
+
+    Returns:
+        ORJSONResponse: Calls in flight and connection pool usage per client
+    """
+    return ORJSONResponse(content={"clients": clients.stats()}, status_code=200)
+
+
+@router.get("/feedback", summary="Feedback pipeline metrics")
+async def get_feedback_metrics() -> ORJSONResponse:
+    """
+    Get the state of the feedback buffer and its sink.
+
+    Returns:
+        ORJSONResponse: Buffered records and accepted/written/dropped counters
+    """
+    return ORJSONResponse(
+        content={"enabled": settings.FEEDBACK_ENABLED, **feedback_pipeline.stats()},
+        status_code=200,
+    )
+
+
+@router.get("/telemetry", summary="Telemetry export metrics")
+async def get_telemetry_metrics() -> ORJSONResponse:
+    """
+    Get the state of the batched span exporter.
+
+    Returns:
+        ORJSONResponse: Queued spans, export and drop counters and bytes
+        before/after compression
+    """
+    return ORJSONResponse(
+        content={"enabled": settings.TELEMETRY_EXPORT_ENABLED, **telemetry_exporter.stats()},
+        status_code=200,
+    )
+
+
+@router.get("/tenants", summary="Tenant quota metrics")
+async def get_tenant_metrics() -> ORJSONResponse:
+    """
+    Get the quota usage of every tenant seen since startup.
+
+    Returns:
+        ORJSONResponse: Runs in flight, tokens used over the last minute and
+        accepted/rejected counts per tenant
+    """
+    return ORJSONResponse(
+        content={"enabled": settings.MULTI_TENANCY_ENABLED, "tenants": tenant_quotas.stats()},
+        status_code=200,
+    )
+
+
+@router.get("/delegation", summary="A2A delegation metrics")
+async def get_delegation_metrics() -> ORJSONResponse:
+    """
+    Get the delegation targets, call counters and agent card cache usage.
+
+    Returns:
+        ORJSONResponse: Local and remote agents, in-process and A2A calls,
+        failed calls, card cache hits and fetches
+    """
+    return ORJSONResponse(
+        content={"enabled": settings.A2A_DELEGATION_ENABLED, **a2a_delegator.stats()},
+        status_code=200,
+    )
+
+
+@router.get("/recording", summary="Model and RAG call recording metrics")
+async def get_recording_metrics() -> ORJSONResponse:
+    """
+    Get the record/replay mode and call counters.
+
+    Returns:
+        ORJSONResponse: Mode, recording file, recorded and replayed calls,
+        and calls missing from the recording
+    """
+    return ORJSONResponse(content=recorder.stats(), status_code=200)
+
+
+@router.get("/tool-responses", summary="Tool response budget metrics")
+async def get_tool_response_metrics() -> ORJSONResponse:
+    """
+    Get the tool response budget and truncation counters.
+
+    Returns:
+        ORJSONResponse: Budget, store, truncated responses and omitted
+        characters, pending and failed uploads, fetches and unknown refs
+    """
+    return ORJSONResponse(content=tool_response_budget.stats(), status_code=200)
+
+
+@router.get("/rag-prefetch", summary="Speculative RAG prefetch metrics")
+async def get_rag_prefetch_metrics() -> ORJSONResponse:
+    """
+    Get the speculative RAG prefetch counters.
+
+    Returns:
+        ORJSONResponse: Started and pending prefetches, tool calls served
+        (hits) or not (misses), unused (wasted) and failed prefetches, and
+        retrieval time saved
+    """
+    return ORJSONResponse(content=rag_prefetcher.stats(), status_code=200)
+
+
+@router.get("/skill-validation", summary="Skill schema validation metrics")
+async def get_skill_validation_metrics() -> ORJSONResponse:
+    """
+    Get the skill schema validation counters.
+
+    Returns:
+        ORJSONResponse: Per agent, the input and output validations, their
+        failures and their duration percentiles (µs)
+    """
+    return ORJSONResponse(content=skill_contracts.stats(), status_code=200)
@@ -0,0 +1,95 @@
+"""
+Production server launcher with multi-worker support.
+
+Runs the FastAPI app with one uvicorn worker process per available CPU (or
+`WEB_CONCURRENCY`). Worker processes are spawned rather than forked: gRPC
+channels (Vertex AI, RAG, Secret Manager) are not fork-safe, so nothing
+holding a connection is preloaded. What is safe to share is prepared once in
+the launcher before the workers start:
+
+- agent cards are generated once, instead of every worker rewriting the
+  same `agent.json` files concurrently
+- the response and context caches use the shared SQLite store
+  (`CACHE_BACKEND=sqlite`) so that workers share hits and cache handles
+
+Usage:
+    uv run python -m app.server
+"""
+
+import logging
+import os
+from pathlib import Path
+
+import uvicorn
+
+from app.config.settings import settings
+from app.utils.agent_card_generator import generate_all_agent_cards
+from app.utils.logger import config_logger
+
+logger = logging.getLogger(__name__)
+
+
+def get_available_cpus() -> int:
+    """
+    Count the CPUs available to this process.
+
+    Honors the cgroup CPU quota (Cloud Run / Docker `--cpus`) and the CPU
+    affinity mask before falling back to the host CPU count.
+    """
+    cpus = len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else os.cpu_count() or 1
+
+    quota_files = [
+        (Path("/sys/fs/cgroup/cpu.max"), None),
+        (Path("/sys/fs/cgroup/cpu/cpu.cfs_quota_us"), Path("/sys/fs/cgroup/cpu/cpu.cfs_period_us")),
+    ]
+    for quota_file, period_file in quota_files:
+        try:
+            if period_file is None:
+                quota, period = quota_file.read_text().split()[:2]
+            else:
+                quota, period = quota_file.read_text().strip(), period_file.read_text().strip()
+        except (OSError, ValueError):
+            continue
+        if quota not in ("max", "-1") and int(period) > 0:
+            cpus = min(cpus, max(1, int(int(quota) / int(period))))
+        break
+
+    return max(1, cpus)
+
+
+def get_worker_count() -> int:
+    """Return the number of worker processes to run."""
+    return settings.WEB_CONCURRENCY or get_available_cpus()
+
+
+def main() -> None:
+    """Prepare shared state and start the uvicorn workers."""
+    config_logger()
+    workers = get_worker_count()
+
+    if workers > 1 and "CACHE_BACKEND" not in os.environ:
+        os.environ["CACHE_BACKEND"] = "sqlite"
+
+    generate_all_agent_cards()
+    # Spawned workers read the environment, the in-process worker (workers=1)
+    # reads the already loaded settings.
+    os.environ["SKIP_AGENT_CARD_GENERATION"] = "true"
+    settings.SKIP_AGENT_CARD_GENERATION = True
+
+    logger.info(
+        f"Starting {workers} worker(s) on {settings.HOST}:{settings.PORT} "
+        f"(cache backend: {os.environ.get('CACHE_BACKEND', settings.CACHE_BACKEND)})"
+    )
+    uvicorn.run(
+        "app.main:app",
+        host=settings.HOST,
+        port=settings.PORT,
+        workers=workers,
+        log_config=None,
+        proxy_headers=True,
+        forwarded_allow_ips="*",
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,293 @@
+"""
+Delegation of a request from one agent to another, over A2A or in-process.
+
+Targets are the agents of this application (discovered from `AGENT_DIR`,
+like the generated agent cards) and the remote A2A agents of
+`A2A_REMOTE_AGENTS` (name → agent URL, its card being served under
+`/.well-known/agent-card.json`).
+
+- Local agents are run in-process, by a runner kept per agent, on a new
+  in-memory session per call: no HTTP round trip, no JSON-RPC encoding, and
+  the request context (tenant, headers) is inherited. Each run is admitted
+  like an HTTP agent run, by the load shedding limiter and the tenant's
+  quotas, and fails when they are exhausted.
+- Remote agents are called with the A2A client on the shared HTTP pool.
+  Their cards are cached for `A2A_CARD_CACHE_TTL_SECONDS`, concurrent
+  lookups of the same card share one fetch, and the client built from a
+  card is reused until the card is refreshed.
+
+Nested delegations are limited to `A2A_DELEGATION_MAX_DEPTH` levels.
+"""
+
+import asyncio
+import logging
+import time
+import uuid
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any
+
+from a2a.client import A2ACardResolver, Client, ClientConfig, ClientFactory
+from a2a.client.helpers import create_text_message_object
+from a2a.types import AgentCard, Message, Part, Task, TextPart
+from google.adk.runners import InMemoryRunner, Runner
+from google.adk.utils.context_utils import Aclosing
+from google.genai import types
+
+from app.config.settings import settings
+from app.services.agent_discovery import agent_catalog
+from app.services.client_registry import clients
+from app.services.concurrency_limiter import agent_run_limiter
+from app.services.connections import HTTP_POOL, get_http_client
+from app.services.tenants import get_current_tenant, tenant_quotas
+
+logger = logging.getLogger(__name__)
+
+DELEGATION_USER_ID = "a2a_delegation"
+
+_delegation_depth: ContextVar[int] = ContextVar("a2a_delegation_depth", default=0)
+
+
+class DelegationError(Exception):
+    """Raised when a delegated request cannot be served."""
+
+
+@dataclass
+class CachedCard:
+    """Agent card of a remote agent and the client built from it."""
+
+    card: AgentCard
+    client: Client
+    expire_at: float
+
+
+class AgentCardCache:
+    """Agent cards and A2A clients of remote agents, fetched on first use."""
+
+    def __init__(self, ttl_seconds: float):
+        self.ttl_seconds = ttl_seconds
+        self._cards: dict[str, CachedCard] = {}
+        self._fetches: dict[str, asyncio.Future[CachedCard]] = {}
+        self.hits = 0
+        self.fetches = 0
+
+    def cached_card(self, url: str) -> AgentCard | None:
+        """Return the cached card of an agent URL, even expired, without fetching."""
+        cached = self._cards.get(url)
+        return cached.card if cached is not None else None
+
+    async def get(self, url: str) -> CachedCard:
+        """
+        Return the card and client of a remote agent, fetching the card if needed.
+
+        Args:
+            url: Agent URL (card served under its well-known path)
+
+        Raises:
+            A2AClientError: If the card cannot be fetched
+        """
+        cached = self._cards.get(url)
+        if cached is not None and cached.expire_at > time.monotonic():
+            self.hits += 1
+            return cached
+
+        # Concurrent callers wait on the fetch already in progress
+        fetch = self._fetches.get(url)
+        if fetch is None:
+            fetch = asyncio.ensure_future(self._fetch(url))
+            self._fetches[url] = fetch
+            fetch.add_done_callback(lambda _: self._fetches.pop(url, None))
+        return await asyncio.shield(fetch)
+
+    async def _fetch(self, url: str) -> CachedCard:
+        self.fetches += 1
+        with clients.track(HTTP_POOL):
+            card = await A2ACardResolver(get_http_client(), url).get_agent_card()
+        factory = ClientFactory(ClientConfig(streaming=False, httpx_client=get_http_client()))
+        cached = CachedCard(
+            card=card,
+            client=factory.create(card),
+            expire_at=time.monotonic() + self.ttl_seconds,
+        )
+        self._cards[url] = cached
+        logger.info(f"Fetched agent card of {card.name} from {url}")
+        return cached
+
+    def clear(self) -> None:
+        """Drop every cached card."""
+        self._cards.clear()
+
+
+class A2ADelegator:
+    """Sends requests to local agents in-process and to remote agents over A2A."""
+
+    def __init__(self, remote_agents: dict[str, str], card_cache: AgentCardCache):
+        self.remote_agents = remote_agents
+        self.card_cache = card_cache
+        self._runners: dict[str, Runner] = {}
+        self.local_calls = 0
+        self.remote_calls = 0
+        self.errors = 0
+
+    def local_agents(self) -> list[str]:
+        """Names of the agents of this application."""
+        return list(agent_catalog.entries())
+
+    def describe_agents(self) -> dict[str, str]:
+        """Return the description of every delegation target, without network calls."""
+        descriptions = {}
+        for name, entry in agent_catalog.entries().items():
+            skills = ", ".join(skill.name for skill in entry.skills)
+            descriptions[name] = f"{entry.description} Skills: {skills}" if skills else entry.description
+        for name, url in self.remote_agents.items():
+            if name not in descriptions:
+                card = self.card_cache.cached_card(url)
+                descriptions[name] = card.description if card is not None else f"Remote A2A agent at {url}"
+        return descriptions
+
+    async def delegate(self, agent_name: str, request: str) -> str:
+        """
+        Send a request to an agent and return its final text response.
+
+        Args:
+            agent_name: Name of a local agent or of an `A2A_REMOTE_AGENTS` entry
+            request: Self-contained request text for the agent
+
+        Returns:
+            The text of the agent's response
+
+        Raises:
+            DelegationError: Unknown agent, nesting too deep, timeout or failed call
+        """
+        depth = _delegation_depth.get()
+        if depth >= settings.A2A_DELEGATION_MAX_DEPTH:
+            raise DelegationError(f"Delegation depth limit reached ({settings.A2A_DELEGATION_MAX_DEPTH})")
+
+        local = agent_name in self.local_agents()
+        if not local and agent_name not in self.remote_agents:
+            raise DelegationError(f"Unknown agent '{agent_name}'")
+
+        token = _delegation_depth.set(depth + 1)
+        try:
+            call = self._call_local(agent_name, request) if local else self._call_remote(agent_name, request)
+            return await asyncio.wait_for(call, timeout=settings.A2A_DELEGATION_TIMEOUT_SECONDS)
+        except DelegationError:
+            self.errors += 1
+            raise
+        except TimeoutError as e:
+            self.errors += 1
+            raise DelegationError(
+                f"Agent '{agent_name}' did not answer within {settings.A2A_DELEGATION_TIMEOUT_SECONDS}s"
+            ) from e
+        except Exception as e:
+            self.errors += 1
+            raise DelegationError(f"Agent '{agent_name}' failed: {type(e).__name__}: {e}") from e
+        finally:
+            _delegation_depth.reset(token)
+
+    def _runner(self, agent_name: str) -> Runner:
+        if agent_name not in self._runners:
+            # Imported here: agent modules import the delegation tool
+            from app.components.agents.registry import get_agent
+
+            self._runners[agent_name] = InMemoryRunner(agent=get_agent(agent_name), app_name=agent_name)
+        return self._runners[agent_name]
+
+    @asynccontextmanager
+    async def _admitted(self) -> AsyncIterator[None]:
+        """Admit a local run against the limits applied to HTTP agent runs."""
+        tenant_id = None
+        if settings.MULTI_TENANCY_ENABLED:
+            tenant = get_current_tenant()
+            quota = tenant_quotas.acquire(tenant)
+            if quota is not None:
+                raise DelegationError(f"Tenant '{tenant.tenant_id}' {quota} quota exceeded")
+            tenant_id = tenant.tenant_id
+        try:
+            if not settings.LOAD_SHEDDING_ENABLED:
+                yield
+                return
+            if not await agent_run_limiter.acquire():
+                raise DelegationError("Service overloaded, retry later")
+            latency: float | None = None
+            started_at = time.perf_counter()
+            try:
+                yield
+                latency = time.perf_counter() - started_at
+            finally:
+                await agent_run_limiter.release(latency)
+        finally:
+            if tenant_id is not None:
+                tenant_quotas.release(tenant_id)
+
+    async def _call_local(self, agent_name: str, request: str) -> str:
+        async with self._admitted():
+            return await self._run_local(agent_name, request)
+
+    async def _run_local(self, agent_name: str, request: str) -> str:
+        self.local_calls += 1
+        runner = self._runner(agent_name)
+        session = await runner.session_service.create_session(app_name=agent_name, user_id=DELEGATION_USER_ID)
+        message = types.Content(role="user", parts=[types.Part(text=request)])
+        last_content = None
+        try:
+            async with Aclosing(
+                runner.run_async(user_id=DELEGATION_USER_ID, session_id=session.id, new_message=message)
+            ) as events:
+                async for event in events:
+                    if event.content and event.content.parts:
+                        last_content = event.content
+        finally:
+            await runner.session_service.delete_session(
+                app_name=agent_name, user_id=DELEGATION_USER_ID, session_id=session.id
+            )
+        if last_content is None or not last_content.parts:
+            return ""
+        return "\n".join(part.text for part in last_content.parts if part.text)
+
+    async def _call_remote(self, agent_name: str, request: str) -> str:
+        self.remote_calls += 1
+        cached = await self.card_cache.get(self.remote_agents[agent_name])
+        message = create_text_message_object(content=request)
+        message.context_id = uuid.uuid4().hex
+        response: Message | Task | None = None
+        with clients.track(HTTP_POOL):
+            async for event in cached.client.send_message(message):
+                response = event if isinstance(event, Message) else event[0]
+        return _response_text(response)
+
+    def stats(self) -> dict[str, Any]:
+        """Return the call counters and card cache usage."""
+        return {
+            "local_agents": self.local_agents(),
+            "remote_agents": sorted(self.remote_agents),
+            "local_calls": self.local_calls,
+            "remote_calls": self.remote_calls,
+            "errors": self.errors,
+            "card_cache_hits": self.card_cache.hits,
+            "card_fetches": self.card_cache.fetches,
+        }
+
+
+def _parts_text(parts: list[Part]) -> list[str]:
+    return [part.root.text for part in parts if isinstance(part.root, TextPart)]
+
+
+def _response_text(response: Message | Task | None) -> str:
+    """Text of an A2A response: message parts, else task artifacts, else task status."""
+    if response is None:
+        return ""
+    if isinstance(response, Message):
+        return "\n".join(_parts_text(response.parts))
+    texts = [text for artifact in response.artifacts or [] for text in _parts_text(artifact.parts)]
+    if not texts and response.status.message is not None:
+        texts = _parts_text(response.status.message.parts)
+    return "\n".join(texts)
+
+
+a2a_delegator = A2ADelegator(
+    remote_agents=settings.A2A_REMOTE_AGENTS,
+    card_cache=AgentCardCache(settings.A2A_CARD_CACHE_TTL_SECONDS),
+)
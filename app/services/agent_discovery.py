@@ -0,0 +1,257 @@
+"""
+Agent discovery from `AGENT_DIR`, indexed in a manifest file.
+
+An agent is a package of `AGENT_DIR` whose `agent.py` module defines
+`root_agent`. Its A2A skills are the `*_SKILLS` lists defined by the modules
+of `app/components/skills/<agent_name>/`, and its URL is resolved by
+`settings.get_agent_url`. Adding an agent therefore only means adding these
+two packages.
+
+Indexing an agent imports its skills modules and its agent module (for the
+description), which pulls in the model, RAG and callback modules. Index
+entries are saved to `AGENT_MANIFEST_PATH` with a hash of the agent's
+sources (agent package, skills package and shared constants). On later
+boots, entries whose hash still matches are reused without importing
+anything, so startup stays flat as agents are added; the agents themselves
+are imported on first use.
+"""
+
+import hashlib
+import importlib
+import logging
+import os
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+import orjson
+from a2a.types import AgentSkill
+
+from app.components.skills.schema_skill import SchemaSkill
+from app.config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_VERSION = 2
+APP_ROOT = Path(__file__).resolve().parents[1]
+SKILLS_DIR = APP_ROOT / "components" / "skills"
+SKILLS_PACKAGE = "app.components.skills"
+# Sources outside the agent packages that agent descriptions and instructions use
+SHARED_SOURCES = (APP_ROOT / "config" / "constants.py",)
+
+
+@dataclass
+class AgentEntry:
+    """Index entry of a discovered agent."""
+
+    name: str
+    module: str
+    description: str
+    skills: list[AgentSkill]
+    source_hash: str
+
+    @property
+    def url(self) -> str:
+        """A2A URL of the agent (resolved from the settings on every boot)."""
+        return settings.get_agent_url(self.name)
+
+    def to_manifest(self) -> dict[str, Any]:
+        return {
+            "name": self.name,
+            "module": self.module,
+            "description": self.description,
+            "skills": [skill.model_dump(mode="json", exclude_none=True) for skill in self.skills],
+            "source_hash": self.source_hash,
+        }
+
+    @classmethod
+    def from_manifest(cls, data: dict[str, Any]) -> "AgentEntry":
+        return cls(
+            name=data["name"],
+            module=data["module"],
+            description=data["description"],
+            skills=[SchemaSkill.model_validate(skill) for skill in data["skills"]],
+            source_hash=data["source_hash"],
+        )
+
+
+class AgentCatalog:
+    """Index of the agents of a directory, backed by a manifest file."""
+
+    def __init__(
+        self,
+        agents_dir: Path,
+        agents_package: str,
+        skills_dir: Path,
+        skills_package: str,
+        manifest_path: Path | None,
+    ):
+        self.agents_dir = agents_dir
+        self.agents_package = agents_package
+        self.skills_dir = skills_dir
+        self.skills_package = skills_package
+        self.manifest_path = manifest_path
+        self._entries: dict[str, AgentEntry] | None = None
+        self._manifest: dict[str, AgentEntry] | None = None
+        self._hashes: dict[str, str] = {}
+        self._skills: dict[str, list[AgentSkill]] = {}
+        self.manifest_hits = 0
+        self.indexed = 0
+
+    def discover(self) -> list[str]:
+        """List the agent packages of the directory (nothing is imported)."""
+        return sorted(
+            path.name
+            for path in self.agents_dir.iterdir()
+            if path.is_dir() and not path.name.startswith(("_", ".")) and (path / "agent.py").is_file()
+        )
+
+    def source_hash(self, agent_name: str) -> str:
+        """Hash the sources an agent's index entry is built from."""
+        if agent_name not in self._hashes:
+            files = [
+                *(self.agents_dir / agent_name).rglob("*.py"),
+                *(self.skills_dir / agent_name).rglob("*.py"),
+                *SHARED_SOURCES,
+            ]
+            digest = hashlib.sha256(f"v{MANIFEST_VERSION}".encode())
+            for path in sorted(files):
+                digest.update(path.name.encode())
+                digest.update(path.read_bytes())
+            self._hashes[agent_name] = digest.hexdigest()
+        return self._hashes[agent_name]
+
+    def entries(self) -> dict[str, AgentEntry]:
+        """Return the index, building it on first call."""
+        if self._entries is None:
+            self._entries = self._build()
+        return self._entries
+
+    def get(self, agent_name: str) -> AgentEntry:
+        """
+        Return the index entry of an agent.
+
+        Raises:
+            KeyError: If no agent package has this name
+        """
+        entries = self.entries()
+        if agent_name not in entries:
+            raise KeyError(f"Agent '{agent_name}' not found. Available agents: {', '.join(entries)}")
+        return entries[agent_name]
+
+    def skills(self, agent_name: str) -> list[AgentSkill]:
+        """
+        Return the skills of an agent without importing any agent module.
+
+        Agent modules look their skills up while being imported (static
+        instructions), including while the index itself is being built.
+
+        Raises:
+            ValueError: If no agent package has this name
+        """
+        if agent_name not in self._skills:
+            available = self.discover()
+            if agent_name not in available:
+                raise ValueError(f"Unknown agent '{agent_name}'. Available agents: {', '.join(available)}")
+            cached = self._read_manifest().get(agent_name)
+            if cached is not None and cached.source_hash == self.source_hash(agent_name):
+                self._skills[agent_name] = cached.skills
+            else:
+                self._skills[agent_name] = self._load_skills(agent_name)
+        return self._skills[agent_name]
+
+    def _build(self) -> dict[str, AgentEntry]:
+        started_at = time.perf_counter()
+        cached = self._read_manifest()
+        names = self.discover()
+        entries = {}
+        for name in names:
+            entry = cached.get(name)
+            if entry is not None and entry.source_hash == self.source_hash(name):
+                entries[name] = entry
+                self.manifest_hits += 1
+
+        stale = [name for name in names if name not in entries]
+        # All skills first: importing an agent module looks up the skills of
+        # every agent sharing its constants
+        for name in stale:
+            self.skills(name)
+        for name in stale:
+            entries[name] = AgentEntry(
+                name=name,
+                module=f"{self.agents_package}.{name}.agent",
+                description=self._load_description(name),
+                skills=self.skills(name),
+                source_hash=self.source_hash(name),
+            )
+            self.indexed += 1
+
+        if stale or set(cached) != set(names):
+            self._write_manifest(entries)
+        logger.info(
+            f"Discovered {len(entries)} agents in {(time.perf_counter() - started_at) * 1000:.0f} ms "
+            f"({self.manifest_hits} from manifest, {len(stale)} indexed)"
+        )
+        return {name: entries[name] for name in names}
+
+    def _load_skills(self, agent_name: str) -> list[AgentSkill]:
+        skills: list[AgentSkill] = []
+        for path in sorted((self.skills_dir / agent_name).glob("*.py")):
+            if path.stem == "__init__":
+                continue
+            module = importlib.import_module(f"{self.skills_package}.{agent_name}.{path.stem}")
+            for attribute, value in vars(module).items():
+                if attribute.endswith("_SKILLS") and isinstance(value, list):
+                    skills.extend(skill for skill in value if isinstance(skill, AgentSkill))
+        if not skills:
+            logger.warning(f"No skills found for {agent_name} in {self.skills_dir / agent_name}")
+        return skills
+
+    def _load_description(self, agent_name: str) -> str:
+        module = importlib.import_module(f"{self.agents_package}.{agent_name}.agent")
+        agent = getattr(module, "root_agent", None)
+        if agent is not None and agent.description:
+            return agent.description
+        if module.__doc__:
+            return module.__doc__.strip().splitlines()[0]
+        return f"{agent_name} agent"
+
+    def _read_manifest(self) -> dict[str, AgentEntry]:
+        if self._manifest is None:
+            self._manifest = {}
+            if self.manifest_path is not None and self.manifest_path.is_file():
+                try:
+                    data = orjson.loads(self.manifest_path.read_bytes())
+                    if data.get("version") == MANIFEST_VERSION:
+                        self._manifest = {
+                            entry["name"]: AgentEntry.from_manifest(entry) for entry in data["agents"]
+                        }
+                except Exception as e:
+                    logger.warning(f"Ignoring unreadable agent manifest {self.manifest_path}: {e}")
+        return self._manifest
+
+    def _write_manifest(self, entries: dict[str, AgentEntry]) -> None:
+        if self.manifest_path is None:
+            return
+        payload = {
+            "version": MANIFEST_VERSION,
+            "agents": [entries[name].to_manifest() for name in sorted(entries)],
+        }
+        try:
+            self.manifest_path.parent.mkdir(parents=True, exist_ok=True)
+            # Written aside then renamed: concurrent workers never read a partial file
+            temporary = self.manifest_path.with_name(f"{self.manifest_path.name}.{os.getpid()}.tmp")
+            temporary.write_bytes(orjson.dumps(payload, option=orjson.OPT_INDENT_2))
+            temporary.replace(self.manifest_path)
+        except OSError as e:
+            logger.warning(f"Could not write agent manifest {self.manifest_path}: {e}")
+
+
+agent_catalog = AgentCatalog(
+    agents_dir=Path(settings.AGENT_DIR),
+    agents_package=settings.AGENT_DIR.replace("/", "."),
+    skills_dir=SKILLS_DIR,
+    skills_package=SKILLS_PACKAGE,
+    manifest_path=Path(settings.AGENT_MANIFEST_PATH) if settings.AGENT_MANIFEST_PATH else None,
+)
@@ -0,0 +1,151 @@
+"""
+Registry of the long-lived network clients of the process.
+
+Every HTTP/gRPC client (GenAI, RAG, Secret Manager, Cloud Storage, plain
+httpx) is created once through the registry and shared by all agents and
+tools, so their connection pools stay warm across requests. The registry:
+
+- creates each client lazily, on first use, from its factory
+- counts in-flight and total calls made through `track`
+- reports connection pool utilization of the httpx pools it owns
+- closes every client it created on application shutdown
+
+This module only depends on the standard library and httpx so that it can be
+used while the settings are being loaded.
+"""
+
+import contextlib
+import inspect
+import logging
+import threading
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass
+from typing import Any, TypeVar
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+@dataclass
+class CallCounters:
+    """In-flight and total calls made through one client."""
+
+    in_flight: int = 0
+    peak_in_flight: int = 0
+    total: int = 0
+    errors: int = 0
+
+
+class ClientRegistry:
+    """Owns shared clients, reports their utilization and closes them."""
+
+    def __init__(self) -> None:
+        self._clients: dict[str, Any] = {}
+        self._pools: dict[str, tuple[httpx.AsyncHTTPTransport, httpx.Limits]] = {}
+        self._calls: dict[str, CallCounters] = {}
+        self._lock = threading.RLock()
+
+    def get(self, name: str, factory: Callable[[], T]) -> T:
+        """
+        Return the client registered under `name`, creating it on first use.
+
+        Args:
+            name: Registry key of the client
+            factory: Builds the client when it does not exist yet
+
+        Returns:
+            The shared client instance
+        """
+        client = self._clients.get(name)
+        if client is None:
+            with self._lock:
+                client = self._clients.get(name)
+                if client is None:
+                    client = factory()
+                    self._clients[name] = client
+                    logger.info(f"Created shared client '{name}' ({type(client).__name__})")
+        return client
+
+    def register_pool(self, name: str, transport: httpx.AsyncHTTPTransport, limits: httpx.Limits) -> None:
+        """Register an httpx transport whose connection pool is reported in `stats`."""
+        self._pools[name] = (transport, limits)
+
+    @contextlib.contextmanager
+    def track(self, name: str) -> Iterator[None]:
+        """Count a call made through the client `name`."""
+        counters = self._calls.setdefault(name, CallCounters())
+        counters.in_flight += 1
+        counters.total += 1
+        counters.peak_in_flight = max(counters.peak_in_flight, counters.in_flight)
+        try:
+            yield
+        except Exception:
+            counters.errors += 1
+            raise
+        finally:
+            counters.in_flight -= 1
+
+    def stats(self) -> dict[str, dict]:
+        """
+        Report the clients, their call counters and pool utilization.
+
+        Returns:
+            Mapping of client name to its type, call counters and, for httpx
+            pools, open/active/idle connections against the configured limits
+        """
+        report: dict[str, dict] = {
+            name: {"type": type(client).__name__} for name, client in self._clients.items()
+        }
+        for name, counters in self._calls.items():
+            report.setdefault(name, {})["calls"] = vars(counters).copy()
+        for name, (transport, limits) in self._pools.items():
+            # httpx exposes no public pool API: skip the stats if its internals change
+            pool = getattr(transport, "_pool", None)
+            connections = getattr(pool, "connections", None)
+            if connections is None:
+                continue
+            idle = sum(1 for connection in connections if connection.is_idle())
+            http2 = sum(1 for connection in connections if "HTTP/2" in connection.info())
+            report.setdefault(name, {})["pool"] = {
+                "open": len(connections),
+                "active": len(connections) - idle,
+                "idle": idle,
+                "http2": http2,
+                "max_connections": limits.max_connections,
+                "max_keepalive_connections": limits.max_keepalive_connections,
+            }
+        return report
+
+    async def aclose(self) -> None:
+        """Close every client created so far, most recent first."""
+        for name in reversed(list(self._clients)):
+            client = self._clients.pop(name)
+            try:
+                await _close(client)
+                logger.info(f"Closed shared client '{name}'")
+            except Exception as e:
+                logger.warning(f"Failed to close shared client '{name}': {e}")
+        self._pools.clear()
+
+
+async def _close(client: Any) -> None:
+    """Close a client with whichever close method its library provides."""
+    aio = getattr(client, "aio", None)
+    if aio is not None and hasattr(aio, "aclose"):
+        # GenAI client: closes its async transport (not a shared httpx client)
+        await aio.aclose()
+    elif hasattr(client, "aclose"):
+        await client.aclose()
+    elif hasattr(client, "transport") and hasattr(client.transport, "close"):
+        # GAPIC clients (Vertex AI RAG, Secret Manager)
+        client.transport.close()
+    elif hasattr(client, "close"):
+        result = client.close()
+        if inspect.isawaitable(result):
+            await result
+
+
+clients = ClientRegistry()
@@ -0,0 +1,185 @@
+"""
+In-memory session service storing events as serialized JSON.
+
+ADK's `InMemorySessionService` keeps every `Event` as a pydantic object
+graph and deep-copies the whole session on each `get_session`, i.e. once or
+twice per agent run. For long histories both the footprint and the copy
+grow with every turn.
+
+`CompactInMemorySessionService` stores each event as its JSON bytes (the
+format of ADK's SQLite session store) next to its timestamp:
+
+- appending an event serializes it once, nothing is copied afterwards
+- `get_session` decodes only the events it returns: with
+  `num_recent_events` or `after_timestamp`, older events are never parsed
+- `list_sessions` and `delete_session` never decode events
+- the decoded `Session` is assembled without re-validation, since the
+  events were validated when decoded and come from this process
+
+Every `get_session` returns fresh objects, so callers cannot mutate the
+stored history, as with ADK's deep copies. Enabled with
+`SESSION_SERVICE_URI=compact://` (single process, like `memory://`).
+"""
+
+import bisect
+import copy
+import logging
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Any
+
+from google.adk.cli.service_registry import get_service_registry
+from google.adk.errors.already_exists_error import AlreadyExistsError
+from google.adk.events import Event
+from google.adk.sessions import BaseSessionService, Session, State
+from google.adk.sessions.base_session_service import (
+    GetSessionConfig,
+    ListSessionsResponse,
+)
+
+logger = logging.getLogger(__name__)
+
+COMPACT_SESSION_SCHEME = "compact"
+
+
+def encode_event(event: Event) -> bytes:
+    """Serialize an event to compact JSON (None fields omitted)."""
+    return event.model_dump_json(exclude_none=True).encode()
+
+
+def decode_event(data: bytes) -> Event:
+    """Parse and validate an event serialized by `encode_event`."""
+    return Event.model_validate_json(data)
+
+
+@dataclass
+class StoredSession:
+    """A session with its events kept serialized."""
+
+    app_name: str
+    user_id: str
+    id: str
+    state: dict[str, Any] = field(default_factory=dict)
+    last_update_time: float = 0.0
+    events: list[bytes] = field(default_factory=list)
+    timestamps: list[float] = field(default_factory=list)
+
+    def event_range(self, config: GetSessionConfig | None) -> range:
+        """Indexes of the events selected by a `GetSessionConfig`."""
+        start = 0
+        if config and config.num_recent_events:
+            start = max(0, len(self.events) - config.num_recent_events)
+        if config and config.after_timestamp:
+            start = max(start, bisect.bisect_left(self.timestamps, config.after_timestamp))
+        return range(start, len(self.events))
+
+
+class CompactInMemorySessionService(BaseSessionService):
+    """In-memory session service with serialized, lazily decoded events."""
+
+    def __init__(self) -> None:
+        self.sessions: dict[str, dict[str, dict[str, StoredSession]]] = {}
+        self.user_state: dict[str, dict[str, dict[str, Any]]] = {}
+        self.app_state: dict[str, dict[str, Any]] = {}
+
+    def _find(self, app_name: str, user_id: str, session_id: str) -> StoredSession | None:
+        return self.sessions.get(app_name, {}).get(user_id, {}).get(session_id)
+
+    def _to_session(self, stored: StoredSession, events: list[Event]) -> Session:
+        state = copy.deepcopy(stored.state)
+        for key, value in self.app_state.get(stored.app_name, {}).items():
+            state[State.APP_PREFIX + key] = value
+        for key, value in self.user_state.get(stored.app_name, {}).get(stored.user_id, {}).items():
+            state[State.USER_PREFIX + key] = value
+        return Session.model_construct(
+            id=stored.id,
+            app_name=stored.app_name,
+            user_id=stored.user_id,
+            state=state,
+            events=events,
+            last_update_time=stored.last_update_time,
+        )
+
+    def _apply_state_delta(self, stored: StoredSession, state_delta: dict[str, Any]) -> None:
+        for key, value in state_delta.items():
+            if key.startswith(State.APP_PREFIX):
+                self.app_state.setdefault(stored.app_name, {})[key.removeprefix(State.APP_PREFIX)] = value
+            elif key.startswith(State.USER_PREFIX):
+                user_state = self.user_state.setdefault(stored.app_name, {}).setdefault(stored.user_id, {})
+                user_state[key.removeprefix(State.USER_PREFIX)] = value
+            elif not key.startswith(State.TEMP_PREFIX):
+                stored.state[key] = value
+
+    async def create_session(
+        self,
+        *,
+        app_name: str,
+        user_id: str,
+        state: dict[str, Any] | None = None,
+        session_id: str | None = None,
+    ) -> Session:
+        session_id = session_id.strip() if session_id and session_id.strip() else str(uuid.uuid4())
+        if self._find(app_name, user_id, session_id):
+            raise AlreadyExistsError(f"Session with id {session_id} already exists.")
+
+        stored = StoredSession(app_name=app_name, user_id=user_id, id=session_id, last_update_time=time.time())
+        self._apply_state_delta(stored, state or {})
+        self.sessions.setdefault(app_name, {}).setdefault(user_id, {})[session_id] = stored
+        return self._to_session(stored, [])
+
+    async def get_session(
+        self,
+        *,
+        app_name: str,
+        user_id: str,
+        session_id: str,
+        config: GetSessionConfig | None = None,
+    ) -> Session | None:
+        stored = self._find(app_name, user_id, session_id)
+        if stored is None:
+            return None
+        events = [decode_event(stored.events[index]) for index in stored.event_range(config)]
+        return self._to_session(stored, events)
+
+    async def list_sessions(self, *, app_name: str, user_id: str | None = None) -> ListSessionsResponse:
+        users = self.sessions.get(app_name, {})
+        if user_id is not None:
+            users = {user_id: users[user_id]} if user_id in users else {}
+        return ListSessionsResponse(
+            sessions=[
+                self._to_session(stored, [])
+                for user_sessions in users.values()
+                for stored in user_sessions.values()
+            ]
+        )
+
+    async def delete_session(self, *, app_name: str, user_id: str, session_id: str) -> None:
+        self.sessions.get(app_name, {}).get(user_id, {}).pop(session_id, None)
+
+    async def append_event(self, session: Session, event: Event) -> Event:
+        if event.partial:
+            return event
+
+        stored = self._find(session.app_name, session.user_id, session.id)
+        if stored is None:
+            logger.warning(f"Failed to append event to session {session.id}: session not found")
+            return event
+
+        # Update the caller's session object (state and events)
+        event = await super().append_event(session=session, event=event)
+        session.last_update_time = event.timestamp
+
+        stored.events.append(encode_event(event))
+        stored.timestamps.append(event.timestamp)
+        stored.last_update_time = event.timestamp
+        if event.actions and event.actions.state_delta:
+            self._apply_state_delta(stored, event.actions.state_delta)
+        return event
+
+
+def register_compact_session_service() -> None:
+    """Make `compact://` session URIs available to ADK's service factory."""
+    get_service_registry().register_session_service(
+        COMPACT_SESSION_SCHEME, lambda uri, **kwargs: CompactInMemorySessionService()
+    )
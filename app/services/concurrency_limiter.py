@@ -0,0 +1,157 @@
+"""
+Adaptive concurrency limit for agent runs.
+
+The limit on concurrent agent runs is adjusted from observed latencies, in
+the spirit of Netflix's Gradient2 algorithm:
+
+- a fast-moving average of run latency (short RTT) is compared with a
+  baseline (long RTT) that follows latency drops quickly but rises only
+  slowly, so a lasting overload does not become the new normal within a
+  few hundred runs
+- when latency rises above the baseline (times a tolerance), queuing is
+  building up downstream (Gemini, RAG) and the limit shrinks
+- when latency stays near the baseline and the limit is actually used, the
+  limit grows by a small headroom (square root of the limit)
+- the limit never grows while fewer than half of the slots are in use, so an
+  idle instance does not drift to an arbitrarily high limit
+
+Requests over the limit are rejected immediately, or after waiting up to
+`max_wait_seconds` for a slot, instead of queuing behind slow model calls
+until timeouts cascade.
+"""
+
+import asyncio
+import math
+from typing import Any
+
+from app.config.settings import settings
+
+
+class AdaptiveConcurrencyLimiter:
+    """Gradient-based adaptive concurrency limiter."""
+
+    SHORT_RTT_ALPHA = 0.3
+    LONG_RTT_ALPHA_DOWN = 0.1
+    LONG_RTT_ALPHA_UP = 0.002
+    SMOOTHING = 0.2
+
+    def __init__(
+        self,
+        initial_limit: int,
+        min_limit: int,
+        max_limit: int,
+        tolerance: float = 1.5,
+        max_wait_seconds: float = 0.0,
+    ):
+        self.limit = float(initial_limit)
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.tolerance = tolerance
+        self.max_wait_seconds = max_wait_seconds
+        self.in_flight = 0
+        self.waiting = 0
+        self.accepted = 0
+        self.rejected = 0
+        self.short_rtt: float | None = None
+        self.long_rtt: float | None = None
+        self._condition: asyncio.Condition | None = None
+
+    @property
+    def condition(self) -> asyncio.Condition:
+        """Condition notified when a slot is released (created on first use)."""
+        if self._condition is None:
+            self._condition = asyncio.Condition()
+        return self._condition
+
+    def has_capacity(self) -> bool:
+        """Whether a new run can start right now."""
+        return self.in_flight < int(self.limit)
+
+    async def acquire(self) -> bool:
+        """
+        Take a slot for a new run.
+
+        Returns:
+            True if the run may start, False if it must be rejected
+        """
+        if self.has_capacity():
+            self.in_flight += 1
+            self.accepted += 1
+            return True
+
+        if self.max_wait_seconds <= 0 or self.waiting >= int(self.limit):
+            self.rejected += 1
+            return False
+
+        self.waiting += 1
+        try:
+            async with self.condition:
+                await asyncio.wait_for(self.condition.wait_for(self.has_capacity), self.max_wait_seconds)
+                self.in_flight += 1
+                self.accepted += 1
+                return True
+        except asyncio.TimeoutError:
+            self.rejected += 1
+            return False
+        finally:
+            self.waiting -= 1
+
+    async def release(self, latency_seconds: float | None) -> None:
+        """
+        Free a slot and update the limit.
+
+        Args:
+            latency_seconds: Duration of a successful run, or None for a
+                failed run (failures do not move the limit)
+        """
+        in_flight = self.in_flight
+        self.in_flight -= 1
+        if latency_seconds is not None:
+            self._update(latency_seconds, in_flight)
+
+        if self.waiting:
+            async with self.condition:
+                self.condition.notify()
+
+    def _update(self, rtt: float, in_flight: int) -> None:
+        if self.short_rtt is None or self.long_rtt is None:
+            self.short_rtt = self.long_rtt = rtt
+            return
+
+        self.short_rtt += self.SHORT_RTT_ALPHA * (rtt - self.short_rtt)
+        alpha = self.LONG_RTT_ALPHA_DOWN if rtt < self.long_rtt else self.LONG_RTT_ALPHA_UP
+        self.long_rtt += alpha * (rtt - self.long_rtt)
+
+        # App-limited: the current limit is not being exercised
+        if in_flight < self.limit / 2:
+            return
+
+        gradient = max(0.5, min(1.0, self.tolerance * self.long_rtt / self.short_rtt))
+        target = self.limit * gradient + math.sqrt(self.limit)
+        limit = self.limit * (1 - self.SMOOTHING) + target * self.SMOOTHING
+        self.limit = max(self.min_limit, min(self.max_limit, limit))
+
+    def retry_after_seconds(self) -> int:
+        """Suggested client back-off: about one run duration."""
+        return max(1, min(60, math.ceil(self.short_rtt or 1)))
+
+    def stats(self) -> dict[str, Any]:
+        """Return the limiter state and counters."""
+        return {
+            "limit": int(self.limit),
+            "in_flight": self.in_flight,
+            "waiting": self.waiting,
+            "accepted": self.accepted,
+            "rejected": self.rejected,
+            "short_rtt_ms": round(self.short_rtt * 1000, 1) if self.short_rtt else None,
+            "long_rtt_ms": round(self.long_rtt * 1000, 1) if self.long_rtt else None,
+        }
+
+
+agent_run_limiter = AdaptiveConcurrencyLimiter(
+    initial_limit=settings.LOAD_SHEDDING_INITIAL_LIMIT,
+    min_limit=settings.LOAD_SHEDDING_MIN_LIMIT,
+    max_limit=settings.LOAD_SHEDDING_MAX_LIMIT,
+    tolerance=settings.LOAD_SHEDDING_TOLERANCE,
+    max_wait_seconds=settings.LOAD_SHEDDING_MAX_WAIT_SECONDS,
+)
@@ -0,0 +1,224 @@
+"""
+Process-wide pooled connections to the model, RAG and storage endpoints.
+
+ADK resolves a string `model=` to a brand new `Gemini` instance (and thus a
+new GenAI HTTP client) on every model call, and `rag.retrieval_query` builds
+a new gRPC client on every retrieval. Both therefore pay connection setup
+(DNS, TLS, auth) per request. The agents and tools instead share the clients
+below, owned by the client registry:
+
+- one httpx pool (keep-alive, HTTP/2 when `h2` is installed, tuned limits)
+  carrying every GenAI call: agent model calls and context cache management
+- gRPC channels with keep-alive pings for RAG retrieval and corpus metadata
+- Cloud Storage, BigQuery and Cloud Logging clients
+
+`MODEL_BASE_URL` and `RAG_API_ENDPOINT` point the clients at other endpoints,
+e.g. local stub servers; plaintext `http://` RAG endpoints are called without
+Google credentials. With `RECORDING_MODE`, the model and RAG calls are
+recorded or replayed (see `app.services.recording`).
+"""
+
+import importlib.util
+import logging
+from functools import cache, cached_property
+from typing import Any, TypeVar
+
+import google.cloud.logging as cloud_logging
+import google.cloud.storage as storage
+import httpx
+from google.adk.models.google_llm import Gemini
+from google.api_core.client_options import ClientOptions
+from google.auth.credentials import AnonymousCredentials
+from google.cloud import bigquery
+from google.cloud.aiplatform_v1 import (
+    VertexRagDataServiceClient,
+    VertexRagServiceClient,
+)
+from google.cloud.aiplatform_v1.services.vertex_rag_data_service.transports import (
+    VertexRagDataServiceGrpcTransport,
+)
+from google.cloud.aiplatform_v1.services.vertex_rag_service.transports import (
+    VertexRagServiceGrpcTransport,
+)
+from google.genai import Client, types
+
+from app.config.settings import settings
+from app.services.client_registry import clients
+from app.services.recording import (
+    recorded_client,
+    recording_transport,
+    replay_client_options,
+)
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T", VertexRagServiceClient, VertexRagDataServiceClient)
+
+HTTP_POOL = "http"
+GENAI_MODEL_CLIENT = "genai_model"
+GENAI_CLIENT = "genai"
+RAG_CLIENT = "rag"
+RAG_DATA_CLIENT = "rag_data"
+STORAGE_CLIENT = "storage"
+BIGQUERY_CLIENT = "bigquery"
+LOGGING_CLIENT = "cloud_logging"
+
+
+def _create_http_client() -> httpx.AsyncClient:
+    http2 = settings.HTTP2_ENABLED and importlib.util.find_spec("h2") is not None
+    if settings.HTTP2_ENABLED and not http2:
+        logger.info("HTTP/2 requested but the 'h2' package is not installed, using HTTP/1.1")
+
+    limits = httpx.Limits(
+        max_connections=settings.HTTP_MAX_CONNECTIONS,
+        max_keepalive_connections=settings.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRY_SECONDS,
+    )
+    transport = httpx.AsyncHTTPTransport(limits=limits, http2=http2, retries=1)
+    clients.register_pool(HTTP_POOL, transport, limits)
+    return httpx.AsyncClient(
+        transport=recording_transport(transport),
+        timeout=httpx.Timeout(settings.HTTP_TIMEOUT_SECONDS, connect=10.0),
+        follow_redirects=True,
+    )
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Return the pooled async HTTP client shared by every component."""
+    return clients.get(HTTP_POOL, _create_http_client)
+
+
+def _genai_http_options(
+    headers: dict[str, str] | None = None, retry_options: types.HttpRetryOptions | None = None
+) -> types.HttpOptions:
+    return types.HttpOptions(
+        headers=headers,
+        retry_options=retry_options,
+        base_url=settings.MODEL_BASE_URL or None,
+        httpx_async_client=get_http_client(),
+    )
+
+
+def get_genai_client() -> Client:
+    """Return the GenAI client used outside model calls (e.g. context caches)."""
+    return clients.get(
+        GENAI_CLIENT,
+        lambda: Client(
+            vertexai=settings.GOOGLE_GENAI_USE_VERTEXAI,
+            project=settings.GOOGLE_CLOUD_PROJECT,
+            location=settings.GOOGLE_CLOUD_LOCATION,
+            http_options=_genai_http_options(),
+            **replay_client_options(settings.GOOGLE_GENAI_USE_VERTEXAI),
+        ),
+    )
+
+
+class PooledGemini(Gemini):
+    """Gemini model whose GenAI client runs on the shared HTTP pool."""
+
+    @cached_property
+    def api_client(self) -> Client:
+        """
+        Provide the registry-owned GenAI client for model calls.
+
+        Models with the same `retry_options` share one client.
+        """
+        name = GENAI_MODEL_CLIENT
+        if self.retry_options is not None:
+            name = f"{GENAI_MODEL_CLIENT}:{self.retry_options.model_dump_json(exclude_none=True)}"
+        return clients.get(
+            name,
+            lambda: Client(
+                http_options=_genai_http_options(self._tracking_headers(), self.retry_options),
+                **replay_client_options(),
+            ),
+        )
+
+
+def get_llm(model: str | None = None) -> PooledGemini:
+    """
+    Return the model instance shared by every agent of the process.
+
+    The request model name (`llm_request.model`) is what is sent to the API,
+    so the same instance also serves the routed `MODEL_FAST`/`MODEL_HEAVY`.
+
+    Args:
+        model: Model name, for tenants overriding `MODEL` (default: `MODEL`)
+    """
+    return _get_llm(model or settings.MODEL)
+
+
+@cache
+def _get_llm(model: str) -> PooledGemini:
+    return PooledGemini(model=model)
+
+
+def get_rag_endpoint() -> str:
+    """Return the Vertex AI RAG API endpoint."""
+    return settings.RAG_API_ENDPOINT or f"{settings.GOOGLE_CLOUD_LOCATION}-aiplatform.googleapis.com"
+
+
+def _create_rag_client(
+    client_class: type[T],
+    grpc_transport_class: type[Any],
+) -> T:
+    endpoint = get_rag_endpoint()
+    credentials = AnonymousCredentials() if endpoint.startswith("http://") else None
+    logger.info(f"Creating {client_class.__name__} for {endpoint} ({settings.RAG_API_TRANSPORT})")
+
+    if settings.RAG_API_TRANSPORT == "rest":
+        return client_class(
+            credentials=credentials,
+            transport="rest",
+            client_options=ClientOptions(api_endpoint=endpoint),
+        )
+
+    channel = grpc_transport_class.create_channel(
+        endpoint,
+        credentials=credentials,
+        options=[
+            ("grpc.max_send_message_length", -1),
+            ("grpc.max_receive_message_length", -1),
+            ("grpc.keepalive_time_ms", settings.GRPC_KEEPALIVE_TIME_MS),
+            ("grpc.keepalive_timeout_ms", 10_000),
+            ("grpc.keepalive_permit_without_calls", 1),
+            ("grpc.http2.max_pings_without_data", 0),
+        ],
+    )
+    return client_class(transport=grpc_transport_class(host=endpoint, channel=channel))
+
+
+def get_rag_client() -> VertexRagServiceClient:
+    """Return the RAG retrieval client shared by every request of the process."""
+    return clients.get(
+        RAG_CLIENT,
+        lambda: recorded_client(
+            RAG_CLIENT, lambda: _create_rag_client(VertexRagServiceClient, VertexRagServiceGrpcTransport)
+        ),
+    )
+
+
+def get_rag_data_client() -> VertexRagDataServiceClient:
+    """Return the RAG corpus management client (corpus metadata, health probes)."""
+    return clients.get(
+        RAG_DATA_CLIENT,
+        lambda: recorded_client(
+            RAG_DATA_CLIENT,
+            lambda: _create_rag_client(VertexRagDataServiceClient, VertexRagDataServiceGrpcTransport),
+        ),
+    )
+
+
+def get_storage_client(project: str) -> storage.Client:
+    """Return the Cloud Storage client shared for `project`."""
+    return clients.get(f"{STORAGE_CLIENT}:{project}", lambda: storage.Client(project=project))
+
+
+def get_bigquery_client(project: str) -> bigquery.Client:
+    """Return the BigQuery client shared for `project`."""
+    return clients.get(f"{BIGQUERY_CLIENT}:{project}", lambda: bigquery.Client(project=project))
+
+
+def get_logging_client(project: str) -> cloud_logging.Client:
+    """Return the Cloud Logging client shared for `project`."""
+    return clients.get(f"{LOGGING_CLIENT}:{project}", lambda: cloud_logging.Client(project=project))
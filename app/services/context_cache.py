@@ -0,0 +1,259 @@
+"""
+Explicit Vertex AI context caching for the static agent instructions.
+
+The rendered instruction templates (plus the skill metadata appended to them)
+never change during the life of the process, yet they are sent as the system
+instruction on every model call. This module keeps one explicit context cache
+per (model, static prefix) pair, shared by every session of the process:
+
+- caches are created lazily on the first call for a given model
+- their TTL is extended while they are in use
+- they are re-created transparently once expired or deleted
+- failed creations (e.g. prefix below the model's minimum token count) are
+  not retried before `CONTEXT_CACHE_RETRY_AFTER_SECONDS`
+- with `CACHE_BACKEND=sqlite`, handles are published in the shared store so
+  the worker processes of an instance reuse the same caches
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import time
+from dataclasses import asdict, dataclass
+
+from google.genai import Client, types
+
+from app.config.settings import settings
+from app.services.connections import get_genai_client
+from app.services.shared_store import SharedStore, get_shared_store
+
+logger = logging.getLogger(__name__)
+
+# Bound of the memoized prefix fingerprints (one per agent, tenant and model)
+MAX_MEMOIZED_FINGERPRINTS = 1024
+
+
+@dataclass
+class CacheHandle:
+    """A live context cache and its expiry (epoch seconds)."""
+
+    name: str
+    model: str
+    expire_at: float
+
+
+class StaticContextCache:
+    """Process-wide registry of context caches keyed by model and static prefix."""
+
+    NAMESPACE = "context_cache"
+
+    def __init__(
+        self,
+        ttl_seconds: int,
+        refresh_margin_seconds: int,
+        min_chars: int,
+        retry_after_seconds: int,
+        store: SharedStore | None = None,
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.refresh_margin_seconds = refresh_margin_seconds
+        self.min_chars = min_chars
+        self.retry_after_seconds = retry_after_seconds
+        self.store = store
+        self._handles: dict[str, CacheHandle] = {}
+        self._failures: dict[str, float] = {}
+        self._locks: dict[str, asyncio.Lock] = {}
+        self._fingerprints: dict[tuple, str] = {}
+
+    @property
+    def client(self) -> Client:
+        """The shared GenAI client used for cache management."""
+        return get_genai_client()
+
+    @staticmethod
+    def fingerprint(
+        model: str,
+        system_instruction: types.ContentUnion | None,
+        tools: list[types.Tool] | None,
+    ) -> str:
+        """Hash everything that ends up in the cached prefix."""
+        payload = {
+            "model": model,
+            "system_instruction": _dump(system_instruction),
+            "tools": [_dump(tool) for tool in tools or []],
+        }
+        encoded = json.dumps(payload, sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+    def memoized_fingerprint(
+        self,
+        display_name: str,
+        model: str,
+        system_instruction: types.ContentUnion | None,
+        tools: list[types.Tool] | None,
+    ) -> str:
+        """
+        Return the prefix fingerprint, computed once per agent and prefix.
+
+        The static prefix of an agent is the same on every model call, but
+        hashing it (JSON dump and SHA-256) costs several times a lookup. The memo is keyed
+        on the instruction text and a cheap signature of the tools: function
+        tools by declaration names (their declarations are fixed in code),
+        other tools (e.g. the RAG retrieval of a tenant corpus) by value.
+        """
+        instruction_key = system_instruction if isinstance(system_instruction, str) else repr(system_instruction)
+        tools_key = tuple(
+            (
+                tuple(declaration.name for declaration in tool.function_declarations or ()),
+                tuple(
+                    getattr(tool, field).model_dump_json(exclude_none=True)
+                    for field in type(tool).model_fields
+                    if field != "function_declarations" and getattr(tool, field) is not None
+                ),
+            )
+            for tool in tools or []
+        )
+        memo_key = (display_name, model, instruction_key, tools_key)
+        fingerprint = self._fingerprints.get(memo_key)
+        if fingerprint is None:
+            if len(self._fingerprints) >= MAX_MEMOIZED_FINGERPRINTS:
+                self._fingerprints.clear()
+            fingerprint = self._fingerprints[memo_key] = self.fingerprint(model, system_instruction, tools)
+        return fingerprint
+
+    async def get_cache_name(
+        self,
+        model: str,
+        system_instruction: types.ContentUnion | None,
+        tools: list[types.Tool] | None,
+        display_name: str,
+    ) -> str | None:
+        """
+        Return the name of a live cache for this prefix, creating it if needed.
+
+        Returns:
+            The cached content resource name, or None when caching is not
+            possible for this prefix (the request is then sent uncached).
+        """
+        if len(json.dumps(_dump(system_instruction), ensure_ascii=False)) < self.min_chars:
+            return None
+
+        key = self.memoized_fingerprint(display_name, model, system_instruction, tools)
+        failed_at = self._failures.get(key)
+        if failed_at and time.time() - failed_at < self.retry_after_seconds:
+            return None
+
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            handle = self._handles.get(key) or await self._load_shared(key)
+            now = time.time()
+
+            if handle and now < handle.expire_at - self.refresh_margin_seconds:
+                return handle.name
+
+            if handle and now < handle.expire_at:
+                if await self._refresh(key, handle):
+                    return handle.name
+
+            handle = await self._create(key, model, system_instruction, tools, display_name)
+            return handle.name if handle else None
+
+    async def _refresh(self, key: str, handle: CacheHandle) -> bool:
+        """Extend the TTL of a cache that is about to expire."""
+        try:
+            await self.client.aio.caches.update(
+                name=handle.name,
+                config=types.UpdateCachedContentConfig(ttl=f"{self.ttl_seconds}s"),
+            )
+        except Exception as e:
+            logger.warning(f"Failed to refresh context cache {handle.name}: {e}")
+            return False
+
+        handle.expire_at = time.time() + self.ttl_seconds
+        await self._save_shared(key, handle)
+        logger.debug(f"Refreshed context cache {handle.name}")
+        return True
+
+    async def _load_shared(self, key: str) -> CacheHandle | None:
+        """Adopt a handle published by another worker process."""
+        if self.store is None:
+            return None
+        value = await asyncio.to_thread(self.store.get, self.NAMESPACE, key)
+        if value is None:
+            return None
+        handle = CacheHandle(**json.loads(value))
+        self._handles[key] = handle
+        return handle
+
+    async def _save_shared(self, key: str, handle: CacheHandle) -> None:
+        """Publish a handle for the other worker processes."""
+        if self.store is None:
+            return
+        ttl = max(handle.expire_at - time.time(), 1)
+        await asyncio.to_thread(
+            self.store.set, self.NAMESPACE, key, json.dumps(asdict(handle)), ttl_seconds=ttl
+        )
+
+    async def _create(
+        self,
+        key: str,
+        model: str,
+        system_instruction: types.ContentUnion | None,
+        tools: list[types.Tool] | None,
+        display_name: str,
+    ) -> CacheHandle | None:
+        """Create a new cache for the prefix and register its handle."""
+        self._handles.pop(key, None)
+        try:
+            cached_content = await self.client.aio.caches.create(
+                model=model,
+                config=types.CreateCachedContentConfig(
+                    display_name=display_name,
+                    system_instruction=system_instruction,
+                    tools=tools,
+                    ttl=f"{self.ttl_seconds}s",
+                ),
+            )
+        except Exception as e:
+            self._failures[key] = time.time()
+            logger.warning(
+                f"Context cache creation failed for '{display_name}' ({model}), "
+                f"falling back to uncached requests: {e}"
+            )
+            return None
+        if not cached_content.name:
+            self._failures[key] = time.time()
+            logger.warning(f"Context cache creation for '{display_name}' ({model}) returned no cache name")
+            return None
+
+        self._failures.pop(key, None)
+        handle = CacheHandle(
+            name=cached_content.name,
+            model=model,
+            expire_at=time.time() + self.ttl_seconds,
+        )
+        self._handles[key] = handle
+        await self._save_shared(key, handle)
+        logger.info(f"Created context cache {handle.name} for '{display_name}' ({model})")
+        return handle
+
+    def stats(self) -> dict[str, int]:
+        """Return the number of live and failed cache handles."""
+        return {"live": len(self._handles), "failed": len(self._failures)}
+
+
+def _dump(value: object) -> object:
+    """Convert genai pydantic values to plain JSON-serializable data."""
+    if hasattr(value, "model_dump"):
+        return value.model_dump(mode="json", exclude_none=True)
+    return value
+
+
+static_context_cache = StaticContextCache(
+    ttl_seconds=settings.CONTEXT_CACHE_TTL_SECONDS,
+    refresh_margin_seconds=settings.CONTEXT_CACHE_REFRESH_MARGIN_SECONDS,
+    min_chars=settings.CONTEXT_CACHE_MIN_CHARS,
+    retry_after_seconds=settings.CONTEXT_CACHE_RETRY_AFTER_SECONDS,
+    store=get_shared_store() if settings.CACHE_BACKEND == "sqlite" else None,
+)
@@ -0,0 +1,260 @@
+"""
+Feedback ingestion: in-memory buffer flushed in batches to a sink.
+
+`POST /feedback` only appends the record to a bounded in-memory buffer, so a
+burst of feedback never waits on BigQuery or Cloud Logging. A background
+task flushes the buffer when `FEEDBACK_BATCH_SIZE` records are waiting or
+every `FEEDBACK_FLUSH_INTERVAL_SECONDS`, writing each batch in a worker
+thread:
+
+- `bigquery`: streaming insert into `FEEDBACK_BIGQUERY_TABLE`; each record's
+  `feedback_id` is sent as row id, so retried batches are de-duplicated
+- `cloud_logging`: one structured entry per record in `FEEDBACK_LOG_NAME`,
+  sent as a single batch (route it to BigQuery with a log sink)
+- `jsonl`: one JSON line per record appended to `FEEDBACK_JSONL_PATH`
+  (local development and tests)
+
+A failed batch goes back to the front of the buffer and is retried with
+exponential backoff, up to `FEEDBACK_MAX_ATTEMPTS`. The buffer never holds
+more than `FEEDBACK_BUFFER_MAX_RECORDS`: when full, the oldest records are
+dropped and counted. Remaining records are flushed on shutdown.
+"""
+
+import abc
+import asyncio
+import logging
+import time
+from collections import deque
+from pathlib import Path
+from typing import Any
+
+import orjson
+
+from app.config.settings import settings
+from app.services.connections import get_bigquery_client, get_logging_client
+
+logger = logging.getLogger(__name__)
+
+MAX_BACKOFF_SECONDS = 60.0
+
+
+class FeedbackSink(abc.ABC):
+    """Destination of feedback batches. `write` is blocking and runs in a thread."""
+
+    name: str
+
+    @abc.abstractmethod
+    def write(self, records: list[dict[str, Any]]) -> None:
+        """
+        Write a batch of records.
+
+        Raises:
+            Exception: If the batch was not written (it will be retried)
+        """
+
+
+class JsonlFeedbackSink(FeedbackSink):
+    """Appends records as JSON lines to a local file."""
+
+    name = "jsonl"
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+
+    def write(self, records: list[dict[str, Any]]) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        payload = b"".join(orjson.dumps(record) + b"\n" for record in records)
+        # One write per batch: appends from several workers do not interleave
+        with self.path.open("ab") as file:
+            file.write(payload)
+
+
+class BigQueryFeedbackSink(FeedbackSink):
+    """Streams records into a BigQuery table."""
+
+    name = "bigquery"
+
+    def __init__(self, project: str, table: str):
+        self.project = project
+        self.table = table if table.count(".") == 2 else f"{project}.{table}"
+
+    def write(self, records: list[dict[str, Any]]) -> None:
+        errors = get_bigquery_client(self.project).insert_rows_json(
+            self.table, records, row_ids=[record["feedback_id"] for record in records]
+        )
+        if errors:
+            raise RuntimeError(f"BigQuery rejected {len(errors)} rows: {errors[:3]}")
+
+
+class CloudLoggingFeedbackSink(FeedbackSink):
+    """Writes one structured Cloud Logging entry per record, in one request."""
+
+    name = "cloud_logging"
+
+    def __init__(self, project: str, log_name: str):
+        self.project = project
+        self.log_name = log_name
+
+    def write(self, records: list[dict[str, Any]]) -> None:
+        batch = get_logging_client(self.project).logger(self.log_name).batch()
+        for record in records:
+            batch.log_struct(record, severity="INFO")
+        batch.commit()
+
+
+def create_feedback_sink() -> FeedbackSink:
+    """Build the sink selected by `FEEDBACK_SINK`."""
+    if settings.FEEDBACK_SINK == "bigquery":
+        return BigQueryFeedbackSink(settings.GOOGLE_CLOUD_PROJECT, settings.FEEDBACK_BIGQUERY_TABLE)
+    if settings.FEEDBACK_SINK == "cloud_logging":
+        return CloudLoggingFeedbackSink(settings.GOOGLE_CLOUD_PROJECT, settings.FEEDBACK_LOG_NAME)
+    return JsonlFeedbackSink(settings.FEEDBACK_JSONL_PATH)
+
+
+class FeedbackPipeline:
+    """Bounded feedback buffer with a background batch flusher."""
+
+    def __init__(
+        self,
+        sink: FeedbackSink,
+        batch_size: int,
+        flush_interval_seconds: float,
+        max_buffered: int,
+        max_attempts: int,
+    ):
+        self.sink = sink
+        self.batch_size = batch_size
+        self.flush_interval_seconds = flush_interval_seconds
+        self.max_attempts = max_attempts
+        self.max_buffered = max_buffered
+        self._buffer: deque[dict[str, Any]] = deque(maxlen=max_buffered)
+        self._batch_ready = asyncio.Event()
+        self._stop_requested = asyncio.Event()
+        self._task: asyncio.Task | None = None
+        self._closing = False
+        self._attempts = 0
+        self.accepted = 0
+        self.written = 0
+        self.dropped = 0
+        self.failed_writes = 0
+        self.last_error: str | None = None
+        self.last_flush_time: float | None = None
+
+    def submit(self, record: dict[str, Any]) -> None:
+        """Buffer a record (never blocks; drops the oldest record when full)."""
+        if len(self._buffer) == self.max_buffered:
+            self.dropped += 1
+        self._buffer.append(record)
+        self.accepted += 1
+        if len(self._buffer) >= self.batch_size:
+            self._batch_ready.set()
+
+    def start(self) -> None:
+        """Start the flusher on the running event loop."""
+        if self._task is None or self._task.done():
+            self._closing = False
+            self._batch_ready = asyncio.Event()
+            self._stop_requested = asyncio.Event()
+            self._task = asyncio.create_task(self._run(), name="feedback-flusher")
+
+    async def stop(self, timeout: float = 10.0) -> None:
+        """Flush what is still buffered (within `timeout`), then stop the flusher."""
+        if self._task is None:
+            return
+        self._closing = True
+        self._batch_ready.set()
+        # Also ends a retry backoff: the batch is tried once more right away
+        self._stop_requested.set()
+        try:
+            await asyncio.wait_for(self._task, timeout)
+        except TimeoutError:
+            pass
+        self._task = None
+        if self._buffer:
+            logger.warning(f"{len(self._buffer)} feedback records lost on shutdown")
+
+    async def _run(self) -> None:
+        while True:
+            if not self._closing:
+                try:
+                    await asyncio.wait_for(self._batch_ready.wait(), self.flush_interval_seconds)
+                except TimeoutError:
+                    pass
+                self._batch_ready.clear()
+
+            # One batch per wake-up, more while full batches are waiting
+            # (everything when closing)
+            while self._buffer:
+                if not await self.flush():
+                    if self._closing:
+                        return
+                    await self._backoff()
+                    break
+                if len(self._buffer) < self.batch_size and not self._closing:
+                    break
+
+            if self._closing and not self._buffer:
+                return
+
+    async def _backoff(self) -> None:
+        """Wait before retrying a failed batch, or until `stop` is called."""
+        delay = min(MAX_BACKOFF_SECONDS, 2 ** (self._attempts - 1))
+        try:
+            await asyncio.wait_for(self._stop_requested.wait(), delay)
+        except TimeoutError:
+            pass
+
+    async def flush(self) -> bool:
+        """
+        Write one batch from the front of the buffer.
+
+        Returns:
+            False if the write failed and the batch was put back for a retry
+        """
+        batch = [self._buffer.popleft() for _ in range(min(self.batch_size, len(self._buffer)))]
+        if not batch:
+            return True
+        try:
+            await asyncio.to_thread(self.sink.write, batch)
+        except Exception as e:
+            self.failed_writes += 1
+            self._attempts += 1
+            self.last_error = f"{type(e).__name__}: {e}"
+            if self._attempts >= self.max_attempts:
+                logger.error(f"Dropping {len(batch)} feedback records after {self._attempts} attempts: {e}")
+                self.dropped += len(batch)
+                self._attempts = 0
+                return True
+            logger.warning(f"Feedback write to {self.sink.name} failed (attempt {self._attempts}): {e}")
+            # Back to the front; if the buffer filled up meanwhile, the oldest records are dropped
+            kept = batch[max(0, len(batch) - (self.max_buffered - len(self._buffer))) :]
+            self.dropped += len(batch) - len(kept)
+            self._buffer.extendleft(reversed(kept))
+            return False
+
+        self._attempts = 0
+        self.written += len(batch)
+        self.last_flush_time = time.time()
+        return True
+
+    def stats(self) -> dict[str, Any]:
+        """Return the buffer size and delivery counters."""
+        return {
+            "sink": self.sink.name,
+            "buffered": len(self._buffer),
+            "accepted": self.accepted,
+            "written": self.written,
+            "dropped": self.dropped,
+            "failed_writes": self.failed_writes,
+            "last_error": self.last_error,
+            "last_flush_time": self.last_flush_time,
+        }
+
+
+feedback_pipeline = FeedbackPipeline(
+    sink=create_feedback_sink(),
+    batch_size=settings.FEEDBACK_BATCH_SIZE,
+    flush_interval_seconds=settings.FEEDBACK_FLUSH_INTERVAL_SECONDS,
+    max_buffered=settings.FEEDBACK_BUFFER_MAX_RECORDS,
+    max_attempts=settings.FEEDBACK_MAX_ATTEMPTS,
+)
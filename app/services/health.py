@@ -0,0 +1,231 @@
+"""
+Deep health checks: dependency probes, resource pressure and latency SLOs.
+
+Each check runs with a timeout and its result is cached for
+`HEALTH_CACHE_TTL_SECONDS`, so frequent load balancer probes stay cheap and
+never pile up calls on the dependencies. Concurrent probes share the same
+in-flight check.
+
+A check reports one of:
+
+- ok: healthy
+- degraded: serving, but slower than expected (loop lag, memory pressure,
+  latency SLO breach)
+- failed: a dependency is unreachable
+
+The overall status is the worst of the checks.
+"""
+
+import asyncio
+import logging
+import os
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any
+
+from google.adk.cli.utils.service_factory import create_session_service_from_options
+from google.adk.sessions import BaseSessionService
+
+from app.config.settings import settings
+from app.services.connections import get_llm, get_rag_data_client
+from app.services.loop_monitor import loop_lag_monitor
+from app.services.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+STATUS_ORDER = {"ok": 0, "degraded": 1, "failed": 2}
+
+
+@dataclass
+class CheckResult:
+    """Outcome of one health check."""
+
+    status: str
+    duration_ms: float = 0.0
+    checked_at: float = field(default_factory=time.time)
+    details: dict[str, Any] = field(default_factory=dict)
+
+
+_session_service: BaseSessionService | None = None
+
+
+def get_probe_session_service() -> BaseSessionService:
+    """Return a session service on the same backend as the application's."""
+    global _session_service
+    if _session_service is None:
+        _session_service = create_session_service_from_options(
+            base_dir=settings.AGENT_DIR,
+            session_service_uri=settings.get_session_service_uri(),
+        )
+    return _session_service
+
+
+async def check_session_backend() -> CheckResult:
+    """List the sessions of a probe user on every agent's session store."""
+    from app.components.agents.registry import list_agent_names
+
+    session_service = get_probe_session_service()
+    for agent_name in list_agent_names():
+        await session_service.list_sessions(app_name=agent_name, user_id="__health__")
+    return CheckResult(status="ok", details={"uri": settings.get_session_service_uri() or "local"})
+
+
+async def check_rag_corpus() -> CheckResult:
+    """Fetch the RAG corpus metadata."""
+    corpus = await asyncio.to_thread(get_rag_data_client().get_rag_corpus, name=settings.RAG_CORPUS_ID)
+    return CheckResult(status="ok", details={"corpus": corpus.display_name or corpus.name})
+
+
+async def check_model_endpoint() -> CheckResult:
+    """Fetch the model metadata (no tokens are generated)."""
+    llm = get_llm()
+    await llm.api_client.aio.models.get(model=llm.model)
+    return CheckResult(status="ok", details={"model": llm.model})
+
+
+async def check_event_loop() -> CheckResult:
+    """Compare the recent event-loop lag with `HEALTH_LOOP_LAG_MAX_MS`."""
+    snapshot = loop_lag_monitor.snapshot(seconds=60)
+    p95 = snapshot["p95_ms"]
+    status = "degraded" if p95 is not None and p95 > settings.HEALTH_LOOP_LAG_MAX_MS else "ok"
+    return CheckResult(status=status, details={**snapshot, "max_allowed_ms": settings.HEALTH_LOOP_LAG_MAX_MS})
+
+
+async def check_memory() -> CheckResult:
+    """Compare the process memory with the container limit."""
+    rss = get_rss_bytes()
+    limit = get_memory_limit_bytes()
+    ratio = rss / limit if rss and limit else None
+    status = "degraded" if ratio is not None and ratio > settings.HEALTH_MEMORY_MAX_RATIO else "ok"
+    return CheckResult(
+        status=status,
+        details={
+            "rss_mb": round(rss / 2**20, 1) if rss else None,
+            "limit_mb": round(limit / 2**20, 1) if limit else None,
+            "ratio": round(ratio, 3) if ratio is not None else None,
+            "max_ratio": settings.HEALTH_MEMORY_MAX_RATIO,
+        },
+    )
+
+
+async def check_latency_slos() -> CheckResult:
+    """Compare the rolling p95 latency of each agent with its SLO."""
+    agents = {}
+    breached = False
+    for agent_name, snapshot in metrics.snapshot("agents").items():
+        slo_ms = settings.AGENT_LATENCY_SLO_P95_MS.get(agent_name, settings.DEFAULT_LATENCY_SLO_P95_MS)
+        p95_ms = snapshot["p95_ms"]
+        enough_samples = snapshot["window"] >= settings.HEALTH_SLO_MIN_SAMPLES
+        within = p95_ms is None or not enough_samples or p95_ms <= slo_ms
+        breached = breached or not within
+        agents[agent_name] = {
+            "p95_ms": p95_ms,
+            "slo_p95_ms": slo_ms,
+            "samples": snapshot["window"],
+            "within_slo": within,
+        }
+    return CheckResult(status="degraded" if breached else "ok", details={"agents": agents})
+
+
+HEALTH_CHECKS: dict[str, Callable[[], Awaitable[CheckResult]]] = {
+    "session_backend": check_session_backend,
+    "rag_corpus": check_rag_corpus,
+    "model_endpoint": check_model_endpoint,
+    "event_loop": check_event_loop,
+    "memory": check_memory,
+    "latency_slo": check_latency_slos,
+}
+
+
+class HealthChecker:
+    """Runs the health checks with timeouts and caches their results."""
+
+    def __init__(
+        self,
+        checks: dict[str, Callable[[], Awaitable[CheckResult]]],
+        ttl_seconds: float,
+        timeout_seconds: float,
+    ):
+        self.checks = checks
+        self.ttl_seconds = ttl_seconds
+        self.timeout_seconds = timeout_seconds
+        self._results: dict[str, CheckResult] = {}
+        self._pending: dict[str, asyncio.Task] = {}
+
+    async def run(self) -> dict[str, Any]:
+        """
+        Return the status of every check, re-running the expired ones.
+
+        Returns:
+            Overall status plus the result of each check
+        """
+        results = await asyncio.gather(*(self._get(name) for name in self.checks))
+        checks = dict(zip(self.checks, results, strict=True))
+        status = max((result.status for result in results), key=STATUS_ORDER.__getitem__, default="ok")
+        return {
+            "status": status,
+            "app": settings.APP_NAME,
+            "version": settings.APP_VERSION,
+            "checks": {name: asdict(result) for name, result in checks.items()},
+        }
+
+    async def _get(self, name: str) -> CheckResult:
+        cached = self._results.get(name)
+        if cached is not None and time.time() - cached.checked_at < self.ttl_seconds:
+            return cached
+
+        task = self._pending.get(name)
+        if task is None:
+            task = asyncio.create_task(self._check(name))
+            self._pending[name] = task
+            task.add_done_callback(lambda _: self._pending.pop(name, None))
+        return await asyncio.shield(task)
+
+    async def _check(self, name: str) -> CheckResult:
+        started_at = time.perf_counter()
+        try:
+            result = await asyncio.wait_for(self.checks[name](), timeout=self.timeout_seconds)
+        except asyncio.TimeoutError:
+            result = CheckResult(status="failed", details={"error": f"timed out after {self.timeout_seconds}s"})
+        except Exception as e:
+            result = CheckResult(status="failed", details={"error": f"{type(e).__name__}: {e}"})
+        result.duration_ms = round((time.perf_counter() - started_at) * 1000, 1)
+
+        if result.status != "ok":
+            logger.warning(f"Health check '{name}' {result.status}: {result.details}")
+        self._results[name] = result
+        return result
+
+
+def get_rss_bytes() -> int | None:
+    """Return the resident set size of the process."""
+    try:
+        pages = int(Path("/proc/self/statm").read_text().split()[1])
+    except (OSError, ValueError, IndexError):
+        return None
+    return pages * os.sysconf("SC_PAGE_SIZE")
+
+
+def get_memory_limit_bytes() -> int | None:
+    """Return the container memory limit (cgroup v2/v1), or the host memory."""
+    for path in ("/sys/fs/cgroup/memory.max", "/sys/fs/cgroup/memory/memory.limit_in_bytes"):
+        try:
+            value = Path(path).read_text().strip()
+        except OSError:
+            continue
+        # cgroup v1 reports "no limit" as a huge page-aligned number
+        if value != "max" and int(value) < 2**60:
+            return int(value)
+    try:
+        return os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES")
+    except (ValueError, OSError):
+        return None
+
+
+health_checker = HealthChecker(
+    HEALTH_CHECKS,
+    ttl_seconds=settings.HEALTH_CACHE_TTL_SECONDS,
+    timeout_seconds=settings.HEALTH_PROBE_TIMEOUT_SECONDS,
+)
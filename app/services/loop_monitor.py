@@ -0,0 +1,70 @@
+"""
+Event-loop lag monitor.
+
+A background task sleeps for a fixed interval and measures how late it wakes
+up. The delay is time during which the loop was busy running something else
+(blocking calls, CPU-heavy callbacks), i.e. latency added to every request
+served by the process at that moment.
+"""
+
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+
+class LoopLagMonitor:
+    """Samples event-loop lag and keeps a bounded history."""
+
+    def __init__(self, interval_seconds: float = 0.5, history_size: int = 600):
+        self.interval_seconds = interval_seconds
+        self._history: deque[tuple[float, float]] = deque(maxlen=history_size)
+        self._task: asyncio.Task | None = None
+
+    def start(self) -> None:
+        """Start sampling on the running event loop."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run(), name="loop-lag-monitor")
+
+    async def stop(self) -> None:
+        """Stop sampling."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            started_at = loop.time()
+            await asyncio.sleep(self.interval_seconds)
+            lag_ms = max(0.0, (loop.time() - started_at - self.interval_seconds) * 1000)
+            self._history.append((time.time(), lag_ms))
+
+    def history(self, seconds: float | None = None) -> list[tuple[float, float]]:
+        """Return the (timestamp, lag_ms) samples, optionally only the last `seconds`."""
+        if seconds is None:
+            return list(self._history)
+        since = time.time() - seconds
+        return [sample for sample in self._history if sample[0] >= since]
+
+    def snapshot(self, seconds: float = 60.0) -> dict[str, Any]:
+        """Summarize the lag over the last `seconds`."""
+        lags = sorted(lag for _, lag in self.history(seconds))
+        if not lags:
+            return {"samples": 0, "last_ms": None, "p95_ms": None, "max_ms": None}
+        return {
+            "samples": len(lags),
+            "last_ms": round(self._history[-1][1], 1),
+            "p95_ms": round(lags[min(len(lags) - 1, int(len(lags) * 0.95))], 1),
+            "max_ms": round(lags[-1], 1),
+        }
+
+
+loop_lag_monitor = LoopLagMonitor()
@@ -0,0 +1,247 @@
+"""
+Memory instrumentation: allocation tracking and per-session accounting.
+
+- `MemoryTracker` wraps `tracemalloc`: snapshots are taken on demand and
+  diffed against the first one (baseline) or the previous one, giving the
+  allocation sites (file:line, optionally with their call stack) that grew
+  in between. Tracing slows allocations down noticeably and stores a trace
+  per live block, so it is only started with `MEMORY_TRACKING_ENABLED` or
+  from the debug endpoint.
+- `SessionMemoryAccounting` records, after each agent invocation, the
+  approximate in-memory size of the session (state, events, tool responses
+  such as RAG passages) for the most recently active sessions, while
+  tracing is on.
+"""
+
+import gc
+import sys
+import threading
+import time
+import tracemalloc
+from collections import OrderedDict, deque
+from enum import Enum
+from types import BuiltinFunctionType, CodeType, FunctionType, ModuleType
+from typing import Any, Literal
+
+from google.adk.sessions import Session
+
+from app.config.settings import settings
+
+# Objects shared by every instance (classes, modules, functions, enum
+# members) are not part of an object's own footprint
+SHARED_TYPES = (type, ModuleType, FunctionType, BuiltinFunctionType, CodeType, Enum)
+
+# Allocation sites of the instrumentation itself
+IGNORED_TRACES = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+)
+
+
+def deep_sizeof(obj: Any) -> int:
+    """
+    Approximate the memory held by `obj` and everything it references.
+
+    Args:
+        obj: Root object (a session, an event, a dict...)
+
+    Returns:
+        Sum of `sys.getsizeof` over the reachable objects, shared objects
+        (classes, modules, functions) excluded
+    """
+    seen: set[int] = set()
+    pending = [obj]
+    total = 0
+    while pending:
+        current = pending.pop()
+        if id(current) in seen or isinstance(current, SHARED_TYPES):
+            continue
+        seen.add(id(current))
+        total += sys.getsizeof(current)
+        pending.extend(gc.get_referents(current))
+    return total
+
+
+def measure_session(session: Session) -> dict[str, Any]:
+    """
+    Break down the approximate size of a session.
+
+    Args:
+        session: ADK session
+
+    Returns:
+        Event count and sizes in bytes of the whole session, its state, its
+        events, the tool responses within the events and the largest event
+    """
+    tool_response_bytes = 0
+    largest_event_bytes = 0
+    events_bytes = 0
+    for event in session.events:
+        event_bytes = deep_sizeof(event)
+        events_bytes += event_bytes
+        largest_event_bytes = max(largest_event_bytes, event_bytes)
+        for part in (event.content.parts or []) if event.content else []:
+            if part.function_response is not None:
+                tool_response_bytes += deep_sizeof(part.function_response)
+
+    return {
+        "app_name": session.app_name,
+        "user_id": session.user_id,
+        "events": len(session.events),
+        "total_bytes": deep_sizeof(session),
+        "state_bytes": deep_sizeof(session.state),
+        "events_bytes": events_bytes,
+        "tool_response_bytes": tool_response_bytes,
+        "largest_event_bytes": largest_event_bytes,
+    }
+
+
+class SessionMemoryAccounting:
+    """Approximate size of the most recently active sessions."""
+
+    def __init__(self, max_sessions: int):
+        self.max_sessions = max_sessions
+        self._sessions: OrderedDict[str, dict[str, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def record(self, session: Session) -> None:
+        """Measure a session and keep it among the tracked ones."""
+        measurement = {**measure_session(session), "measured_at": time.time()}
+        with self._lock:
+            self._sessions[session.id] = measurement
+            self._sessions.move_to_end(session.id)
+            while len(self._sessions) > self.max_sessions:
+                self._sessions.popitem(last=False)
+
+    def largest(self, limit: int = 20) -> dict[str, Any]:
+        """
+        Summarize the tracked sessions.
+
+        Returns:
+            Session count, total and mean size, and the `limit` largest
+            sessions with their breakdown
+        """
+        with self._lock:
+            sessions = [{"session_id": session_id, **entry} for session_id, entry in self._sessions.items()]
+        sessions.sort(key=lambda entry: entry["total_bytes"], reverse=True)
+        total = sum(entry["total_bytes"] for entry in sessions)
+        return {
+            "tracked": len(sessions),
+            "total_bytes": total,
+            "mean_bytes": total // len(sessions) if sessions else 0,
+            "mean_bytes_per_event": total // max(1, sum(entry["events"] for entry in sessions)),
+            "sessions": sessions[:limit],
+        }
+
+    def clear(self) -> None:
+        """Forget the tracked sessions."""
+        with self._lock:
+            self._sessions.clear()
+
+
+class MemoryTracker:
+    """tracemalloc snapshots diffed over time."""
+
+    def __init__(self, max_snapshots: int = 10):
+        self._baseline: tracemalloc.Snapshot | None = None
+        self._snapshots: deque[tuple[float, tracemalloc.Snapshot]] = deque(maxlen=max_snapshots)
+        self._lock = threading.Lock()
+
+    @property
+    def tracing(self) -> bool:
+        """Whether allocations are being traced."""
+        return tracemalloc.is_tracing()
+
+    def start(self, frames: int = 1) -> None:
+        """
+        Start tracing allocations and take the baseline snapshot.
+
+        Args:
+            frames: Call stack depth stored per allocation (1 = allocation
+                line only, more frames give the callers but cost more)
+        """
+        with self._lock:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start(frames)
+            self._baseline = self._take()
+            self._snapshots.clear()
+
+    def stop(self) -> None:
+        """Stop tracing and drop the snapshots."""
+        with self._lock:
+            tracemalloc.stop()
+            self._baseline = None
+            self._snapshots.clear()
+
+    def _take(self) -> tracemalloc.Snapshot:
+        return tracemalloc.take_snapshot().filter_traces(IGNORED_TRACES)
+
+    def diff(
+        self,
+        against: Literal["baseline", "previous"] = "baseline",
+        group_by: Literal["lineno", "filename", "traceback"] = "lineno",
+        limit: int = 25,
+    ) -> dict[str, Any]:
+        """
+        Take a snapshot and compare it with the baseline or the previous one.
+
+        Args:
+            against: Reference snapshot
+            group_by: Aggregate allocations per line, per file, or per call
+                stack (meaningful when started with more than one frame)
+            limit: Number of allocation sites returned
+
+        Returns:
+            Traced memory, growth since the reference, and the allocation
+            sites sorted by growth
+
+        Raises:
+            RuntimeError: If tracing is not started
+        """
+        with self._lock:
+            if not tracemalloc.is_tracing() or self._baseline is None:
+                raise RuntimeError("Memory tracing is not started")
+            reference_time, reference = (
+                self._snapshots[-1] if against == "previous" and self._snapshots else (None, self._baseline)
+            )
+            snapshot = self._take()
+            self._snapshots.append((time.time(), snapshot))
+
+        stats = snapshot.compare_to(reference, group_by)
+        return {
+            "against": "previous" if reference_time else "baseline",
+            "reference_time": reference_time,
+            "traced_bytes": sum(stat.size for stat in stats),
+            "growth_bytes": sum(stat.size_diff for stat in stats),
+            "sites": [
+                {
+                    "site": str(stat.traceback[-1]),
+                    "size_bytes": stat.size,
+                    "size_diff_bytes": stat.size_diff,
+                    "count": stat.count,
+                    "count_diff": stat.count_diff,
+                    **({"traceback": [str(frame) for frame in stat.traceback]} if group_by == "traceback" else {}),
+                }
+                for stat in stats[:limit]
+            ],
+        }
+
+    def status(self) -> dict[str, Any]:
+        """Return whether tracing is on, traced memory and tracemalloc's own overhead."""
+        if not tracemalloc.is_tracing():
+            return {"tracing": False}
+        current, peak = tracemalloc.get_traced_memory()
+        return {
+            "tracing": True,
+            "frames": tracemalloc.get_traceback_limit(),
+            "traced_bytes": current,
+            "traced_peak_bytes": peak,
+            "tracemalloc_overhead_bytes": tracemalloc.get_tracemalloc_memory(),
+            "snapshots": len(self._snapshots),
+        }
+
+
+memory_tracker = MemoryTracker()
+session_memory = SessionMemoryAccounting(max_sessions=settings.MEMORY_TRACKED_SESSIONS)
@@ -0,0 +1,90 @@
+"""
+In-process rolling metrics.
+
+Lightweight latency and counter aggregation kept in memory, used to tune
+model routing thresholds and to report latency percentiles per agent. Each
+series keeps a bounded window of recent samples so percentiles reflect
+current behaviour rather than the whole process lifetime.
+"""
+
+import threading
+from collections import Counter, deque
+from typing import Any
+
+DEFAULT_WINDOW_SIZE = 500
+
+
+class RollingSeries:
+    """Bounded window of latency samples plus free-form counters."""
+
+    def __init__(self, window_size: int = DEFAULT_WINDOW_SIZE):
+        self._latencies: deque[float] = deque(maxlen=window_size)
+        self.counters: Counter[str] = Counter()
+        self.count = 0
+
+    def observe(self, latency_seconds: float | None = None, **counters: int) -> None:
+        """Record one sample and increment the given counters."""
+        self.count += 1
+        if latency_seconds is not None:
+            self._latencies.append(latency_seconds)
+        self.counters.update(counters)
+
+    def percentile(self, q: float) -> float | None:
+        """Return the q-th percentile (0-100) of the window, in seconds."""
+        if not self._latencies:
+            return None
+        ordered = sorted(self._latencies)
+        index = min(len(ordered) - 1, max(0, round(q / 100 * len(ordered)) - 1))
+        return ordered[index]
+
+    def snapshot(self) -> dict[str, Any]:
+        """Return a JSON-serializable summary of the series."""
+        p50 = self.percentile(50)
+        p95 = self.percentile(95)
+        return {
+            "count": self.count,
+            "window": len(self._latencies),
+            "p50_ms": round(p50 * 1000, 1) if p50 is not None else None,
+            "p95_ms": round(p95 * 1000, 1) if p95 is not None else None,
+            **dict(self.counters),
+        }
+
+
+class MetricsRegistry:
+    """Thread-safe registry of named rolling series, grouped by family."""
+
+    def __init__(self, window_size: int = DEFAULT_WINDOW_SIZE):
+        self.window_size = window_size
+        self._series: dict[str, dict[str, RollingSeries]] = {}
+        self._lock = threading.Lock()
+
+    def series(self, family: str, name: str) -> RollingSeries:
+        """Get or create the series `name` of a metric family."""
+        with self._lock:
+            family_series = self._series.setdefault(family, {})
+            if name not in family_series:
+                family_series[name] = RollingSeries(self.window_size)
+            return family_series[name]
+
+    def observe(
+        self,
+        family: str,
+        name: str,
+        latency_seconds: float | None = None,
+        **counters: int,
+    ) -> None:
+        """Record a sample on the series `name` of a metric family."""
+        series = self.series(family, name)
+        with self._lock:
+            series.observe(latency_seconds, **counters)
+
+    def snapshot(self, family: str) -> dict[str, dict[str, Any]]:
+        """Return the summaries of every series of a metric family."""
+        with self._lock:
+            return {
+                name: series.snapshot()
+                for name, series in self._series.get(family, {}).items()
+            }
+
+
+metrics = MetricsRegistry()
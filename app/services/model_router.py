@@ -0,0 +1,176 @@
+"""
+Model routing between a fast model and a heavy model.
+
+Requests are classified from the prompt length and the intent of the
+prompt (the four actions of `quizz_v1.j2`: création, analyse, variation,
+explication). Short analysis or explanation requests go to
+`MODEL_FAST`; creations, variations and long prompts go to `MODEL_HEAVY`.
+Latency and quality counters are recorded per route in the metrics registry
+so the thresholds can be tuned from `/metrics/routes`.
+"""
+
+import re
+import unicodedata
+from dataclasses import asdict, dataclass
+from enum import Enum
+
+from app.config.settings import settings
+from app.services.tenants import get_current_tenant
+
+
+class Intent(str, Enum):
+    """Main action requested by the user."""
+
+    CREATION = "creation"
+    ANALYSE = "analyse"
+    VARIATION = "variation"
+    EXPLICATION = "explication"
+
+
+class Route(str, Enum):
+    """Model class a request is dispatched to."""
+
+    FAST = "fast"
+    HEAVY = "heavy"
+
+
+# Explicit requests for another version of an existing quiz. Kept narrow: a
+# creation prompt mentioning a "version" or "distracteurs" is not a variation.
+_VARIATION_PATTERN = re.compile(
+    r"\b(variantes?|autres? versions?|(une|des|\d+|deux|trois|quatre|cinq) nouvelles? versions?"
+    r"|reformul\w*|autres? (questions?|distracteurs?))\b"
+    r"|\b(change[rz]?|changeant|modifie[rz]?|modifiant|remplace[rz]?|remplacant)\b"
+    r".{0,40}?\b(distracteurs?|reponses?|questions?|ce quiz|ce test)\b"
+)
+
+# The action verb that comes first in the prompt wins: "Crée un quiz pour
+# évaluer..." is a creation, "Explique pourquoi tu as créé..." an explanation.
+_ACTION_PATTERNS: list[tuple[Intent, re.Pattern[str]]] = [
+    (
+        Intent.CREATION,
+        re.compile(
+            r"\b(cree[rsz]?|genere[rsz]?|redige[rsz]?|con[cç]oi[st]?|concevoir|prepare[rsz]?|construi\w*"
+            r"|ecri\w*|fais|faites|faire|produi\w*|elabore[rsz]?)\b"
+        ),
+    ),
+    (
+        Intent.EXPLICATION,
+        re.compile(r"\b(expliqu\w*|explications?|pourquoi|clarifi\w*|justifi\w*|que signifie|c'est quoi)\b"),
+    ),
+    (
+        Intent.ANALYSE,
+        re.compile(r"\b(analys\w*|evalu\w*|difficulte|pertinen\w*|critiqu\w*|relis|verifi\w*|objectifs?)\b"),
+    ),
+]
+
+
+# Follow-up requests about content already written in the session. A reference
+# to that content ("le quiz", "ce module", "la section 2") makes a follow-up;
+# otherwise a request for new content ("Crée une formation...") is a creation,
+# and only edit or explanation wording ("plus difficile", "pourquoi") a follow-up.
+_EXISTING_CONTENT_PATTERN = re.compile(
+    r"\b(ce|cet|cette|ces)\s+(quiz|script|formation|cours|modules?|sections?|questions?|parties?|chapitres?|textes?)\b"
+    r"|\b(le|du|au)\s+(quiz|script|cours)\b|\b(la|de la)\s+formation\b"
+    r"|\b(modules?|sections?|questions?|parties?|chapitres?)\s+(n[°o]\s*)?\d+"
+    r"|\b(premier|premiere|deuxieme|second|seconde|troisieme|quatrieme|cinquieme|dernier|derniere)s?\s+"
+    r"(modules?|sections?|questions?|parties?|chapitres?)\b"
+)
+_NEW_CONTENT_PATTERN = re.compile(
+    r"\b(cree[rsz]?|genere[rsz]?|redige[rsz]?|con[cç]oi[st]?|concevoir|prepare[rsz]?|construi\w*"
+    r"|ecri\w*|fais|faites|faire|produi\w*|elabore[rsz]?)\s+(moi\s+)?(une?|des|nouv\w*)\b"
+)
+_FOLLOWUP_PATTERN = re.compile(
+    r"\b(rends|rendre|simplifi\w*|complexifi\w*|raccourci\w*|allonge\w*|developpe\w*|detaille\w*"
+    r"|ajoute\w*|supprime\w*|retire\w*|enleve\w*|corrige\w*|tradui\w*|reformul\w*|modifi\w*"
+    r"|change\w*|remplace\w*|resume\w*|expliqu\w*|pourquoi|clarifi\w*|justifi\w*)\b"
+    r"|\b(plus|moins)\s+(difficiles?|faciles?|simples?|courts?|courtes?|longs?|longues?|detaille\w*|complexes?)\b"
+)
+
+
+@dataclass(frozen=True)
+class RouteDecision:
+    """Outcome of the classification of a request."""
+
+    route: Route
+    model: str
+    intent: Intent
+    reason: str
+
+    def to_dict(self) -> dict[str, str]:
+        """Convert the decision to a JSON-serializable dictionary."""
+        return {key: str(getattr(value, "value", value)) for key, value in asdict(self).items()}
+
+
+def _fold(text: str) -> str:
+    """Lowercase and strip accents for keyword matching."""
+    decomposed = unicodedata.normalize("NFKD", text.lower())
+    return "".join(char for char in decomposed if not unicodedata.combining(char))
+
+
+def detect_intent(prompt: str) -> Intent:
+    """
+    Detect the main action of a prompt, defaulting to creation.
+
+    An explicit request for another version of the quiz is a variation;
+    otherwise the earliest action verb or keyword of the prompt decides.
+    """
+    folded = _fold(prompt)
+    if _VARIATION_PATTERN.search(folded):
+        return Intent.VARIATION
+    matches = [(match.start(), intent) for intent, pattern in _ACTION_PATTERNS if (match := pattern.search(folded))]
+    return min(matches)[1] if matches else Intent.CREATION
+
+
+def is_followup_request(prompt: str) -> bool:
+    """
+    Whether a prompt is about the content already written in the session.
+
+    "Rends le quiz du deuxième module plus difficile" is a follow-up, "Crée
+    une formation sur SQL avec un quiz d'évaluation" a new creation.
+    """
+    folded = _fold(prompt)
+    if _EXISTING_CONTENT_PATTERN.search(folded):
+        return True
+    if _NEW_CONTENT_PATTERN.search(folded):
+        return False
+    return _FOLLOWUP_PATTERN.search(folded) is not None
+
+
+def is_new_content_request(prompt: str) -> bool:
+    """Whether a prompt explicitly asks for new content ("Crée une formation sur...")."""
+    return not is_followup_request(prompt) and _NEW_CONTENT_PATTERN.search(_fold(prompt)) is not None
+
+
+def get_route_model(route: Route) -> str:
+    """Return the model of the current tenant for a route (its model when unset)."""
+    tenant = get_current_tenant()
+    if route is Route.FAST:
+        return tenant.model_fast or tenant.model
+    return tenant.model_heavy or tenant.model
+
+
+def classify_request(prompt: str) -> RouteDecision:
+    """
+    Classify a request and pick the model that should serve it.
+
+    Args:
+        prompt: The user prompt of the current turn
+
+    Returns:
+        The routing decision
+    """
+    intent = detect_intent(prompt)
+
+    if len(prompt) > settings.MODEL_ROUTING_FAST_MAX_PROMPT_CHARS:
+        route, reason = Route.HEAVY, "long_prompt"
+    elif intent.value in settings.MODEL_ROUTING_FAST_INTENTS:
+        route, reason = Route.FAST, f"intent_{intent.value}"
+    else:
+        route, reason = Route.HEAVY, f"intent_{intent.value}"
+
+    return RouteDecision(
+        route=route,
+        model=get_route_model(route),
+        intent=intent,
+        reason=reason,
+    )
@@ -0,0 +1,160 @@
+"""
+Speculative RAG prefetch: retrieval starts with the turn, not after the model asks.
+
+Without prefetch, a turn of a RAG agent is serial: a model call producing a
+`retrieve_drive_documents` call, the retrieval, then a second model call.
+With `RAG_PREFETCH_ENABLED`, the `before_agent_callback` starts a retrieval
+for the user's raw prompt as soon as the turn begins, concurrently with the
+first model call. When the model then calls the retrieval tool with a query
+close enough to the prompt (at least `RAG_PREFETCH_MIN_OVERLAP` of the
+query's words appear in the prompt), the tool returns the prefetched
+passages, waiting for them if the retrieval is still running. Otherwise it
+retrieves as usual.
+
+A prefetch serves at most one tool call, and is cancelled when its turn ends
+unused. Unused prefetches are counted as wasted retrievals.
+"""
+
+import asyncio
+import logging
+import re
+import time
+import unicodedata
+from collections import OrderedDict
+from collections.abc import Coroutine
+from dataclasses import dataclass, field
+from typing import Any
+
+from app.config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+# Prefetches kept at most (turns ending without their after-agent callback)
+MAX_PENDING = 1024
+_WORD = re.compile(r"\w{3,}")
+_STOPWORDS = frozenset(
+    "les des une pour sur avec dans par qui que aux est son ses cette ces mes tes nos vos "
+    "leur leurs pas plus tout tous toute toutes sont etre avoir fait faire cree creer "
+    "the and for with from that this what about".split()
+)
+
+
+def query_terms(text: str) -> set[str]:
+    """Significant words of a query: folded, without accents, stopwords and short words."""
+    decomposed = unicodedata.normalize("NFKD", text.lower())
+    folded = "".join(char for char in decomposed if not unicodedata.combining(char))
+    return {word for word in _WORD.findall(folded) if word not in _STOPWORDS}
+
+
+def term_overlap(query: str, prompt_terms: set[str]) -> float:
+    """Share of the query's significant words found in the prompt."""
+    terms = query_terms(query)
+    if not terms:
+        return 0.0
+    return len(terms & prompt_terms) / len(terms)
+
+
+@dataclass
+class Prefetch:
+    """A retrieval started for the prompt of a turn."""
+
+    corpus: str
+    terms: set[str]
+    task: asyncio.Task
+    started_at: float = field(default_factory=time.perf_counter)
+    finished_at: float | None = None
+
+
+class RagPrefetcher:
+    """Starts retrievals for turn prompts and hands them over to matching tool calls."""
+
+    def __init__(self, min_overlap: float):
+        self.min_overlap = min_overlap
+        self._prefetches: OrderedDict[str, Prefetch] = OrderedDict()
+        self.started = 0
+        self.hits = 0
+        self.misses = 0
+        self.wasted = 0
+        self.errors = 0
+        self.saved_seconds = 0.0
+
+    def start(self, invocation_id: str, prompt: str, corpus: str, retrieval: Coroutine[Any, Any, list[str]]) -> None:
+        """
+        Start the retrieval of a turn in the background.
+
+        Args:
+            invocation_id: Invocation (turn) the prefetch belongs to
+            prompt: The user prompt the retrieval was started for
+            corpus: RAG corpus of the retrieval
+            retrieval: The retrieval coroutine
+        """
+        task = asyncio.ensure_future(retrieval)
+        prefetch = Prefetch(corpus=corpus, terms=query_terms(prompt), task=task)
+        task.add_done_callback(lambda _: setattr(prefetch, "finished_at", time.perf_counter()))
+        self._prefetches[invocation_id] = prefetch
+        self.started += 1
+        while len(self._prefetches) > MAX_PENDING:
+            _, oldest = self._prefetches.popitem(last=False)
+            oldest.task.cancel()
+
+    async def take(self, invocation_id: str, query: str, corpus: str) -> list[str] | None:
+        """
+        Return the prefetched passages for a tool call, if its query matches the prompt.
+
+        Args:
+            invocation_id: Invocation of the tool call
+            query: Query chosen by the model
+            corpus: Corpus of the tool
+
+        Returns:
+            The prefetched passages, or None to retrieve normally (no
+            prefetch, different corpus, query too far from the prompt, or
+            failed prefetch)
+        """
+        prefetch = self._prefetches.get(invocation_id)
+        if prefetch is None:
+            return None
+        overlap = term_overlap(query, prefetch.terms)
+        if prefetch.corpus != corpus or overlap < self.min_overlap:
+            # Kept for a later, closer call of the same turn
+            self.misses += 1
+            logger.info(f"RAG prefetch not used for query {query!r} (overlap {overlap:.2f})")
+            return None
+
+        del self._prefetches[invocation_id]
+        requested_at = time.perf_counter()
+        try:
+            contexts = await prefetch.task
+        except Exception as e:
+            self.errors += 1
+            logger.warning(f"RAG prefetch failed, retrieving again: {e}")
+            return None
+        self.hits += 1
+        # Retrieval time the tool call did not wait for
+        duration = (prefetch.finished_at or time.perf_counter()) - prefetch.started_at
+        self.saved_seconds += max(0.0, duration - (time.perf_counter() - requested_at))
+        logger.info(f"RAG prefetch served query {query!r} (overlap {overlap:.2f})")
+        return contexts
+
+    def discard(self, invocation_id: str) -> None:
+        """Drop the prefetch of a finished turn, cancelling it if still running."""
+        prefetch = self._prefetches.pop(invocation_id, None)
+        if prefetch is not None:
+            self.wasted += 1
+            prefetch.task.cancel()
+
+    def stats(self) -> dict[str, Any]:
+        """Return the prefetch counters."""
+        return {
+            "enabled": settings.RAG_PREFETCH_ENABLED,
+            "started": self.started,
+            "pending": len(self._prefetches),
+            "hits": self.hits,
+            "misses": self.misses,
+            "wasted": self.wasted,
+            "errors": self.errors,
+            "saved_seconds": round(self.saved_seconds, 3),
+        }
+
+
+rag_prefetcher = RagPrefetcher(min_overlap=settings.RAG_PREFETCH_MIN_OVERLAP)
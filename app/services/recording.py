@@ -0,0 +1,351 @@
+"""
+Record/replay of the model and RAG calls, for deterministic performance tests.
+
+With `RECORDING_MODE=record`, every call to the GenAI API (through the
+shared HTTP pool) and to the RAG API is run normally and appended to
+`RECORDING_PATH`: the request key, the response, and its timing. Streamed
+model responses keep the arrival time of each chunk. The file is
+gzip-compressed JSON lines, one gzip member per call, so a killed process
+leaves a readable file.
+
+With `RECORDING_MODE=replay`, nothing goes to the network. The recorded
+responses are served back with their recorded timing, scaled by
+`RECORDING_REPLAY_SPEED` (0 serves them immediately). No credentials are
+needed (see `replay_client_options`). Load tests and evaluations then
+measure the application's own overhead, without the model's latency
+variance, on machines without network access.
+
+Calls are matched on method, path and normalized JSON body, or on the RAG
+method and its request message. Identical calls recorded several times are
+replayed in turn, cycling when the recording is exhausted. Unrecorded calls
+raise `RecordingMissError`.
+"""
+
+import asyncio
+import base64
+import gzip
+import hashlib
+import importlib
+import json
+import logging
+import os
+import threading
+import time
+from collections.abc import AsyncIterator, Callable
+from pathlib import Path
+from typing import Any, TypeVar
+
+import httpx
+import proto
+from google.oauth2.credentials import Credentials
+
+from app.config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Response headers replayed (the others describe the recorded connection)
+REPLAYED_HEADERS = ("content-type", "content-encoding")
+# RAG client methods recorded (retrieval, corpus metadata of the health probe)
+RAG_METHODS = ("retrieve_contexts", "get_rag_corpus")
+
+
+class RecordingMissError(LookupError):
+    """Raised in replay mode for a call absent from the recording."""
+
+
+class CallRecorder:
+    """Appends recorded calls to a file, or serves them back from it."""
+
+    def __init__(self, path: str, mode: str, speed: float):
+        self.path = Path(path)
+        self.mode = mode
+        self.speed = speed
+        self._entries: dict[str, list[dict[str, Any]]] | None = None
+        self._positions: dict[str, int] = {}
+        self._lock = threading.Lock()
+        self.recorded = 0
+        self.replayed = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(*parts: str) -> str:
+        """Hash the parts identifying a call."""
+        return hashlib.sha256("\x00".join(parts).encode("utf-8")).hexdigest()
+
+    def scaled(self, seconds: float) -> float:
+        """Replay delay of a recorded duration."""
+        return seconds / self.speed if self.speed > 0 else 0.0
+
+    def write(self, entry: dict[str, Any]) -> None:
+        """Append a recorded call to the recording file."""
+        member = gzip.compress((json.dumps(entry, ensure_ascii=False) + "\n").encode("utf-8"))
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, "ab") as f:
+                f.write(member)
+            self.recorded += 1
+
+    def _load(self) -> dict[str, list[dict[str, Any]]]:
+        entries: dict[str, list[dict[str, Any]]] = {}
+        if self.path.exists():
+            with gzip.open(self.path, "rt", encoding="utf-8") as f:
+                for line in f:
+                    entry = json.loads(line)
+                    entries.setdefault(entry["key"], []).append(entry)
+        logger.info(f"Loaded {sum(map(len, entries.values()))} recorded calls from {self.path}")
+        return entries
+
+    def next_entry(self, key: str, description: str) -> dict[str, Any]:
+        """
+        Return the next recorded response of a call.
+
+        Args:
+            key: Call key (`make_key`)
+            description: Call description for the error message
+
+        Raises:
+            RecordingMissError: If the call was not recorded
+        """
+        with self._lock:
+            if self._entries is None:
+                self._entries = self._load()
+            candidates = self._entries.get(key)
+            if not candidates:
+                self.misses += 1
+                raise RecordingMissError(f"No recorded response for {description} in {self.path}")
+            position = self._positions.get(key, 0)
+            self._positions[key] = position + 1
+            self.replayed += 1
+            return candidates[position % len(candidates)]
+
+    def stats(self) -> dict[str, Any]:
+        """Return the mode and the recorded, replayed and missed calls."""
+        return {
+            "mode": self.mode,
+            "path": str(self.path),
+            "recorded": self.recorded,
+            "replayed": self.replayed,
+            "misses": self.misses,
+        }
+
+
+def _encode_chunk(chunk: bytes) -> str:
+    try:
+        return chunk.decode("utf-8")
+    except UnicodeDecodeError:
+        # Compressed or binary bodies
+        return "b64:" + base64.b64encode(chunk).decode("ascii")
+
+
+def _decode_chunk(chunk: str) -> bytes:
+    if chunk.startswith("b64:"):
+        return base64.b64decode(chunk[4:])
+    return chunk.encode("utf-8")
+
+
+def _http_key(request: httpx.Request, body: bytes) -> tuple[str, str]:
+    query = sorted((name, value) for name, value in request.url.params.multi_items() if name != "key")
+    try:
+        normalized = json.dumps(json.loads(body), sort_keys=True, ensure_ascii=False) if body else ""
+    except ValueError:
+        normalized = body.decode("utf-8", "replace")
+    description = f"{request.method} {request.url.path}"
+    return CallRecorder.make_key("http", request.method, request.url.path, repr(query), normalized), description
+
+
+class RecordingStream(httpx.AsyncByteStream):
+    """Forwards a response body and records its chunks with their arrival time."""
+
+    def __init__(self, stream: httpx.AsyncByteStream, on_close: Callable[[list[list[Any]]], None], started: float):
+        self._stream = stream
+        self._on_close = on_close
+        self._started = started
+        self._chunks: list[list[Any]] = []
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        async for chunk in self._stream:
+            self._chunks.append([round(time.perf_counter() - self._started, 4), _encode_chunk(chunk)])
+            yield chunk
+
+    async def aclose(self) -> None:
+        await self._stream.aclose()
+        self._on_close(self._chunks)
+
+
+class ReplayStream(httpx.AsyncByteStream):
+    """Serves recorded chunks at their recorded time, scaled by the replay speed."""
+
+    def __init__(self, chunks: list[list[Any]], recorder: CallRecorder, started: float):
+        self._chunks = chunks
+        self._recorder = recorder
+        self._started = started
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        for offset, chunk in self._chunks:
+            delay = self._recorder.scaled(offset) - (time.perf_counter() - self._started)
+            if delay > 0:
+                await asyncio.sleep(delay)
+            yield _decode_chunk(chunk)
+
+
+class RecordingTransport(httpx.AsyncBaseTransport):
+    """httpx transport recording the calls of another transport, or replaying them."""
+
+    def __init__(self, transport: httpx.AsyncBaseTransport, recorder: CallRecorder):
+        self.transport = transport
+        self.recorder = recorder
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        body = await request.aread()
+        key, description = _http_key(request, body)
+        started = time.perf_counter()
+
+        if self.recorder.mode == "replay":
+            entry = self.recorder.next_entry(key, description)
+            await asyncio.sleep(self.recorder.scaled(entry["headers_s"]))
+            return httpx.Response(
+                entry["status"],
+                headers=entry["headers"],
+                stream=ReplayStream(entry["chunks"], self.recorder, started),
+                request=request,
+            )
+
+        response = await self.transport.handle_async_request(request)
+        headers_s = round(time.perf_counter() - started, 4)
+        stream = response.stream
+        if not isinstance(stream, httpx.AsyncByteStream):
+            # Async transports return async bodies; anything else is a wrapped sync transport
+            raise TypeError(f"Cannot record a {type(stream).__name__} response body")
+
+        def on_close(chunks: list[list[Any]]) -> None:
+            self.recorder.write(
+                {
+                    "key": key,
+                    "call": description,
+                    "status": response.status_code,
+                    "headers": {name: response.headers[name] for name in REPLAYED_HEADERS if name in response.headers},
+                    "headers_s": headers_s,
+                    "chunks": chunks,
+                }
+            )
+
+        return httpx.Response(
+            response.status_code,
+            headers=response.headers,
+            stream=RecordingStream(stream, on_close, started),
+            extensions=response.extensions,
+            request=request,
+        )
+
+    async def aclose(self) -> None:
+        await self.transport.aclose()
+
+
+def _message_json(value: Any) -> str:
+    if isinstance(value, proto.Message):
+        return type(value).to_json(value, sort_keys=True, indent=None)
+    return repr(value)
+
+
+class RecordedClient:
+    """
+    Proxy of a synchronous GAPIC client recording or replaying some methods.
+
+    Other attributes are read from the wrapped client. In replay mode, the
+    client is never built (its transport would resolve credentials).
+    """
+
+    def __init__(self, name: str, client: Any, recorder: CallRecorder, methods: tuple[str, ...]):
+        self._name = name
+        self._client = client
+        self._recorder = recorder
+        self._methods = methods
+
+    def __getattr__(self, attribute: str) -> Any:
+        if attribute in self._methods:
+            return lambda *args, **kwargs: self._call(attribute, args, kwargs)
+        if self._client is None:
+            raise AttributeError(attribute)
+        return getattr(self._client, attribute)
+
+    def _call(self, method: str, args: tuple, kwargs: dict[str, Any]) -> Any:
+        parts = [_message_json(arg) for arg in args]
+        parts += [f"{name}={_message_json(value)}" for name, value in sorted(kwargs.items())]
+        key = CallRecorder.make_key("rpc", self._name, method, *parts)
+
+        if self._recorder.mode == "replay":
+            entry = self._recorder.next_entry(key, f"{self._name}.{method}")
+            time.sleep(self._recorder.scaled(entry["latency_s"]))
+            module_name, _, class_name = entry["response_type"].rpartition(".")
+            response_class = getattr(importlib.import_module(module_name), class_name)
+            return response_class.from_json(entry["response"], ignore_unknown_fields=True)
+
+        started = time.perf_counter()
+        response = getattr(self._client, method)(*args, **kwargs)
+        self._recorder.write(
+            {
+                "key": key,
+                "call": f"{self._name}.{method}",
+                "latency_s": round(time.perf_counter() - started, 4),
+                "response_type": f"{type(response).__module__}.{type(response).__name__}",
+                "response": _message_json(response),
+            }
+        )
+        return response
+
+    def close(self) -> None:
+        if self._client is not None:
+            self._client.transport.close()
+
+
+recorder = CallRecorder(settings.RECORDING_PATH, settings.RECORDING_MODE, settings.RECORDING_REPLAY_SPEED)
+
+
+def recording_transport(transport: httpx.AsyncBaseTransport) -> httpx.AsyncBaseTransport:
+    """Wrap the shared HTTP transport when recording or replaying."""
+    if recorder.mode == "off":
+        return transport
+    logger.info(f"HTTP calls: {recorder.mode} mode ({recorder.path})")
+    return RecordingTransport(transport, recorder)
+
+
+def recorded_client(name: str, factory: Callable[[], T], methods: tuple[str, ...] = RAG_METHODS) -> T:
+    """
+    Build a GAPIC client, wrapped when recording or replaying.
+
+    Args:
+        name: Client name, part of the call keys
+        factory: Builds the real client (not called in replay mode)
+        methods: Methods recorded or replayed
+
+    Returns:
+        The client, or a `RecordedClient` proxy of it
+    """
+    if recorder.mode == "off":
+        return factory()
+    logger.info(f"{name} calls: {recorder.mode} mode ({recorder.path})")
+    client = factory() if recorder.mode == "record" else None
+    return RecordedClient(name, client, recorder, methods)  # type: ignore[return-value]
+
+
+def replay_client_options(vertexai: bool | None = None) -> dict[str, Any]:
+    """
+    GenAI client arguments standing in for credentials in replay mode.
+
+    Nothing is sent in replay mode, so no ADC lookup or API key is needed:
+    Vertex AI clients get a static token, Gemini API clients a placeholder key
+    when none is configured.
+
+    Args:
+        vertexai: Client mode (default: `GOOGLE_GENAI_USE_VERTEXAI` from the
+            environment, as the GenAI client reads it)
+    """
+    if recorder.mode != "replay":
+        return {}
+    if vertexai is None:
+        vertexai = os.environ.get("GOOGLE_GENAI_USE_VERTEXAI", "").lower() in ("true", "1")
+    if vertexai:
+        return {"credentials": Credentials(token="replay")}
+    return {"api_key": os.environ.get("GOOGLE_API_KEY") or os.environ.get("GEMINI_API_KEY") or "replay"}
@@ -0,0 +1,265 @@
+"""
+Full-response cache for deterministic, single-turn agent requests.
+
+Identical first-turn prompts (e.g. the same quiz request sent by different
+learners) are answered from this cache without running RAG retrieval or
+calling the model. Entries are keyed on:
+
+- the agent name
+- a hash of the agent's rendered instructions
+- the model serving the invocation (the routed model with `MODEL_ROUTING_ENABLED`)
+- the normalized prompt
+- the RAG corpus version (`RAG_CORPUS_VERSION`)
+
+The cache is bounded (LRU eviction past `RESPONSE_CACHE_MAX_ENTRIES`), entries
+expire after `RESPONSE_CACHE_TTL_SECONDS`, and can be invalidated explicitly
+for one agent or globally. With `CACHE_BACKEND=sqlite` the entries live in the
+shared store so every worker process of the instance sees the same cache.
+"""
+
+import asyncio
+import hashlib
+import logging
+import re
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from google.adk.agents.callback_context import CallbackContext
+
+from app.config.settings import settings
+from app.services.shared_store import SharedStore, get_shared_store
+from app.services.tenants import DEFAULT_TENANT_ID, get_current_tenant
+from app.utils.adk_context import get_running_agent
+from app.utils.request_context import is_response_cache_bypassed
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_prompt(prompt: str) -> str:
+    """Normalize a prompt so trivially different spellings share an entry."""
+    normalized = unicodedata.normalize("NFC", prompt).strip().lower()
+    return _WHITESPACE.sub(" ", normalized)
+
+
+def hash_instruction(*parts: object) -> str:
+    """Return a short stable hash of the agent instruction parts."""
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(str(part or "").encode("utf-8"))
+        digest.update(b"\x00")
+    return digest.hexdigest()[:16]
+
+
+@dataclass
+class CachedResponse:
+    """A cached final response and its bookkeeping."""
+
+    agent_name: str
+    text: str
+    expire_at: float
+    hits: int = 0
+
+
+class ResponseCache:
+    """Thread-safe bounded LRU cache of final agent responses."""
+
+    def __init__(self, max_entries: int, ttl_seconds: int):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[str, CachedResponse] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(
+        agent_name: str,
+        instruction_hash: str,
+        model: str,
+        prompt: str,
+        corpus_version: str | None = None,
+        tenant_id: str = DEFAULT_TENANT_ID,
+    ) -> str:
+        """Build the cache key for a request."""
+        corpus_version = corpus_version or settings.RAG_CORPUS_VERSION
+        raw = "\x00".join(
+            [tenant_id, agent_name, instruction_hash, model, corpus_version, normalize_prompt(prompt)]
+        )
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    async def get(self, key: str) -> str | None:
+        """Return the cached response text, or None on miss or expiry."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry.expire_at < time.time():
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            entry.hits += 1
+            self.hits += 1
+            return entry.text
+
+    async def set(self, key: str, agent_name: str, text: str) -> None:
+        """Store a response, evicting the least recently used entries."""
+        with self._lock:
+            self._entries[key] = CachedResponse(
+                agent_name=agent_name,
+                text=text,
+                expire_at=time.time() + self.ttl_seconds,
+            )
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    async def invalidate(self, agent_name: str | None = None) -> int:
+        """
+        Drop cached responses.
+
+        Args:
+            agent_name: Only drop entries of this agent (all entries if None)
+
+        Returns:
+            Number of entries removed
+        """
+        with self._lock:
+            if agent_name is None:
+                removed = len(self._entries)
+                self._entries.clear()
+            else:
+                keys = [k for k, e in self._entries.items() if e.agent_name == agent_name]
+                for key in keys:
+                    del self._entries[key]
+                removed = len(keys)
+
+        logger.info(f"Invalidated {removed} cached responses (agent={agent_name or 'all'})")
+        return removed
+
+    async def stats(self) -> dict[str, int]:
+        """Return cache size and hit/miss counters."""
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+class SharedResponseCache(ResponseCache):
+    """
+    Response cache stored in the SQLite store shared by all workers.
+
+    Store calls run in a thread, off the event loop. Hits do not refresh
+    entries: past `max_entries`, the oldest written are evicted.
+    """
+
+    NAMESPACE = "response_cache"
+
+    def __init__(self, max_entries: int, ttl_seconds: int, store: SharedStore):
+        super().__init__(max_entries, ttl_seconds)
+        self.store = store
+
+    async def get(self, key: str) -> str | None:
+        """Return the cached response text, or None on miss or expiry."""
+        text = await asyncio.to_thread(self.store.get, self.NAMESPACE, key)
+        with self._lock:
+            if text is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return text
+
+    async def set(self, key: str, agent_name: str, text: str) -> None:
+        """Store a response, evicting the oldest entries."""
+        await asyncio.to_thread(
+            self.store.set,
+            self.NAMESPACE,
+            key,
+            text,
+            ttl_seconds=self.ttl_seconds,
+            tag=agent_name,
+            max_entries=self.max_entries,
+        )
+
+    async def invalidate(self, agent_name: str | None = None) -> int:
+        """Drop cached responses of one agent (all agents if None)."""
+        removed = await asyncio.to_thread(self.store.delete, self.NAMESPACE, tag=agent_name)
+        logger.info(f"Invalidated {removed} cached responses (agent={agent_name or 'all'})")
+        return removed
+
+    async def stats(self) -> dict[str, int]:
+        """Return cache size and this worker's hit/miss counters."""
+        return {
+            "entries": await asyncio.to_thread(self.store.count, self.NAMESPACE),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+def create_response_cache() -> ResponseCache:
+    """Create the response cache for the configured CACHE_BACKEND."""
+    if settings.CACHE_BACKEND == "sqlite":
+        return SharedResponseCache(
+            max_entries=settings.RESPONSE_CACHE_MAX_ENTRIES,
+            ttl_seconds=settings.RESPONSE_CACHE_TTL_SECONDS,
+            store=get_shared_store(),
+        )
+    return ResponseCache(
+        max_entries=settings.RESPONSE_CACHE_MAX_ENTRIES,
+        ttl_seconds=settings.RESPONSE_CACHE_TTL_SECONDS,
+    )
+
+
+response_cache = create_response_cache()
+
+
+def get_response_cache_key(callback_context: CallbackContext, model: str) -> str | None:
+    """
+    Compute the response cache key of the current invocation.
+
+    Returns None when the invocation is not cacheable: caching disabled or
+    bypassed by the request, follow-up turn of an existing conversation, or
+    non-text prompt.
+
+    Args:
+        callback_context: ADK callback context
+        model: The model serving the invocation (routed model included)
+    """
+    if not settings.RESPONSE_CACHE_ENABLED or is_response_cache_bypassed():
+        return None
+
+    events = callback_context.session.events
+    if any(event.invocation_id != callback_context.invocation_id for event in events):
+        return None
+
+    user_content = callback_context.user_content
+    if not user_content or not user_content.parts:
+        return None
+    if any(part.text is None for part in user_content.parts):
+        return None
+    prompt = "\n".join(part.text for part in user_content.parts if part.text)
+    if not prompt.strip():
+        return None
+
+    agent = get_running_agent(callback_context)
+    instruction_hash = hash_instruction(
+        getattr(agent, "static_instruction", None),
+        getattr(agent, "instruction", None),
+    )
+    tenant = get_current_tenant()
+    return ResponseCache.make_key(
+        agent_name=agent.name,
+        instruction_hash=instruction_hash,
+        model=model,
+        prompt=prompt,
+        corpus_version=tenant.rag_corpus_version,
+        tenant_id=tenant.tenant_id,
+    )
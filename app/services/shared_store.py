@@ -0,0 +1,131 @@
+"""
+SQLite-backed key/value store shared by the worker processes of one instance.
+
+In multi-worker mode every worker is a separate process, so in-memory caches
+would be duplicated (and cold) in each of them. This store keeps small shared
+entries (cached responses, context cache handles) in a local SQLite database
+in WAL mode, which supports concurrent readers and serialized writers across
+processes without any extra service.
+
+The methods are blocking (SQLite waits up to 5 s for a lock held by another
+worker): async callers run them with `asyncio.to_thread`. Reads never write,
+so a cache hit does not take the database write lock.
+"""
+
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+from app.config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    namespace TEXT NOT NULL,
+    key TEXT NOT NULL,
+    value TEXT NOT NULL,
+    tag TEXT,
+    expire_at REAL NOT NULL,
+    -- Write time: entries are evicted oldest-written first
+    accessed_at REAL NOT NULL,
+    PRIMARY KEY (namespace, key)
+);
+CREATE INDEX IF NOT EXISTS entries_accessed ON entries (namespace, accessed_at);
+"""
+
+
+class SharedStore:
+    """Process-safe namespaced key/value store with TTL and bounded size."""
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+        with self._connect() as connection:
+            connection.executescript(_SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        """Return the connection of the calling thread (one per thread)."""
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=5.0, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+        return connection
+
+    def get(self, namespace: str, key: str) -> str | None:
+        """Return a live value, or None if missing or expired."""
+        row = self._connect().execute(
+            "SELECT value FROM entries WHERE namespace = ? AND key = ? AND expire_at >= ?",
+            (namespace, key, time.time()),
+        ).fetchone()
+        return row[0] if row else None
+
+    def set(
+        self,
+        namespace: str,
+        key: str,
+        value: str,
+        ttl_seconds: float,
+        tag: str | None = None,
+        max_entries: int | None = None,
+    ) -> None:
+        """Store a value, dropping expired entries and the oldest ones past max_entries."""
+        now = time.time()
+        connection = self._connect()
+        connection.execute("DELETE FROM entries WHERE namespace = ? AND expire_at < ?", (namespace, now))
+        connection.execute(
+            "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?)",
+            (namespace, key, value, tag, now + ttl_seconds, now),
+        )
+        if max_entries is not None:
+            connection.execute(
+                """
+                DELETE FROM entries WHERE namespace = ? AND key IN (
+                    SELECT key FROM entries WHERE namespace = ?
+                    ORDER BY accessed_at DESC LIMIT -1 OFFSET ?
+                )
+                """,
+                (namespace, namespace, max_entries),
+            )
+
+    def delete(self, namespace: str, key: str | None = None, tag: str | None = None) -> int:
+        """Delete one key, every entry with a tag, or the whole namespace."""
+        connection = self._connect()
+        if key is not None:
+            cursor = connection.execute(
+                "DELETE FROM entries WHERE namespace = ? AND key = ?", (namespace, key)
+            )
+        elif tag is not None:
+            cursor = connection.execute(
+                "DELETE FROM entries WHERE namespace = ? AND tag = ?", (namespace, tag)
+            )
+        else:
+            cursor = connection.execute("DELETE FROM entries WHERE namespace = ?", (namespace,))
+        return cursor.rowcount
+
+    def count(self, namespace: str) -> int:
+        """Return the number of live entries of a namespace."""
+        row = self._connect().execute(
+            "SELECT COUNT(*) FROM entries WHERE namespace = ? AND expire_at >= ?",
+            (namespace, time.time()),
+        ).fetchone()
+        return row[0]
+
+
+_shared_store: SharedStore | None = None
+_shared_store_lock = threading.Lock()
+
+
+def get_shared_store() -> SharedStore:
+    """Return the instance-wide shared store, created on first use."""
+    global _shared_store
+    with _shared_store_lock:
+        if _shared_store is None:
+            _shared_store = SharedStore(Path(settings.SHARED_STATE_DIR) / "shared_state.db")
+            logger.info(f"Using shared state store at {_shared_store.path}")
+        return _shared_store
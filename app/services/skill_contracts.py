@@ -0,0 +1,245 @@
+"""
+Skill contracts: validators and agent card of each agent, built once.
+
+The skills of an agent (`SchemaSkill`) declare the JSON schemas of their
+input and output. The contract of an agent checks these schemas against
+their metaschema and compiles them into validators once, and renders the
+agent card from the same skills:
+
+- A2A messages are validated before the agent runs: their text parts form
+  the `prompt`, their file parts the `files`, their data parts add their
+  fields. A message must satisfy the input schema of at least one skill
+- final responses (`response`) are validated against the output schemas
+- `agent.json` and the card served on `/a2a/<agent>/.well-known/agent-card.json`
+  are the contract's card, serialized once
+
+Validation runs on every request, so its duration is measured
+(`GET /metrics/skill-validation`): a compiled validator takes microseconds,
+where `jsonschema.validate` would compile the schema again on every call.
+"""
+
+import logging
+import os
+import time
+from collections import deque
+from typing import Any
+
+import orjson
+from jsonschema.exceptions import SchemaError
+from jsonschema.protocols import Validator
+from jsonschema.validators import validator_for
+
+from app.config.settings import settings
+from app.services.agent_discovery import AgentEntry, agent_catalog
+from app.utils.error import ConfigurationError, ErrorCode
+
+logger = logging.getLogger(__name__)
+
+# Validation durations kept per agent and direction
+DURATION_WINDOW = 1000
+# Schema errors reported for an invalid instance
+MAX_REPORTED_ERRORS = 5
+# File part fields exposed to the input schemas (not the content)
+FILE_FIELDS = ("name", "mimeType", "uri")
+
+
+def compile_schema(schema: dict[str, Any] | None, description: str) -> Validator | None:
+    """
+    Check a JSON schema and compile it into a validator.
+
+    Args:
+        schema: The schema (None: nothing to validate)
+        description: Schema description for the error message
+
+    Raises:
+        ConfigurationError: If the schema is invalid
+    """
+    if schema is None:
+        return None
+    validator_class = validator_for(schema)
+    try:
+        validator_class.check_schema(schema)
+    except SchemaError as e:
+        raise ConfigurationError(
+            error_code=ErrorCode.CONFIGURATION_ERROR,
+            message=f"Invalid {description}: {e.message}",
+            details={"schema_path": "/".join(map(str, e.path))},
+        ) from e
+    return validator_class(schema)
+
+
+def build_agent_card(entry: AgentEntry) -> dict[str, Any]:
+    """Build the agent card of an indexed agent."""
+    service_url = entry.url
+
+    if service_url.startswith("http://localhost"):
+        k_service = os.getenv("K_SERVICE")
+        if k_service:
+            region = settings.GOOGLE_CLOUD_LOCATION
+            service_url = f"https://{k_service}-HASH-{region}.a.run.app"
+
+    skills_list = [
+        {
+            "id": skill.id,
+            "name": skill.name,
+            "description": skill.description,
+            "tags": skill.tags,
+            "examples": skill.examples if skill.examples else [],
+        }
+        for skill in entry.skills
+    ]
+    logger.info(f"  • Loaded {len(skills_list)} skills for {entry.name}")
+
+    return {
+        "name": entry.name,
+        "url": service_url,
+        "description": entry.description,
+        "version": "1.0.0",
+        "capabilities": {},
+        "skills": skills_list,
+        "defaultInputModes": ["text/plain"],
+        "defaultOutputModes": ["text/plain"],
+        "supportsAuthenticatedExtendedCard": False,
+    }
+
+
+def message_instance(message: dict[str, Any]) -> dict[str, Any]:
+    """
+    Input instance of an A2A message (JSON-RPC `params.message`).
+
+    Returns:
+        The `prompt` (text parts, joined), the `files` (name, MIME type and
+        URI of the file parts, without their content) and the fields of the
+        data parts
+    """
+    instance: dict[str, Any] = {}
+    texts = []
+    files = []
+    for part in message.get("parts") or []:
+        if not isinstance(part, dict):
+            continue
+        if isinstance(part.get("text"), str):
+            texts.append(part["text"])
+        elif isinstance(part.get("data"), dict):
+            instance.update(part["data"])
+        elif isinstance(part.get("file"), dict):
+            files.append({key: value for key, value in part["file"].items() if key in FILE_FIELDS})
+    if texts:
+        instance["prompt"] = "\n".join(texts)
+    if files:
+        instance["files"] = files
+    return instance
+
+
+class ValidationStats:
+    """Counters and recent durations of the validations of one agent and direction."""
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.failures = 0
+        self._durations: deque[float] = deque(maxlen=DURATION_WINDOW)
+
+    def observe(self, seconds: float, valid: bool) -> None:
+        self.count += 1
+        self.failures += not valid
+        self._durations.append(seconds)
+
+    def snapshot(self) -> dict[str, Any]:
+        ordered = sorted(self._durations)
+
+        def percentile_us(q: float) -> float | None:
+            if not ordered:
+                return None
+            return round(ordered[min(len(ordered) - 1, int(q / 100 * len(ordered)))] * 1e6, 1)
+
+        return {
+            "count": self.count,
+            "failures": self.failures,
+            "p50_us": percentile_us(50),
+            "p99_us": percentile_us(99),
+            "max_us": round(ordered[-1] * 1e6, 1) if ordered else None,
+        }
+
+
+class AgentContract:
+    """Compiled skill validators and agent card of one agent."""
+
+    def __init__(self, entry: AgentEntry):
+        self.name = entry.name
+        self.input_validators: list[Validator] = []
+        self.output_validators: list[Validator] = []
+        for skill in entry.skills:
+            # Plain `AgentSkill`s declare no schema
+            for direction, validators in (("input", self.input_validators), ("output", self.output_validators)):
+                validator = compile_schema(
+                    getattr(skill, f"{direction}_schema", None), f"{direction} schema of skill '{skill.id}'"
+                )
+                if validator is not None:
+                    validators.append(validator)
+        self.card = build_agent_card(entry)
+        self.card_json = orjson.dumps(self.card)
+        self.input_stats = ValidationStats()
+        self.output_stats = ValidationStats()
+
+    @staticmethod
+    def _validate(validators: list[Validator], instance: Any, stats: ValidationStats) -> list[str]:
+        started_at = time.perf_counter()
+        errors: list[str] = []
+        # Valid instances, the common case, only take the fast boolean check
+        if validators and not any(validator.is_valid(instance) for validator in validators):
+            errors = [
+                f"{'/'.join(map(str, error.absolute_path)) or '<root>'}: {error.message}"
+                for error in validators[0].iter_errors(instance)
+            ][:MAX_REPORTED_ERRORS]
+        stats.observe(time.perf_counter() - started_at, valid=not errors)
+        return errors
+
+    def validate_input(self, instance: Any) -> list[str]:
+        """
+        Validate a request against the input schemas of the skills.
+
+        Returns:
+            The errors against the first skill's schema, empty if a skill accepts it
+        """
+        return self._validate(self.input_validators, instance, self.input_stats)
+
+    def validate_output(self, instance: Any) -> list[str]:
+        """
+        Validate a response against the output schemas of the skills.
+
+        Returns:
+            The errors against the first skill's schema, empty if a skill accepts it
+        """
+        return self._validate(self.output_validators, instance, self.output_stats)
+
+
+class SkillContracts:
+    """Contracts of the discovered agents, built on first use."""
+
+    def __init__(self) -> None:
+        self._contracts: dict[str, AgentContract] = {}
+
+    def get(self, agent_name: str) -> AgentContract:
+        """
+        Return the contract of an agent.
+
+        Raises:
+            KeyError: If no agent has this name
+            ConfigurationError: If a skill schema is invalid
+        """
+        if agent_name not in self._contracts:
+            self._contracts[agent_name] = AgentContract(agent_catalog.get(agent_name))
+        return self._contracts[agent_name]
+
+    def stats(self) -> dict[str, Any]:
+        """Return the input and output validation counters and durations per agent."""
+        return {
+            "enabled": settings.SKILL_VALIDATION_ENABLED,
+            "agents": {
+                name: {"input": contract.input_stats.snapshot(), "output": contract.output_stats.snapshot()}
+                for name, contract in self._contracts.items()
+            },
+        }
+
+
+skill_contracts = SkillContracts()
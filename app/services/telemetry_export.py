@@ -0,0 +1,277 @@
+"""
+Batched, compressed export of the ADK spans.
+
+ADK traces every agent invocation, model call and tool call as OpenTelemetry
+spans; model call spans carry the completion metadata (model, token usage,
+finish reasons). `BatchingSpanExporter` is a span processor that only
+appends finished spans to an in-memory queue, so ending a span never waits
+on the network. A background thread drains the queue in batches of
+`TELEMETRY_EXPORT_BATCH_SPANS`, or every
+`TELEMETRY_EXPORT_FLUSH_INTERVAL_SECONDS`, encodes each batch as gzipped
+JSON lines and hands it to an uploader:
+
+- `gcs`: one object per batch under `gs://{bucket}/{prefix}/YYYY/MM/DD/`
+- `local`: the same files under `TELEMETRY_EXPORT_LOCAL_DIR` (tests and
+  overhead measurements)
+
+Under pressure (queue filled above `TELEMETRY_EXPORT_PRESSURE_THRESHOLD`),
+spans are sampled per trace at `TELEMETRY_EXPORT_PRESSURE_SAMPLE_RATE`;
+error spans, model call spans and root spans are always kept. A full queue
+drops new spans. Prompts, responses and tool payloads are stripped unless
+`TELEMETRY_EXPORT_CAPTURE_CONTENT` is set.
+"""
+
+import abc
+import gzip
+import logging
+import os
+import threading
+import time
+from collections import deque
+from pathlib import Path
+from typing import Any
+
+import orjson
+from opentelemetry.sdk.trace import ReadableSpan, SpanProcessor
+from opentelemetry.trace import StatusCode
+
+from app.config.settings import settings
+from app.services.connections import get_storage_client
+
+logger = logging.getLogger(__name__)
+
+CONTENT_ATTRIBUTES = frozenset(
+    {
+        "gcp.vertex.agent.llm_request",
+        "gcp.vertex.agent.llm_response",
+        "gcp.vertex.agent.tool_call_args",
+        "gcp.vertex.agent.tool_response",
+        "gcp.vertex.agent.data",
+        "gen_ai.input.messages",
+        "gen_ai.output.messages",
+        "gen_ai.system_instructions",
+    }
+)
+LLM_MODEL_ATTRIBUTE = "gen_ai.request.model"
+
+
+class TelemetryUploader(abc.ABC):
+    """Destination of compressed span batches. `upload` runs in the export thread."""
+
+    name: str
+
+    @abc.abstractmethod
+    def upload(self, object_name: str, payload: bytes) -> None:
+        """
+        Store one batch.
+
+        Args:
+            object_name: Relative name of the batch (`prefix/YYYY/MM/DD/...jsonl.gz`)
+            payload: Gzipped JSON lines, one span per line
+        """
+
+
+class GcsTelemetryUploader(TelemetryUploader):
+    """Uploads batches as Cloud Storage objects."""
+
+    name = "gcs"
+
+    def __init__(self, project: str, bucket: str):
+        self.project = project
+        self.bucket = bucket.removeprefix("gs://").rstrip("/")
+
+    def upload(self, object_name: str, payload: bytes) -> None:
+        blob = get_storage_client(self.project).bucket(self.bucket).blob(object_name)
+        blob.upload_from_string(payload, content_type="application/gzip")
+
+
+class LocalTelemetryUploader(TelemetryUploader):
+    """Writes batches as files under a local directory."""
+
+    name = "local"
+
+    def __init__(self, directory: str):
+        self.directory = Path(directory)
+
+    def upload(self, object_name: str, payload: bytes) -> None:
+        path = self.directory / object_name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(payload)
+
+
+def create_telemetry_uploader() -> TelemetryUploader:
+    """Build the uploader selected by `TELEMETRY_EXPORT_DESTINATION`."""
+    if settings.TELEMETRY_EXPORT_DESTINATION == "local":
+        return LocalTelemetryUploader(settings.TELEMETRY_EXPORT_LOCAL_DIR)
+    bucket = settings.TELEMETRY_EXPORT_BUCKET or os.environ.get("LOGS_BUCKET_NAME", "")
+    return GcsTelemetryUploader(settings.GOOGLE_CLOUD_PROJECT, bucket)
+
+
+def span_to_record(span: ReadableSpan, capture_content: bool) -> dict[str, Any]:
+    """Convert a finished span to a JSON-serializable record."""
+    attributes = dict(span.attributes or {})
+    if not capture_content:
+        for name in CONTENT_ATTRIBUTES.intersection(attributes):
+            del attributes[name]
+    # Both are set once the span has ended; guard against a span exported unfinished
+    start_time = span.start_time or 0
+    end_time = span.end_time or start_time
+    return {
+        "trace_id": f"{span.context.trace_id:032x}",
+        "span_id": f"{span.context.span_id:016x}",
+        "parent_span_id": f"{span.parent.span_id:016x}" if span.parent else None,
+        "name": span.name,
+        "start_time": start_time / 1e9,
+        "duration_ms": (end_time - start_time) / 1e6,
+        "status": span.status.status_code.name,
+        "status_description": span.status.description,
+        "attributes": attributes,
+    }
+
+
+class BatchingSpanExporter(SpanProcessor):
+    """Span processor queuing finished spans for a background batch uploader."""
+
+    def __init__(
+        self,
+        uploader: TelemetryUploader,
+        batch_spans: int,
+        flush_interval_seconds: float,
+        max_queue_spans: int,
+        pressure_threshold: float,
+        pressure_sample_rate: float,
+        capture_content: bool = False,
+    ):
+        self.uploader = uploader
+        self.batch_spans = batch_spans
+        self.flush_interval_seconds = flush_interval_seconds
+        self.max_queue_spans = max_queue_spans
+        self.pressure_queue_spans = int(max_queue_spans * pressure_threshold)
+        self.pressure_sample_rate = pressure_sample_rate
+        self.capture_content = capture_content
+        self._queue: deque[ReadableSpan] = deque()
+        self._condition = threading.Condition()
+        self._export_lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+        self._shutdown = False
+        self._sequence = 0
+        self.exported = 0
+        self.dropped_full = 0
+        self.dropped_sampled = 0
+        self.uploads = 0
+        self.failed_uploads = 0
+        self.uploaded_bytes = 0
+        self.encoded_bytes = 0
+        self.last_error: str | None = None
+
+    def start(self) -> None:
+        """Start the export thread (in the serving process, after any fork)."""
+        if self._thread is None or not self._thread.is_alive():
+            self._shutdown = False
+            self._thread = threading.Thread(target=self._run, name="telemetry-export", daemon=True)
+            self._thread.start()
+
+    def on_end(self, span: ReadableSpan) -> None:
+        if not span.context.trace_flags.sampled:
+            return
+        queued = len(self._queue)
+        if queued >= self.max_queue_spans:
+            self.dropped_full += 1
+            return
+        if queued >= self.pressure_queue_spans and not self._keep_under_pressure(span):
+            self.dropped_sampled += 1
+            return
+        self._queue.append(span)
+        if queued + 1 == self.batch_spans:
+            with self._condition:
+                self._condition.notify()
+
+    def _keep_under_pressure(self, span: ReadableSpan) -> bool:
+        if span.parent is None or span.status.status_code is StatusCode.ERROR:
+            return True
+        if span.attributes and LLM_MODEL_ATTRIBUTE in span.attributes:
+            return True
+        # Same decision for every span of a trace: kept traces stay complete
+        return (span.context.trace_id & 0xFFFFFFFFFFFFFFFF) < self.pressure_sample_rate * 2**64
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                if not self._shutdown and len(self._queue) < self.batch_spans:
+                    self._condition.wait(self.flush_interval_seconds)
+                shutdown = self._shutdown
+            self._export_pending()
+            if shutdown:
+                return
+
+    def _export_pending(self) -> None:
+        with self._export_lock:
+            while self._queue:
+                batch = [self._queue.popleft() for _ in range(min(self.batch_spans, len(self._queue)))]
+                self._export(batch)
+
+    def _export(self, batch: list[ReadableSpan]) -> None:
+        lines = b"".join(
+            orjson.dumps(span_to_record(span, self.capture_content)) + b"\n"
+            for span in batch
+        )
+        payload = gzip.compress(lines, compresslevel=6)
+        self._sequence += 1
+        object_name = (
+            f"{settings.TELEMETRY_EXPORT_PREFIX}/{time.strftime('%Y/%m/%d/%H%M%S', time.gmtime())}"
+            f"-{os.getpid()}-{self._sequence:06d}.jsonl.gz"
+        )
+        try:
+            self.uploader.upload(object_name, payload)
+        except Exception as e:
+            # Telemetry is best effort: a failed batch is dropped, not retried
+            self.failed_uploads += 1
+            self.last_error = f"{type(e).__name__}: {e}"
+            logger.warning(f"Telemetry upload to {self.uploader.name} failed, {len(batch)} spans dropped: {e}")
+            return
+        self.uploads += 1
+        self.exported += len(batch)
+        self.encoded_bytes += len(lines)
+        self.uploaded_bytes += len(payload)
+
+    def force_flush(self, timeout_millis: int = 30000) -> bool:
+        """Upload the queued spans now, in the calling thread."""
+        self._export_pending()
+        return True
+
+    def shutdown(self) -> None:
+        """Stop the export thread after it uploaded the queued spans."""
+        with self._condition:
+            self._shutdown = True
+            self._condition.notify()
+        if self._thread is not None:
+            self._thread.join(timeout=30)
+            self._thread = None
+        else:
+            self._export_pending()
+
+    def stats(self) -> dict[str, Any]:
+        """Return the queue size and export counters."""
+        return {
+            "destination": self.uploader.name,
+            "queued": len(self._queue),
+            "exported": self.exported,
+            "dropped_full": self.dropped_full,
+            "dropped_sampled": self.dropped_sampled,
+            "uploads": self.uploads,
+            "failed_uploads": self.failed_uploads,
+            "encoded_bytes": self.encoded_bytes,
+            "uploaded_bytes": self.uploaded_bytes,
+            "last_error": self.last_error,
+        }
+
+
+telemetry_exporter = BatchingSpanExporter(
+    uploader=create_telemetry_uploader(),
+    batch_spans=settings.TELEMETRY_EXPORT_BATCH_SPANS,
+    flush_interval_seconds=settings.TELEMETRY_EXPORT_FLUSH_INTERVAL_SECONDS,
+    max_queue_spans=settings.TELEMETRY_EXPORT_MAX_QUEUE_SPANS,
+    pressure_threshold=settings.TELEMETRY_EXPORT_PRESSURE_THRESHOLD,
+    pressure_sample_rate=settings.TELEMETRY_EXPORT_PRESSURE_SAMPLE_RATE,
+    capture_content=settings.TELEMETRY_EXPORT_CAPTURE_CONTENT,
+)
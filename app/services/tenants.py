@@ -0,0 +1,286 @@
+"""
+Per-tenant configuration, agent instances and quotas.
+
+With `MULTI_TENANCY_ENABLED`, one deployment serves several tenants,
+identified by the `TENANT_HEADER` request header. Requests without the
+header are served as the `default` tenant, configured by the global
+settings. The header alone is not trusted: a request naming another tenant
+must carry one of its API keys in `TENANT_API_KEY_HEADER`, unless
+`TENANT_HEADER_TRUSTED` declares that an authenticating proxy sets the
+header (and strips it from client requests). Tenants are declared in `TENANTS_CONFIG_PATH` (JSON object keyed
+by tenant id) and may override:
+
+- the RAG corpus, and its version (part of the response cache key)
+- the model, and the fast and heavy models of the model router
+- the instruction template of each agent
+- the A2A URL published in their agent cards
+- their quotas: concurrent agent runs and model tokens per minute
+
+Agent modules build their agent for a tenant with a factory. The agent
+exposed to ADK is a `TenantAgent` that runs the current tenant's instance,
+taken from a bounded LRU cache (`TENANT_AGENT_CACHE_SIZE`) and built on
+first use. Quotas are enforced on agent runs by `TenantMiddleware`, so a
+tenant running a batch job is rejected with 429 once it uses its share,
+instead of filling the instance's global concurrency limit.
+"""
+
+import hashlib
+import logging
+import secrets
+import time
+from collections import OrderedDict, deque
+from collections.abc import AsyncGenerator, Callable
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+import orjson
+from google.adk.agents import BaseAgent
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.events import Event
+from google.adk.utils.context_utils import Aclosing
+from pydantic import BaseModel, Field, PrivateAttr
+from typing_extensions import override
+
+from app.config.settings import settings
+from app.utils.request_context import get_request_header
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TENANT_ID = "default"
+TOKEN_WINDOW_SECONDS = 60.0
+
+
+class TenantConfig(BaseModel):
+    """Configuration of a tenant; unset fields fall back to the global settings."""
+
+    model_config = {"extra": "forbid"}
+
+    tenant_id: str
+    rag_corpus_id: str = Field(default_factory=lambda: settings.RAG_CORPUS_ID)
+    rag_corpus_version: str = Field(default_factory=lambda: settings.RAG_CORPUS_VERSION)
+    model: str = Field(default_factory=lambda: settings.MODEL)
+    model_fast: str = Field(default_factory=lambda: settings.MODEL_FAST)
+    model_heavy: str = Field(default_factory=lambda: settings.MODEL_HEAVY)
+    # Instruction template per agent name, e.g. {"quizz_agent": "quizz_v1"}
+    instructions: dict[str, str] = {}
+    a2a_base_url: str = ""
+    agent_urls: dict[str, str] = {}
+    max_concurrent_runs: int = Field(default_factory=lambda: settings.TENANT_MAX_CONCURRENT_RUNS)
+    tokens_per_minute: int = Field(default_factory=lambda: settings.TENANT_TOKENS_PER_MINUTE)
+    # SHA-256 (hex) of the API keys authenticating the tenant's requests
+    api_key_sha256: list[str] = []
+
+    def agent_url(self, agent_name: str) -> str | None:
+        """URL published in the tenant's card of an agent (None: the global URL)."""
+        return self.agent_urls.get(agent_name) or self.a2a_base_url or None
+
+    def is_api_key(self, api_key: str) -> bool:
+        """Whether `api_key` is one of the tenant's keys."""
+        digest = hashlib.sha256(api_key.encode()).hexdigest()
+        # No short-circuit: the time does not tell which key matched
+        matches = [secrets.compare_digest(digest, expected.lower()) for expected in self.api_key_sha256]
+        return any(matches)
+
+
+class TenantRegistry:
+    """Tenant configurations, loaded from `TENANTS_CONFIG_PATH` on first use."""
+
+    def __init__(self, config_path: str):
+        self.config_path = config_path
+        self._tenants: dict[str, TenantConfig] | None = None
+
+    @property
+    def tenants(self) -> dict[str, TenantConfig]:
+        if self._tenants is None:
+            self._tenants = self._load()
+        return self._tenants
+
+    def _load(self) -> dict[str, TenantConfig]:
+        tenants = {DEFAULT_TENANT_ID: TenantConfig(tenant_id=DEFAULT_TENANT_ID)}
+        if self.config_path:
+            data = orjson.loads(Path(self.config_path).read_bytes())
+            for tenant_id, config in data.items():
+                tenants[tenant_id] = TenantConfig(tenant_id=tenant_id, **config)
+            logger.info(f"Loaded {len(data)} tenants from {self.config_path}")
+        return tenants
+
+    def get(self, tenant_id: str) -> TenantConfig:
+        """
+        Return the configuration of a tenant.
+
+        Raises:
+            KeyError: If the tenant is not configured
+        """
+        if tenant_id not in self.tenants:
+            raise KeyError(f"Unknown tenant '{tenant_id}'")
+        return self.tenants[tenant_id]
+
+
+tenant_registry = TenantRegistry(settings.TENANTS_CONFIG_PATH)
+
+
+def get_request_tenant_id() -> str:
+    """Tenant id of the request being served (`default` without header)."""
+    if not settings.MULTI_TENANCY_ENABLED:
+        return DEFAULT_TENANT_ID
+    return get_request_header(settings.TENANT_HEADER) or DEFAULT_TENANT_ID
+
+
+def get_current_tenant() -> TenantConfig:
+    """
+    Configuration of the tenant of the request being served.
+
+    Requests naming an unknown tenant are rejected by `TenantMiddleware`
+    before reaching the agents.
+    """
+    return tenant_registry.get(get_request_tenant_id())
+
+
+@dataclass
+class TenantUsage:
+    """Quota state of a tenant."""
+
+    in_flight: int = 0
+    tokens: deque[tuple[float, int]] = field(default_factory=deque)
+    tokens_in_window: int = 0
+    accepted: int = 0
+    rejected_concurrency: int = 0
+    rejected_tokens: int = 0
+
+    def prune(self, now: float) -> None:
+        while self.tokens and self.tokens[0][0] <= now - TOKEN_WINDOW_SECONDS:
+            self.tokens_in_window -= self.tokens.popleft()[1]
+
+
+class TenantQuotas:
+    """Per-tenant concurrent run and token-per-minute quotas."""
+
+    def __init__(self) -> None:
+        self._usage: dict[str, TenantUsage] = {}
+
+    def usage(self, tenant_id: str) -> TenantUsage:
+        if tenant_id not in self._usage:
+            self._usage[tenant_id] = TenantUsage()
+        return self._usage[tenant_id]
+
+    def acquire(self, tenant: TenantConfig) -> str | None:
+        """
+        Admit an agent run of a tenant.
+
+        Returns:
+            None if admitted (call `release` when it ends), otherwise the
+            exhausted quota: `concurrency` or `tokens`
+        """
+        usage = self.usage(tenant.tenant_id)
+        if tenant.max_concurrent_runs and usage.in_flight >= tenant.max_concurrent_runs:
+            usage.rejected_concurrency += 1
+            return "concurrency"
+        usage.prune(time.monotonic())
+        # Checked at admission: runs in flight may still overshoot the quota
+        if tenant.tokens_per_minute and usage.tokens_in_window >= tenant.tokens_per_minute:
+            usage.rejected_tokens += 1
+            return "tokens"
+        usage.in_flight += 1
+        usage.accepted += 1
+        return None
+
+    def release(self, tenant_id: str) -> None:
+        """Mark an admitted run of a tenant as finished."""
+        self.usage(tenant_id).in_flight -= 1
+
+    def record_tokens(self, tenant_id: str, tokens: int) -> None:
+        """Count model tokens used by a tenant."""
+        usage = self.usage(tenant_id)
+        usage.tokens.append((time.monotonic(), tokens))
+        usage.tokens_in_window += tokens
+
+    def retry_after_seconds(self, tenant_id: str, quota: str) -> int:
+        """Seconds until a rejected tenant may retry."""
+        usage = self.usage(tenant_id)
+        if quota == "tokens" and usage.tokens:
+            return max(1, int(usage.tokens[0][0] + TOKEN_WINDOW_SECONDS - time.monotonic()) + 1)
+        return 1
+
+    def stats(self) -> dict[str, Any]:
+        """Return the quota usage of every tenant seen."""
+        now = time.monotonic()
+        stats = {}
+        for tenant_id, usage in self._usage.items():
+            usage.prune(now)
+            stats[tenant_id] = {
+                "in_flight": usage.in_flight,
+                "tokens_last_minute": usage.tokens_in_window,
+                "accepted": usage.accepted,
+                "rejected_concurrency": usage.rejected_concurrency,
+                "rejected_tokens": usage.rejected_tokens,
+            }
+        return stats
+
+
+tenant_quotas = TenantQuotas()
+
+
+class TenantAgent(BaseAgent):
+    """Runs the current tenant's instance of an agent."""
+
+    factory: Callable[[TenantConfig], BaseAgent]
+    """Builds the agent for a tenant."""
+
+    cache_size: int
+    """Tenant instances kept at most (least recently used evicted)."""
+
+    _agents: OrderedDict[str, BaseAgent] = PrivateAttr(default_factory=OrderedDict)
+
+    def agent_for(self, tenant: TenantConfig) -> BaseAgent:
+        """Return the tenant's agent instance, building it on first use."""
+        agent = self._agents.get(tenant.tenant_id)
+        if agent is None:
+            agent = self.factory(tenant)
+            logger.info(f"Built agent '{self.name}' for tenant '{tenant.tenant_id}'")
+            self._agents[tenant.tenant_id] = agent
+            while len(self._agents) > self.cache_size:
+                self._agents.popitem(last=False)
+        else:
+            self._agents.move_to_end(tenant.tenant_id)
+        return agent
+
+    @override
+    async def _run_async_impl(self, ctx: InvocationContext) -> AsyncGenerator[Event, None]:
+        agent = self.agent_for(get_current_tenant())
+        async with Aclosing(agent.run_async(ctx)) as agen:
+            async for event in agen:
+                yield event
+
+    @override
+    async def _run_live_impl(self, ctx: InvocationContext) -> AsyncGenerator[Event, None]:
+        agent = self.agent_for(get_current_tenant())
+        async with Aclosing(agent.run_live(ctx)) as agen:
+            async for event in agen:
+                yield event
+
+
+def tenant_agent(factory: Callable[[TenantConfig], BaseAgent]) -> BaseAgent:
+    """
+    Build the root agent of an agent module.
+
+    Args:
+        factory: Builds the agent for a tenant
+
+    Returns:
+        The default tenant's agent, or a `TenantAgent` dispatching to the
+        tenant instances when multi-tenancy is enabled
+    """
+    default_tenant = tenant_registry.get(DEFAULT_TENANT_ID)
+    agent = factory(default_tenant)
+    if not settings.MULTI_TENANCY_ENABLED:
+        return agent
+
+    router = TenantAgent(
+        name=agent.name,
+        description=agent.description,
+        factory=factory,
+        cache_size=settings.TENANT_AGENT_CACHE_SIZE,
+    )
+    router._agents[DEFAULT_TENANT_ID] = agent
+    return router
@@ -0,0 +1,367 @@
+"""
+Tool response budget: oversized tool responses are truncated in the session.
+
+A tool response is stored in the session events and sent back to the model
+with every later request of the conversation, so one large response (a RAG
+retrieval returning a whole Drive document, a long delegated answer)
+inflates all of them. Responses whose text exceeds `TOOL_RESPONSE_MAX_CHARS`
+are therefore truncated by the `after_tool_callback`:
+
+- the budget is shared among the text fields of the response: short fields
+  (most passages) are kept whole and only the longest ones are cut, to a
+  common length, with a marker of the omitted size
+- the full response is stored out of line (`TOOL_RESPONSE_STORE`: a local
+  directory or Cloud Storage), under a content hash, per tenant. The local
+  store deletes responses older than `TOOL_RESPONSE_TTL_SECONDS`; Cloud
+  Storage objects expire with a lifecycle rule of the bucket
+- the truncated response carries a `truncation` reference; the model reads
+  a truncated field in full, page by page, with the `fetch_tool_response`
+  tool, only if it needs it
+
+Uploads run in the background; recent full responses are also kept in
+memory, so fetches right after the truncation do not wait for the store.
+"""
+
+import abc
+import asyncio
+import gzip
+import hashlib
+import json
+import logging
+import os
+import re
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any
+
+from app.app_utils.gcs import download_bytes, upload_bytes
+from app.config.settings import settings
+from app.services.tenants import get_current_tenant
+
+logger = logging.getLogger(__name__)
+
+FETCH_TOOL_NAME = "fetch_tool_response"
+TRUNCATION_KEY = "truncation"
+# Full responses kept in memory for fetches
+MEMORY_CACHE_SIZE = 64
+# Minimum delay between two scans of the local store for expired responses
+LOCAL_CLEANUP_INTERVAL_SECONDS = 600
+_REF = re.compile(r"[0-9a-f]{32}")
+
+
+class ToolResponseStore(abc.ABC):
+    """Out-of-line storage of full tool responses. Methods run in a worker thread."""
+
+    name: str
+
+    @abc.abstractmethod
+    def put(self, object_name: str, payload: bytes) -> None:
+        """Store a gzipped JSON response."""
+
+    @abc.abstractmethod
+    def get(self, object_name: str) -> bytes | None:
+        """Return a stored response, or None if it does not exist."""
+
+
+class GcsToolResponseStore(ToolResponseStore):
+    """Stores responses as Cloud Storage objects."""
+
+    name = "gcs"
+
+    def __init__(self, project: str, bucket: str):
+        self.project = project
+        self.bucket = bucket
+
+    def put(self, object_name: str, payload: bytes) -> None:
+        upload_bytes(self.bucket, object_name, payload, self.project, content_type="application/gzip")
+
+    def get(self, object_name: str) -> bytes | None:
+        return download_bytes(self.bucket, object_name, self.project)
+
+
+class LocalToolResponseStore(ToolResponseStore):
+    """Stores responses as files under a local directory, deleted after `ttl_seconds`."""
+
+    name = "local"
+
+    def __init__(self, directory: str, ttl_seconds: float):
+        self.directory = Path(directory)
+        self.ttl_seconds = ttl_seconds
+        self._cleaned_at = 0.0
+        self.expired = 0
+
+    def put(self, object_name: str, payload: bytes) -> None:
+        path = self.directory / object_name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(payload)
+        if time.monotonic() - self._cleaned_at >= LOCAL_CLEANUP_INTERVAL_SECONDS:
+            self.cleanup()
+
+    def get(self, object_name: str) -> bytes | None:
+        path = self.directory / object_name
+        try:
+            if time.time() - path.stat().st_mtime > self.ttl_seconds:
+                return None
+            return path.read_bytes()
+        except FileNotFoundError:
+            return None
+
+    def cleanup(self) -> int:
+        """Delete the responses older than the TTL and return their count."""
+        self._cleaned_at = time.monotonic()
+        expire_before = time.time() - self.ttl_seconds
+        deleted = 0
+        for path in self.directory.rglob("*.json.gz"):
+            try:
+                if path.stat().st_mtime < expire_before:
+                    path.unlink()
+                    deleted += 1
+            except FileNotFoundError:
+                continue
+        if deleted:
+            logger.info(f"Deleted {deleted} expired tool responses from {self.directory}")
+        self.expired += deleted
+        return deleted
+
+
+def create_tool_response_store() -> ToolResponseStore:
+    """Build the store selected by `TOOL_RESPONSE_STORE`."""
+    if settings.TOOL_RESPONSE_STORE == "local":
+        return LocalToolResponseStore(settings.TOOL_RESPONSE_LOCAL_DIR, settings.TOOL_RESPONSE_TTL_SECONDS)
+    bucket = settings.TOOL_RESPONSE_BUCKET or os.environ.get("LOGS_BUCKET_NAME", "")
+    return GcsToolResponseStore(settings.GOOGLE_CLOUD_PROJECT, bucket)
+
+
+def text_lengths(value: Any) -> list[int]:
+    """Lengths of the text fields of a response, at any depth."""
+    if isinstance(value, str):
+        return [len(value)]
+    if isinstance(value, dict):
+        return [length for item in value.values() for length in text_lengths(item)]
+    if isinstance(value, list | tuple):
+        return [length for item in value for length in text_lengths(item)]
+    return []
+
+
+def field_cap(lengths: list[int], budget: int) -> int | None:
+    """
+    Return the length the text fields must be cut to so their total fits the budget.
+
+    Fields shorter than their fair share are kept whole and their unused
+    share goes to the longer ones.
+
+    Returns:
+        The common maximum length, or None if the fields already fit
+    """
+    if sum(lengths) <= budget:
+        return None
+    remaining = budget
+    ordered = sorted(lengths)
+    for position, length in enumerate(ordered):
+        share = remaining // (len(ordered) - position)
+        if length > share:
+            return share
+        remaining -= length
+    return None
+
+
+def truncate_fields(value: Any, cap: int) -> Any:
+    """Copy a response, cutting its text fields longer than `cap`."""
+    if isinstance(value, str):
+        if len(value) <= cap:
+            return value
+        return f"{value[:cap]}… [+{len(value) - cap} chars]"
+    if isinstance(value, dict):
+        return {key: truncate_fields(item, cap) for key, item in value.items()}
+    if isinstance(value, list | tuple):
+        return [truncate_fields(item, cap) for item in value]
+    return value
+
+
+def resolve_path(value: Any, path: str) -> Any:
+    """
+    Return the field of a response at a dotted path (`result.3`, `response`).
+
+    Raises:
+        KeyError: If the path does not exist
+    """
+    for part in filter(None, path.split(".")):
+        if isinstance(value, list):
+            if not part.isdigit() or int(part) >= len(value):
+                raise KeyError(path)
+            value = value[int(part)]
+        elif isinstance(value, dict) and part in value:
+            value = value[part]
+        else:
+            raise KeyError(path)
+    return value
+
+
+class ToolResponseBudget:
+    """Truncates oversized tool responses and serves their full text on demand."""
+
+    def __init__(self, max_chars: int, page_chars: int, store: ToolResponseStore, prefix: str):
+        self.max_chars = max_chars
+        self.page_chars = page_chars
+        self.store = store
+        self.prefix = prefix.strip("/")
+        self._payloads: OrderedDict[str, dict[str, Any]] = OrderedDict()
+        self._uploads: dict[str, asyncio.Task] = {}
+        self.truncated = 0
+        self.omitted_chars = 0
+        self.upload_errors = 0
+        self.fetches = 0
+        self.fetch_misses = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_chars > 0
+
+    def _object_name(self, ref: str) -> str:
+        return f"{self.prefix}/{get_current_tenant().tenant_id}/{ref}.json.gz"
+
+    def _remember(self, object_name: str, payload: dict[str, Any]) -> None:
+        self._payloads[object_name] = payload
+        self._payloads.move_to_end(object_name)
+        while len(self._payloads) > MEMORY_CACHE_SIZE:
+            self._payloads.popitem(last=False)
+
+    async def enforce(self, tool_name: str, response: Any) -> dict[str, Any] | None:
+        """
+        Truncate a tool response exceeding the budget and store it in full.
+
+        Args:
+            tool_name: Name of the tool that produced the response
+            response: Tool response (dict, list or text)
+
+        Returns:
+            The truncated response with its `truncation` reference, or None
+            when the response fits the budget (kept as is)
+        """
+        if not self.enabled or tool_name == FETCH_TOOL_NAME:
+            return None
+        payload = response if isinstance(response, dict) else {"result": response}
+        lengths = text_lengths(payload)
+        cap = field_cap(lengths, self.max_chars)
+        if cap is None:
+            return None
+
+        serialized = json.dumps(payload, ensure_ascii=False, default=str).encode("utf-8")
+        ref = hashlib.sha256(serialized).hexdigest()[:32]
+        object_name = self._object_name(ref)
+        if object_name not in self._payloads and object_name not in self._uploads:
+            upload = asyncio.create_task(self._upload(object_name, gzip.compress(serialized)))
+            self._uploads[object_name] = upload
+            upload.add_done_callback(lambda _: self._uploads.pop(object_name, None))
+        self._remember(object_name, payload)
+
+        omitted = sum(length - cap for length in lengths if length > cap)
+        self.truncated += 1
+        self.omitted_chars += omitted
+        logger.info(f"Tool '{tool_name}' response truncated: {omitted} of {sum(lengths)} chars stored as {ref}")
+        return {
+            **truncate_fields(payload, cap),
+            TRUNCATION_KEY: {
+                "ref": ref,
+                "omitted_chars": omitted,
+                "hint": (
+                    f"Long fields were truncated. Call {FETCH_TOOL_NAME} with this ref and the "
+                    "path of a truncated field (e.g. 'result.2') to read it in full if needed."
+                ),
+            },
+        }
+
+    async def _upload(self, object_name: str, payload: bytes) -> None:
+        try:
+            await asyncio.to_thread(self.store.put, object_name, payload)
+        except Exception as e:
+            self.upload_errors += 1
+            logger.warning(f"Failed to store tool response {object_name} ({self.store.name}): {e}")
+
+    async def _load(self, ref: str) -> dict[str, Any] | None:
+        object_name = self._object_name(ref)
+        payload = self._payloads.get(object_name)
+        if payload is not None:
+            return payload
+        upload = self._uploads.get(object_name)
+        if upload is not None:
+            await upload
+        data = await asyncio.to_thread(self.store.get, object_name)
+        if data is None:
+            return None
+        payload = json.loads(gzip.decompress(data))
+        self._remember(object_name, payload)
+        return payload
+
+    async def restore(self, response: dict[str, Any]) -> dict[str, Any]:
+        """
+        Return the full version of a response truncated by `enforce`.
+
+        Returns:
+            The stored full response, or `response` itself when it was not
+            truncated or its full version is no longer stored
+        """
+        truncation = response.get(TRUNCATION_KEY)
+        ref = truncation.get("ref") if isinstance(truncation, dict) else None
+        if not isinstance(ref, str) or not _REF.fullmatch(ref):
+            return response
+        payload = await self._load(ref)
+        return payload if payload is not None else response
+
+    async def fetch(self, ref: str, path: str = "", offset: int = 0) -> dict[str, Any]:
+        """
+        Return one page of a field of a stored full response.
+
+        Args:
+            ref: Reference of the truncated response
+            path: Dotted path of the field (whole response if empty)
+            offset: Character offset of the page
+
+        Returns:
+            The page text, the field's total length and the offset of the
+            next page (None on the last page), or an error
+        """
+        self.fetches += 1
+        # Refs come from the model: only content hashes name stored objects
+        payload = await self._load(ref) if _REF.fullmatch(ref) else None
+        if payload is None:
+            self.fetch_misses += 1
+            return {"status": "error", "error": f"Unknown tool response ref '{ref}'"}
+        try:
+            value = resolve_path(payload, path)
+        except KeyError:
+            return {"status": "error", "error": f"No field '{path}' in tool response '{ref}'"}
+        text = value if isinstance(value, str) else json.dumps(value, ensure_ascii=False, default=str)
+        offset = max(offset, 0)
+        end = offset + self.page_chars
+        return {
+            "status": "success",
+            "ref": ref,
+            "path": path,
+            "offset": offset,
+            "text": text[offset:end],
+            "total_chars": len(text),
+            "next_offset": end if end < len(text) else None,
+        }
+
+    def stats(self) -> dict[str, Any]:
+        """Return the budget, truncation and fetch counters."""
+        return {
+            "max_chars": self.max_chars,
+            "store": self.store.name,
+            "truncated": self.truncated,
+            "omitted_chars": self.omitted_chars,
+            "pending_uploads": len(self._uploads),
+            "upload_errors": self.upload_errors,
+            "fetches": self.fetches,
+            "fetch_misses": self.fetch_misses,
+        }
+
+
+tool_response_budget = ToolResponseBudget(
+    max_chars=settings.TOOL_RESPONSE_MAX_CHARS,
+    page_chars=settings.TOOL_RESPONSE_FETCH_PAGE_CHARS,
+    store=create_tool_response_store(),
+    prefix=settings.TOOL_RESPONSE_PREFIX,
+)
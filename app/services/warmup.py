@@ -0,0 +1,136 @@
+"""
+Startup warm-up of the model and RAG connections.
+
+The first request after a cold start would otherwise pay for DNS, TLS and
+auth token setup on the Vertex AI endpoints. The warm-up stage runs in the
+background right after startup and opens the pooled connections of
+`app.services.connections`:
+
+- model: a metadata call (`models.get`, no tokens) on the shared GenAI client,
+  plus an optional one-token generation (`WARMUP_PRIME_MODEL`)
+- rag: waits for the gRPC channel of the shared RAG client to connect, plus an
+  optional one-passage retrieval (`WARMUP_PRIME_RAG`)
+
+`/health/live` answers as soon as the process serves requests, while
+`/health/ready` only succeeds once the warm-up has completed. A failed step
+does not keep the instance out of rotation: it is reported as degraded and
+the connection is opened by the first request instead.
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import asdict, dataclass, field
+
+import grpc
+from google.cloud.aiplatform_v1.services.vertex_rag_service.transports import (
+    VertexRagServiceGrpcTransport,
+)
+from google.genai import types
+
+from app.config.settings import settings
+from app.services.connections import get_llm, get_rag_client
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class WarmupStep:
+    """Outcome of one warm-up step."""
+
+    status: str = "pending"
+    duration_ms: float | None = None
+    error: str | None = None
+
+
+@dataclass
+class WarmupState:
+    """Progress of the warm-up stage, reported by the readiness endpoint."""
+
+    ready: bool = False
+    status: str = "pending"
+    steps: dict[str, WarmupStep] = field(default_factory=dict)
+
+    def to_dict(self) -> dict:
+        """Return the state as JSON-serializable data."""
+        return asdict(self)
+
+
+warmup_state = WarmupState()
+
+
+async def warm_model() -> None:
+    """Open the model connection, optionally with a one-token generation."""
+    llm = get_llm()
+    await llm.api_client.aio.models.get(model=llm.model)
+    if settings.WARMUP_PRIME_MODEL:
+        await llm.api_client.aio.models.generate_content(
+            model=llm.model,
+            contents="ping",
+            config=types.GenerateContentConfig(max_output_tokens=1),
+        )
+
+
+async def warm_rag() -> None:
+    """Open the RAG connection, optionally with a one-passage retrieval."""
+    # Imported here: the tool module builds the agents' RAG tool at import time.
+    from app.components.tools.custom.vertex_ai_rag_retrieval_tool import (
+        retrieve_contexts,
+    )
+
+    # Only gRPC channels have a connection to open (not REST, nor replayed calls)
+    transport = get_rag_client().transport if settings.RECORDING_MODE != "replay" else None
+    if isinstance(transport, VertexRagServiceGrpcTransport):
+        await asyncio.to_thread(
+            grpc.channel_ready_future(transport.grpc_channel).result,
+            timeout=settings.WARMUP_TIMEOUT_SECONDS,
+        )
+    if settings.WARMUP_PRIME_RAG:
+        await retrieve_contexts("warmup", similarity_top_k=1)
+
+
+WARMUP_STEPS = {
+    "model": warm_model,
+    "rag": warm_rag,
+}
+
+
+async def _run_step(name: str, state: WarmupState) -> None:
+    step = state.steps[name]
+    step.status = "running"
+    started_at = time.perf_counter()
+    try:
+        await asyncio.wait_for(WARMUP_STEPS[name](), timeout=settings.WARMUP_TIMEOUT_SECONDS)
+        step.status = "ok"
+    except Exception as e:
+        step.status = "failed"
+        step.error = f"{type(e).__name__}: {e}"
+        logger.warning(f"Warm-up step '{name}' failed: {step.error}")
+    step.duration_ms = round((time.perf_counter() - started_at) * 1000, 1)
+
+
+async def run_warmup(state: WarmupState = warmup_state) -> WarmupState:
+    """
+    Run every warm-up step concurrently, then mark the instance ready.
+
+    Args:
+        state: State object updated in place
+
+    Returns:
+        The completed warm-up state
+    """
+    state.ready = False
+    state.status = "warming"
+    state.steps = {name: WarmupStep() for name in WARMUP_STEPS}
+
+    started_at = time.perf_counter()
+    await asyncio.gather(*(_run_step(name, state) for name in WARMUP_STEPS))
+
+    failed = [name for name, step in state.steps.items() if step.status == "failed"]
+    state.status = "degraded" if failed else "ok"
+    state.ready = True
+    logger.info(
+        f"Warm-up completed in {(time.perf_counter() - started_at) * 1000:.0f}ms "
+        f"(status={state.status})"
+    )
+    return state
@@ -0,0 +1,47 @@
+"""
+Access to the ADK invocation from agent callbacks.
+
+`CallbackContext` exposes the agent name, the session and the user content,
+but not the running agent itself (ADK 1.21). The callbacks needing the agent
+(its tools and models) go through `get_running_agent`, the only place that
+reads the private `_invocation_context`: an ADK upgrade that renames it
+breaks here, with a clear error, rather than in every callback.
+"""
+
+from google.adk.agents import BaseAgent, LlmAgent
+from google.adk.agents.callback_context import CallbackContext
+
+
+def get_running_agent(callback_context: CallbackContext) -> BaseAgent:
+    """
+    Return the agent whose callback is running.
+
+    Raises:
+        RuntimeError: If the ADK version no longer exposes the invocation context
+    """
+    invocation_context = getattr(callback_context, "_invocation_context", None)
+    if invocation_context is None:
+        raise RuntimeError("CallbackContext has no invocation context: update app.utils.adk_context for this ADK version")
+    return invocation_context.agent
+
+
+def get_agent_models(agent: BaseAgent) -> list[str]:
+    """
+    Return the models of an agent: its own, or those of the LLM agents under it.
+
+    Args:
+        agent: An LLM agent, or a workflow agent (pipeline, fan-out)
+
+    Returns:
+        The sorted model names
+    """
+    if isinstance(agent, LlmAgent):
+        return [agent.canonical_model.model]
+    models: set[str] = set()
+    pending = list(agent.sub_agents)
+    while pending:
+        sub_agent = pending.pop()
+        if isinstance(sub_agent, LlmAgent):
+            models.add(sub_agent.canonical_model.model)
+        pending.extend(sub_agent.sub_agents)
+    return sorted(models)
@@ -3,16 +3,17 @@ Utility to generate agent.json cards for all registered agents.
 
 This module provides functions to automatically generate agent cards
 at application startup with dynamic URLs based on the deployment environment.
+Cards are rendered by the agents' skill contracts (`app.services.skill_contracts`),
+which also compile and check the skill schemas at startup.
 """
 
 import json
 import logging
-import os
 from pathlib import Path
-from typing import Any
 
 from app.config.settings import settings
-from app.config.skills import get_skills_for_agent
+from app.services.agent_discovery import AgentEntry, agent_catalog
+from app.services.skill_contracts import skill_contracts
 
 logger = logging.getLogger(__name__)
 
@@ -23,114 +24,31 @@ def get_agent_directory(agent_name: str) -> Path | None:
 
     Returns None if directory not found.
     """
-    agents_dir = Path(settings.AGENT_DIR)
+    agent_dir = Path(settings.AGENT_DIR) / agent_name
+    return agent_dir if agent_dir.exists() else None
 
-    possible_names = [
-        agent_name,
-        f"{agent_name}_agent",
-    ]
 
-    for name in possible_names:
-        agent_dir = agents_dir / name
-        if agent_dir.exists():
-            return agent_dir
-
-    return None
-
-
-def get_agent_description(agent_name: str, agent_instance: Any) -> str:
-    """
-    Extract description from agent instance or module docstring.
-
-    Priority:
-    1. agent_instance.description attribute
-    2. First line of agent module's docstring
-    3. Default fallback description
-    """
-    if hasattr(agent_instance, 'description') and agent_instance.description:
-        return agent_instance.description
-
-    try:
-        import importlib
-        module_name = f"app.components.agents.{agent_name}.agent"
-        if not module_name.endswith('_agent.agent'):
-            try:
-                module = importlib.import_module(module_name)
-            except ModuleNotFoundError:
-                module_name = f"app.components.agents.{agent_name}_agent.agent"
-                module = importlib.import_module(module_name)
-        else:
-            module = importlib.import_module(module_name)
-
-        if module.__doc__:
-            lines = [line.strip() for line in module.__doc__.strip().split('\n') if line.strip()]
-            if lines:
-                return lines[0]
-    except Exception as e:
-        logger.debug(f"Could not extract description from module docstring for {agent_name}: {e}")
-
-    return f"{agent_name} agent"
-
-
-def generate_agent_card(agent_name: str, agent_instance: Any) -> bool:
+def generate_agent_card(entry: AgentEntry) -> bool:
     """
     Generate agent.json file for a specific agent.
 
+    The file is left untouched when its content is already up to date.
+
     Returns True if successful, False otherwise.
     """
-    service_url = settings.get_agent_url(agent_name)
-
-    if service_url.startswith("http://localhost"):
-        k_service = os.getenv("K_SERVICE")
-        if k_service:
-            region = settings.GOOGLE_CLOUD_LOCATION
-            service_url = f"https://{k_service}-HASH-{region}.a.run.app"
-
-    description = get_agent_description(agent_name, agent_instance)
-
-    try:
-        agent_skills = get_skills_for_agent(agent_name)
-        skills_list = []
-        for skill in agent_skills:
-            if hasattr(skill, 'to_dict'):
-                skill_dict = skill.to_dict()
-            else:
-                skill_dict = {
-                    "id": skill.id,
-                    "name": skill.name,
-                    "description": skill.description,
-                    "tags": skill.tags,
-                    "examples": skill.examples if skill.examples else [],
-                }
-            skills_list.append(skill_dict)
-        schemas_count = sum(1 for s in skills_list if "inputSchema" in s and "outputSchema" in s)
-        logger.info(f"  • Loaded {len(skills_list)} skills for {agent_name} ({schemas_count} with schemas)")
-    except ValueError as e:
-        logger.warning(f"  • No skills configured for {agent_name}: {e}")
-        skills_list = []
-
-    agent_card = {
-        "name": agent_name,
-        "url": service_url,
-        "description": description,
-        "version": "1.0.0",
-        "capabilities": {},
-        "skills": skills_list,
-        "defaultInputModes": ["text/plain"],
-        "defaultOutputModes": ["text/plain"],
-        "supportsAuthenticatedExtendedCard": False,
-    }
-
-    agent_dir = get_agent_directory(agent_name)
+    agent_dir = get_agent_directory(entry.name)
     if not agent_dir:
-        logger.warning(f"Could not find directory for agent '{agent_name}', skipping card generation")
+        logger.warning(f"Could not find directory for agent '{entry.name}', skipping card generation")
         return False
 
     agent_json_path = agent_dir / "agent.json"
+    content = json.dumps(skill_contracts.get(entry.name).card, indent=2)
 
     try:
-        with open(agent_json_path, "w") as f:
-            json.dump(agent_card, f, indent=2)
+        if agent_json_path.is_file() and agent_json_path.read_text() == content:
+            logger.info(f"✓ {agent_json_path.name} of {entry.name} up to date")
+            return True
+        agent_json_path.write_text(content)
         try:
             display_path = agent_json_path.relative_to(Path.cwd())
         except ValueError:
@@ -144,19 +62,16 @@ def generate_agent_card(agent_name: str, agent_instance: Any) -> bool:
 
 
 def generate_all_agent_cards() -> None:
-    """Generate agent.json files for all registered agents."""
-
-    from app.components.agents.registry import get_all_agents
+    """Generate agent.json files for all discovered agents."""
 
-    agents = get_all_agents()
+    entries = agent_catalog.entries()
 
     logger.info("Generating agent cards with custom URLs...")
 
     success_count = 0
-    for agent_name, agent_instance in agents.items():
-        agent_url = settings.get_agent_url(agent_name)
-        logger.info(f"  • {agent_name}: {agent_url}")
-        if generate_agent_card(agent_name, agent_instance):
+    for agent_name, entry in entries.items():
+        logger.info(f"  • {agent_name}: {entry.url}")
+        if generate_agent_card(entry):
             success_count += 1
 
-    logger.info(f"✓ Generated {success_count}/{len(agents)} agent cards successfully")
+    logger.info(f"✓ Generated {success_count}/{len(entries)} agent cards successfully")
@@ -11,6 +11,11 @@ class ErrorCode(Enum):
     INVALID_INPUT = 1001
     CONFIGURATION_ERROR = 1002
     INSTRUCTION_ERROR = 1003
+    SERVICE_OVERLOADED = 1004
+    UNAUTHORIZED = 1005
+    CONFLICT = 1006
+    QUOTA_EXCEEDED = 1007
+    PAYLOAD_TOO_LARGE = 1008
     TOOL_EXECUTION_ERROR = 3001
 
 
@@ -19,6 +24,11 @@ HTTP_STATUS_CODES = {
     ErrorCode.INVALID_INPUT: 400,
     ErrorCode.CONFIGURATION_ERROR: 500,
     ErrorCode.INSTRUCTION_ERROR: 500,
+    ErrorCode.SERVICE_OVERLOADED: 503,
+    ErrorCode.UNAUTHORIZED: 401,
+    ErrorCode.CONFLICT: 409,
+    ErrorCode.QUOTA_EXCEEDED: 429,
+    ErrorCode.PAYLOAD_TOO_LARGE: 413,
     ErrorCode.TOOL_EXECUTION_ERROR: 502,
 }
 
@@ -28,6 +38,11 @@ ERROR_MESSAGES = {
     ErrorCode.INVALID_INPUT: "Invalid input provided",
     ErrorCode.CONFIGURATION_ERROR: "Configuration error",
     ErrorCode.INSTRUCTION_ERROR: "Instruction loading or rendering failed",
+    ErrorCode.SERVICE_OVERLOADED: "Service overloaded, retry later",
+    ErrorCode.UNAUTHORIZED: "Missing or invalid credentials",
+    ErrorCode.CONFLICT: "Operation already in progress",
+    ErrorCode.QUOTA_EXCEEDED: "Tenant quota exceeded, retry later",
+    ErrorCode.PAYLOAD_TOO_LARGE: "Request body too large",
     ErrorCode.TOOL_EXECUTION_ERROR: "Tool execution failed",
 }
 
@@ -85,3 +100,23 @@ class InstructionError(AppError):
 
 class ToolExecutionError(AppError):
     """Raised when tool execution fails."""
+
+
+class ServiceOverloadedError(AppError):
+    """Raised when a request is shed because the instance is at capacity."""
+
+
+class UnauthorizedError(AppError):
+    """Raised when a request lacks valid credentials."""
+
+
+class ConflictError(AppError):
+    """Raised when an exclusive operation is already running."""
+
+
+class QuotaExceededError(AppError):
+    """Raised when a tenant exceeds its quotas."""
+
+
+class PayloadTooLargeError(AppError):
+    """Raised when a request body exceeds the size a handler buffers."""
@@ -0,0 +1,134 @@
+"""Load shedding middleware for agent runs."""
+
+import logging
+import time
+
+import orjson
+from fastapi.responses import ORJSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.config.settings import settings
+from app.services.concurrency_limiter import AdaptiveConcurrencyLimiter
+from app.utils.error import ErrorCode, ServiceOverloadedError
+
+logger = logging.getLogger(__name__)
+
+AGENT_RUN_PATHS = ("/run", "/run_sse")
+A2A_PATH_PREFIX = "/a2a/"
+# JSON-RPC methods of the A2A calls sending a user message (the others,
+# `tasks/get`, `tasks/cancel`, push notification configs, do not run the agent)
+MESSAGE_METHODS = ("message/send", "message/stream")
+# Scope key of the JSON-RPC method, parsed once per request
+JSONRPC_METHOD_SCOPE_KEY = "a2a.jsonrpc_method"
+
+
+async def read_body(receive: Receive, max_bytes: int | None = None) -> bytes | None:
+    """Read the request body, or return None once it exceeds `max_bytes`."""
+    chunks = []
+    size = 0
+    while True:
+        message = await receive()
+        if message["type"] != "http.request":
+            break
+        chunk = message.get("body", b"")
+        size += len(chunk)
+        if max_bytes is not None and size > max_bytes:
+            return None
+        chunks.append(chunk)
+        if not message.get("more_body"):
+            break
+    return b"".join(chunks)
+
+
+def replay_body(body: bytes, receive: Receive) -> Receive:
+    """Return a receive channel replaying a consumed body, then forwarding `receive`."""
+    replayed = False
+
+    async def replay() -> Message:
+        nonlocal replayed
+        if replayed:
+            return await receive()
+        replayed = True
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    return replay
+
+
+async def starts_agent_run(scope: Scope, receive: Receive) -> tuple[bool, Receive]:
+    """
+    Whether the request starts an agent run, and the receive channel to pass on.
+
+    Only agent runs (`POST /run`, `POST /run_sse` and A2A `message/send` and
+    `message/stream` calls) are limited. Other A2A JSON-RPC calls, health
+    checks, agent cards, sessions and the web UI are exempt.
+
+    The JSON-RPC method of an A2A call is read from its body, which the
+    returned channel replays; it is kept in the scope for the next middlewares.
+    """
+    if scope["type"] != "http" or scope["method"] != "POST":
+        return False, receive
+    path = scope["path"]
+    if path in AGENT_RUN_PATHS:
+        return True, receive
+    if not path.startswith(A2A_PATH_PREFIX):
+        return False, receive
+
+    if JSONRPC_METHOD_SCOPE_KEY not in scope:
+        body = await read_body(receive) or b""
+        try:
+            request = orjson.loads(body)
+        except orjson.JSONDecodeError:
+            # Malformed JSON-RPC: the A2A application reports it
+            request = None
+        scope[JSONRPC_METHOD_SCOPE_KEY] = request.get("method") if isinstance(request, dict) else None
+        receive = replay_body(body, receive)
+    return scope[JSONRPC_METHOD_SCOPE_KEY] in MESSAGE_METHODS, receive
+
+
+class LoadSheddingMiddleware:
+    """Pure ASGI middleware rejecting agent runs above the adaptive limit."""
+
+    def __init__(self, app: ASGIApp, limiter: AdaptiveConcurrencyLimiter):
+        self.app = app
+        self.limiter = limiter
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        agent_run, receive = await starts_agent_run(scope, receive)
+        if not agent_run:
+            await self.app(scope, receive, send)
+            return
+
+        if not await self.limiter.acquire():
+            await self._reject(scope, receive, send)
+            return
+
+        status_code = 500
+        started_at = time.perf_counter()
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            latency = time.perf_counter() - started_at if status_code < 500 else None
+            await self.limiter.release(latency)
+
+    async def _reject(self, scope: Scope, receive: Receive, send: Send) -> None:
+        retry_after = self.limiter.retry_after_seconds()
+        error = ServiceOverloadedError(
+            error_code=ErrorCode.SERVICE_OVERLOADED,
+            details={"limit": int(self.limiter.limit), "retry_after_seconds": retry_after},
+        )
+        error.status_code = settings.LOAD_SHEDDING_STATUS_CODE
+        logger.debug(f"Shedding {scope['path']}: {self.limiter.in_flight} runs in flight")
+
+        response = ORJSONResponse(
+            content=error.to_dict(),
+            status_code=error.status_code,
+            headers={"Retry-After": str(retry_after)},
+        )
+        await response(scope, receive, send)
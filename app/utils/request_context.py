@@ -0,0 +1,50 @@
+"""
+Per-request context propagated from the HTTP layer to agents and callbacks.
+
+ADK runs agents inside the task serving the HTTP request (or in tasks spawned
+from it), so values stored in a ContextVar by the ASGI middleware below are
+visible from agent callbacks and tools without threading them through ADK.
+"""
+
+from contextvars import ContextVar
+
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.config.settings import settings
+
+_request_headers: ContextVar[Headers | None] = ContextVar(
+    "request_headers", default=None
+)
+
+
+def get_request_header(name: str) -> str | None:
+    """Return a header of the HTTP request being served, if any."""
+    headers = _request_headers.get()
+    if headers is None:
+        return None
+    return headers.get(name)
+
+
+def is_response_cache_bypassed() -> bool:
+    """Whether the current request asked to bypass the response cache."""
+    value = get_request_header(settings.RESPONSE_CACHE_BYPASS_HEADER)
+    return value is not None and value.strip().lower() in {"bypass", "no-cache", "1", "true"}
+
+
+class RequestContextMiddleware:
+    """Pure ASGI middleware exposing request headers through a ContextVar."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        token = _request_headers.set(Headers(scope=scope))
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _request_headers.reset(token)
@@ -0,0 +1,49 @@
+"""
+orjson-backed JSON responses.
+
+The application's own routers return `ORJSONResponse`. The routes created by
+ADK (`/run`, sessions, artifacts, eval...) are declared with FastAPI's
+default `JSONResponse`, which renders with the standard `json` module after
+FastAPI has converted the return value (e.g. the `list[Event]` of `/run`)
+to plain Python data. `use_orjson_responses` switches those routes to
+`ORJSONResponse`, so that final encoding step runs in orjson.
+
+Streaming routes (`/run_sse`) and the A2A routes build their responses
+themselves and are left untouched: ADK writes each SSE event with a single
+pydantic-core `model_dump_json` call.
+"""
+
+import logging
+
+from fastapi import FastAPI
+from fastapi.datastructures import DefaultPlaceholder
+from fastapi.responses import ORJSONResponse
+from fastapi.routing import APIRoute, request_response
+
+logger = logging.getLogger(__name__)
+
+
+def use_orjson_responses(app: FastAPI) -> int:
+    """
+    Render the JSON responses of the app's routes with orjson.
+
+    Only routes using the default response class are changed; routes with an
+    explicit response class, or returning a `Response` themselves, behave as
+    before.
+
+    Args:
+        app: FastAPI application, with its routes already registered
+
+    Returns:
+        Number of routes switched to `ORJSONResponse`
+    """
+    switched = 0
+    for route in app.router.routes:
+        if isinstance(route, APIRoute) and isinstance(route.response_class, DefaultPlaceholder):
+            route.response_class = ORJSONResponse
+            # The request handler captures the response class when the route is
+            # built, rebuild it the way APIRoute.__init__ does
+            route.app = request_response(route.get_route_handler())
+            switched += 1
+    logger.info(f"Rendering {switched} API routes with orjson")
+    return switched
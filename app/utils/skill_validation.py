@@ -0,0 +1,106 @@
+"""Validation of A2A messages against the skill schemas, and precomputed agent cards."""
+
+import logging
+
+import orjson
+from a2a.types import InvalidParamsError, JSONRPCErrorResponse
+from a2a.utils.constants import AGENT_CARD_WELL_KNOWN_PATH
+from fastapi.responses import ORJSONResponse, Response
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.config.settings import settings
+from app.services.skill_contracts import AgentContract, SkillContracts, message_instance
+from app.utils.error import ErrorCode, PayloadTooLargeError
+from app.utils.load_shedding import (
+    A2A_PATH_PREFIX,
+    MESSAGE_METHODS,
+    read_body,
+    replay_body,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class SkillValidationMiddleware:
+    """
+    Pure ASGI middleware applying the agents' skill contracts to A2A requests.
+
+    - Agent cards are served from the contract, serialized once.
+    - With `SKILL_VALIDATION_ENABLED`, messages sent to an agent
+      (`message/send`, `message/stream`) that no skill input schema accepts
+      are rejected with a JSON-RPC invalid params error, before the agent runs.
+      Their body is buffered for the validation, up to
+      `SKILL_VALIDATION_MAX_BODY_BYTES` (413 above).
+    """
+
+    def __init__(self, app: ASGIApp, contracts: SkillContracts):
+        self.app = app
+        self.contracts = contracts
+
+    def _contract(self, app_name: str) -> AgentContract | None:
+        try:
+            return self.contracts.get(app_name)
+        except KeyError:
+            return None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        path = scope["path"] if scope["type"] == "http" else ""
+        if not path.startswith(A2A_PATH_PREFIX):
+            await self.app(scope, receive, send)
+            return
+
+        if scope["method"] == "GET" and path.endswith(AGENT_CARD_WELL_KNOWN_PATH):
+            contract = self._contract(path[len(A2A_PATH_PREFIX) : -len(AGENT_CARD_WELL_KNOWN_PATH)])
+            if contract is None:
+                await self.app(scope, receive, send)
+                return
+            await Response(content=contract.card_json, media_type="application/json")(scope, receive, send)
+            return
+
+        contract = self._contract(path[len(A2A_PATH_PREFIX) :].strip("/"))
+        if not settings.SKILL_VALIDATION_ENABLED or scope["method"] != "POST" or contract is None:
+            await self.app(scope, receive, send)
+            return
+
+        body = await read_body(receive, settings.SKILL_VALIDATION_MAX_BODY_BYTES)
+        if body is None:
+            too_large = PayloadTooLargeError(
+                error_code=ErrorCode.PAYLOAD_TOO_LARGE,
+                details={"max_bytes": settings.SKILL_VALIDATION_MAX_BODY_BYTES},
+            )
+            logger.info(f"Rejecting A2A message to {contract.name}: body over {settings.SKILL_VALIDATION_MAX_BODY_BYTES} bytes")
+            await ORJSONResponse(content=too_large.to_dict(), status_code=too_large.status_code)(scope, receive, send)
+            return
+
+        errors, request_id = self._validate(contract, body)
+        if errors:
+            logger.info(f"Rejecting A2A message to {contract.name}: {'; '.join(errors)}")
+            error = JSONRPCErrorResponse(
+                id=request_id,
+                error=InvalidParamsError(message="Message does not match the agent's skills", data={"errors": errors}),
+            )
+            response = Response(
+                content=orjson.dumps(error.model_dump(mode="json", exclude_none=True)),
+                media_type="application/json",
+            )
+            await response(scope, receive, send)
+            return
+
+        # The body was consumed: replay it to the A2A application
+        await self.app(scope, replay_body(body, receive), send)
+
+    @staticmethod
+    def _validate(contract: AgentContract, body: bytes) -> tuple[list[str], str | int | None]:
+        """Return the schema errors of a JSON-RPC message request and its id."""
+        try:
+            request = orjson.loads(body)
+        except orjson.JSONDecodeError:
+            # Malformed JSON-RPC: the A2A application reports it
+            return [], None
+        if not isinstance(request, dict) or request.get("method") not in MESSAGE_METHODS:
+            return [], None
+        params = request.get("params")
+        message = params.get("message") if isinstance(params, dict) else None
+        if not isinstance(message, dict):
+            return [], None
+        return contract.validate_input(message_instance(message)), request.get("id")
@@ -0,0 +1,139 @@
+"""Tenant resolution, agent card URLs and quotas for multi-tenant deployments."""
+
+import logging
+
+import orjson
+from a2a.utils.constants import AGENT_CARD_WELL_KNOWN_PATH
+from fastapi.responses import ORJSONResponse, Response
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.config.settings import settings
+from app.services.skill_contracts import skill_contracts
+from app.services.tenants import (
+    DEFAULT_TENANT_ID,
+    TenantConfig,
+    TenantQuotas,
+    tenant_registry,
+)
+from app.utils.error import (
+    AppError,
+    ErrorCode,
+    InvalidInputError,
+    QuotaExceededError,
+    UnauthorizedError,
+)
+from app.utils.load_shedding import A2A_PATH_PREFIX, starts_agent_run
+
+logger = logging.getLogger(__name__)
+
+
+class TenantMiddleware:
+    """
+    Pure ASGI middleware applying the tenant of each request.
+
+    - Requests naming an unknown tenant are rejected with 400, and requests
+      naming a tenant without one of its API keys with 401 (unless
+      `TENANT_HEADER_TRUSTED`).
+    - Agent cards are served with the tenant's A2A URL, when it has one.
+    - Agent runs are admitted against the tenant's quotas, or rejected with
+      429 and `Retry-After`.
+    """
+
+    def __init__(self, app: ASGIApp, quotas: TenantQuotas):
+        self.app = app
+        self.quotas = quotas
+        self._cards: dict[tuple[str, str], bytes] = {}
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = Headers(scope=scope)
+        tenant_id = headers.get(settings.TENANT_HEADER) or DEFAULT_TENANT_ID
+        try:
+            tenant = tenant_registry.get(tenant_id)
+        except KeyError:
+            invalid = InvalidInputError(
+                error_code=ErrorCode.INVALID_INPUT,
+                message=f"Unknown tenant '{tenant_id}'",
+                details={"header": settings.TENANT_HEADER},
+            )
+            await self._error(invalid, scope, receive, send)
+            return
+
+        if not self._is_authenticated(headers, tenant):
+            unauthorized = UnauthorizedError(
+                error_code=ErrorCode.UNAUTHORIZED,
+                message=f"Missing or invalid API key for tenant '{tenant_id}'",
+                details={"header": settings.TENANT_API_KEY_HEADER},
+            )
+            await self._error(unauthorized, scope, receive, send)
+            return
+
+        card = self._agent_card(scope, tenant)
+        if card is not None:
+            await Response(content=card, media_type="application/json")(scope, receive, send)
+            return
+
+        agent_run, receive = await starts_agent_run(scope, receive)
+        if not agent_run:
+            await self.app(scope, receive, send)
+            return
+
+        quota = self.quotas.acquire(tenant)
+        if quota is not None:
+            retry_after = self.quotas.retry_after_seconds(tenant.tenant_id, quota)
+            exceeded = QuotaExceededError(
+                error_code=ErrorCode.QUOTA_EXCEEDED,
+                details={"tenant": tenant.tenant_id, "quota": quota, "retry_after_seconds": retry_after},
+            )
+            logger.debug(f"Rejecting {scope['path']} of tenant '{tenant.tenant_id}': {quota} quota")
+            await self._error(exceeded, scope, receive, send, headers={"Retry-After": str(retry_after)})
+            return
+
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.quotas.release(tenant.tenant_id)
+
+    @staticmethod
+    def _is_authenticated(headers: Headers, tenant: TenantConfig) -> bool:
+        """Whether the request may act as `tenant`: the default one, or with one of its API keys."""
+        if tenant.tenant_id == DEFAULT_TENANT_ID or settings.TENANT_HEADER_TRUSTED:
+            return True
+        api_key = headers.get(settings.TENANT_API_KEY_HEADER)
+        return api_key is not None and tenant.is_api_key(api_key)
+
+    def _agent_card(self, scope: Scope, tenant: TenantConfig) -> bytes | None:
+        """Return the agent card requested with the tenant's URL, if it overrides it."""
+        path = scope["path"]
+        if scope["method"] != "GET" or not (
+            path.startswith(A2A_PATH_PREFIX) and path.endswith(AGENT_CARD_WELL_KNOWN_PATH)
+        ):
+            return None
+        app_name = path[len(A2A_PATH_PREFIX) : -len(AGENT_CARD_WELL_KNOWN_PATH)]
+        url = tenant.agent_url(app_name)
+        if url is None:
+            return None
+
+        key = (app_name, tenant.tenant_id)
+        if key not in self._cards:
+            try:
+                card = skill_contracts.get(app_name).card
+            except KeyError:
+                return None
+            self._cards[key] = orjson.dumps({**card, "url": url})
+        return self._cards[key]
+
+    async def _error(
+        self,
+        error: AppError,
+        scope: Scope,
+        receive: Receive,
+        send: Send,
+        headers: dict[str, str] | None = None,
+    ) -> None:
+        response = ORJSONResponse(content=error.to_dict(), status_code=error.status_code, headers=headers)
+        await response(scope, receive, send)
@@ -0,0 +1,121 @@
+"""
+Agent discovery benchmark: index build time, cold vs from the manifest.
+
+Generates `--agents` synthetic agents (an `LlmAgent` and a skills module
+each) in a temporary package, plus the application's own agents, and times
+`AgentCatalog.entries()` in a fresh interpreter per run:
+
+- `cold`: no manifest, every agent and skills module is imported
+- `warm`: manifest written by the cold run, entries reused (sources hashed only)
+
+Usage:
+    uv run python -m benchmarks.bench_agent_discovery --agents 2 10 50
+"""
+
+import argparse
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+AGENT_SOURCE = '''"""Synthetic agent {index}."""
+
+from google.adk.agents import LlmAgent
+
+from app.config.skills import get_skills_for_agent
+
+root_agent = LlmAgent(
+    name="agent_{index}",
+    model="gemini-2.5-flash",
+    description="Synthetic agent {index}",
+    instruction="Skills: " + ", ".join(skill.id for skill in get_skills_for_agent("agent_{index}")),
+)
+'''
+SKILLS_SOURCE = '''from a2a.types import AgentSkill
+
+AGENT_{index}_SKILLS = [
+    AgentSkill(id="skill_{index}", name="Skill {index}", description="Synthetic skill", tags=["bench"]),
+]
+'''
+
+
+def write_agents(root: Path, count: int) -> None:
+    """Write `count` agent packages and their skills packages under `root`."""
+    for package in ("bench_agents", "bench_skills"):
+        (root / package).mkdir(parents=True, exist_ok=True)
+        (root / package / "__init__.py").write_text("")
+    for index in range(count):
+        agent_dir = root / "bench_agents" / f"agent_{index}"
+        skills_dir = root / "bench_skills" / f"agent_{index}"
+        for directory in (agent_dir, skills_dir):
+            directory.mkdir(exist_ok=True)
+            (directory / "__init__.py").write_text("")
+        (agent_dir / "agent.py").write_text(AGENT_SOURCE.format(index=index))
+        (skills_dir / f"agent_{index}_skills.py").write_text(SKILLS_SOURCE.format(index=index))
+
+
+def child(root: str | None, manifest: str) -> None:
+    """Build the index once and print the elapsed milliseconds."""
+    import app.config.skills as skills_config
+    from app.services import agent_discovery
+
+    if root is None:
+        catalog = agent_discovery.agent_catalog
+        catalog.manifest_path = Path(manifest)
+    else:
+        sys.path.insert(0, root)
+        catalog = agent_discovery.AgentCatalog(
+            agents_dir=Path(root) / "bench_agents",
+            agents_package="bench_agents",
+            skills_dir=Path(root) / "bench_skills",
+            skills_package="bench_skills",
+            manifest_path=Path(manifest),
+        )
+        # Synthetic agents look their skills up through the same catalog
+        skills_config.agent_catalog = catalog
+    started_at = time.perf_counter()
+    entries = catalog.entries()
+    elapsed = time.perf_counter() - started_at
+    print(f"{elapsed * 1000:.1f} {len(entries)} {catalog.manifest_hits}")
+
+
+def run(root: str | None, manifest: Path) -> tuple[float, int, int]:
+    """Time an index build in a fresh interpreter."""
+    command = [sys.executable, "-m", "benchmarks.bench_agent_discovery", "--child", "--manifest", str(manifest)]
+    if root is not None:
+        command += ["--root", root]
+    output = subprocess.run(command, check=True, capture_output=True, text=True).stdout.split()
+    return float(output[0]), int(output[1]), int(output[2])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--agents", type=int, nargs="+", default=[2, 10, 50])
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--root", help=argparse.SUPPRESS)
+    parser.add_argument("--manifest", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(args.root, args.manifest)
+        return
+
+    print(f"{'agents':<14} {'cold':>10} {'warm':>10}")
+    with tempfile.TemporaryDirectory(prefix="bench-discovery-") as directory:
+        cases: list[tuple[str, str | None]] = [("application", None)]
+        for count in args.agents:
+            agents_root = Path(directory) / f"agents-{count}"
+            write_agents(agents_root, count)
+            cases.append((f"synthetic {count}", str(agents_root)))
+
+        for label, root in cases:
+            manifest = Path(directory) / f"{label.replace(' ', '-')}.json"
+            cold_ms, agents, _ = run(root, manifest)
+            warm_ms, _, hits = run(root, manifest)
+            assert hits == agents, f"{label}: {hits}/{agents} entries reused from the manifest"
+            print(f"{label:<14} {cold_ms:8.0f}ms {warm_ms:8.0f}ms  ({agents} agents)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+JSON response micro-benchmark: starlette's `JSONResponse` vs `ORJSONResponse`.
+
+Payloads:
+- `run`: the `/run` response of a training-script session (`--events`
+  events converted by FastAPI from `list[Event]`, as it does before
+  rendering)
+- `card`: the quizz_agent agent card
+- `script`: a single large generated training script (`--script-kb`)
+
+For each payload, reports the render time of both classes and checks that
+they produce the same JSON. Then measures a full `/run`-shaped route
+through FastAPI (validation, conversion and rendering) before and after
+`use_orjson_responses`.
+
+Usage:
+    uv run python -m benchmarks.bench_json --events 200
+"""
+
+import argparse
+import json
+import time
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse, ORJSONResponse
+from fastapi.testclient import TestClient
+from google.adk.events import Event
+from pydantic import TypeAdapter
+
+from app.utils.responses import use_orjson_responses
+from benchmarks.bench_session_storage import make_event
+
+CARD_PATH = Path("app/components/agents/quizz_agent/agent.json")
+SCRIPT_PARAGRAPH = (
+    "## Séquence pédagogique\n\nDans cette séquence, l'apprenant découvre les notions clés "
+    "du module, illustrées par des exemples concrets et des mises en situation. "
+)
+
+
+def best_of(function: Callable[[], object], repeat: int) -> float:
+    """Best wall time of `function` over `repeat` runs, in milliseconds."""
+    timings = []
+    for _ in range(repeat):
+        started_at = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - started_at)
+    return min(timings) * 1000
+
+
+def bench_render(label: str, content: Any, repeat: int) -> None:
+    """Compare the render time of both response classes on `content`."""
+    standard = JSONResponse(content).body
+    fast = ORJSONResponse(content).body
+    assert json.loads(standard) == json.loads(fast), f"{label}: outputs differ"
+    standard_ms = best_of(lambda: JSONResponse(content), repeat)
+    fast_ms = best_of(lambda: ORJSONResponse(content), repeat)
+    print(
+        f"{label:<8} {len(standard) / 1024:8.1f} KiB  json {standard_ms:8.3f} ms  "
+        f"orjson {fast_ms:8.3f} ms  x{standard_ms / fast_ms:5.1f}"
+    )
+
+
+def bench_route(events: list[Event], requests: int) -> None:
+    """Time a `/run`-shaped route with the default and the orjson response class."""
+    for label in ("json", "orjson"):
+        app = FastAPI()
+
+        @app.post("/run", response_model_exclude_none=True)
+        async def run() -> list[Event]:
+            return events
+
+        if label == "orjson":
+            use_orjson_responses(app)
+        with TestClient(app) as client:
+            client.post("/run")
+            started_at = time.perf_counter()
+            for _ in range(requests):
+                client.post("/run")
+            elapsed = time.perf_counter() - started_at
+        print(f"route    {label:<6} {elapsed / requests * 1000:8.2f} ms/request")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--events", type=int, default=200)
+    parser.add_argument("--script-kb", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--requests", type=int, default=50)
+    args = parser.parse_args()
+
+    events = [make_event(index) for index in range(args.events)]
+    run_content = TypeAdapter(list[Event]).dump_python(events, mode="json", exclude_none=True, by_alias=True)
+    script = SCRIPT_PARAGRAPH * (args.script_kb * 1024 // len(SCRIPT_PARAGRAPH))
+
+    bench_render("run", run_content, args.repeat)
+    bench_render("card", json.loads(CARD_PATH.read_text()), args.repeat)
+    bench_render("script", {"author": "training_script_agent", "text": script}, args.repeat)
+    bench_route(events, args.requests)
+
+
+if __name__ == "__main__":
+    main()
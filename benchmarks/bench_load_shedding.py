@@ -0,0 +1,137 @@
+"""
+Overload benchmark of the load shedding middleware.
+
+Starts the stub model (`benchmarks.stub_vertex`) with a bounded capacity, so
+that generations queue up like on a saturated Gemini endpoint, then runs the
+server twice, with and without load shedding, under the same closed-loop
+load of `/run` calls. Each client gives up after `--client-timeout` seconds.
+
+Without shedding, every run is accepted and waits behind the stub's queue
+until clients time out: goodput collapses. With shedding, excess runs are
+rejected immediately with `Retry-After` while accepted runs keep a bounded
+latency.
+
+Usage:
+    uv run python -m benchmarks.bench_load_shedding --clients 64 --capacity 8
+"""
+
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import time
+import uuid
+from collections import Counter
+
+import httpx
+
+from benchmarks.processes import stop, wait_until_ready
+
+
+async def _client_loop(base_url: str, deadline: float, timeout: float, results: list) -> None:
+    async with httpx.AsyncClient(base_url=base_url, timeout=timeout) as client:
+        while time.perf_counter() < deadline:
+            session_id = uuid.uuid4().hex
+            await client.post(f"/apps/quizz_agent/users/bench/sessions/{session_id}", json={})
+            started_at = time.perf_counter()
+            outcome: int | str
+            try:
+                response = await client.post(
+                    "/run",
+                    json={
+                        "app_name": "quizz_agent",
+                        "user_id": "bench",
+                        "session_id": session_id,
+                        "new_message": {"role": "user", "parts": [{"text": "Explique la notion de quiz."}]},
+                    },
+                )
+                outcome = response.status_code
+                if outcome in (429, 503):
+                    await asyncio.sleep(min(float(response.headers.get("Retry-After", 1)), 1.0))
+            except httpx.TimeoutException:
+                outcome = "timeout"
+            results.append((outcome, time.perf_counter() - started_at))
+
+
+async def drive(base_url: str, clients: int, duration: float, timeout: float) -> list:
+    """Run `clients` closed-loop clients for `duration` seconds."""
+    results: list = []
+    deadline = time.perf_counter() + duration
+    await asyncio.gather(*(_client_loop(base_url, deadline, timeout, results) for _ in range(clients)))
+    return results
+
+
+def summarize(label: str, results: list, duration: float) -> None:
+    """Print goodput, outcome counts and latency of successful runs."""
+    outcomes = Counter(outcome for outcome, _ in results)
+    latencies = sorted(latency for outcome, latency in results if outcome == 200)
+    p50 = latencies[len(latencies) // 2] if latencies else float("nan")
+    p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))] if latencies else float("nan")
+    print(
+        f"{label:<14} goodput={len(latencies) / duration:6.2f} req/s  "
+        f"p50={p50:6.2f}s  p95={p95:6.2f}s  outcomes={dict(outcomes)}"
+    )
+
+
+def run_scenario(shedding: bool, args: argparse.Namespace) -> None:
+    """Start the server with or without load shedding and drive the load."""
+    env = {
+        **os.environ,
+        "GOOGLE_GENAI_USE_VERTEXAI": "false",
+        "GOOGLE_API_KEY": "stub",
+        "MODEL_BASE_URL": f"http://127.0.0.1:{args.stub_port}",
+        "RAG_API_ENDPOINT": f"http://127.0.0.1:{args.stub_port}",
+        "RAG_API_TRANSPORT": "rest",
+        "CONTEXT_CACHE_ENABLED": "false",
+        "SESSION_SERVICE_URI": "memory://",
+        "LOG_LEVEL": "WARNING",
+        "LOAD_SHEDDING_ENABLED": str(shedding).lower(),
+        "LOAD_SHEDDING_INITIAL_LIMIT": str(args.initial_limit),
+        "LOAD_SHEDDING_MIN_LIMIT": "2",
+    }
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(args.port), "--log-level", "warning"],
+        env=env,
+    )
+    base_url = f"http://127.0.0.1:{args.port}"
+    try:
+        wait_until_ready(f"{base_url}/health/ready", 120)
+        results = asyncio.run(drive(base_url, args.clients, args.duration, args.client_timeout))
+        summarize("shedding" if shedding else "no shedding", results, args.duration)
+        if shedding:
+            print(f"{'':<14} limiter={httpx.get(f'{base_url}/metrics/concurrency').json()}")
+    finally:
+        stop(server)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clients", type=int, default=64, help="Concurrent closed-loop clients")
+    parser.add_argument("--duration", type=float, default=30.0)
+    parser.add_argument("--client-timeout", type=float, default=5.0)
+    parser.add_argument("--latency", type=float, default=0.5, help="Stub generation latency (s)")
+    parser.add_argument("--capacity", type=int, default=8, help="Stub concurrent generations")
+    parser.add_argument("--initial-limit", type=int, default=32)
+    parser.add_argument("--port", type=int, default=8099)
+    parser.add_argument("--stub-port", type=int, default=9090)
+    args = parser.parse_args()
+
+    stub = subprocess.Popen(
+        [
+            sys.executable, "-m", "benchmarks.stub_vertex",
+            "--port", str(args.stub_port),
+            "--latency", str(args.latency),
+            "--capacity", str(args.capacity),
+        ]
+    )
+    try:
+        wait_until_ready(f"http://127.0.0.1:{args.stub_port}/_stats", 30)
+        for shedding in (False, True):
+            run_scenario(shedding, args)
+    finally:
+        stop(stub)
+
+
+if __name__ == "__main__":
+    main()
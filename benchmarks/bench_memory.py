@@ -0,0 +1,151 @@
+"""
+Memory benchmark of multi-turn sessions.
+
+Starts the stub model (`benchmarks.stub_vertex`) and the server with memory
+tracking on, plays `--sessions` conversations of `--turns` turns each, then
+reports from the debug endpoints:
+
+- resident memory before and after the load
+- traced allocation growth since startup and the top allocation sites
+- the approximate size of a session, per event and per tool response
+
+With `--max-bytes-per-session` or `--max-growth-mb`, the script exits with
+status 1 when the measurement exceeds the budget, so memory regressions can
+fail a CI job.
+
+Usage:
+    uv run python -m benchmarks.bench_memory --sessions 50 --turns 5
+"""
+
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import uuid
+
+import httpx
+
+from benchmarks.processes import stop, wait_until_ready
+
+DEBUG_TOKEN = uuid.uuid4().hex
+
+
+async def _play_session(client: httpx.AsyncClient, agent: str, turns: int, semaphore: asyncio.Semaphore) -> None:
+    session_id = uuid.uuid4().hex
+    async with semaphore:
+        await client.post(f"/apps/{agent}/users/bench/sessions/{session_id}", json={})
+        for turn in range(turns):
+            response = await client.post(
+                "/run",
+                json={
+                    "app_name": agent,
+                    "user_id": "bench",
+                    "session_id": session_id,
+                    "new_message": {"role": "user", "parts": [{"text": f"Question {turn} sur le module."}]},
+                },
+            )
+            response.raise_for_status()
+
+
+async def drive(base_url: str, args: argparse.Namespace) -> None:
+    """Play all sessions with at most `--concurrency` of them at once."""
+    semaphore = asyncio.Semaphore(args.concurrency)
+    async with httpx.AsyncClient(base_url=base_url, timeout=60.0) as client:
+        await asyncio.gather(
+            *(_play_session(client, args.agent, args.turns, semaphore) for _ in range(args.sessions))
+        )
+
+
+def report(base_url: str, rss_before: int, args: argparse.Namespace) -> bool:
+    """Print the memory report and return whether it fits the budgets."""
+    headers = {"Authorization": f"Bearer {DEBUG_TOKEN}"}
+    diff = httpx.get(f"{base_url}/debug/memory/diff", params={"limit": args.top}, headers=headers, timeout=60).json()
+    sessions = httpx.get(f"{base_url}/debug/memory/sessions", params={"limit": 1}, headers=headers).json()
+    mib = 1024 * 1024
+
+    print(f"RSS             {rss_before / mib:8.1f} MiB -> {diff['rss_bytes'] / mib:8.1f} MiB")
+    print(f"traced growth   {diff['growth_bytes'] / mib:8.1f} MiB (traced {diff['traced_bytes'] / mib:.1f} MiB)")
+    print(
+        f"sessions        {sessions['tracked']} tracked, {sessions['mean_bytes'] / 1024:.1f} KiB/session, "
+        f"{sessions['mean_bytes_per_event'] / 1024:.1f} KiB/event"
+    )
+    if sessions["sessions"]:
+        largest = sessions["sessions"][0]
+        print(
+            f"largest session {largest['total_bytes'] / 1024:.1f} KiB: {largest['events']} events, "
+            f"state {largest['state_bytes'] / 1024:.1f} KiB, "
+            f"tool responses {largest['tool_response_bytes'] / 1024:.1f} KiB"
+        )
+    print("top allocation sites (growth):")
+    for site in diff["sites"]:
+        print(f"  {site['size_diff_bytes'] / 1024:10.1f} KiB  {site['count_diff']:+8d}  {site['site']}")
+
+    ok = True
+    if args.max_bytes_per_session and sessions["mean_bytes"] > args.max_bytes_per_session:
+        print(f"FAIL: {sessions['mean_bytes']} bytes/session > {args.max_bytes_per_session}")
+        ok = False
+    if args.max_growth_mb and diff["growth_bytes"] > args.max_growth_mb * mib:
+        print(f"FAIL: traced growth {diff['growth_bytes'] / mib:.1f} MiB > {args.max_growth_mb} MiB")
+        ok = False
+    return ok
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--agent", default="quizz_agent")
+    parser.add_argument("--sessions", type=int, default=50)
+    parser.add_argument("--turns", type=int, default=5)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--frames", type=int, default=1, help="Call stack depth per traced allocation")
+    parser.add_argument("--top", type=int, default=15, help="Allocation sites reported")
+    parser.add_argument("--max-bytes-per-session", type=int, default=0, help="Budget (0 = no check)")
+    parser.add_argument("--max-growth-mb", type=float, default=0.0, help="Budget (0 = no check)")
+    parser.add_argument("--latency", type=float, default=0.05, help="Stub generation latency (s)")
+    parser.add_argument("--port", type=int, default=8099)
+    parser.add_argument("--stub-port", type=int, default=9090)
+    args = parser.parse_args()
+
+    stub = subprocess.Popen(
+        [sys.executable, "-m", "benchmarks.stub_vertex", "--port", str(args.stub_port), "--latency", str(args.latency)]
+    )
+    env = {
+        **os.environ,
+        "GOOGLE_GENAI_USE_VERTEXAI": "false",
+        "GOOGLE_API_KEY": "stub",
+        "MODEL_BASE_URL": f"http://127.0.0.1:{args.stub_port}",
+        "RAG_API_ENDPOINT": f"http://127.0.0.1:{args.stub_port}",
+        "RAG_API_TRANSPORT": "rest",
+        "CONTEXT_CACHE_ENABLED": "false",
+        "RESPONSE_CACHE_ENABLED": "false",
+        "SESSION_SERVICE_URI": "memory://",
+        "LOG_LEVEL": "WARNING",
+        "DEBUG_ENDPOINTS_ENABLED": "true",
+        "DEBUG_TOKEN": DEBUG_TOKEN,
+        "MEMORY_TRACKING_ENABLED": "true",
+        "MEMORY_TRACKING_FRAMES": str(args.frames),
+        "MEMORY_TRACKED_SESSIONS": str(args.sessions),
+    }
+    base_url = f"http://127.0.0.1:{args.port}"
+    server = None
+    try:
+        wait_until_ready(f"http://127.0.0.1:{args.stub_port}/_stats", 30)
+        server = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(args.port), "--log-level", "warning"],
+            env=env,
+        )
+        wait_until_ready(f"{base_url}/health/ready", 120)
+        rss_before = httpx.get(f"{base_url}/debug/memory", headers={"Authorization": f"Bearer {DEBUG_TOKEN}"}).json()[
+            "rss_bytes"
+        ]
+        asyncio.run(drive(base_url, args))
+        ok = report(base_url, rss_before, args)
+    finally:
+        if server is not None:
+            stop(server)
+        stop(stub)
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""
+Quiz variation benchmark: full regeneration vs incremental, per-question regeneration.
+
+Starts the stub model (quizzes of `--questions` questions, a delay of
+`--token-latency` per output token on top of `--latency`), then the server
+twice, with `QUIZ_VARIATION_ENABLED` false and true. For every variation
+request, a new session first creates a quiz, then asks for the variation;
+the variation turn's latency and the model output tokens it cost (from the
+stub's counters) are reported. Without the variation mode, every request
+rewrites the whole quiz in one call; with it, only the targeted questions or
+distractors are regenerated, concurrently.
+
+Usage:
+    uv run python -m benchmarks.bench_quiz_variation --questions 10 --token-latency 0.002
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+import uuid
+
+import httpx
+
+from benchmarks.processes import stop, wait_until_ready
+
+APP_NAME = "quizz_agent"
+CREATION = "Crée un quiz sur la sécurité des mots de passe."
+VARIATIONS = {
+    "one question": "Génère une autre version de ce quiz en remplaçant la question 3.",
+    "distractors": "Change les distracteurs de toutes les questions.",
+    "whole quiz": "Génère une autre version de ce quiz.",
+}
+
+
+def send(client: httpx.Client, session_id: str, text: str) -> None:
+    """Run the quiz agent on a session."""
+    client.post(
+        "/run",
+        json={
+            "app_name": APP_NAME,
+            "user_id": "bench",
+            "session_id": session_id,
+            "new_message": {"role": "user", "parts": [{"text": text}]},
+        },
+    ).raise_for_status()
+
+
+def run_phase(label: str, env: dict[str, str], args: argparse.Namespace) -> None:
+    """Start the server with `env`, run the variations and print their latency and output tokens."""
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(args.port), "--log-level", "warning"],
+        env=env,
+    )
+    try:
+        base_url = f"http://127.0.0.1:{args.port}"
+        wait_until_ready(f"{base_url}/health/ready", 120)
+        with (
+            httpx.Client(base_url=base_url, timeout=120) as client,
+            httpx.Client(base_url=f"http://127.0.0.1:{args.stub_port}") as stub,
+        ):
+            for variation, text in VARIATIONS.items():
+                latencies, tokens = [], []
+                for _ in range(args.requests):
+                    session_id = uuid.uuid4().hex
+                    client.post(f"/apps/{APP_NAME}/users/bench/sessions/{session_id}", json={}).raise_for_status()
+                    send(client, session_id, CREATION)
+                    tokens_before = stub.get("/_stats").json()["output_tokens"]
+                    started_at = time.perf_counter()
+                    send(client, session_id, text)
+                    latencies.append(time.perf_counter() - started_at)
+                    tokens.append(stub.get("/_stats").json()["output_tokens"] - tokens_before)
+                print(
+                    f"{label:<13} {variation:<13} mean={statistics.fmean(latencies) * 1000:7.1f}ms "
+                    f"output_tokens={statistics.fmean(tokens):7.1f}"
+                )
+    finally:
+        stop(server)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=5, help="Variation requests per kind and phase")
+    parser.add_argument("--questions", type=int, default=10, help="Questions of the created quizzes")
+    parser.add_argument("--latency", type=float, default=0.2, help="Stub fixed generation/retrieval latency (s)")
+    parser.add_argument("--token-latency", type=float, default=0.002, help="Stub delay per output token (s)")
+    parser.add_argument("--port", type=int, default=8099)
+    parser.add_argument("--stub-port", type=int, default=9090)
+    args = parser.parse_args()
+
+    env = {
+        **os.environ,
+        "GOOGLE_GENAI_USE_VERTEXAI": "false",
+        "GOOGLE_API_KEY": "stub",
+        "MODEL_BASE_URL": f"http://127.0.0.1:{args.stub_port}",
+        "RAG_API_ENDPOINT": f"http://127.0.0.1:{args.stub_port}",
+        "RAG_API_TRANSPORT": "rest",
+        "CONTEXT_CACHE_ENABLED": "false",
+        "RESPONSE_CACHE_ENABLED": "false",
+        "SESSION_SERVICE_URI": "memory://",
+        "LOG_LEVEL": "WARNING",
+    }
+    stub = subprocess.Popen(
+        [
+            sys.executable, "-m", "benchmarks.stub_vertex",
+            "--port", str(args.stub_port),
+            "--latency", str(args.latency),
+            "--token-latency", str(args.token_latency),
+            "--quiz-questions", str(args.questions),
+            "--tool-calls",
+        ]
+    )
+    try:
+        wait_until_ready(f"http://127.0.0.1:{args.stub_port}/_stats", 30)
+        print(
+            f"stub latency {args.latency}s + {args.token_latency}s/token, "
+            f"{args.questions}-question quizzes, {args.requests} requests per variation"
+        )
+        run_phase("full rewrite", {**env, "QUIZ_VARIATION_ENABLED": "false"}, args)
+        run_phase("incremental", {**env, "QUIZ_VARIATION_ENABLED": "true"}, args)
+    finally:
+        stop(stub)
+
+
+if __name__ == "__main__":
+    main()
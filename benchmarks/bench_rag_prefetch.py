@@ -0,0 +1,114 @@
+"""
+Speculative RAG prefetch benchmark: turn latency of RAG agents with and without it.
+
+Starts the stub model with `--tool-calls` (the first model call of an agent
+answers with a `retrieve_drive_documents` call whose query is the prompt),
+then the server twice, with `RAG_PREFETCH_ENABLED` false and true, and sends
+`--requests` requests to each agent through `/run`. Without prefetch a turn
+is model call → retrieval → model call; with it, the retrieval runs during
+the first model call, so a turn should save about one stub latency.
+
+Usage:
+    uv run python -m benchmarks.bench_rag_prefetch --requests 10 --latency 0.3
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+import uuid
+
+import httpx
+
+from benchmarks.processes import stop, wait_until_ready
+
+REQUESTS = {
+    "quizz_agent": "Crée un quiz de 3 questions sur la sécurité des mots de passe.",
+    "training_script_agent": "Crée une formation d'une heure sur l'hameçonnage.",
+}
+
+
+def send(client: httpx.Client, app_name: str, text: str) -> float:
+    """Run an agent on a new session and return the request latency."""
+    session_id = uuid.uuid4().hex
+    client.post(f"/apps/{app_name}/users/bench/sessions/{session_id}", json={}).raise_for_status()
+    started_at = time.perf_counter()
+    client.post(
+        "/run",
+        json={
+            "app_name": app_name,
+            "user_id": "bench",
+            "session_id": session_id,
+            "new_message": {"role": "user", "parts": [{"text": text}]},
+        },
+    ).raise_for_status()
+    return time.perf_counter() - started_at
+
+
+def run_phase(label: str, env: dict[str, str], args: argparse.Namespace) -> None:
+    """Start the server with `env`, send the requests and print their latency and prefetch counters."""
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(args.port), "--log-level", "warning"],
+        env=env,
+    )
+    try:
+        base_url = f"http://127.0.0.1:{args.port}"
+        wait_until_ready(f"{base_url}/health/ready", 120)
+        with httpx.Client(base_url=base_url, timeout=120) as client:
+            for app_name, text in REQUESTS.items():
+                latencies = [send(client, app_name, text) for _ in range(args.requests)]
+                print(
+                    f"{label:<13} {app_name:<22} mean={statistics.fmean(latencies) * 1000:7.1f}ms "
+                    f"max={max(latencies) * 1000:7.1f}ms"
+                )
+            stats = client.get("/metrics/rag-prefetch").json()
+        print(
+            f"{label:<13} prefetch: started={stats['started']} hits={stats['hits']} "
+            f"misses={stats['misses']} wasted={stats['wasted']} saved={stats['saved_seconds']}s"
+        )
+    finally:
+        stop(server)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=10, help="Requests per agent and phase")
+    parser.add_argument("--latency", type=float, default=0.3, help="Stub generation/retrieval latency (s)")
+    parser.add_argument("--port", type=int, default=8099)
+    parser.add_argument("--stub-port", type=int, default=9090)
+    args = parser.parse_args()
+
+    env = {
+        **os.environ,
+        "GOOGLE_GENAI_USE_VERTEXAI": "false",
+        "GOOGLE_API_KEY": "stub",
+        "MODEL_BASE_URL": f"http://127.0.0.1:{args.stub_port}",
+        "RAG_API_ENDPOINT": f"http://127.0.0.1:{args.stub_port}",
+        "RAG_API_TRANSPORT": "rest",
+        "CONTEXT_CACHE_ENABLED": "false",
+        "RESPONSE_CACHE_ENABLED": "false",
+        "TRAINING_SCRIPT_PIPELINE_ENABLED": "false",
+        "SESSION_SERVICE_URI": "memory://",
+        "LOG_LEVEL": "WARNING",
+    }
+    stub = subprocess.Popen(
+        [
+            sys.executable, "-m", "benchmarks.stub_vertex",
+            "--port", str(args.stub_port),
+            "--latency", str(args.latency),
+            "--tool-calls",
+        ]
+    )
+    try:
+        wait_until_ready(f"http://127.0.0.1:{args.stub_port}/_stats", 30)
+        print(f"stub latency {args.latency}s, {args.requests} requests per agent and phase")
+        run_phase("prefetch off", {**env, "RAG_PREFETCH_ENABLED": "false"}, args)
+        run_phase("prefetch on", {**env, "RAG_PREFETCH_ENABLED": "true"}, args)
+    finally:
+        stop(stub)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""
+Record/replay benchmark: the application's overhead without model variance.
+
+1. `record`: starts the stub model (`benchmarks.stub_vertex --tool-calls`,
+   so agents also call the RAG tool) and the server with
+   `RECORDING_MODE=record`, and sends `--requests` requests to each agent
+   through `/run` and streamed through `/run_sse`
+2. stops the stub: the next phases have no model or RAG endpoint at all
+3. `replay x1`: the server with `RECORDING_MODE=replay` serves the same
+   requests at the recorded speed, so latencies match the recording
+4. `replay x0`: replay without delays, which leaves only the application's
+   own overhead (routing, callbacks, sessions, serialization)
+
+Usage:
+    uv run python -m benchmarks.bench_record_replay --requests 10 --latency 0.3
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+
+import httpx
+
+from benchmarks.processes import stop, wait_until_ready
+
+REQUESTS = {
+    "quizz_agent": "Crée un quiz de 3 questions sur la sécurité des mots de passe.",
+    "training_script_agent": "Crée une formation d'une heure sur l'hameçonnage.",
+}
+
+
+def send(client: httpx.Client, app_name: str, text: str, streaming: bool) -> float:
+    """Run an agent on a new session and return the request latency."""
+    session_id = uuid.uuid4().hex
+    client.post(f"/apps/{app_name}/users/bench/sessions/{session_id}", json={}).raise_for_status()
+    body = {
+        "app_name": app_name,
+        "user_id": "bench",
+        "session_id": session_id,
+        "new_message": {"role": "user", "parts": [{"text": text}]},
+    }
+    started_at = time.perf_counter()
+    if streaming:
+        with client.stream("POST", "/run_sse", json={**body, "streaming": True}) as response:
+            response.raise_for_status()
+            chunks = [line for line in response.iter_lines() if line.startswith("data:")]
+        if any('"error"' in chunk for chunk in chunks):
+            raise RuntimeError(f"{app_name} failed: {chunks[-1]}")
+    else:
+        client.post("/run", json=body).raise_for_status()
+    return time.perf_counter() - started_at
+
+
+def run_phase(label: str, env: dict[str, str], args: argparse.Namespace) -> None:
+    """Start the server with `env`, send the requests and print their latency."""
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(args.port), "--log-level", "warning"],
+        env=env,
+    )
+    try:
+        base_url = f"http://127.0.0.1:{args.port}"
+        wait_until_ready(f"{base_url}/health/ready", 120)
+        latencies: dict[str, list[float]] = {"run": [], "run_sse": []}
+        with httpx.Client(base_url=base_url, timeout=120) as client:
+            for _ in range(args.requests):
+                for app_name, text in REQUESTS.items():
+                    latencies["run"].append(send(client, app_name, text, streaming=False))
+                    latencies["run_sse"].append(send(client, app_name, text, streaming=True))
+        report = "  ".join(
+            f"{route} mean={statistics.fmean(values) * 1000:7.1f}ms p95={sorted(values)[int(len(values) * 0.95)] * 1000:7.1f}ms"
+            for route, values in latencies.items()
+        )
+        print(f"{label:<10} {report}")
+    finally:
+        stop(server)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=10, help="Requests per agent and route")
+    parser.add_argument("--latency", type=float, default=0.3, help="Stub generation/retrieval latency (s)")
+    parser.add_argument("--port", type=int, default=8099)
+    parser.add_argument("--stub-port", type=int, default=9090)
+    args = parser.parse_args()
+
+    recording_path = os.path.join(tempfile.mkdtemp(), "calls.jsonl.gz")
+    env = {
+        **os.environ,
+        "GOOGLE_GENAI_USE_VERTEXAI": "false",
+        "GOOGLE_API_KEY": "stub",
+        "MODEL_BASE_URL": f"http://127.0.0.1:{args.stub_port}",
+        "RAG_API_ENDPOINT": f"http://127.0.0.1:{args.stub_port}",
+        "RAG_API_TRANSPORT": "rest",
+        "CONTEXT_CACHE_ENABLED": "false",
+        "RESPONSE_CACHE_ENABLED": "false",
+        "SESSION_SERVICE_URI": "memory://",
+        "LOG_LEVEL": "WARNING",
+        "RECORDING_PATH": recording_path,
+    }
+    stub = subprocess.Popen(
+        [
+            sys.executable, "-m", "benchmarks.stub_vertex",
+            "--port", str(args.stub_port),
+            "--latency", str(args.latency),
+            "--tool-calls",
+        ]
+    )
+    try:
+        wait_until_ready(f"http://127.0.0.1:{args.stub_port}/_stats", 30)
+        print(f"stub latency {args.latency}s, {args.requests} requests per agent and route")
+        run_phase("record", {**env, "RECORDING_MODE": "record"}, args)
+    finally:
+        stop(stub)
+
+    size = os.path.getsize(recording_path)
+    print(f"recording: {size / 1024:.1f} KiB ({recording_path}), stub stopped")
+    run_phase("replay x1", {**env, "RECORDING_MODE": "replay", "RECORDING_REPLAY_SPEED": "1"}, args)
+    run_phase("replay x0", {**env, "RECORDING_MODE": "replay", "RECORDING_REPLAY_SPEED": "0"}, args)
+
+
+if __name__ == "__main__":
+    main()
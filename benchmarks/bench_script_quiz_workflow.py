@@ -0,0 +1,135 @@
+"""
+Script → quiz benchmark: two agents in sequence vs the workflow agent.
+
+Starts the stub model (`benchmarks.stub_vertex --tool-calls`), which returns
+an agenda of `--sections` sections and makes agents holding the RAG tool call
+it, then the server with the training script pipeline enabled, and measures
+for `--runs` requests:
+
+- `sequential`: `training_script_agent` writes the script, then
+  `quizz_agent` writes a quiz on it (its own retrieval, after the script)
+- `workflow`: `training_quiz_agent` writes the script and the quiz of each
+  section as soon as the section is written, from the same passages
+
+Reported per request: end-to-end latency, model calls and RAG retrievals
+(from the stub counters).
+
+Usage:
+    uv run python -m benchmarks.bench_script_quiz_workflow --sections 4 --latency 0.5
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import time
+import uuid
+from collections.abc import Callable
+
+import httpx
+
+from benchmarks.processes import stop, wait_until_ready
+
+PROMPT = "Crée une formation d'une heure sur la sécurité des mots de passe."
+
+
+def run_agent(client: httpx.Client, app_name: str, text: str) -> str:
+    """Run an agent on a new session and return its final text."""
+    session_id = uuid.uuid4().hex
+    client.post(f"/apps/{app_name}/users/bench/sessions/{session_id}", json={}).raise_for_status()
+    response = client.post(
+        "/run",
+        json={
+            "app_name": app_name,
+            "user_id": "bench",
+            "session_id": session_id,
+            "new_message": {"role": "user", "parts": [{"text": text}]},
+        },
+    )
+    response.raise_for_status()
+    texts = [
+        part["text"]
+        for event in response.json()
+        if not event.get("branch")
+        for part in (event.get("content") or {}).get("parts") or []
+        if part.get("text")
+    ]
+    return texts[-1] if texts else ""
+
+
+def sequential(client: httpx.Client) -> None:
+    script = run_agent(client, "training_script_agent", PROMPT)
+    run_agent(client, "quizz_agent", f"Crée un quiz sur cette formation :\n\n{script}")
+
+
+def workflow(client: httpx.Client) -> None:
+    run_agent(client, "training_quiz_agent", PROMPT)
+
+
+def measure(label: str, scenario: Callable[[httpx.Client], None], client: httpx.Client, stub_url: str, runs: int) -> None:
+    """Run a scenario `runs` times and print its averages."""
+    before = httpx.get(stub_url).json()
+    started_at = time.perf_counter()
+    for _ in range(runs):
+        scenario(client)
+    elapsed = (time.perf_counter() - started_at) / runs
+    after = httpx.get(stub_url).json()
+    generations = (after["generations"] - before["generations"]) / runs
+    retrievals = (after["retrievals"] - before["retrievals"]) / runs
+    print(f"{label:<12} {elapsed:7.2f}s  {generations:5.1f} model calls  {retrievals:5.1f} retrievals")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--sections", type=int, default=4)
+    parser.add_argument("--latency", type=float, default=0.5, help="Stub generation/retrieval latency (s)")
+    parser.add_argument("--port", type=int, default=8099)
+    parser.add_argument("--stub-port", type=int, default=9090)
+    args = parser.parse_args()
+
+    stub = subprocess.Popen(
+        [
+            sys.executable, "-m", "benchmarks.stub_vertex",
+            "--port", str(args.stub_port),
+            "--latency", str(args.latency),
+            "--agenda-sections", str(args.sections),
+            "--tool-calls",
+        ]
+    )
+    env = {
+        **os.environ,
+        "GOOGLE_GENAI_USE_VERTEXAI": "false",
+        "GOOGLE_API_KEY": "stub",
+        "MODEL_BASE_URL": f"http://127.0.0.1:{args.stub_port}",
+        "RAG_API_ENDPOINT": f"http://127.0.0.1:{args.stub_port}",
+        "RAG_API_TRANSPORT": "rest",
+        "CONTEXT_CACHE_ENABLED": "false",
+        "RESPONSE_CACHE_ENABLED": "false",
+        "SESSION_SERVICE_URI": "memory://",
+        "LOG_LEVEL": "WARNING",
+        "TRAINING_SCRIPT_PIPELINE_ENABLED": "true",
+        "TRAINING_SCRIPT_PIPELINE_MAX_CONCURRENCY": str(args.sections),
+    }
+    server = None
+    try:
+        stub_url = f"http://127.0.0.1:{args.stub_port}/_stats"
+        wait_until_ready(stub_url, 30)
+        server = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(args.port), "--log-level", "warning"],
+            env=env,
+        )
+        base_url = f"http://127.0.0.1:{args.port}"
+        wait_until_ready(f"{base_url}/health/ready", 120)
+        print(f"{args.sections} sections, stub latency {args.latency}s, {args.runs} runs")
+        with httpx.Client(base_url=base_url, timeout=120) as client:
+            measure("sequential", sequential, client, stub_url, args.runs)
+            measure("workflow", workflow, client, stub_url, args.runs)
+    finally:
+        if server is not None:
+            stop(server)
+        stop(stub)
+
+
+if __name__ == "__main__":
+    main()
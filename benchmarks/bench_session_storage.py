@@ -0,0 +1,120 @@
+"""
+Session storage benchmark: ADK's in-memory service vs compact events.
+
+Builds a session history of `--events` events shaped like a quiz
+conversation (user messages, RAG tool calls and tool responses with
+passages, model answers with usage metadata), appends it to both
+`InMemorySessionService` (pydantic objects, deep copy on read) and
+`CompactInMemorySessionService` (`SESSION_SERVICE_URI=compact://`, JSON
+bytes decoded on read), then reports per 1k events:
+
+- append time
+- full `get_session` time, and with `num_recent_events=--recent`
+- memory held by the stored history
+
+Usage:
+    uv run python -m benchmarks.bench_session_storage --events 1000
+"""
+
+import argparse
+import asyncio
+import time
+
+from google.adk.events import Event, EventActions
+from google.adk.sessions import InMemorySessionService
+from google.adk.sessions.base_session_service import GetSessionConfig
+from google.genai import types
+
+from app.services.compact_sessions import CompactInMemorySessionService
+from app.services.memory import deep_sizeof
+
+PASSAGE = "Passage de documentation interne sur le module de formation. " * 4
+
+
+def make_event(index: int) -> Event:
+    """Build the `index`-th event of a quiz conversation."""
+    invocation_id = f"e-{index // 4}"
+    call_id = f"call-{index // 4}"
+    match index % 4:
+        case 0:
+            content = types.Content(role="user", parts=[types.Part(text=f"Génère un quiz sur la notion {index}.")])
+            return Event(author="user", invocation_id=invocation_id, content=content)
+        case 1:
+            call = types.FunctionCall(id=call_id, name="retrieve_rag_documentation", args={"query": f"notion {index}"})
+            content = types.Content(role="model", parts=[types.Part(function_call=call)])
+        case 2:
+            response = types.FunctionResponse(
+                id=call_id, name="retrieve_rag_documentation", response={"result": [PASSAGE] * 3}
+            )
+            content = types.Content(role="user", parts=[types.Part(function_response=response)])
+        case _:
+            content = types.Content(role="model", parts=[types.Part(text="Question 1 : ... Réponse : ... " * 10)])
+    return Event(
+        author="quizz_agent",
+        invocation_id=invocation_id,
+        content=content,
+        actions=EventActions(state_delta={"last_turn": index}),
+        usage_metadata=types.GenerateContentResponseUsageMetadata(
+            prompt_token_count=1200, candidates_token_count=300, total_token_count=1500
+        ),
+    )
+
+
+def stored_bytes(service: InMemorySessionService | CompactInMemorySessionService, session_id: str) -> int:
+    """Approximate memory held by the stored events of a session."""
+    if isinstance(service, CompactInMemorySessionService):
+        compact = service.sessions["bench"]["user"][session_id]
+        return deep_sizeof(compact.events) + deep_sizeof(compact.timestamps)
+    return deep_sizeof(service.sessions["bench"]["user"][session_id].events)
+
+
+async def bench(service: InMemorySessionService | CompactInMemorySessionService, events: list[Event], args: argparse.Namespace) -> dict[str, float]:
+    """Append the history then read it back, timing each step."""
+    session = await service.create_session(app_name="bench", user_id="user", session_id="s")
+    copies = [event.model_copy(deep=True) for event in events]
+    started_at = time.perf_counter()
+    for event in copies:
+        await service.append_event(session, event)
+    append_seconds = time.perf_counter() - started_at
+
+    started_at = time.perf_counter()
+    for _ in range(args.reads):
+        full = await service.get_session(app_name="bench", user_id="user", session_id="s")
+    read_seconds = (time.perf_counter() - started_at) / args.reads
+
+    config = GetSessionConfig(num_recent_events=args.recent)
+    started_at = time.perf_counter()
+    for _ in range(args.reads):
+        await service.get_session(app_name="bench", user_id="user", session_id="s", config=config)
+    recent_seconds = (time.perf_counter() - started_at) / args.reads
+
+    assert full is not None and full.events == events, "history does not round-trip"
+    per_1k = 1000 / len(events)
+    return {
+        "append_ms": append_seconds * 1000 * per_1k,
+        "read_ms": read_seconds * 1000 * per_1k,
+        "recent_ms": recent_seconds * 1000,
+        "bytes": stored_bytes(service, "s") * per_1k,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--events", type=int, default=1000)
+    parser.add_argument("--reads", type=int, default=10, help="get_session calls averaged")
+    parser.add_argument("--recent", type=int, default=20, help="num_recent_events of the partial read")
+    args = parser.parse_args()
+
+    events = [make_event(index) for index in range(args.events)]
+    print(f"{args.events} events, per 1k events (partial read: last {args.recent} events)")
+    print(f"{'service':<10} {'append':>10} {'get_session':>12} {'partial get':>12} {'memory':>10}")
+    for label, service in (("memory", InMemorySessionService()), ("compact", CompactInMemorySessionService())):
+        result = asyncio.run(bench(service, events, args))
+        print(
+            f"{label:<10} {result['append_ms']:8.1f}ms {result['read_ms']:10.1f}ms "
+            f"{result['recent_ms']:10.2f}ms {result['bytes'] / 1024 / 1024:7.2f}MiB"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+Skill contract micro-benchmark: per-call validation and agent card serving cost.
+
+Validation of the quizz_agent skill schemas, per call:
+- `jsonschema.validate`: the schema is checked and a validator built on
+  every call
+- `contract`: the validators compiled once by `AgentContract`
+
+for a valid and an invalid input, and a valid output (`--script-kb` KiB).
+
+Agent card, per request:
+- `a2a`: the A2A application's rendering, `AgentCard.model_dump` then
+  `JSONResponse`
+- `contract`: the card serialized once by `AgentContract`
+
+Usage:
+    uv run python -m benchmarks.bench_skill_validation --repeat 2000
+"""
+
+import argparse
+import time
+from collections.abc import Callable
+from typing import Any
+
+import jsonschema
+from a2a.types import AgentCard
+from fastapi.responses import JSONResponse, Response
+
+from app.components.skills.schema_skill import SchemaSkill
+from app.services.agent_discovery import agent_catalog
+from app.services.skill_contracts import message_instance, skill_contracts
+
+APP_NAME = "quizz_agent"
+
+
+def per_call_us(function: Callable[[], object], repeat: int) -> float:
+    """Mean wall time of `function` over `repeat` calls, in microseconds."""
+    function()
+    started_at = time.perf_counter()
+    for _ in range(repeat):
+        function()
+    return (time.perf_counter() - started_at) / repeat * 1e6
+
+
+def compare(
+    label: str, baseline_label: str, baseline: Callable[[], object], fast: Callable[[], object], repeat: int
+) -> None:
+    baseline_us = per_call_us(baseline, repeat)
+    fast_us = per_call_us(fast, repeat)
+    print(
+        f"{label:<15} {baseline_label:<19} {baseline_us:9.1f} µs  "
+        f"contract {fast_us:7.1f} µs  x{baseline_us / fast_us:6.1f}"
+    )
+
+
+def validate_all(schemas: list[dict[str, Any]], instance: dict[str, Any]) -> None:
+    """Accept `instance` if a schema does, as the contract does, with `jsonschema.validate`."""
+    for schema in schemas:
+        try:
+            jsonschema.validate(instance, schema)
+            return
+        except jsonschema.ValidationError:
+            continue
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=2000, help="Calls per measurement")
+    parser.add_argument("--script-kb", type=int, default=20, help="Size of the validated output (KiB)")
+    args = parser.parse_args()
+
+    started_at = time.perf_counter()
+    contract = skill_contracts.get(APP_NAME)
+    print(f"{APP_NAME} contract built in {(time.perf_counter() - started_at) * 1000:.1f} ms")
+
+    skills = [skill for skill in agent_catalog.get(APP_NAME).skills if isinstance(skill, SchemaSkill)]
+    input_schemas = [skill.input_schema for skill in skills if skill.input_schema]
+    output_schemas = [skill.output_schema for skill in skills if skill.output_schema]
+
+    valid = message_instance({"parts": [{"kind": "text", "text": "Crée un quiz sur la sécurité des mots de passe."}]})
+    invalid = message_instance({"parts": [{"kind": "text", "text": ""}]})
+    output = {"response": "**Question 1 : ...**\n" * (args.script_kb * 1024 // 20)}
+    assert not contract.validate_input(valid) and contract.validate_input(invalid)
+    assert not contract.validate_output(output)
+
+    print(f"{args.repeat} calls per measurement")
+    compare("input valid", "jsonschema.validate", lambda: validate_all(input_schemas, valid), lambda: contract.validate_input(valid), args.repeat)
+    compare("input invalid", "jsonschema.validate", lambda: validate_all(input_schemas, invalid), lambda: contract.validate_input(invalid), args.repeat)
+    compare("output valid", "jsonschema.validate", lambda: validate_all(output_schemas, output), lambda: contract.validate_output(output), args.repeat)
+
+    card = AgentCard.model_validate(contract.card)
+    compare(
+        "agent card",
+        "a2a",
+        lambda: JSONResponse(card.model_dump(exclude_none=True, by_alias=True)),
+        lambda: Response(content=contract.card_json, media_type="application/json"),
+        args.repeat,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""
+Telemetry export overhead benchmark, with the local filesystem exporter.
+
+Emits `--traces` traces shaped like an ADK invocation (`invocation` →
+`invoke_agent` → `call_llm` with a `--content-kb` prompt attribute →
+`execute_tool`) and reports the time spent creating and ending spans:
+
+- `none`: no span processor
+- `sync`: one gzipped file written per span as it ends, in the request path
+  (what a per-completion upload costs)
+- `batched`: `BatchingSpanExporter`, files written by its export thread
+
+The batched run also reports the compression ratio. Then `--pressure`
+replays the traces against an uploader slowed down by `--upload-delay`
+with a small queue, and reports the spans dropped by sampling and by a full
+queue.
+
+Usage:
+    uv run python -m benchmarks.bench_telemetry --traces 2000
+"""
+
+import argparse
+import gzip
+import tempfile
+import time
+
+import orjson
+from opentelemetry.sdk.trace import ReadableSpan, SpanProcessor, TracerProvider
+
+from app.services.telemetry_export import (
+    BatchingSpanExporter,
+    LocalTelemetryUploader,
+    span_to_record,
+)
+
+
+class SyncFileProcessor(SpanProcessor):
+    """Writes every span to its own gzipped file when it ends."""
+
+    def __init__(self, uploader: LocalTelemetryUploader):
+        self.uploader = uploader
+        self.count = 0
+
+    def on_end(self, span: ReadableSpan) -> None:
+        self.count += 1
+        payload = gzip.compress(orjson.dumps(span_to_record(span, capture_content=False)), compresslevel=6)
+        self.uploader.upload(f"sync/{self.count:08d}.json.gz", payload)
+
+
+class SlowUploader(LocalTelemetryUploader):
+    """Local uploader taking `delay` seconds per batch."""
+
+    def __init__(self, directory: str, delay: float):
+        super().__init__(directory)
+        self.delay = delay
+
+    def upload(self, object_name: str, payload: bytes) -> None:
+        time.sleep(self.delay)
+        super().upload(object_name, payload)
+
+
+def emit_traces(provider: TracerProvider, traces: int, content: str) -> float:
+    """Emit ADK-shaped traces, return the elapsed time in seconds."""
+    tracer = provider.get_tracer("bench")
+    started_at = time.perf_counter()
+    for index in range(traces):
+        with tracer.start_as_current_span("invocation"):
+            with tracer.start_as_current_span("invoke_agent quizz_agent") as agent_span:
+                agent_span.set_attribute("gen_ai.agent.name", "quizz_agent")
+                with tracer.start_as_current_span("call_llm") as llm_span:
+                    llm_span.set_attribute("gen_ai.request.model", "gemini-2.5-flash")
+                    llm_span.set_attribute("gen_ai.usage.input_tokens", 1200 + index % 100)
+                    llm_span.set_attribute("gen_ai.usage.output_tokens", 300)
+                    llm_span.set_attribute("gcp.vertex.agent.llm_request", content)
+                with tracer.start_as_current_span("execute_tool retrieve_rag_documentation") as tool_span:
+                    tool_span.set_attribute("gen_ai.tool.name", "retrieve_rag_documentation")
+                    tool_span.set_attribute("gcp.vertex.agent.tool_response", content)
+    return time.perf_counter() - started_at
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--traces", type=int, default=2000)
+    parser.add_argument("--content-kb", type=int, default=20)
+    parser.add_argument("--batch-spans", type=int, default=512)
+    parser.add_argument("--pressure", action=argparse.BooleanOptionalAction, default=True)
+    parser.add_argument("--upload-delay", type=float, default=0.2, help="seconds per batch in the pressure run")
+    args = parser.parse_args()
+
+    content = "x" * (args.content_kb * 1024)
+    spans = args.traces * 4
+    directory = tempfile.mkdtemp(prefix="bench-telemetry-")
+    print(f"{args.traces} traces, {spans} spans, files in {directory}")
+
+    baseline = emit_traces(TracerProvider(), args.traces, content)
+    print(f"none     {baseline / spans * 1e6:8.1f} us/span")
+
+    provider = TracerProvider()
+    provider.add_span_processor(SyncFileProcessor(LocalTelemetryUploader(directory)))
+    elapsed = emit_traces(provider, args.traces, content)
+    print(f"sync     {elapsed / spans * 1e6:8.1f} us/span  (+{(elapsed - baseline) / spans * 1e6:.1f})")
+
+    exporter = BatchingSpanExporter(
+        LocalTelemetryUploader(directory),
+        batch_spans=args.batch_spans,
+        flush_interval_seconds=1.0,
+        max_queue_spans=spans,
+        pressure_threshold=1.0,
+        pressure_sample_rate=1.0,
+    )
+    exporter.start()
+    provider = TracerProvider()
+    provider.add_span_processor(exporter)
+    elapsed = emit_traces(provider, args.traces, content)
+    provider.shutdown()
+    stats = exporter.stats()
+    print(
+        f"batched  {elapsed / spans * 1e6:8.1f} us/span  (+{(elapsed - baseline) / spans * 1e6:.1f})  "
+        f"{stats['uploads']} files, {stats['encoded_bytes'] / 1024:.0f} KiB -> "
+        f"{stats['uploaded_bytes'] / 1024:.0f} KiB gzip"
+    )
+
+    if args.pressure:
+        exporter = BatchingSpanExporter(
+            SlowUploader(directory, args.upload_delay),
+            batch_spans=64,
+            flush_interval_seconds=1.0,
+            max_queue_spans=1024,
+            pressure_threshold=0.5,
+            pressure_sample_rate=0.1,
+        )
+        exporter.start()
+        provider = TracerProvider()
+        provider.add_span_processor(exporter)
+        emit_traces(provider, args.traces, content)
+        provider.shutdown()
+        stats = exporter.stats()
+        print(
+            f"pressure exported {stats['exported']}/{spans} spans, "
+            f"dropped {stats['dropped_sampled']} sampled + {stats['dropped_full']} queue full"
+        )
+
+
+if __name__ == "__main__":
+    main()
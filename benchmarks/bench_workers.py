@@ -0,0 +1,104 @@
+"""
+Throughput benchmark of the server across worker counts.
+
+Starts `python -m app.server` with each requested `WEB_CONCURRENCY`, waits for
+it to answer, then drives a fixed request load from several client processes
+and reports the sustained requests per second. The default target is
+`/health`, which isolates the serving stack (ASGI, routing, serialization)
+from Gemini latency.
+
+Usage:
+    uv run python -m benchmarks.bench_workers --workers 1 2 4 --duration 10
+"""
+
+import argparse
+import asyncio
+import multiprocessing
+import os
+import subprocess
+import sys
+import time
+
+import httpx
+
+from benchmarks.processes import wait_until_ready
+
+
+async def _drive(url: str, duration: float, concurrency: int) -> int:
+    """Send requests for `duration` seconds and return the success count."""
+    deadline = time.perf_counter() + duration
+    completed = 0
+
+    async with httpx.AsyncClient(timeout=10.0) as client:
+
+        async def loop() -> None:
+            nonlocal completed
+            while time.perf_counter() < deadline:
+                response = await client.get(url)
+                if response.status_code == 200:
+                    completed += 1
+
+        await asyncio.gather(*(loop() for _ in range(concurrency)))
+    return completed
+
+
+def _client_process(url: str, duration: float, concurrency: int, results: "multiprocessing.Queue[int]") -> None:
+    results.put(asyncio.run(_drive(url, duration, concurrency)))
+
+
+def run_load(url: str, duration: float, clients: int, concurrency: int) -> float:
+    """Run the load from `clients` processes and return requests per second."""
+    results: multiprocessing.Queue[int] = multiprocessing.Queue()
+    processes = [
+        multiprocessing.Process(target=_client_process, args=(url, duration, concurrency, results))
+        for _ in range(clients)
+    ]
+    for process in processes:
+        process.start()
+    total = sum(results.get() for _ in processes)
+    for process in processes:
+        process.join()
+    return total / duration
+
+
+def bench(workers: int, args: argparse.Namespace) -> float:
+    """Start a server with `workers` processes and measure its throughput."""
+    env = {
+        **os.environ,
+        "WEB_CONCURRENCY": str(workers),
+        "PORT": str(args.port),
+        "HOST": "127.0.0.1",
+        "LOG_LEVEL": "WARNING",
+    }
+    server = subprocess.Popen([sys.executable, "-m", "app.server"], env=env)
+    try:
+        base_url = f"http://127.0.0.1:{args.port}"
+        wait_until_ready(f"{base_url}/health", args.startup_timeout)
+        run_load(f"{base_url}{args.path}", 2.0, args.clients, args.concurrency)  # warm-up
+        return run_load(f"{base_url}{args.path}", args.duration, args.clients, args.concurrency)
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--path", default="/health")
+    parser.add_argument("--port", type=int, default=8099)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--clients", type=int, default=4, help="Client processes")
+    parser.add_argument("--concurrency", type=int, default=32, help="Requests in flight per client")
+    parser.add_argument("--startup-timeout", type=float, default=120.0)
+    args = parser.parse_args()
+
+    baseline = None
+    print(f"{'workers':>8} {'req/s':>10} {'scaling':>8}")
+    for workers in args.workers:
+        throughput = bench(workers, args)
+        baseline = baseline or throughput
+        print(f"{workers:>8} {throughput:>10.0f} {throughput / baseline:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,29 @@
+"""Helpers shared by the benchmarks and evaluations starting the server or the stub model."""
+
+import subprocess
+import time
+
+import httpx
+
+
+def wait_until_ready(url: str, timeout: float) -> None:
+    """Poll the server until it answers or the timeout expires."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(url, timeout=1.0).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.5)
+    raise TimeoutError(f"Server not ready after {timeout}s: {url}")
+
+
+def stop(process: subprocess.Popen) -> None:
+    """Terminate a child process, killing it if it does not exit in time."""
+    process.terminate()
+    try:
+        process.wait(timeout=15)
+    except subprocess.TimeoutExpired:
+        process.kill()
+        process.wait()
@@ -0,0 +1,246 @@
+"""
+Local stub of the GenAI and Vertex AI RAG REST endpoints.
+
+Answers model metadata, `generateContent`, `streamGenerateContent`, RAG
+corpus metadata and `retrieveContexts` calls with canned payloads after a configurable delay, so
+the server can be started, warmed up and load-tested without Google Cloud.
+
+Requests of the training script agenda agent get a JSON agenda of
+`--agenda-sections` sections, so the pipelines run end to end. With
+`--tool-calls`, the first model call of an agent holding the RAG retrieval
+tool answers with a call to that tool, like a model grounding its answer
+(its query is the user's prompt). Requests of the quiz agent get a quiz of
+`--quiz-questions` questions in the standard format, and its variation
+sub-agents a single question or new distractors. `--token-latency` adds a
+delay per output token, as generation time grows with the answer length.
+`GET /_stats` counts requests, generations, retrievals and output tokens.
+
+Usage:
+    uv run python -m benchmarks.stub_vertex --port 9090 --latency 0.5
+
+Then start the server against it:
+    GOOGLE_GENAI_USE_VERTEXAI=false GOOGLE_API_KEY=stub \\
+    MODEL_BASE_URL=http://127.0.0.1:9090 \\
+    RAG_API_ENDPOINT=http://127.0.0.1:9090 RAG_API_TRANSPORT=rest \\
+    uv run python -m app.server
+"""
+
+import argparse
+import asyncio
+import contextlib
+import json
+from collections.abc import AsyncIterator
+
+import uvicorn
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response, StreamingResponse
+from starlette.routing import Route
+
+MODEL_TEXT = "Réponse simulée par le serveur de test."
+RAG_PASSAGES = [f"Passage de test numéro {index}." for index in range(1, 4)]
+RAG_TOOL_NAME = "retrieve_drive_documents"
+# Marker of the training script agenda instruction (training_script_agenda_v1)
+AGENDA_MARKER = "produire l'AGENDA"
+# Markers of the quiz agent instruction (quizz_v1) and variation briefs (quizz_variation_v1)
+QUIZ_MARKER = "FORMAT DE QUIZ STANDARD"
+QUESTION_MARKER = "## MODE : question"
+DISTRACTORS_MARKER = "## MODE : distracteurs"
+
+
+def agenda_text(sections: int) -> str:
+    """Return a training agenda as the agenda agent would write it."""
+    return json.dumps(
+        {
+            "title": "Formation de test",
+            "audience": "Débutants",
+            "duration": f"{sections * 15} minutes",
+            "sections": [
+                {
+                    "title": f"Section {index}",
+                    "duration": "15 minutes",
+                    "objectives": [f"Objectif {index}"],
+                    "summary": f"Contenu de la section {index}.",
+                    "query": f"section {index}",
+                }
+                for index in range(1, sections + 1)
+            ],
+        },
+        ensure_ascii=False,
+    )
+
+
+def question_text(number: int) -> str:
+    """Return a quiz question in the standard format."""
+    options = "\n".join(f"{letter}) Option {letter} de la question {number}." for letter in "ABCD")
+    return (
+        f"**Question {number} : Question de test numéro {number} sur les documents ?**\n{options}\n\n"
+        f"**Bonne Réponse :** A\n**Explication :** L'option A est correcte d'après les extraits."
+    )
+
+
+def quiz_text(questions: int) -> str:
+    """Return a quiz as the quiz agent would write it."""
+    return "\n\n---\n\n".join(question_text(number) for number in range(1, questions + 1))
+
+
+def output_tokens(part: dict | None) -> int:
+    """Approximate output tokens of an answer (4 characters per token)."""
+    return max(16, len(json.dumps(part or {"text": MODEL_TEXT}, ensure_ascii=False)) // 4)
+
+
+def generate_content_payload(part: dict | None = None) -> dict:
+    """Return a minimal `GenerateContentResponse` (text, or the given part)."""
+    tokens = output_tokens(part)
+    return {
+        "candidates": [
+            {
+                "content": {"role": "model", "parts": [part or {"text": MODEL_TEXT}]},
+                "finishReason": "STOP",
+            }
+        ],
+        "usageMetadata": {"promptTokenCount": 64, "candidatesTokenCount": tokens, "totalTokenCount": 64 + tokens},
+    }
+
+
+def response_part(body: dict, agenda_sections: int, tool_calls: bool, quiz_questions: int = 5) -> dict | None:
+    """Pick the answer to a generation request: agenda, RAG tool call, quiz or default text."""
+    system_instruction = json.dumps(body.get("systemInstruction") or {}, ensure_ascii=False)
+    if AGENDA_MARKER in system_instruction:
+        return {"text": agenda_text(agenda_sections)}
+    request = json.dumps(body, ensure_ascii=False)
+    if DISTRACTORS_MARKER in request:
+        return {"text": "B) Nouvelle option B.\nC) Nouvelle option C.\nD) Nouvelle option D."}
+    if QUESTION_MARKER in request:
+        return {"text": question_text(1)}
+    if not tool_calls:
+        return {"text": quiz_text(quiz_questions)} if QUIZ_MARKER in system_instruction else None
+    declarations = [
+        declaration.get("name")
+        for tool in body.get("tools") or []
+        for declaration in tool.get("functionDeclarations") or []
+    ]
+    answered = any(
+        "functionResponse" in part
+        for content in body.get("contents") or []
+        for part in content.get("parts") or []
+    )
+    if RAG_TOOL_NAME in declarations and not answered:
+        prompt = next(
+            (
+                part["text"]
+                for content in body.get("contents") or []
+                if content.get("role") == "user"
+                for part in content.get("parts") or []
+                if part.get("text")
+            ),
+            "documents",
+        )
+        return {"functionCall": {"name": RAG_TOOL_NAME, "args": {"query": prompt}}}
+    if QUIZ_MARKER in system_instruction:
+        return {"text": quiz_text(quiz_questions)}
+    return None
+
+
+def create_stub_app(
+    latency: float,
+    warmup_latency: float,
+    capacity: int = 0,
+    agenda_sections: int = 4,
+    tool_calls: bool = False,
+    quiz_questions: int = 5,
+    token_latency: float = 0.0,
+) -> Starlette:
+    """
+    Build the stub application.
+
+    Args:
+        latency: Delay before answering generation and retrieval calls
+        warmup_latency: Delay before answering model metadata calls
+        capacity: Generation calls served concurrently, the others queue as
+            on a throttled model endpoint (0 = unlimited)
+        agenda_sections: Sections of the agendas returned to the agenda agent
+        tool_calls: Answer the first call of agents holding the RAG tool with a tool call
+        quiz_questions: Questions of the quizzes returned to the quiz agent
+        token_latency: Additional generation delay per output token
+    """
+    stats = {"requests": 0, "generations": 0, "retrievals": 0, "output_tokens": 0}
+    slots = asyncio.Semaphore(capacity) if capacity else contextlib.nullcontext()
+
+    async def generate(tokens: int) -> None:
+        async with slots:
+            await asyncio.sleep(latency + tokens * token_latency)
+
+    async def handle(request: Request) -> Response:
+        stats["requests"] += 1
+        path = request.url.path
+
+        if path.endswith(":retrieveContexts"):
+            stats["retrievals"] += 1
+            await asyncio.sleep(latency)
+            return JSONResponse({"contexts": {"contexts": [{"text": text} for text in RAG_PASSAGES]}})
+
+        if path.endswith((":streamGenerateContent", ":generateContent")):
+            stats["generations"] += 1
+            part = response_part(await request.json(), agenda_sections, tool_calls, quiz_questions)
+            tokens = output_tokens(part)
+            stats["output_tokens"] += tokens
+            await generate(tokens)
+            if path.endswith(":generateContent"):
+                return JSONResponse(generate_content_payload(part))
+
+            async def stream() -> AsyncIterator[str]:
+                yield f"data: {json.dumps(generate_content_payload(part))}\r\n\r\n"
+
+            return StreamingResponse(stream(), media_type="text/event-stream")
+
+        if path.endswith(":countTokens"):
+            return JSONResponse({"totalTokens": 64})
+
+        if "/ragCorpora/" in path and request.method == "GET":
+            return JSONResponse({"name": path.split("/v1/", 1)[-1], "displayName": "stub-corpus"})
+
+        if "/models/" in path and request.method == "GET":
+            await asyncio.sleep(warmup_latency)
+            return JSONResponse({"name": path.rsplit("/", 1)[-1], "displayName": "stub"})
+
+        return JSONResponse({"error": {"code": 404, "message": f"Not stubbed: {path}"}}, status_code=404)
+
+    async def get_stats(request: Request) -> Response:
+        return JSONResponse(stats)
+
+    return Starlette(
+        routes=[
+            Route("/_stats", get_stats),
+            Route("/{path:path}", handle, methods=["GET", "POST"]),
+        ]
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9090)
+    parser.add_argument("--latency", type=float, default=0.5, help="Generation/retrieval delay (s)")
+    parser.add_argument("--warmup-latency", type=float, default=0.0, help="Model metadata delay (s)")
+    parser.add_argument("--capacity", type=int, default=0, help="Concurrent generations (0 = unlimited)")
+    parser.add_argument("--agenda-sections", type=int, default=4, help="Sections of the returned agendas")
+    parser.add_argument("--tool-calls", action="store_true", help="Answer with RAG tool calls first")
+    parser.add_argument("--quiz-questions", type=int, default=5, help="Questions of the returned quizzes")
+    parser.add_argument("--token-latency", type=float, default=0.0, help="Generation delay per output token (s)")
+    args = parser.parse_args()
+
+    app = create_stub_app(
+        args.latency,
+        args.warmup_latency,
+        args.capacity,
+        args.agenda_sections,
+        args.tool_calls,
+        args.quiz_questions,
+        args.token_latency,
+    )
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+"""
+Comparison report of two evaluation runs (`evals.run`).
+
+Writes a Markdown report with, overall and per agent, the quality metrics,
+latency and usage of both runs and their difference, whether the agent
+instructions or models changed between the runs, and the cases whose
+quality metrics dropped by more than `--max-drop`.
+
+Usage:
+    uv run python -m evals.compare .adk/evals/baseline .adk/evals/candidate --output report.md
+    uv run python -m evals.compare .adk/evals/baseline .adk/evals/candidate --fail-on-regression
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+from typing import Any
+
+# Metrics where an increase is a regression
+LOWER_IS_BETTER = {
+    "errors",
+    "latency_mean_s",
+    "latency_p50_s",
+    "latency_p95_s",
+    "model_calls_mean",
+    "prompt_tokens_mean",
+    "output_tokens_mean",
+}
+RUN_METRICS = [
+    "cases",
+    "errors",
+    "cache_hits",
+    "latency_mean_s",
+    "latency_p50_s",
+    "latency_p95_s",
+    "model_calls_mean",
+    "prompt_tokens_mean",
+    "output_tokens_mean",
+    "tool_calls_mean",
+]
+
+
+def load_run(path: Path) -> tuple[dict[str, Any], dict[str, dict[str, Any]]]:
+    """Load the summary of a run and its case results by case id."""
+    summary = json.loads((path / "summary.json").read_text(encoding="utf-8"))
+    with open(path / "results.jsonl", encoding="utf-8") as f:
+        results = {result["id"]: result for result in map(json.loads, filter(str.strip, f))}
+    return summary, results
+
+
+def format_value(value: float | None) -> str:
+    if value is None:
+        return "-"
+    return f"{value:.0f}" if float(value).is_integer() else f"{value:.3f}"
+
+
+def metric_rows(base: dict[str, Any], candidate: dict[str, Any]) -> list[str]:
+    """Table rows of the run and quality metrics of two summaries."""
+    rows = []
+    values = [(name, base.get(name), candidate.get(name)) for name in RUN_METRICS]
+    names = sorted({*base.get("quality", {}), *candidate.get("quality", {})})
+    values += [(name, base.get("quality", {}).get(name), candidate.get("quality", {}).get(name)) for name in names]
+    for name, before, after in values:
+        delta = ""
+        if before is not None and after is not None:
+            delta = f"{after - before:+.3f}"
+            if before and name in LOWER_IS_BETTER:
+                delta += f" ({(after - before) / before:+.0%})"
+        rows.append(f"| {name} | {format_value(before)} | {format_value(after)} | {delta} |")
+    return rows
+
+
+def find_regressions(
+    base_results: dict[str, dict[str, Any]], candidate_results: dict[str, dict[str, Any]], max_drop: float
+) -> list[tuple[str, str, float, float]]:
+    """Return (case id, metric, base value, candidate value) of the quality drops above `max_drop`."""
+    regressions = []
+    for case_id, before in sorted(base_results.items()):
+        after = candidate_results.get(case_id)
+        if after is None or before["error"] is not None:
+            continue
+        if after["error"] is not None:
+            regressions.append((case_id, "error", 0.0, 1.0))
+            continue
+        for name, value in before["quality"].items():
+            candidate_value = after["quality"].get(name)
+            # Counts (question_count...) are not scores: only compared through their match metrics
+            if candidate_value is None or name.endswith("_count"):
+                continue
+            if value - candidate_value > max_drop:
+                regressions.append((case_id, name, value, candidate_value))
+    return regressions
+
+
+def build_report(base_path: Path, candidate_path: Path, max_drop: float) -> tuple[str, int]:
+    """
+    Build the comparison report of two runs.
+
+    Args:
+        base_path: Directory of the reference run
+        candidate_path: Directory of the compared run
+        max_drop: Quality drop of a case above which it is reported as a regression
+
+    Returns:
+        The Markdown report and the number of regressions
+    """
+    base, base_results = load_run(base_path)
+    candidate, candidate_results = load_run(candidate_path)
+    lines = [
+        f"# Évaluation : {candidate['name']} vs {base['name']}",
+        "",
+        f"- Référence : `{base['name']}` ({base['created_at']}, {base['wall_time_s']:.1f}s)",
+        f"- Candidat : `{candidate['name']}` ({candidate['created_at']}, {candidate['wall_time_s']:.1f}s)",
+        "",
+    ]
+    sections = [("Global", base["overall"], candidate["overall"])]
+    for agent in sorted({*base["agents"], *candidate["agents"]}):
+        sections.append((agent, base["agents"].get(agent, {}), candidate["agents"].get(agent, {})))
+    for title, before, after in sections:
+        lines += [f"## {title}", ""]
+        fingerprints = (base["fingerprints"].get(title), candidate["fingerprints"].get(title))
+        if all(fingerprints) and fingerprints[0] != fingerprints[1]:
+            changed = [key for key in fingerprints[0] if fingerprints[0][key] != fingerprints[1].get(key)]
+            lines += [f"Modifié entre les deux runs : {', '.join(changed)}", ""]
+        lines += ["| Métrique | Référence | Candidat | Écart |", "|---|---|---|---|"]
+        lines += [*metric_rows(before, after), ""]
+
+    regressions = find_regressions(base_results, candidate_results, max_drop)
+    missing = sorted(set(base_results) - set(candidate_results))
+    lines += [f"## Régressions (baisse > {max_drop})", ""]
+    if regressions:
+        lines += ["| Cas | Métrique | Référence | Candidat |", "|---|---|---|---|"]
+        lines += [
+            f"| {case_id} | {name} | {format_value(before)} | {format_value(after)} |"
+            for case_id, name, before, after in regressions
+        ]
+    else:
+        lines.append("Aucune.")
+    if missing:
+        lines += ["", f"Cas absents du candidat : {', '.join(missing)}"]
+    return "\n".join(lines) + "\n", len(regressions)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("base", type=Path, help="Directory of the reference run")
+    parser.add_argument("candidate", type=Path, help="Directory of the compared run")
+    parser.add_argument("--output", type=Path, help="Report file (default: stdout)")
+    parser.add_argument("--max-drop", type=float, default=0.05, help="Tolerated quality drop per case")
+    parser.add_argument("--fail-on-regression", action="store_true", help="Exit with status 1 on regressions")
+    args = parser.parse_args()
+
+    report, regressions = build_report(args.base, args.candidate, args.max_drop)
+    if args.output:
+        args.output.write_text(report, encoding="utf-8")
+        print(f"Report written to {args.output} ({regressions} regressions)")
+    else:
+        print(report)
+    if args.fail_on_regression and regressions:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""
+Quality metrics of agent responses, computed locally (no model or network).
+
+Every metric is a score between 0 and 1, or a count, computed from the
+response text and the expectations of the dataset case:
+
+- all agents: `non_empty`, `keyword_coverage` (case `keywords`), `rouge_l`
+  (F1 of the longest common token subsequence with case `reference`)
+- `quizz_agent`: `question_count`, `quiz_format` (share of questions with
+  four options, an answer and an explanation), `question_count_match`
+  (case `expected_questions`)
+- `training_script_agent`: `module_count`, `script_structure` (share of
+  modules with a duration, objectives and content)
+
+Metrics whose expectation is missing from the case are not reported.
+"""
+
+import re
+import unicodedata
+from typing import Any
+
+_QUESTION = re.compile(r"\*\*Question\s*\d+", re.IGNORECASE)
+_OPTION = re.compile(r"^\s*[A-D]\)", re.MULTILINE)
+_ANSWER = re.compile(r"Bonne\s+R[ée]ponse", re.IGNORECASE)
+_EXPLANATION = re.compile(r"Explication", re.IGNORECASE)
+_MODULE = re.compile(r"\*\*Module(?:\s*\d+)?\s*:", re.IGNORECASE)
+_MODULE_FIELDS = (r"\*\*Dur[ée]e\s*:", r"\*\*Objectifs\s*:", r"\*\*Contenu\s*:")
+_TOKEN = re.compile(r"\w+")
+
+
+def normalize(text: str) -> str:
+    """Lowercase and strip accents, for keyword matching."""
+    decomposed = unicodedata.normalize("NFKD", text.lower())
+    return "".join(char for char in decomposed if not unicodedata.combining(char))
+
+
+def split_blocks(text: str, pattern: re.Pattern[str]) -> list[str]:
+    """Split a text into the blocks starting at each match of `pattern`."""
+    starts = [match.start() for match in pattern.finditer(text)]
+    return [text[start:end] for start, end in zip(starts, [*starts[1:], len(text)], strict=True)]
+
+
+def keyword_coverage(text: str, keywords: list[str]) -> float:
+    """Share of the expected keywords present in the text."""
+    normalized = normalize(text)
+    return sum(normalize(keyword) in normalized for keyword in keywords) / len(keywords)
+
+
+def rouge_l(text: str, reference: str) -> float:
+    """F1 of the longest common subsequence of tokens (ROUGE-L)."""
+    candidate = _TOKEN.findall(normalize(text))
+    expected = _TOKEN.findall(normalize(reference))
+    if not candidate or not expected:
+        return 0.0
+    previous = [0] * (len(expected) + 1)
+    for token in candidate:
+        current = [0]
+        for position, reference_token in enumerate(expected, start=1):
+            if token == reference_token:
+                current.append(previous[position - 1] + 1)
+            else:
+                current.append(max(previous[position], current[-1]))
+        previous = current
+    common = previous[-1]
+    if common == 0:
+        return 0.0
+    precision = common / len(candidate)
+    recall = common / len(expected)
+    return 2 * precision * recall / (precision + recall)
+
+
+def quiz_metrics(text: str, case: dict[str, Any]) -> dict[str, float]:
+    questions = split_blocks(text, _QUESTION)
+    complete = sum(
+        len(_OPTION.findall(question)) >= 4
+        and _ANSWER.search(question) is not None
+        and _EXPLANATION.search(question) is not None
+        for question in questions
+    )
+    metrics = {
+        "question_count": float(len(questions)),
+        "quiz_format": complete / len(questions) if questions else 0.0,
+    }
+    if case.get("expected_questions"):
+        metrics["question_count_match"] = float(len(questions) == case["expected_questions"])
+    return metrics
+
+
+def script_metrics(text: str, case: dict[str, Any]) -> dict[str, float]:
+    modules = split_blocks(text, _MODULE)
+    complete = sum(
+        all(re.search(field, module, re.IGNORECASE) for field in _MODULE_FIELDS) for module in modules
+    )
+    return {
+        "module_count": float(len(modules)),
+        "script_structure": complete / len(modules) if modules else 0.0,
+    }
+
+
+AGENT_METRICS = {
+    "quizz_agent": quiz_metrics,
+    "training_script_agent": script_metrics,
+}
+
+
+def compute_quality(agent_name: str, text: str, case: dict[str, Any]) -> dict[str, float]:
+    """
+    Compute the quality metrics of a response.
+
+    Args:
+        agent_name: Agent that produced the response
+        text: Final response text
+        case: Dataset case (`keywords`, `reference`, `expected_questions`...)
+
+    Returns:
+        Metric name to value
+    """
+    metrics = {"non_empty": float(bool(text.strip()))}
+    if case.get("keywords"):
+        metrics["keyword_coverage"] = keyword_coverage(text, case["keywords"])
+    if case.get("reference"):
+        metrics["rouge_l"] = rouge_l(text, case["reference"])
+    if agent_name in AGENT_METRICS:
+        metrics.update(AGENT_METRICS[agent_name](text, case))
+    return metrics
@@ -0,0 +1,371 @@
+"""
+Offline evaluation: runs a dataset of prompts against the agents.
+
+Every case of the datasets (JSON lines: `id`, `agent`, `prompt`, and the
+expectations used by `evals.metrics`) is run in-process, on a new in-memory
+session, with at most `--concurrency` cases at a time. Reported per case:
+final text, latency, model calls, prompt/output tokens, tool calls and
+quality metrics; `summary.json` aggregates them per agent.
+
+Model outputs are cached on disk (`--cache-dir`) by agent, instruction
+hash, models (including the routed fast and heavy models), model backend
+(Vertex AI, the `MODEL_BASE_URL` endpoint such as the stub, or the replayed
+recording), tenant, RAG corpus and version, and prompt: re-running a dataset only calls the model
+for the cases whose agent, instructions, models or corpus changed, and cached
+cases keep the latency and tokens recorded when they were run. The
+server's response cache is disabled for the run.
+
+Runs are offline with `--stub` (the stub model of `benchmarks.stub_vertex`
+is started and the agents pointed at it), `--replay` (model and RAG calls
+served from a recording made with `--record`, see `app.services.recording`),
+or `--cache-only` (cached outputs only, missing cases reported as errors).
+Compare two runs with `evals.compare`.
+
+Usage:
+    uv run python -m evals.run --name baseline --stub
+    uv run python -m evals.run --name candidate --dataset evals/datasets/quizz_agent.jsonl --concurrency 8
+    uv run python -m evals.run --name ci --replay evals/recordings/calls.jsonl.gz --no-cache
+"""
+
+import argparse
+import asyncio
+import glob
+import hashlib
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Any
+
+from evals.metrics import compute_quality
+
+DEFAULT_DATASETS = "evals/datasets/*.jsonl"
+DEFAULT_OUTPUT_DIR = ".adk/evals"
+EVAL_USER_ID = "eval"
+
+
+def load_cases(patterns: list[str], agents: list[str] | None) -> list[dict[str, Any]]:
+    """Load the cases of the dataset files, optionally restricted to some agents."""
+    cases = []
+    for path in sorted({path for pattern in patterns for path in glob.glob(pattern)}):
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    cases.append(json.loads(line))
+    if agents:
+        cases = [case for case in cases if case["agent"] in agents]
+    return cases
+
+
+def model_backend() -> str:
+    """Return what serves the model calls: a replayed recording, an endpoint, or the default API."""
+    from app.config.settings import settings
+
+    if settings.RECORDING_MODE == "replay":
+        with open(settings.RECORDING_PATH, "rb") as f:
+            return f"replay:{hashlib.file_digest(f, 'sha256').hexdigest()[:16]}"
+    if settings.MODEL_BASE_URL:
+        return f"endpoint:{settings.MODEL_BASE_URL}"
+    return "default"
+
+
+def fingerprint(agent: Any) -> dict[str, str]:
+    """
+    Return the instruction hash, models and corpus an agent answers with.
+
+    Composite agents (pipelines, workflows) are walked through their agent
+    fields, so changing the instruction of any sub-agent changes the hash.
+    With model routing, the fast and heavy models can serve any agent and
+    are part of the models.
+
+    Args:
+        agent: Root agent
+
+    Returns:
+        `instruction_hash`, `model` (sorted model names of the tree),
+        `backend` (see `model_backend`), `tenant_id` and `corpus` (RAG
+        corpus and version of the tenant)
+    """
+    from google.adk.agents import BaseAgent
+
+    from app.config.settings import settings
+    from app.services.model_router import Route, get_route_model
+    from app.services.response_cache import hash_instruction
+    from app.services.tenants import TenantAgent, get_current_tenant
+
+    tenant = get_current_tenant()
+
+    parts: list[object] = []
+    models: set[str] = set()
+    pending = [agent]
+    seen: set[int] = set()
+    while pending:
+        current = pending.pop(0)
+        if isinstance(current, TenantAgent):
+            current = current.agent_for(tenant)
+        if id(current) in seen:
+            continue
+        seen.add(id(current))
+        for attribute in ("static_instruction", "instruction"):
+            value = getattr(current, attribute, None)
+            # Instruction providers are identified by name, not by address
+            parts.append(getattr(value, "__qualname__", value) if callable(value) else value)
+        if getattr(current, "model", None):
+            models.add(str(getattr(current.model, "model", current.model)))
+        for name in type(current).model_fields:
+            value = getattr(current, name)
+            values = value if isinstance(value, list) else [value]
+            if name != "parent_agent":
+                pending.extend(child for child in values if isinstance(child, BaseAgent))
+    if settings.MODEL_ROUTING_ENABLED:
+        models.update(get_route_model(route) for route in Route)
+    return {
+        "instruction_hash": hash_instruction(*parts),
+        "model": ",".join(sorted(models)),
+        "backend": model_backend(),
+        "tenant_id": tenant.tenant_id,
+        "corpus": f"{tenant.rag_corpus_id}@{tenant.rag_corpus_version}",
+    }
+
+
+def collect(events: list[Any]) -> dict[str, Any]:
+    """Extract the final text and usage counters from the events of a run."""
+    texts = [
+        part.text
+        for event in events
+        if not event.branch and event.content and event.content.parts
+        for part in event.content.parts
+        if part.text and not part.thought
+    ]
+    usages = [event.usage_metadata for event in events if event.usage_metadata and not event.partial]
+    return {
+        "text": texts[-1] if texts else "",
+        "model_calls": len(usages),
+        "prompt_tokens": sum(usage.prompt_token_count or 0 for usage in usages),
+        "output_tokens": sum(usage.candidates_token_count or 0 for usage in usages),
+        "tool_calls": sum(len(event.get_function_calls()) for event in events),
+    }
+
+
+class EvalRunner:
+    """Runs cases against the agents, with a bounded parallelism and an output cache."""
+
+    def __init__(self, cache_dir: Path, concurrency: int, timeout: float, use_cache: bool, cache_only: bool):
+        self.cache_dir = cache_dir
+        self.semaphore = asyncio.Semaphore(concurrency)
+        self.timeout = timeout
+        self.use_cache = use_cache
+        self.cache_only = cache_only
+        self._runners: dict[str, Any] = {}
+        self.fingerprints: dict[str, dict[str, str]] = {}
+
+    def _runner(self, agent_name: str) -> Any:
+        if agent_name not in self._runners:
+            from google.adk.runners import InMemoryRunner
+
+            from app.components.agents.registry import get_agent
+
+            agent = get_agent(agent_name)
+            self._runners[agent_name] = InMemoryRunner(agent=agent, app_name=agent_name)
+            self.fingerprints[agent_name] = fingerprint(agent)
+        return self._runners[agent_name]
+
+    def _cache_key(self, case: dict[str, Any]) -> str:
+        from app.services.response_cache import ResponseCache
+
+        fingerprint = self.fingerprints[case["agent"]]
+        return ResponseCache.make_key(
+            agent_name=case["agent"],
+            instruction_hash=fingerprint["instruction_hash"],
+            model=f"{fingerprint['backend']}/{fingerprint['model']}",
+            prompt=case["prompt"],
+            corpus_version=fingerprint["corpus"],
+            tenant_id=fingerprint["tenant_id"],
+        )
+
+    async def _generate(self, runner: Any, case: dict[str, Any]) -> dict[str, Any]:
+        from google.genai import types
+
+        session = await runner.session_service.create_session(app_name=case["agent"], user_id=EVAL_USER_ID)
+        message = types.Content(role="user", parts=[types.Part(text=case["prompt"])])
+        events = []
+        started_at = time.perf_counter()
+        try:
+            async for event in runner.run_async(user_id=EVAL_USER_ID, session_id=session.id, new_message=message):
+                events.append(event)
+        finally:
+            await runner.session_service.delete_session(
+                app_name=case["agent"], user_id=EVAL_USER_ID, session_id=session.id
+            )
+        return {"latency_s": time.perf_counter() - started_at, **collect(events)}
+
+    async def run_case(self, case: dict[str, Any]) -> dict[str, Any]:
+        """
+        Run one case, or read its output from the cache.
+
+        Args:
+            case: Dataset case
+
+        Returns:
+            The case result: output, usage counters, quality metrics, `cached`
+            and `error` (None when the case ran)
+        """
+        result: dict[str, Any] = {"id": case["id"], "agent": case["agent"], "cached": False, "error": None}
+        try:
+            runner = self._runner(case["agent"])
+        except KeyError:
+            return {**result, "error": f"Unknown agent '{case['agent']}'"}
+
+        cache_path = self.cache_dir / f"{self._cache_key(case)}.json"
+        if self.use_cache and cache_path.exists():
+            output = json.loads(cache_path.read_text(encoding="utf-8"))
+            result["cached"] = True
+        elif self.cache_only:
+            return {**result, "error": "Not in cache"}
+        else:
+            async with self.semaphore:
+                try:
+                    output = await asyncio.wait_for(self._generate(runner, case), timeout=self.timeout)
+                except Exception as e:
+                    return {**result, "error": f"{type(e).__name__}: {e}"}
+            cache_path.write_text(json.dumps(output, ensure_ascii=False), encoding="utf-8")
+        return {**result, **output, "quality": compute_quality(case["agent"], output["text"], case)}
+
+
+def percentile(values: list[float], fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def summarize(results: list[dict[str, Any]]) -> dict[str, Any]:
+    """Aggregate case results: error and cache counts, latency, usage and quality means."""
+    ran = [result for result in results if result["error"] is None]
+    summary: dict[str, Any] = {
+        "cases": len(results),
+        "errors": len(results) - len(ran),
+        "cache_hits": sum(result["cached"] for result in ran),
+    }
+    if not ran:
+        return summary
+    latencies = [result["latency_s"] for result in ran]
+    summary.update(
+        latency_mean_s=statistics.fmean(latencies),
+        latency_p50_s=percentile(latencies, 0.5),
+        latency_p95_s=percentile(latencies, 0.95),
+        **{
+            f"{counter}_mean": statistics.fmean(result[counter] for result in ran)
+            for counter in ("model_calls", "prompt_tokens", "output_tokens", "tool_calls")
+        },
+    )
+    metric_names = sorted({name for result in ran for name in result["quality"]})
+    summary["quality"] = {
+        name: statistics.fmean(result["quality"][name] for result in ran if name in result["quality"])
+        for name in metric_names
+    }
+    return summary
+
+
+async def evaluate(cases: list[dict[str, Any]], args: argparse.Namespace) -> dict[str, Any]:
+    """Run the cases concurrently and write the results and summary of the run."""
+    from app.config.settings import settings
+
+    settings.RESPONSE_CACHE_ENABLED = False
+    cache_dir = Path(args.cache_dir)
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    runner = EvalRunner(cache_dir, args.concurrency, args.timeout, not args.no_cache, args.cache_only)
+
+    started_at = time.perf_counter()
+    results = await asyncio.gather(*(runner.run_case(case) for case in cases))
+    elapsed = time.perf_counter() - started_at
+
+    agents = sorted({result["agent"] for result in results})
+    summary = {
+        "name": args.name,
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "wall_time_s": elapsed,
+        "concurrency": args.concurrency,
+        "fingerprints": runner.fingerprints,
+        "overall": summarize(results),
+        "agents": {agent: summarize([result for result in results if result["agent"] == agent]) for agent in agents},
+    }
+    output_dir = Path(args.output_dir) / args.name
+    output_dir.mkdir(parents=True, exist_ok=True)
+    with open(output_dir / "results.jsonl", "w", encoding="utf-8") as f:
+        for result in results:
+            f.write(json.dumps(result, ensure_ascii=False) + "\n")
+    (output_dir / "summary.json").write_text(json.dumps(summary, indent=2, ensure_ascii=False), encoding="utf-8")
+    return summary
+
+
+def start_stub(port: int, latency: float) -> subprocess.Popen:
+    """Start the stub model and point the agents at it (before `app` is imported)."""
+    from benchmarks.processes import wait_until_ready
+
+    stub = subprocess.Popen(
+        [sys.executable, "-m", "benchmarks.stub_vertex", "--port", str(port), "--latency", str(latency)]
+    )
+    os.environ.update(
+        {
+            "GOOGLE_GENAI_USE_VERTEXAI": "false",
+            "GOOGLE_API_KEY": "stub",
+            "MODEL_BASE_URL": f"http://127.0.0.1:{port}",
+            "RAG_API_ENDPOINT": f"http://127.0.0.1:{port}",
+            "RAG_API_TRANSPORT": "rest",
+            "CONTEXT_CACHE_ENABLED": "false",
+        }
+    )
+    wait_until_ready(f"http://127.0.0.1:{port}/_stats", 30)
+    return stub
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--name", default=None, help="Run name (default: timestamp)")
+    parser.add_argument("--dataset", action="append", help=f"Dataset files or globs (default: {DEFAULT_DATASETS})")
+    parser.add_argument("--agent", action="append", help="Only run the cases of these agents")
+    parser.add_argument("--concurrency", type=int, default=4, help="Cases run at the same time")
+    parser.add_argument("--timeout", type=float, default=300, help="Timeout of one case (s)")
+    parser.add_argument("--output-dir", default=DEFAULT_OUTPUT_DIR)
+    parser.add_argument("--cache-dir", default=f"{DEFAULT_OUTPUT_DIR}/cache")
+    parser.add_argument("--no-cache", action="store_true", help="Run every case, refreshing the cache")
+    parser.add_argument("--cache-only", action="store_true", help="Only replay cached outputs")
+    parser.add_argument("--stub", action="store_true", help="Run against the stub model")
+    parser.add_argument("--stub-port", type=int, default=9090)
+    parser.add_argument("--stub-latency", type=float, default=0.2)
+    parser.add_argument("--record", metavar="PATH", help="Record the model and RAG calls to PATH")
+    parser.add_argument("--replay", metavar="PATH", help="Replay the model and RAG calls recorded in PATH")
+    args = parser.parse_args()
+    args.name = args.name or time.strftime("%Y%m%d-%H%M%S")
+
+    cases = load_cases(args.dataset or [DEFAULT_DATASETS], args.agent)
+    if not cases:
+        parser.error("No evaluation case found")
+
+    if args.record or args.replay:
+        mode = "record" if args.record else "replay"
+        os.environ.update({"RECORDING_MODE": mode, "RECORDING_PATH": args.record or args.replay})
+    stub = start_stub(args.stub_port, args.stub_latency) if args.stub else None
+    try:
+        summary = asyncio.run(evaluate(cases, args))
+    finally:
+        if stub is not None:
+            from benchmarks.processes import stop
+
+            stop(stub)
+
+    overall = summary["overall"]
+    print(
+        f"{args.name}: {overall['cases']} cases, {overall['errors']} errors, "
+        f"{overall['cache_hits']} cached, {summary['wall_time_s']:.2f}s"
+    )
+    for agent, agent_summary in summary["agents"].items():
+        quality = ", ".join(f"{name} {value:.2f}" for name, value in agent_summary.get("quality", {}).items())
+        print(f"  {agent:<24} {agent_summary.get('latency_mean_s', 0):6.2f}s  {quality}")
+    print(f"Results written to {Path(args.output_dir) / args.name}")
+
+
+if __name__ == "__main__":
+    main()
@@ -202,6 +202,22 @@ resource "google_cloud_run_v2_service" "default" {
           }
         }
       }
+      # Traffic is only routed once the warm-up of the model and RAG
+      # connections has completed (/health/ready)
+      startup_probe {
+        http_get {
+          path = "/health/ready"
+        }
+        period_seconds    = 2
+        timeout_seconds   = 2
+        failure_threshold = 30
+      }
+      liveness_probe {
+        http_get {
+          path = "/health/live"
+        }
+        period_seconds = 30
+      }
     }
   }
 }
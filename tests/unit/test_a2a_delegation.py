@@ -0,0 +1,51 @@
+"""Tests of the admission of local delegated runs."""
+
+import pytest
+
+from app.config.settings import settings
+from app.services.a2a_delegation import A2ADelegator, AgentCardCache, DelegationError
+from app.services.concurrency_limiter import agent_run_limiter
+from app.services.tenants import (
+    DEFAULT_TENANT_ID,
+    TenantConfig,
+    tenant_quotas,
+    tenant_registry,
+)
+
+
+@pytest.fixture
+def delegator(monkeypatch: pytest.MonkeyPatch) -> A2ADelegator:
+    monkeypatch.setattr(settings, "MULTI_TENANCY_ENABLED", True)
+    monkeypatch.setattr(settings, "LOAD_SHEDDING_ENABLED", False)
+    monkeypatch.setattr(
+        tenant_registry, "_tenants", {DEFAULT_TENANT_ID: TenantConfig(tenant_id=DEFAULT_TENANT_ID, max_concurrent_runs=1)}
+    )
+    monkeypatch.setattr(tenant_quotas, "_usage", {})
+    return A2ADelegator(remote_agents={}, card_cache=AgentCardCache(ttl_seconds=60))
+
+
+@pytest.mark.asyncio
+async def test_local_run_takes_a_tenant_slot(delegator: A2ADelegator) -> None:
+    async with delegator._admitted():
+        assert tenant_quotas.usage(DEFAULT_TENANT_ID).in_flight == 1
+    assert tenant_quotas.usage(DEFAULT_TENANT_ID).in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_local_run_is_rejected_over_the_tenant_quota(delegator: A2ADelegator) -> None:
+    tenant_quotas.acquire(tenant_registry.get(DEFAULT_TENANT_ID))
+    with pytest.raises(DelegationError, match="concurrency quota"):
+        async with delegator._admitted():
+            pass
+
+
+@pytest.mark.asyncio
+async def test_local_run_is_shed_when_overloaded(delegator: A2ADelegator, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(settings, "LOAD_SHEDDING_ENABLED", True)
+    monkeypatch.setattr(agent_run_limiter, "has_capacity", lambda: False)
+    monkeypatch.setattr(agent_run_limiter, "max_wait_seconds", 0)
+    with pytest.raises(DelegationError, match="overloaded"):
+        async with delegator._admitted():
+            pass
+    # The tenant slot taken first is given back
+    assert tenant_quotas.usage(DEFAULT_TENANT_ID).in_flight == 0
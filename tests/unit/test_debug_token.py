@@ -0,0 +1,42 @@
+"""Tests of the debug token lookup."""
+
+import pytest
+
+from app.config.settings import settings
+from app.routers import debug
+
+
+@pytest.fixture(autouse=True)
+def reset_token(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(debug, "_debug_token", "")
+    monkeypatch.setattr(debug, "_debug_token_checked_at", None)
+    monkeypatch.setattr(settings, "DEBUG_TOKEN", "")
+    monkeypatch.setenv("GOOGLE_CLOUD_PROJECT", "project")
+
+
+def test_failed_lookup_is_retried_after_the_delay(monkeypatch: pytest.MonkeyPatch) -> None:
+    secrets = iter([None, "token"])
+    monkeypatch.setattr(debug, "get_secret", lambda *args: next(secrets))
+    now = [1000.0]
+    monkeypatch.setattr(debug.time, "monotonic", lambda: now[0])
+
+    assert debug.get_debug_token() == ""
+    # Not looked up again before the delay
+    now[0] += debug.DEBUG_TOKEN_RETRY_SECONDS / 2
+    assert debug.get_debug_token() == ""
+    now[0] += debug.DEBUG_TOKEN_RETRY_SECONDS
+    assert debug.get_debug_token() == "token"
+
+
+def test_token_found_is_kept(monkeypatch: pytest.MonkeyPatch) -> None:
+    calls: list[tuple[str, ...]] = []
+
+    def get_secret(*args: str) -> str:
+        calls.append(args)
+        return "token"
+
+    monkeypatch.setattr(debug, "get_secret", get_secret)
+
+    assert debug.get_debug_token() == "token"
+    assert debug.get_debug_token() == "token"
+    assert len(calls) == 1
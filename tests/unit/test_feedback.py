@@ -0,0 +1,79 @@
+"""Tests of the batched feedback pipeline."""
+
+import asyncio
+import time
+from pathlib import Path
+from typing import Any
+
+import orjson
+import pytest
+
+from app.services.feedback import FeedbackPipeline, FeedbackSink, JsonlFeedbackSink
+
+
+class FlakySink(FeedbackSink):
+    """Fails the first `failures` writes, then keeps the records."""
+
+    name = "flaky"
+
+    def __init__(self, failures: int):
+        self.failures = failures
+        self.records: list[dict[str, Any]] = []
+
+    def write(self, records: list[dict[str, Any]]) -> None:
+        if self.failures:
+            self.failures -= 1
+            raise ConnectionError("sink unavailable")
+        self.records.extend(records)
+
+
+def make_pipeline(sink: FeedbackSink, max_attempts: int = 5) -> FeedbackPipeline:
+    return FeedbackPipeline(sink=sink, batch_size=2, flush_interval_seconds=60, max_buffered=10, max_attempts=max_attempts)
+
+
+@pytest.mark.asyncio
+async def test_full_batch_is_written_without_waiting_for_the_interval(tmp_path: Path) -> None:
+    path = tmp_path / "feedback.jsonl"
+    pipeline = make_pipeline(JsonlFeedbackSink(str(path)))
+    pipeline.start()
+    pipeline.submit({"score": 1})
+    pipeline.submit({"score": 0})
+    for _ in range(100):
+        if pipeline.written == 2:
+            break
+        await asyncio.sleep(0.01)
+    await pipeline.stop()
+
+    assert [orjson.loads(line) for line in path.read_bytes().splitlines()] == [{"score": 1}, {"score": 0}]
+
+
+@pytest.mark.asyncio
+async def test_failed_batch_is_put_back_then_dropped_after_max_attempts() -> None:
+    sink = FlakySink(failures=2)
+    pipeline = make_pipeline(sink, max_attempts=2)
+    pipeline.submit({"score": 1})
+
+    assert await pipeline.flush() is False
+    assert pipeline.stats()["buffered"] == 1
+    assert await pipeline.flush() is True
+    assert pipeline.dropped == 1
+    assert pipeline.stats()["buffered"] == 0
+
+
+@pytest.mark.asyncio
+async def test_stop_interrupts_the_backoff_and_drains_the_buffer() -> None:
+    sink = FlakySink(failures=1)
+    pipeline = make_pipeline(sink)
+    pipeline.start()
+    pipeline.submit({"score": 1})
+    pipeline.submit({"score": 0})
+    for _ in range(100):
+        if pipeline.failed_writes:
+            break
+        await asyncio.sleep(0.01)
+
+    started_at = time.perf_counter()
+    await pipeline.stop(timeout=5)
+
+    assert time.perf_counter() - started_at < 1
+    assert sink.records == [{"score": 1}, {"score": 0}]
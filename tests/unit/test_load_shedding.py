@@ -0,0 +1,58 @@
+"""Tests of the requests limited by the load shedding middleware."""
+
+import json
+from typing import Any
+
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+
+from app.config.settings import settings
+from app.services.concurrency_limiter import AdaptiveConcurrencyLimiter
+from app.utils.load_shedding import LoadSheddingMiddleware
+
+
+@pytest.fixture
+def limiter() -> AdaptiveConcurrencyLimiter:
+    """A limiter whose only slot is taken."""
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=1, min_limit=1, max_limit=1)
+    limiter.in_flight = 1
+    return limiter
+
+
+@pytest.fixture
+def client(limiter: AdaptiveConcurrencyLimiter) -> TestClient:
+    app = FastAPI()
+
+    @app.post("/a2a/quizz_agent")
+    async def echo(request: Request) -> dict[str, str]:
+        return {"body": (await request.body()).decode()}
+
+    app.add_middleware(LoadSheddingMiddleware, limiter=limiter)
+    return TestClient(app)
+
+
+def rpc(method: str) -> dict[str, Any]:
+    return {"jsonrpc": "2.0", "id": 1, "method": method, "params": {"id": "task-1"}}
+
+
+@pytest.mark.parametrize("method", ["message/send", "message/stream"])
+def test_messages_are_shed(client: TestClient, limiter: AdaptiveConcurrencyLimiter, method: str) -> None:
+    response = client.post("/a2a/quizz_agent", json=rpc(method))
+    assert response.status_code == settings.LOAD_SHEDDING_STATUS_CODE
+    assert limiter.rejected == 1
+
+
+@pytest.mark.parametrize("method", ["tasks/get", "tasks/cancel", "tasks/pushNotificationConfig/get"])
+def test_task_calls_are_not_limited(client: TestClient, limiter: AdaptiveConcurrencyLimiter, method: str) -> None:
+    body = json.dumps(rpc(method))
+    response = client.post("/a2a/quizz_agent", content=body, headers={"Content-Type": "application/json"})
+    # The body read for the method reaches the A2A application
+    assert response.json() == {"body": body}
+    assert (limiter.accepted, limiter.rejected) == (0, 0)
+
+
+def test_malformed_body_reaches_the_application(client: TestClient, limiter: AdaptiveConcurrencyLimiter) -> None:
+    response = client.post("/a2a/quizz_agent", content=b"{not json", headers={"Content-Type": "application/json"})
+    assert response.json() == {"body": "{not json"}
+    assert limiter.rejected == 0
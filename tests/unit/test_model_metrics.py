@@ -0,0 +1,44 @@
+"""Tests of the per-route model call metrics of the model callbacks."""
+
+import asyncio
+
+import pytest
+from google.adk.agents import LlmAgent
+from google.adk.agents.callback_context import CallbackContext
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.models import LlmRequest, LlmResponse
+from google.adk.sessions import InMemorySessionService
+from google.genai import types
+
+from app.components.callbacks import after_model
+from app.components.callbacks.after_model import record_model_metrics
+from app.components.callbacks.before_model import route_model
+from app.config.settings import settings
+
+
+@pytest.mark.asyncio
+async def test_concurrent_calls_of_a_session_keep_their_own_start_time(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(settings, "MODEL_ROUTING_ENABLED", False)
+    latencies: list[float | None] = []
+    monkeypatch.setattr(
+        after_model.metrics, "observe", lambda family, name, latency, **counters: latencies.append(latency)
+    )
+    service = InMemorySessionService()
+    session = await service.create_session(app_name="quizz_agent", user_id="user")
+    agent = LlmAgent(name="quizz_agent", model="gemini-2.5-flash", instruction="Quiz")
+    ctx = InvocationContext(session_service=service, invocation_id="e-1", agent=agent, session=session)
+    response = LlmResponse(content=types.Content(role="model", parts=[types.Part(text="Quiz")]))
+
+    async def call(delay: float, duration: float) -> None:
+        await asyncio.sleep(delay)
+        route_model(CallbackContext(ctx), LlmRequest())
+        await asyncio.sleep(duration)
+        # Without the pending state delta of the call, as once its events are appended
+        record_model_metrics(CallbackContext(ctx), response)
+
+    # The short call starts after, and ends before, the long one
+    await asyncio.gather(call(0, 0.2), call(0.05, 0.05))
+
+    short, long = latencies
+    assert short is not None and short < 0.1
+    assert long is not None and long >= 0.2
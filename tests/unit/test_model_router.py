@@ -0,0 +1,83 @@
+"""Tests of the intent detection and routing of `app.services.model_router`."""
+
+import pytest
+
+from app.config.settings import settings
+from app.services.model_router import (
+    Intent,
+    Route,
+    classify_request,
+    detect_intent,
+    is_followup_request,
+)
+
+
+@pytest.mark.parametrize(
+    ("prompt", "intent"),
+    [
+        # Creations, including prompts mentioning analysis or variation words
+        ("Crée un quiz sur la sécurité des mots de passe.", Intent.CREATION),
+        ("Crée un quiz de difficulté moyenne sur SQL", Intent.CREATION),
+        ("Génère un quiz pour évaluer les connaissances en Git", Intent.CREATION),
+        ("Crée un script de formation avec des objectifs pédagogiques", Intent.CREATION),
+        ("Fais un quiz pour vérifier les acquis sur Git", Intent.CREATION),
+        ("Crée un quiz sur la version 3 de Python", Intent.CREATION),
+        ("Crée un quiz avec des distracteurs plausibles", Intent.CREATION),
+        ("Crée une formation sur SQL avec des objectifs et un quiz d'évaluation", Intent.CREATION),
+        ("Rédige un module sur la gestion du changement", Intent.CREATION),
+        ("Un quiz sur Docker, s'il te plaît", Intent.CREATION),
+        ("", Intent.CREATION),
+        # Variations of an existing quiz
+        ("Génère 2 autres versions de ce quiz en changeant les questions 2 et 4.", Intent.VARIATION),
+        ("Génère une autre version de ce quiz.", Intent.VARIATION),
+        ("Propose une variante de ce quiz", Intent.VARIATION),
+        ("Change les distracteurs de la question 3.", Intent.VARIATION),
+        ("Génère une autre version de ce quiz en remplaçant la question 3.", Intent.VARIATION),
+        ("Reformule la question 2", Intent.VARIATION),
+        # Analyses
+        ("Analyse la difficulté de ce quiz", Intent.ANALYSE),
+        ("Évalue la pertinence des questions", Intent.ANALYSE),
+        ("Quelle est la difficulté de ce quiz ?", Intent.ANALYSE),
+        # Explanations
+        ("Explique pourquoi la réponse B est correcte", Intent.EXPLICATION),
+        ("Explique pourquoi tu as créé cette question", Intent.EXPLICATION),
+        ("Pourquoi la réponse A est-elle fausse ?", Intent.EXPLICATION),
+    ],
+)
+def test_detect_intent(prompt: str, intent: Intent) -> None:
+    assert detect_intent(prompt) is intent
+
+
+@pytest.mark.parametrize(
+    ("prompt", "route"),
+    [
+        ("Crée un quiz de difficulté moyenne sur SQL", Route.HEAVY),
+        ("Génère une autre version de ce quiz.", Route.HEAVY),
+        ("Explique pourquoi la réponse B est correcte", Route.FAST),
+        ("Analyse la difficulté de ce quiz", Route.FAST),
+        ("Analyse la difficulté de ce quiz : " + "x" * 1000, Route.HEAVY),
+    ],
+)
+def test_classify_request(monkeypatch: pytest.MonkeyPatch, prompt: str, route: Route) -> None:
+    monkeypatch.setattr(settings, "MODEL_ROUTING_FAST_INTENTS", ["analyse", "explication"])
+    monkeypatch.setattr(settings, "MODEL_ROUTING_FAST_MAX_PROMPT_CHARS", 400)
+    assert classify_request(prompt).route is route
+
+
+@pytest.mark.parametrize(
+    ("prompt", "followup"),
+    [
+        ("Rends le quiz du deuxième module plus difficile", True),
+        ("Explique la question 3", True),
+        ("Pourquoi la réponse B est-elle correcte ?", True),
+        ("Ajoute un exemple à la section 2", True),
+        ("Génère un nouveau quiz pour ce module", True),
+        ("Rends-le plus court", True),
+        ("Crée une formation sur SQL avec des objectifs et un quiz d'évaluation", False),
+        ("Crée un quiz sur Docker", False),
+        ("Rédige une formation sur Git pour des débutants", False),
+        ("Une formation sur Kubernetes", False),
+    ],
+)
+def test_is_followup_request(prompt: str, followup: bool) -> None:
+    assert is_followup_request(prompt) is followup
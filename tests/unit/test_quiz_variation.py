@@ -0,0 +1,59 @@
+"""Tests of the quiz parsing and passage collection of the variation mode."""
+
+from pathlib import Path
+
+import pytest
+from google.adk.events import Event
+from google.genai import types
+
+from app.components.agents.quizz_agent import variation
+from app.components.agents.quizz_agent.variation import (
+    collect_passages,
+    format_quiz,
+    parse_questions,
+)
+from app.services.tool_responses import LocalToolResponseStore, ToolResponseBudget
+
+QUIZ = """**Question 1 : Quelle commande crée un dépôt ?**
+A) git init
+B) git add
+C) git push
+D) git log
+
+**Bonne Réponse :** A
+**Explication :** `git init` crée le dépôt.
+
+---
+
+**Question 2 : Quelle commande envoie les commits ?**
+A) git pull
+B) git push
+
+**Bonne Réponse :** B
+**Explication :** `git push` envoie les commits."""
+
+
+def test_parse_questions_round_trips_the_quiz_format() -> None:
+    questions = parse_questions(QUIZ)
+
+    assert [question["answer"] for question in questions] == ["A", "B"]
+    assert parse_questions(format_quiz(questions)) == questions
+
+
+@pytest.mark.asyncio
+async def test_truncated_passages_are_collected_in_full(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    budget = ToolResponseBudget(
+        max_chars=100, page_chars=1000, store=LocalToolResponseStore(str(tmp_path), ttl_seconds=60), prefix="tool_responses"
+    )
+    monkeypatch.setattr(variation, "tool_response_budget", budget)
+    passages = ["court", "x" * 500]
+    truncated = await budget.enforce("retrieve", {"result": passages})
+    event = Event(
+        author="quizz_agent",
+        content=types.Content(
+            role="user",
+            parts=[types.Part(function_response=types.FunctionResponse(name="retrieve", response=truncated))],
+        ),
+    )
+
+    assert await collect_passages(event, {"retrieve"}) == passages
@@ -0,0 +1,37 @@
+"""Tests of the SQLite store shared by the worker processes."""
+
+import time
+from pathlib import Path
+
+from app.services.shared_store import SharedStore
+
+
+def test_expired_entries_are_hidden_and_not_counted(tmp_path: Path) -> None:
+    store = SharedStore(tmp_path / "store.db")
+    store.set("ns", "expired", "1", ttl_seconds=0.01)
+    store.set("ns", "live", "2", ttl_seconds=60)
+    time.sleep(0.02)
+
+    assert store.get("ns", "expired") is None
+    assert store.get("ns", "live") == "2"
+    assert store.count("ns") == 1
+
+
+def test_get_does_not_write(tmp_path: Path) -> None:
+    store = SharedStore(tmp_path / "store.db")
+    store.set("ns", "key", "value", ttl_seconds=60)
+    connection = store._connect()
+    changes = connection.total_changes
+
+    assert store.get("ns", "key") == "value"
+    assert connection.total_changes == changes
+
+
+def test_set_evicts_the_oldest_entries(tmp_path: Path) -> None:
+    store = SharedStore(tmp_path / "store.db")
+    for index in range(3):
+        store.set("ns", f"key{index}", "value", ttl_seconds=60, max_entries=2)
+        time.sleep(0.001)
+
+    assert store.get("ns", "key0") is None
+    assert store.count("ns") == 2
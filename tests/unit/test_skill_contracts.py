@@ -0,0 +1,87 @@
+"""Tests of the skill contracts and of the A2A message validation middleware."""
+
+from typing import Any
+
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+
+from app.components.skills.quizz_agent.quizz_agent_skills import QUIZZ_AGENT_SKILLS
+from app.config.settings import settings
+from app.services.agent_discovery import AgentEntry
+from app.services.skill_contracts import AgentContract, SkillContracts, message_instance
+from app.utils.skill_validation import SkillValidationMiddleware
+
+
+class Contracts(SkillContracts):
+    """The quiz agent's contract, without agent discovery."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        entry = AgentEntry(
+            name="quizz_agent", module="", description="Quiz", skills=list(QUIZZ_AGENT_SKILLS), source_hash=""
+        )
+        self.contract = AgentContract(entry)
+
+    def get(self, agent_name: str) -> AgentContract:
+        if agent_name != "quizz_agent":
+            raise KeyError(agent_name)
+        return self.contract
+
+
+def message(*parts: dict[str, Any]) -> dict[str, Any]:
+    return {"role": "user", "messageId": "1", "parts": list(parts)}
+
+
+@pytest.mark.parametrize(
+    ("parts", "valid"),
+    [
+        ([{"kind": "text", "text": "Crée un quiz sur Git"}], True),
+        ([{"kind": "file", "file": {"name": "cours.pdf", "mimeType": "application/pdf", "bytes": "JVBERi0="}}], True),
+        ([{"kind": "data", "data": {"topic": "Git"}}], True),
+        ([{"kind": "text", "text": ""}], False),
+        ([], False),
+    ],
+)
+def test_input_schema_accepts_messages_without_text(parts: list[dict[str, Any]], valid: bool) -> None:
+    errors = Contracts().contract.validate_input(message_instance(message(*parts)))
+    assert (errors == []) is valid
+
+
+def test_file_content_is_not_part_of_the_instance() -> None:
+    instance = message_instance(message({"kind": "file", "file": {"name": "a.pdf", "bytes": "JVBERi0="}}))
+    assert instance == {"files": [{"name": "a.pdf"}]}
+
+
+@pytest.fixture
+def client(monkeypatch: pytest.MonkeyPatch) -> TestClient:
+    monkeypatch.setattr(settings, "SKILL_VALIDATION_ENABLED", True)
+    monkeypatch.setattr(settings, "SKILL_VALIDATION_MAX_BODY_BYTES", 1000)
+    app = FastAPI()
+
+    @app.post("/a2a/quizz_agent")
+    async def echo(request: Request) -> dict[str, int]:
+        return {"received": len(await request.body())}
+
+    app.add_middleware(SkillValidationMiddleware, contracts=Contracts())
+    return TestClient(app)
+
+
+def rpc(text: str) -> dict[str, Any]:
+    return {"jsonrpc": "2.0", "id": 1, "method": "message/send", "params": {"message": message({"kind": "text", "text": text})}}
+
+
+def test_valid_message_reaches_the_agent_with_its_body(client: TestClient) -> None:
+    response = client.post("/a2a/quizz_agent", json=rpc("Crée un quiz sur Git"))
+    assert response.status_code == 200
+    assert response.json()["received"] > 0
+
+
+def test_invalid_message_is_rejected(client: TestClient) -> None:
+    response = client.post("/a2a/quizz_agent", json=rpc(""))
+    assert response.json()["error"]["code"] == -32602
+
+
+def test_oversized_body_is_rejected(client: TestClient) -> None:
+    response = client.post("/a2a/quizz_agent", json=rpc("x" * 2000))
+    assert response.status_code == 413
@@ -0,0 +1,56 @@
+"""Tests of the tenant authentication of `TenantMiddleware`."""
+
+import hashlib
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.config.settings import settings
+from app.services.tenants import (
+    DEFAULT_TENANT_ID,
+    TenantConfig,
+    TenantQuotas,
+    tenant_registry,
+)
+from app.utils.tenancy import TenantMiddleware
+
+API_KEY = "acme-secret"
+
+
+@pytest.fixture
+def client(monkeypatch: pytest.MonkeyPatch) -> TestClient:
+    monkeypatch.setattr(settings, "TENANT_HEADER_TRUSTED", False)
+    monkeypatch.setattr(
+        tenant_registry,
+        "_tenants",
+        {
+            DEFAULT_TENANT_ID: TenantConfig(tenant_id=DEFAULT_TENANT_ID),
+            "acme": TenantConfig(tenant_id="acme", api_key_sha256=[hashlib.sha256(API_KEY.encode()).hexdigest()]),
+        },
+    )
+    app = FastAPI()
+    app.add_api_route("/ping", lambda: {"ok": True})
+    app.add_middleware(TenantMiddleware, quotas=TenantQuotas())
+    return TestClient(app)
+
+
+@pytest.mark.parametrize(
+    ("headers", "status_code"),
+    [
+        ({}, 200),
+        ({"X-Tenant-ID": "acme", "X-API-Key": API_KEY}, 200),
+        ({"X-Tenant-ID": "acme"}, 401),
+        ({"X-Tenant-ID": "acme", "X-API-Key": "wrong"}, 401),
+        ({"X-Tenant-ID": "other", "X-API-Key": API_KEY}, 400),
+    ],
+)
+def test_tenant_header_requires_the_tenant_api_key(
+    client: TestClient, headers: dict[str, str], status_code: int
+) -> None:
+    assert client.get("/ping", headers=headers).status_code == status_code
+
+
+def test_trusted_tenant_header_needs_no_api_key(client: TestClient, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(settings, "TENANT_HEADER_TRUSTED", True)
+    assert client.get("/ping", headers={"X-Tenant-ID": "acme"}).status_code == 200
@@ -0,0 +1,50 @@
+"""Tests of the tool response budget and its local store."""
+
+import os
+import time
+from pathlib import Path
+
+import pytest
+
+from app.services.tool_responses import LocalToolResponseStore, ToolResponseBudget
+
+DAY = 24 * 3600
+
+
+def age(path: Path, seconds: float) -> None:
+    mtime = time.time() - seconds
+    os.utime(path, (mtime, mtime))
+
+
+def test_expired_responses_are_hidden_and_deleted(tmp_path: Path) -> None:
+    store = LocalToolResponseStore(str(tmp_path), ttl_seconds=DAY)
+    store.put("tool_responses/default/old.json.gz", b"old")
+    store.put("tool_responses/default/new.json.gz", b"new")
+    age(tmp_path / "tool_responses/default/old.json.gz", 2 * DAY)
+
+    assert store.get("tool_responses/default/old.json.gz") is None
+    assert store.get("tool_responses/default/new.json.gz") == b"new"
+    assert store.cleanup() == 1
+    assert not (tmp_path / "tool_responses/default/old.json.gz").exists()
+
+
+@pytest.mark.asyncio
+async def test_truncated_response_is_fetched_in_full(tmp_path: Path) -> None:
+    store = LocalToolResponseStore(str(tmp_path), ttl_seconds=DAY)
+    budget = ToolResponseBudget(max_chars=100, page_chars=1000, store=store, prefix="tool_responses")
+    response = {"result": ["short", "x" * 500]}
+
+    truncated = await budget.enforce("retrieve", response)
+
+    assert truncated is not None
+    assert truncated["result"][0] == "short"
+    assert len(truncated["result"][1]) < 500
+    page = await budget.fetch(truncated["truncation"]["ref"], "result.1")
+    assert page["text"] == "x" * 500
+
+
+@pytest.mark.asyncio
+async def test_budget_is_disabled_without_a_limit(tmp_path: Path) -> None:
+    store = LocalToolResponseStore(str(tmp_path), ttl_seconds=DAY)
+    budget = ToolResponseBudget(max_chars=0, page_chars=1000, store=store, prefix="tool_responses")
+    assert await budget.enforce("retrieve", {"result": "x" * 100_000}) is None
@@ -0,0 +1,94 @@
+"""Tests of the routing of the training script pipeline."""
+
+from collections.abc import AsyncGenerator
+
+import pytest
+from google.adk.agents import BaseAgent, LlmAgent
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.events import Event
+from google.adk.sessions import InMemorySessionService
+from google.genai import types
+
+from app.components.agents.training_script_agent.pipeline import (
+    TrainingScriptPipelineAgent,
+    build_training_script_pipeline,
+)
+
+
+@pytest.fixture
+def started(monkeypatch: pytest.MonkeyPatch) -> list[str]:
+    """Names of the sub-agents run, which do not call any model."""
+    names: list[str] = []
+
+    async def run_async(self: BaseAgent, ctx: InvocationContext) -> AsyncGenerator[Event, None]:
+        names.append(self.name)
+        events: list[Event] = []
+        for event in events:
+            yield event
+
+    monkeypatch.setattr(BaseAgent, "run_async", run_async)
+    return names
+
+
+async def run(pipeline: TrainingScriptPipelineAgent, prompt: str, answered: bool) -> None:
+    service = InMemorySessionService()
+    session = await service.create_session(app_name="training_script_agent", user_id="user")
+    if answered:
+        session.events.append(
+            Event(
+                invocation_id="previous",
+                author=pipeline.name,
+                content=types.Content(role="model", parts=[types.Part(text="# Script")]),
+            )
+        )
+    ctx = InvocationContext(
+        session_service=service,
+        invocation_id="current",
+        agent=pipeline,
+        session=session,
+        user_content=types.Content(role="user", parts=[types.Part(text=prompt)]),
+    )
+    async for _ in pipeline._run_async_impl(ctx):
+        pass
+
+
+@pytest.fixture
+def pipeline() -> TrainingScriptPipelineAgent:
+    writer = LlmAgent(name="training_script_agent", model="gemini-2.5-flash", instruction="Script")
+    return build_training_script_pipeline(writer, "Agenda", "Section")
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("prompt", "answered"),
+    [
+        ("Rends-le plus court", True),
+        ("Traduis le script en anglais", True),
+        ("Peux-tu adapter ce script pour des débutants ?", True),
+        ("Ajoute un exemple à la section 2", True),
+        ("Merci !", True),
+        ("Rends-le plus court", False),
+        ("Explique la section 3", False),
+    ],
+)
+async def test_followups_reach_the_writer(
+    started: list[str], pipeline: TrainingScriptPipelineAgent, prompt: str, answered: bool
+) -> None:
+    await run(pipeline, prompt, answered)
+    assert started == [pipeline.writer.name]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("prompt", "answered"),
+    [
+        ("Crée une formation sur SQL pour des débutants", False),
+        ("Une formation sur Kubernetes", False),
+        ("Rédige un nouveau script sur Git", True),
+    ],
+)
+async def test_creations_start_with_the_agenda(
+    started: list[str], pipeline: TrainingScriptPipelineAgent, prompt: str, answered: bool
+) -> None:
+    await run(pipeline, prompt, answered)
+    assert started[0] == pipeline.agenda_agent.name